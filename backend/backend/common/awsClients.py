@@ -0,0 +1,233 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Shared AWS client registry
+
+Handlers used to create their own boto3 clients and resources at import time with the default
+configuration (10 pooled connections, standard retries), including clients the invoked code path
+never uses. Clients from this registry are created on first use, shared by every module in the
+Lambda container and configured for the thread pool fan-out used by the handlers.
+
+Module level usage keeps the existing attribute names (so tests can still patch them):
+
+    s3_client = lazy_client('s3')
+    dynamodb = lazy_resource('dynamodb')
+    asset_table = dynamodb.Table(asset_table_name)
+
+Tests can inject moto or stub clients for every module at once with set_aws_client/set_aws_resource
+and remove them again with reset_aws_clients.
+
+Every client is instrumented for per invocation call tracing (see common/callTracing.py).
+"""
+
+import os
+import threading
+import boto3
+from botocore.config import Config
+from urllib.parse import urlparse
+from common.callTracing import instrument_client, instrument_opensearch_client
+
+# Connections pooled per OpenSearch client
+OPENSEARCH_POOL_MAXSIZE = 20
+
+# Handlers fan out up to 10 worker threads, and managed S3 transfers (copy/upload) add their own
+# threads per worker, so the default pool of 10 connections would be a bottleneck
+MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_CLIENT_MAX_POOL_CONNECTIONS", "50"))
+RETRY_MAX_ATTEMPTS = int(os.environ.get("AWS_CLIENT_RETRY_MAX_ATTEMPTS", "5"))
+
+DEFAULT_CONFIG = Config(
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    retries={
+        'max_attempts': RETRY_MAX_ATTEMPTS,
+        'mode': 'adaptive'
+    },
+    tcp_keepalive=True
+)
+
+_lock = threading.Lock()
+_clients = {}
+_resources = {}
+_client_overrides = {}
+_resource_overrides = {}
+
+
+def _cache_key(service_name, region_name, config):
+    options = {}
+    if config is not None:
+        options = getattr(config, '_user_provided_options', {})
+    return (service_name, region_name, repr(sorted(options.items())))
+
+
+def _merged_config(config):
+    if config is None:
+        return DEFAULT_CONFIG
+    return DEFAULT_CONFIG.merge(config)
+
+
+def get_client(service_name, region_name=None, config=None):
+    """Get the shared boto3 client for a service, creating it on first use
+
+    Args:
+        service_name: The AWS service name (e.g. 's3')
+        region_name: Optional region, defaults to the Lambda region
+        config: Optional botocore Config merged over the registry defaults
+
+    Returns:
+        The boto3 client
+    """
+    if service_name in _client_overrides:
+        return _client_overrides[service_name]
+
+    key = _cache_key(service_name, region_name, config)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = instrument_client(
+                    boto3.client(service_name, region_name=region_name, config=_merged_config(config)))
+                _clients[key] = client
+    return client
+
+
+def get_resource(service_name, region_name=None, config=None):
+    """Get the shared boto3 resource for a service, creating it on first use
+
+    Args:
+        service_name: The AWS service name (e.g. 'dynamodb')
+        region_name: Optional region, defaults to the Lambda region
+        config: Optional botocore Config merged over the registry defaults
+
+    Returns:
+        The boto3 service resource
+    """
+    if service_name in _resource_overrides:
+        return _resource_overrides[service_name]
+
+    key = _cache_key(service_name, region_name, config)
+    resource = _resources.get(key)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = boto3.resource(service_name, region_name=region_name, config=_merged_config(config))
+                instrument_client(resource.meta.client)
+                _resources[key] = resource
+    return resource
+
+
+class LazyAWSObject:
+    """Proxy that resolves a registry client, resource or table on every attribute access
+
+    Resolving on access (a dictionary lookup once created) lets test overrides apply to proxies that
+    were bound at module import.
+    """
+
+    def __init__(self, factory, description):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_description', description)
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._factory(), name, value)
+
+    def __repr__(self):
+        return f"<LazyAWSObject {self._description}>"
+
+
+class LazyTable(LazyAWSObject):
+    """Proxy for a DynamoDB table of a lazy resource, reusing the Table object while the resource is unchanged"""
+
+    def __init__(self, resource_factory, table_name):
+        cached = {}
+
+        def factory():
+            resource = resource_factory()
+            if cached.get('resource') is not resource:
+                cached['table'] = resource.Table(table_name)
+                cached['resource'] = resource
+            return cached['table']
+
+        super().__init__(factory, f"table {table_name}")
+
+
+class LazyResource(LazyAWSObject):
+    """Proxy for a registry resource. Tables taken from it are lazy too, so module level
+    `dynamodb.Table(name)` assignments do not create the resource at import."""
+
+    def Table(self, table_name):
+        return LazyTable(self._factory, table_name)
+
+
+def lazy_client(service_name, region_name=None, config=None):
+    """Get a proxy for the shared client of a service that is only created when first used"""
+    return LazyAWSObject(lambda: get_client(service_name, region_name, config), f"client {service_name}")
+
+
+def lazy_resource(service_name, region_name=None, config=None):
+    """Get a proxy for the shared resource of a service that is only created when first used"""
+    return LazyResource(lambda: get_resource(service_name, region_name, config), f"resource {service_name}")
+
+
+def lazy_table(table_name, region_name=None, config=None):
+    """Get a proxy for a DynamoDB table on the shared resource that is only created when first used"""
+    return lazy_resource('dynamodb', region_name, config).Table(table_name)
+
+
+def lazy_paginator(client, operation_name):
+    """Get a proxy for a paginator of a (lazy) client that does not create the client at import"""
+    return LazyAWSObject(lambda: client.get_paginator(operation_name), f"paginator {operation_name}")
+
+
+def opensearch_module():
+    """Get the opensearchpy module
+
+    It is imported when the first OpenSearch client is built (or an OpenSearch error is handled),
+    not on every cold start.
+    """
+    import opensearchpy
+    return opensearchpy
+
+
+def create_opensearch_client(host, auth):
+    """Create an OpenSearch client for a domain or collection endpoint, instrumented for call tracing
+
+    Args:
+        host: The endpoint URL
+        auth: The request signer, e.g. opensearch_module().AWSV4SignerAuth(credentials, region, service)
+
+    Returns:
+        The opensearchpy.OpenSearch client
+    """
+    opensearchpy = opensearch_module()
+    return instrument_opensearch_client(opensearchpy.OpenSearch(
+        hosts=[{'host': urlparse(host).hostname, 'port': 443}],
+        http_auth=auth,
+        use_ssl=True,
+        verify_certs=True,
+        connection_class=opensearchpy.RequestsHttpConnection,
+        pool_maxsize=OPENSEARCH_POOL_MAXSIZE
+    ))
+
+
+def set_aws_client(service_name, client):
+    """Use the given client (e.g. a moto or stubbed client) for a service in every module"""
+    _client_overrides[service_name] = instrument_client(client)
+
+
+def set_aws_resource(service_name, resource):
+    """Use the given resource (e.g. a moto resource) for a service in every module"""
+    instrument_client(resource.meta.client)
+    _resource_overrides[service_name] = resource
+
+
+def reset_aws_clients():
+    """Remove injected clients and resources and drop every cached client"""
+    with _lock:
+        _client_overrides.clear()
+        _resource_overrides.clear()
+        _clients.clear()
+        _resources.clear()
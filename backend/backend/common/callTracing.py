@@ -0,0 +1,307 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Per invocation call tracing
+
+Records every AWS API call (botocore before-call/after-call events on the clients of the shared
+registry, see common/awsClients.py), every OpenSearch request (opensearch-py transport) and every
+Casbin enforce call made while a handler invocation runs, including calls made from worker threads.
+When the invocation ends a summary with call counts and time per operation and the slowest calls is
+written to stdout as a CloudWatch embedded metric format (EMF) document, and appended as a JSON line
+to CALL_TRACING_FILE when that is set (local runs, tests and benchmarks).
+
+    @trace_invocation
+    def lambda_handler(event, context):
+        ...
+
+Environment variables:
+    CALL_TRACING_ENABLED: 'false' turns tracing off (default 'true')
+    CALL_TRACING_NAMESPACE: CloudWatch metrics namespace (default 'VAMS')
+    CALL_TRACING_FILE: Optional path of a JSON lines file that receives every invocation summary
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+CALL_TRACING_ENABLED = os.environ.get("CALL_TRACING_ENABLED", "true").lower() == "true"
+CALL_TRACING_NAMESPACE = os.environ.get("CALL_TRACING_NAMESPACE", "VAMS")
+CALL_TRACING_FILE = os.environ.get("CALL_TRACING_FILE")
+
+# Number of slowest calls kept in the invocation summary
+SLOWEST_CALLS_COUNT = 5
+
+# Call categories and the metrics emitted for them
+CATEGORY_AWS = "aws"
+CATEGORY_OPENSEARCH = "opensearch"
+CATEGORY_AUTHZ = "authz"
+CATEGORY_METRICS = {
+    CATEGORY_AWS: ("AwsCalls", "AwsCallTime"),
+    CATEGORY_OPENSEARCH: ("OpenSearchCalls", "OpenSearchCallTime"),
+    CATEGORY_AUTHZ: ("AuthzEnforceCalls", "AuthzEnforceTime"),
+}
+
+_CONTEXT_START_KEY = "callTracingStart"
+_CONTEXT_DETAIL_KEY = "callTracingDetail"
+
+# Lambda runs one invocation at a time per container, worker threads record into the same trace
+_active_trace = None
+_sink_lock = threading.Lock()
+
+
+class InvocationTrace:
+    """Calls recorded during one handler invocation"""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.duration_ms = None
+        # Operation (e.g. 'dynamodb.Query') -> {'category', 'count', 'errors', 'totalMs', 'maxMs'}
+        self.operations = {}
+        self.slowest_calls = []
+        self._lock = threading.Lock()
+
+    def record(self, category, operation, duration_ms, error=False, detail=None):
+        """Record one call
+
+        Args:
+            category: One of CATEGORY_AWS, CATEGORY_OPENSEARCH, CATEGORY_AUTHZ
+            operation: Operation name, e.g. 'dynamodb.Query' or 'opensearch.POST _search'
+            duration_ms: Time spent waiting on the call in milliseconds
+            error: Whether the call failed
+            detail: Optional target of the call (table, bucket or index name)
+        """
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = {"category": category, "count": 0, "errors": 0, "totalMs": 0.0, "maxMs": 0.0}
+                self.operations[operation] = stats
+            stats["count"] += 1
+            stats["errors"] += 1 if error else 0
+            stats["totalMs"] += duration_ms
+            stats["maxMs"] = max(stats["maxMs"], duration_ms)
+
+            if len(self.slowest_calls) < SLOWEST_CALLS_COUNT or duration_ms > self.slowest_calls[-1]["durationMs"]:
+                self.slowest_calls.append({"operation": operation, "durationMs": duration_ms, "detail": detail})
+                self.slowest_calls.sort(key=lambda call: call["durationMs"], reverse=True)
+                del self.slowest_calls[SLOWEST_CALLS_COUNT:]
+
+    def call_count(self, category=None, operation=None):
+        """Number of recorded calls, optionally of one category or operation"""
+        with self._lock:
+            return sum(stats["count"] for name, stats in self.operations.items()
+                       if (category is None or stats["category"] == category)
+                       and (operation is None or name == operation))
+
+    def summary(self):
+        """Invocation summary with per category totals, per operation statistics and the slowest calls"""
+        with self._lock:
+            summary = {
+                "handler": self.name,
+                "durationMs": round(self.duration_ms if self.duration_ms is not None
+                                    else (time.perf_counter() - self.started) * 1000, 2),
+            }
+            for category, (count_metric, time_metric) in CATEGORY_METRICS.items():
+                category_stats = [stats for stats in self.operations.values() if stats["category"] == category]
+                summary[count_metric] = sum(stats["count"] for stats in category_stats)
+                summary[time_metric] = round(sum(stats["totalMs"] for stats in category_stats), 2)
+            summary["operations"] = {
+                name: {**stats, "totalMs": round(stats["totalMs"], 2), "maxMs": round(stats["maxMs"], 2)}
+                for name, stats in sorted(self.operations.items(), key=lambda item: item[1]["totalMs"], reverse=True)
+            }
+            summary["slowestCalls"] = [{**call, "durationMs": round(call["durationMs"], 2)} for call in self.slowest_calls]
+            return summary
+
+
+def current_trace():
+    """The trace of the running invocation, or None"""
+    return _active_trace
+
+
+@contextmanager
+def invocation_trace(name):
+    """Trace the calls made inside the block and emit the summary when it exits
+
+    Nested blocks (e.g. a handler calling another handler in-process) record into the outer trace.
+
+    Args:
+        name: Handler name, used as the metrics dimension
+
+    Yields:
+        The InvocationTrace
+    """
+    global _active_trace
+    if _active_trace is not None:
+        yield _active_trace
+        return
+
+    trace = InvocationTrace(name)
+    _active_trace = trace
+    try:
+        yield trace
+    finally:
+        _active_trace = None
+        trace.duration_ms = (time.perf_counter() - trace.started) * 1000
+        emit_summary(trace)
+
+
+def trace_invocation(handler):
+    """Decorator for Lambda handler entry points that traces each invocation
+
+    The metrics dimension is the handler module name (with the function name appended for modules
+    that have several entry points, e.g. 'streams.lambda_handler_a').
+    """
+    name = handler.__module__.rsplit(".", 1)[-1]
+    if handler.__name__ != "lambda_handler":
+        name = f"{name}.{handler.__name__}"
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not CALL_TRACING_ENABLED:
+            return handler(*args, **kwargs)
+        with invocation_trace(name):
+            return handler(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def trace_call(category, operation, detail=None):
+    """Time the call made inside the block and record it on the running invocation trace"""
+    trace = _active_trace
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        trace.record(category, operation, (time.perf_counter() - started) * 1000, error, detail)
+
+
+def to_emf(summary, namespace=None):
+    """Convert an invocation summary into a CloudWatch embedded metric format document"""
+    metrics = [{"Name": "InvocationTime", "Unit": "Milliseconds"}]
+    for count_metric, time_metric in CATEGORY_METRICS.values():
+        metrics.append({"Name": count_metric, "Unit": "Count"})
+        metrics.append({"Name": time_metric, "Unit": "Milliseconds"})
+
+    document = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": namespace or CALL_TRACING_NAMESPACE,
+                "Dimensions": [["Handler"]],
+                "Metrics": metrics,
+            }],
+        },
+        "Handler": summary["handler"],
+        "InvocationTime": summary["durationMs"],
+    }
+    document.update({key: value for key, value in summary.items() if key not in ("handler", "durationMs")})
+    return document
+
+
+def emit_summary(trace):
+    """Write the invocation summary to stdout as EMF and to the local JSON sink when configured"""
+    summary = trace.summary()
+    try:
+        sys.stdout.write(json.dumps(to_emf(summary), default=str) + "\n")
+        if CALL_TRACING_FILE:
+            with _sink_lock, open(CALL_TRACING_FILE, "a", encoding="utf-8") as sink:
+                sink.write(json.dumps(summary, default=str) + "\n")
+    except Exception:
+        # Tracing never fails an invocation
+        pass
+
+
+def _before_parameter_build(params=None, context=None, **kwargs):
+    # API parameters are only available before serialization
+    if _active_trace is None or context is None or not isinstance(params, dict):
+        return
+    context[_CONTEXT_DETAIL_KEY] = params.get("TableName") or params.get("Bucket") or params.get("FunctionName")
+
+
+def _before_call(context=None, **kwargs):
+    if _active_trace is None or context is None:
+        return
+    context[_CONTEXT_START_KEY] = time.perf_counter()
+
+
+def _record_aws_call(model, context, error):
+    trace = _active_trace
+    if trace is None or context is None:
+        return
+    started = context.pop(_CONTEXT_START_KEY, None)
+    if started is None:
+        return
+    operation = f"{model.service_model.service_name}.{model.name}" if model is not None else "aws.unknown"
+    trace.record(CATEGORY_AWS, operation, (time.perf_counter() - started) * 1000, error,
+                 context.pop(_CONTEXT_DETAIL_KEY, None))
+
+
+def _after_call(http_response=None, model=None, context=None, **kwargs):
+    _record_aws_call(model, context, http_response is not None and http_response.status_code >= 300)
+
+
+def _after_call_error(model=None, context=None, **kwargs):
+    _record_aws_call(model, context, True)
+
+
+def instrument_client(client):
+    """Register the call tracing hooks on a boto3 client (registering again has no effect)
+
+    Args:
+        client: A boto3 client
+
+    Returns:
+        The same client
+    """
+    events = client.meta.events
+    events.register("before-parameter-build", _before_parameter_build, unique_id="callTracing.before-parameter-build")
+    events.register("before-call", _before_call, unique_id="callTracing.before-call")
+    events.register("after-call", _after_call, unique_id="callTracing.after-call")
+    # Connection errors and exhausted retries skip after-call
+    events.register("after-call-error", _after_call_error, unique_id="callTracing.after-call-error")
+    return client
+
+
+def _opensearch_operation(method, url):
+    segments = [segment for segment in url.split("?", 1)[0].split("/") if segment]
+    api = next((segment for segment in segments if segment.startswith("_")), None)
+    index = segments[0] if segments and not segments[0].startswith("_") else None
+    return f"opensearch.{method} {api or ('index' if index else '/')}", index
+
+
+def instrument_opensearch_client(client):
+    """Record the requests of an opensearch-py client on the running invocation trace
+
+    Args:
+        client: An opensearchpy.OpenSearch client
+
+    Returns:
+        The same client
+    """
+    transport = client.transport
+    perform_request = transport.perform_request
+
+    @functools.wraps(perform_request)
+    def traced_perform_request(method, url, *args, **kwargs):
+        if _active_trace is None:
+            return perform_request(method, url, *args, **kwargs)
+        operation, index = _opensearch_operation(method, url)
+        with trace_call(CATEGORY_OPENSEARCH, operation, index):
+            return perform_request(method, url, *args, **kwargs)
+
+    transport.perform_request = traced_perform_request
+    return client
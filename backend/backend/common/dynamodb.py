@@ -1,7 +1,9 @@
 #  Copyright 2022 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 import os
-import boto3
+import time
+from common.awsClients import lazy_client, lazy_resource
+from common.requestContext import request_asset
 from typing import Tuple
 from typing import Any
 from typing import Dict
@@ -10,8 +12,13 @@ from customLogging.logger import safeLogger
 from models.common import VAMSGeneralErrorResponse
 
 logger = safeLogger(service_name="DynamoDBCommon")
-dynamodb_client = boto3.client('dynamodb')
-dynamodb = boto3.resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+
+# Maximum keys DynamoDB accepts in a single BatchGetItem request
+BATCH_GET_MAX_KEYS = 100
+# Rounds of unprocessed keys read again before giving up
+BATCH_GET_MAX_RETRIES = 8
 
 def to_update_expr(record, op="SET") -> Tuple[Dict[str, str], Dict[str, Any], str]:
     """
@@ -38,6 +45,32 @@ def to_update_expr(record, op="SET") -> Tuple[Dict[str, str], Dict[str, Any], st
     return keys_map, values_map, expr
 
 
+def batch_get_items(table, keys):
+    """
+    Read the items of many keys of one table, 100 keys per BatchGetItem request
+    :param table: boto3 Table resource
+    :param keys: Primary keys of the items, without duplicates
+    :return: List of the items found, keys without an item are left out
+    """
+    client = table.meta.client
+    items = []
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items = {table.name: {"Keys": keys[start:start + BATCH_GET_MAX_KEYS]}}
+        attempt = 0
+        while request_items:
+            response = client.batch_get_item(RequestItems=request_items)
+            items.extend(response.get("Responses", {}).get(table.name, []))
+
+            # Throttled keys are returned as unprocessed, read them again with backoff
+            request_items = response.get("UnprocessedKeys")
+            if request_items:
+                attempt += 1
+                if attempt > BATCH_GET_MAX_RETRIES:
+                    raise Exception(f"Unable to read all items of {table.name}, DynamoDB kept throttling")
+                time.sleep(min(0.05 * 2 ** attempt, 1))
+    return items
+
+
 def get_asset_object_from_id(databaseId, assetId):
     if not assetId:
         raise VAMSGeneralErrorResponse("Empty assetId or databaseId received")
@@ -52,16 +85,17 @@ def get_asset_object_from_id(databaseId, assetId):
     if databaseId:
         """Get asset details from DynamoDB"""
         try:
-            response = asset_table.query(
-                KeyConditionExpression=Key('databaseId').eq(databaseId) & Key('assetId').eq(assetId),
-                ScanIndexForward=False
-            )
-            
-            if not response.get('Items'):
+            def load_asset():
+                response = asset_table.query(
+                    KeyConditionExpression=Key('databaseId').eq(databaseId) & Key('assetId').eq(assetId),
+                    ScanIndexForward=False
+                )
+                #get first object
+                return response['Items'][0] if response.get('Items') else None
+
+            asset_object = request_asset(databaseId, assetId, load_asset)
+            if not asset_object:
                 return None
-
-            #get first object
-            asset_object = response['Items'][0]
             asset_object.update({
                 "object__type": "asset"
             })
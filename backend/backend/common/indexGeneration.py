@@ -0,0 +1,146 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import functools
+import hashlib
+import json
+import time
+from common.awsClients import opensearch_module
+from customLogging.logger import safeLogger
+
+# Document of the search index that holds its generation. It has no database ID, so the database
+# filters of every search query exclude it.
+#
+INDEX_GENERATION_DOCUMENT_ID = "#vams-index-generation"
+INDEX_GENERATION_RECTYPE = "indexgeneration"
+
+# Document of the search index naming the index a reindex job is building (handlers/indexing/reindex.py).
+# Indexers read it after writing and record each change they made as a replay document of that index,
+# the job applies them before and after it moves the index alias to the rebuilt index. Only the job
+# writes it, so indexers reading it never conflict with each other.
+#
+REINDEX_STATE_DOCUMENT_ID = "#vams-reindex-state"
+REINDEX_STATE_RECTYPE = "reindexstate"
+REINDEX_BUILD_INDEX_FIELD = "reindex_buildindex"
+REINDEX_REPLAY_RECTYPE = "reindexreplay"
+REINDEX_REPLAY_CHANGE_FIELD = "reindex_change"
+
+logger = safeLogger(service_name="IndexGeneration")
+
+# Search indexes written during the running invocation, index name -> opensearch-py client.
+# Filled by mark_index_changed(), their generation is bumped once when the invocation ends.
+#
+_changed_indexes = {}
+# Changes of the running invocation by index name, kept for a reindex job building a new index
+_index_changes = {}
+
+
+def get_index_generation(client, index_name):
+    """Get the generation of a search index, 0 when no indexer bumped it yet
+
+    Returns:
+        The generation, or None when it can't be read (results derived from the index then can't be cached)
+    """
+    try:
+        response = client.get(index=index_name, id=INDEX_GENERATION_DOCUMENT_ID)
+        return response.get("_source", {}).get("num_generation", 0)
+    except opensearch_module().NotFoundError:
+        return 0
+    except Exception as e:
+        logger.warning(f"Unable to read the search index generation: {str(e)}")
+        return None
+
+
+def bump_index_generation(client, index_name):
+    """Record that documents of a search index were written or deleted
+
+    The generation only needs to change, not to count, so the current time is written rather than
+    an incremented value that concurrent indexers would have to coordinate on.
+    """
+    client.update(
+        index=index_name,
+        id=INDEX_GENERATION_DOCUMENT_ID,
+        body={
+            "doc": {"_rectype": INDEX_GENERATION_RECTYPE, "num_generation": time.time_ns()},
+            "doc_as_upsert": True,
+        },
+        params={"retry_on_conflict": 3},
+    )
+
+
+def get_reindex_build_index(client, index_name):
+    """Name of the index a reindex job is building to replace a search index, None when no job runs
+
+    Raises:
+        Errors other than a missing state document, changes of the caller would otherwise be lost
+    """
+    try:
+        response = client.get(index=index_name, id=REINDEX_STATE_DOCUMENT_ID)
+    except opensearch_module().NotFoundError:
+        return None
+    return response.get("_source", {}).get(REINDEX_BUILD_INDEX_FIELD)
+
+
+def set_reindex_build_index(client, index_name, build_index_name):
+    """Name the index a reindex job is building to replace a search index, None when the job ended"""
+    client.index(index=index_name, id=REINDEX_STATE_DOCUMENT_ID,
+                 body={"_rectype": REINDEX_STATE_RECTYPE, REINDEX_BUILD_INDEX_FIELD: build_index_name})
+
+
+def mark_index_changed(client, index_name, change=None):
+    """Remember that the running invocation wrote or deleted documents of a search index
+
+    Args:
+        change: What a reindex job has to apply again to a rebuilt index, one of
+            {"databaseId", "assetId"} (the asset and its files were indexed),
+            {"deletedId"} (a document was deleted) or {"deletedAssetId"} (the asset and its files were deleted)
+    """
+    _changed_indexes[index_name] = client
+    if change is not None:
+        _index_changes.setdefault(index_name, {})[json.dumps(change, sort_keys=True)] = change
+
+
+def record_reindex_changes(client, build_index_name, changes):
+    """Save changes of the live index as replay documents of the index a reindex job is building
+
+    The document ID is derived from the change, so a change repeated while the job runs is applied once.
+    """
+    body = []
+    for key, change in changes.items():
+        body.append({"index": {"_index": build_index_name,
+                               "_id": "#vams-replay-" + hashlib.sha256(key.encode()).hexdigest()}})
+        body.append({"_rectype": REINDEX_REPLAY_RECTYPE, REINDEX_REPLAY_CHANGE_FIELD: key})
+    response = client.bulk(body=body)
+    if response.get("errors"):
+        raise Exception("Unable to record the changes of the search index for the running reindex job")
+
+
+def bumps_index_generation(handler):
+    """Decorator for indexing handlers that bumps the generation of every index they changed, once per
+    invocation, and records their changes for a reindex job building a replacement of the index
+
+    Recording fails the invocation, so the batch is retried rather than the rebuilt index missing the
+    changes. A failed generation bump only makes cached search results expire by age.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            changed = list(_changed_indexes.items())
+            changes = dict(_index_changes)
+            _changed_indexes.clear()
+            _index_changes.clear()
+            for index_name, client in changed:
+                try:
+                    bump_index_generation(client, index_name)
+                except Exception as e:
+                    logger.warning(f"Unable to bump the search index generation: {str(e)}")
+            for index_name, client in changed:
+                if changes.get(index_name):
+                    build_index_name = get_reindex_build_index(client, index_name)
+                    if build_index_name:
+                        record_reindex_changes(client, build_index_name, changes[index_name])
+
+    return wrapper
@@ -0,0 +1,165 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Request scoped memoization
+
+One API request often reads the same asset, bucket and metadata records several times (permission
+check, S3 location, response enrichment, one bucket lookup per listed asset). A RequestContext
+created for each handler invocation memoizes those reads, so every helper of the invocation shares
+them, and is dropped when the invocation ends, so nothing is cached across requests.
+
+    @trace_invocation
+    @request_scoped
+    def lambda_handler(event, context):
+        ...
+
+    def get_asset_details(databaseId, assetId):
+        return request_asset(databaseId, assetId, lambda: asset_table.get_item(...).get('Item'))
+
+Helpers pass the loader that performs their own read, outside of a request context it is called
+directly. Records are returned as copies, so callers may modify them. Missing records (None) are not
+memoized, and writers call forget_asset / forget_metadata after changing a record.
+"""
+
+import copy
+import functools
+import threading
+from contextlib import contextmanager
+
+KIND_ASSET = "asset"
+KIND_BUCKET = "bucket"
+KIND_METADATA = "metadata"
+KIND_ENFORCER = "enforcer"
+
+# Lambda runs one invocation at a time per container, worker threads share the same context
+_active_context = None
+
+
+class RequestContext:
+    """Records read during one handler invocation"""
+
+    def __init__(self):
+        # (kind, key) -> value
+        self._values = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def memoize(self, kind, key, loader, copy_value=True):
+        """Value of (kind, key), read with loader on first use
+
+        Args:
+            kind: One of KIND_ASSET, KIND_BUCKET, KIND_METADATA, KIND_ENFORCER
+            key: Hashable key of the record within the kind
+            loader: Function without arguments that reads the value, None results are not memoized
+            copy_value: Return a deep copy, so callers can modify the value
+
+        Returns:
+            The value
+        """
+        with self._lock:
+            found = (kind, key) in self._values
+            value = self._values.get((kind, key))
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not found:
+            # Concurrent first reads of the same key may both load, the last one wins
+            value = loader()
+            if value is None:
+                return None
+            with self._lock:
+                self._values[(kind, key)] = value
+
+        return copy.deepcopy(value) if copy_value else value
+
+    def forget(self, kind, key=None):
+        """Drop the memoized value of (kind, key), or every value of the kind when key is None"""
+        with self._lock:
+            for memoized in [memoized for memoized in self._values
+                             if memoized[0] == kind and (key is None or memoized[1] == key)]:
+                del self._values[memoized]
+
+
+def current_request_context():
+    """The context of the running invocation, or None"""
+    return _active_context
+
+
+@contextmanager
+def request_context():
+    """Memoize record reads inside the block
+
+    Nested blocks (e.g. a handler calling another handler in-process) share the outer context.
+
+    Yields:
+        The RequestContext
+    """
+    global _active_context
+    if _active_context is not None:
+        yield _active_context
+        return
+
+    context = RequestContext()
+    _active_context = context
+    try:
+        yield context
+    finally:
+        _active_context = None
+
+
+def request_scoped(handler):
+    """Decorator for Lambda handler entry points that runs each invocation in a request context"""
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        with request_context():
+            return handler(*args, **kwargs)
+
+    return wrapper
+
+
+def request_cached(kind, key, loader, copy_value=True):
+    """Memoize loader on the running request context, or call it when there is none"""
+    context = _active_context
+    if context is None:
+        return loader()
+    return context.memoize(kind, key, loader, copy_value)
+
+
+def request_asset(databaseId, assetId, loader):
+    """Asset table record of an asset"""
+    return request_cached(KIND_ASSET, (databaseId, assetId), loader)
+
+
+def request_bucket(bucketId, loader):
+    """Asset buckets table record of a bucket"""
+    return request_cached(KIND_BUCKET, bucketId, loader)
+
+
+def request_metadata(databaseId, assetId, loader):
+    """Metadata table record of an asset, file or folder (assetId is the key path for files and folders)"""
+    return request_cached(KIND_METADATA, (databaseId, assetId), loader)
+
+
+def request_enforcer(claims_and_roles, factory):
+    """Casbin enforcer of the user of the claims and roles, created with factory(claims_and_roles)"""
+    key = (claims_and_roles["tokens"][0], claims_and_roles.get("mfaEnabled", False))
+    return request_cached(KIND_ENFORCER, key, lambda: factory(claims_and_roles), copy_value=False)
+
+
+def forget_asset(databaseId, assetId):
+    """Drop the memoized record of an asset after writing or deleting it"""
+    context = _active_context
+    if context is not None:
+        context.forget(KIND_ASSET, (databaseId, assetId))
+
+
+def forget_metadata(databaseId, assetId):
+    """Drop the memoized metadata record of an asset, file or folder after writing or deleting it"""
+    context = _active_context
+    if context is not None:
+        context.forget(KIND_METADATA, (databaseId, assetId))
@@ -2,14 +2,18 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client
 import json
+from concurrent.futures import ThreadPoolExecutor
 from common.validators import validate
 from customLogging.logger import safeLogger
 from common.constants import UNALLOWED_MIME_LIST, UNALLOWED_FILE_EXTENSION_LIST
 
 logger = safeLogger(service_name="S3Common")
-s3c = boto3.client('s3')
+s3c = lazy_client('s3')
+
+# Concurrent HeadObject requests when validating the objects under a prefix
+HEAD_OBJECT_MAX_WORKERS = 10
 
 def validateUnallowedFileExtensionAndContentType(keyPath: str, contentType: str):
     #Check if the content type is in the list of unallowed MIME types
@@ -24,16 +28,16 @@ def validateUnallowedFileExtensionAndContentType(keyPath: str, contentType: str)
     return True
 
 def validateS3AssetExtensionsAndContentType(bucket: str, prefixKey: str):
-    #Get list of all objects in a particular S3 key/prefix
-    resp = s3c.list_objects_v2(Bucket=bucket, Prefix=prefixKey)
-    logger.info(resp)
-
+    #Check every object in a particular S3 key/prefix, following the listing through all pages
     #Check for each returned object if it is a valid asset based on ContentType
     #Check for all malicious executable MIME types
-    if "Contents" in resp:
-        for obj in resp['Contents']:
-            respHeader = s3c.head_object(Bucket=bucket, Key=obj['Key'])
-            logger.info(respHeader)
-            if not validateUnallowedFileExtensionAndContentType(obj['Key'], respHeader['ContentType']):
-                return False
-    return True
\ No newline at end of file
+    paginator = s3c.get_paginator('list_objects_v2')
+    with ThreadPoolExecutor(max_workers=HEAD_OBJECT_MAX_WORKERS) as executor:
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefixKey):
+            keys = [obj['Key'] for obj in page.get('Contents', [])]
+            logger.info(f"Validating {len(keys)} object(s) under {prefixKey}")
+            contentTypes = executor.map(lambda key: s3c.head_object(Bucket=bucket, Key=key).get('ContentType', ''), keys)
+            for key, contentType in zip(keys, contentTypes):
+                if not validateUnallowedFileExtensionAndContentType(key, contentType):
+                    return False
+    return True
@@ -0,0 +1,133 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""Typeahead suggestions of asset names, file names and tags
+
+The suggestions live in a side index next to the search index ({index}-suggest, created with the
+search index by the deployment). Its suggest field is analyzed with edge n-grams, so a prefix
+query is a plain match on small documents instead of a full search. The indexing stream handlers
+write one document per asset name, file name and asset tag, the search handler serves the prefix
+suggestions (GET /search/suggest).
+
+Every suggestion carries the database ID and the Casbin ABAC fields of its asset, suggestions are
+filtered by the databases the caller may read and checked like search hits.
+"""
+
+SUGGEST_INDEX_SUFFIX = "-suggest"
+
+SUGGEST_TYPE_ASSET = "asset"
+SUGGEST_TYPE_FILE = "file"
+SUGGEST_TYPE_TAG = "tag"
+SUGGEST_TYPES = (SUGGEST_TYPE_ASSET, SUGGEST_TYPE_FILE, SUGGEST_TYPE_TAG)
+
+# Longest n-gram of the suggest field, longer words of a prefix are matched by their first characters
+SUGGEST_MAX_GRAM = 20
+# Hits read per returned suggestion, duplicate tags and hits the caller may not read are dropped
+SUGGEST_OVERFETCH = 3
+
+SUGGEST_SOURCE_FIELDS = ["value", "type", "databaseId", "assetId", "key", "assetName", "assetType", "tags"]
+
+
+def suggest_index_name(index_name):
+    """Name of the suggestion index of a search index (or of its alias)"""
+    return index_name + SUGGEST_INDEX_SUFFIX
+
+
+def asset_suggestion_id(assetId):
+    return f"{SUGGEST_TYPE_ASSET}#{assetId}"
+
+
+def tag_suggestion_id(assetId, tag):
+    return f"{SUGGEST_TYPE_TAG}#{assetId}#{tag}"
+
+
+def file_suggestion_id(key):
+    return f"{SUGGEST_TYPE_FILE}#{key}"
+
+
+def _suggestion(suggestion_type, value, asset):
+    return {"suggest": value, "value": value, "type": suggestion_type, **asset}
+
+
+def suggestion_asset_fields(databaseId, assetId, assetName, assetType, tags):
+    """Fields of an asset that every suggestion of the asset carries"""
+    return {"databaseId": databaseId, "assetId": assetId, "assetName": str(assetName or ""),
+            "assetType": str(assetType or ""), "tags": [str(tag) for tag in tags or []]}
+
+
+def asset_suggestions(asset):
+    """Suggestion documents of the name and the tags of an asset
+
+    Args:
+        asset: Fields of the asset, from suggestion_asset_fields()
+
+    Returns:
+        Dictionary of document ID to document
+    """
+    documents = {}
+    if asset["assetName"]:
+        documents[asset_suggestion_id(asset["assetId"])] = _suggestion(SUGGEST_TYPE_ASSET, asset["assetName"], asset)
+    for tag in asset["tags"]:
+        documents[tag_suggestion_id(asset["assetId"], tag)] = _suggestion(SUGGEST_TYPE_TAG, tag, asset)
+    return documents
+
+
+def file_suggestion(asset, key):
+    """Suggestion document of the file name of an S3 object of an asset
+
+    Args:
+        asset: Fields of the asset, from suggestion_asset_fields()
+
+    Returns:
+        (document ID, document)
+    """
+    return file_suggestion_id(key), {**_suggestion(SUGGEST_TYPE_FILE, key.rsplit("/", 1)[-1], asset), "key": key}
+
+
+def suggestion_query(prefix, databaseIds, size, types=SUGGEST_TYPES):
+    """Query of the suggestion index for the suggestions of a prefix in the given databases"""
+    words = " ".join(word[:SUGGEST_MAX_GRAM] for word in prefix.split())
+    return {
+        "size": size * SUGGEST_OVERFETCH,
+        "_source": SUGGEST_SOURCE_FIELDS,
+        "track_total_hits": False,
+        "query": {
+            "bool": {
+                "must": [{"match": {"suggest": {"query": words, "operator": "and"}}}],
+                # Values that start with the whole prefix rank above values with a word starting with it
+                "should": [{"prefix": {"value": {"value": prefix, "case_insensitive": True}}}],
+                "filter": [
+                    {"terms": {"databaseId": list(databaseIds)}},
+                    {"terms": {"type": list(types)}},
+                ],
+            }
+        },
+        "sort": ["_score", {"value": "asc"}],
+    }
+
+
+def unique_suggestions(hits, size, authorized=lambda source: True):
+    """The first size suggestions of the hits, a tag is suggested once whatever number of assets have it
+
+    Args:
+        authorized: Whether the caller may read the suggestion of a hit source, only called for the
+            hits that would be suggested, in hit order
+    """
+    suggestions = []
+    seen = set()
+    for hit in hits:
+        source = hit["_source"]
+        if source["type"] == SUGGEST_TYPE_TAG:
+            unique_key = (source["type"], source["value"])
+            suggestion = {"type": source["type"], "value": source["value"]}
+        else:
+            unique_key = hit["_id"]
+            suggestion = {field: source[field] for field in ("type", "value", "databaseId", "assetId", "key")
+                          if field in source}
+        if unique_key in seen or not authorized(source):
+            continue
+        seen.add(unique_key)
+        suggestions.append(suggestion)
+        if len(suggestions) == size:
+            break
+    return suggestions
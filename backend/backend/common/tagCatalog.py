@@ -0,0 +1,161 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+from common.awsClients import lazy_client, lazy_paginator
+from datetime import datetime, timedelta
+from boto3.dynamodb.types import TypeDeserializer
+from customLogging.logger import safeLogger
+from locked_dict import locked_dict
+
+# Duration before a cached tag catalog is reloaded from DynamoDB on the next lookup.
+# Tag and tag type writes bump the version item and invalidate the catalogs of every container;
+# this bounds staleness when a version bump failed.
+#
+TAG_CATALOG_REFRESH_SECONDS = 60
+
+# Key of the item of the tag type table that holds the catalog version stamp. Tag type names are
+# OBJECT_NAME values and can't start with '#'.
+#
+TAG_CATALOG_VERSION_ITEM = "#tagCatalogVersion"
+
+logger = safeLogger(service_name="TagCatalog")
+deserializer = TypeDeserializer()
+dynamodb_client = lazy_client('dynamodb')
+paginator = lazy_paginator(dynamodb_client, 'scan')
+
+# Tracks loaded catalogs keyed by (tag table name, tag type table name)
+#
+_tag_catalog_map = locked_dict.LockedDict()
+
+
+class TagCatalog:
+    """In-memory index of tags and tag types, built from a single scan of each table"""
+
+    def __init__(self, tag_items, tag_type_items, version):
+        self.version = version
+        self.dateTime_Cached = datetime.now()
+
+        # tagName -> tagTypeName
+        self.tag_type_by_tag = {}
+        # tagTypeName -> [tagName, ...]
+        self.tags_by_tag_type = {}
+        # tagTypeName -> True/False
+        self.required_by_tag_type = {}
+
+        for tag in tag_items:
+            tag_name = tag.get("tagName")
+            tag_type_name = tag.get("tagTypeName")
+            if tag_name is None or tag_type_name is None:
+                continue
+            self.tag_type_by_tag[tag_name] = tag_type_name
+            self.tags_by_tag_type.setdefault(tag_type_name, []).append(tag_name)
+
+        for tag_type in tag_type_items:
+            tag_type_name = tag_type.get("tagTypeName")
+            if tag_type_name is None or tag_type_name == TAG_CATALOG_VERSION_ITEM:
+                continue
+            self.required_by_tag_type[tag_type_name] = tag_type.get("required", "False") == "True"
+
+        # Tag types only count as required when they have tags that can satisfy them
+        self.required_tag_types = [
+            tag_type_name for tag_type_name, required in self.required_by_tag_type.items()
+            if required and tag_type_name in self.tags_by_tag_type
+        ]
+
+    def is_expired(self, version):
+        if self.version != version:
+            return True
+        return (datetime.now() - timedelta(seconds=TAG_CATALOG_REFRESH_SECONDS)) > self.dateTime_Cached
+
+    def is_tag_type_required(self, tag_type_name):
+        return self.required_by_tag_type.get(tag_type_name, False)
+
+    def get_tag_types_for_tags(self, tags):
+        """Get the set of tag types that a list of tag names belong to"""
+        if not tags:
+            return set()
+        return {self.tag_type_by_tag[tag] for tag in tags if tag in self.tag_type_by_tag}
+
+    def get_tags_for_tag_type(self, tag_type_name):
+        return list(self.tags_by_tag_type.get(tag_type_name, []))
+
+    def get_missing_required_tag_types(self, tags):
+        """Get the required tag types that are not satisfied by a list of tag names"""
+        if len(self.required_tag_types) == 0:
+            return []
+        tag_types = self.get_tag_types_for_tags(tags)
+        return [tag_type_name for tag_type_name in self.required_tag_types if tag_type_name not in tag_types]
+
+
+def bump_tag_catalog_version(tag_type_table_name):
+    """Invalidate the tag catalogs cached by every container after a tag or tag type write"""
+    try:
+        dynamodb_client.update_item(
+            TableName=tag_type_table_name,
+            Key={"tagTypeName": {"S": TAG_CATALOG_VERSION_ITEM}},
+            UpdateExpression="ADD catalogVersion :one",
+            ExpressionAttributeValues={":one": {"N": "1"}}
+        )
+    except Exception:
+        # The write itself succeeded, cached catalogs still reload after TAG_CATALOG_REFRESH_SECONDS
+        logger.exception("Failed to bump the tag catalog version")
+
+
+def get_tag_catalog_version(tag_type_table_name):
+    """Current version stamp of the tag catalog, 0 before the first tag or tag type write"""
+    item = dynamodb_client.get_item(
+        TableName=tag_type_table_name,
+        Key={"tagTypeName": {"S": TAG_CATALOG_VERSION_ITEM}},
+        ProjectionExpression="catalogVersion",
+        ConsistentRead=True
+    ).get("Item")
+    if item is None or "catalogVersion" not in item:
+        return 0
+    return int(item["catalogVersion"]["N"])
+
+
+def _scan_all_items(table_name):
+    page_iterator = paginator.paginate(
+        TableName=table_name,
+        PaginationConfig={
+            'MaxItems': 1000,
+            'PageSize': 1000,
+        }
+    ).build_full_result()
+
+    rawItems = []
+    rawItems.extend(page_iterator["Items"])
+    while "NextToken" in page_iterator:
+        page_iterator = paginator.paginate(
+            TableName=table_name,
+            PaginationConfig={
+                'MaxItems': 1000,
+                'PageSize': 1000,
+                'StartingToken': page_iterator["NextToken"]
+            }
+        ).build_full_result()
+        rawItems.extend(page_iterator["Items"])
+
+    return [{k: deserializer.deserialize(v) for k, v in item.items()} for item in rawItems]
+
+
+def get_tag_catalog(tag_table_name, tag_type_table_name):
+    """Get the tag catalog for the tables, loading it once per container until its version changes
+
+    Checking the version costs one GetItem of the version item instead of scanning both tables.
+    """
+    cache_key = (tag_table_name, tag_type_table_name)
+    # Read before the scans, a write during the scans makes the next lookup reload
+    version = get_tag_catalog_version(tag_type_table_name)
+    catalog = _tag_catalog_map.get(cache_key)
+    if catalog is not None and not catalog.is_expired(version):
+        return catalog
+
+    logger.info("Loading tag catalog")
+    catalog = TagCatalog(
+        _scan_all_items(tag_table_name),
+        _scan_all_items(tag_type_table_name),
+        version
+    )
+    _tag_catalog_map[cache_key] = catalog
+    return catalog
@@ -1,39 +1,155 @@
 # Copyright 2023 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
+import os
+import random
+
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.logging.formatter import LambdaPowertoolsFormatter
 
 location_format = "[%(funcName)s] %(module)s"
 date_format = "%m/%d/%Y %I:%M:%S %p"
 
+# Keys whose values are redacted before logging
+SENSITIVE_KEYS = ("authorization", "idJwtToken", "Credentials", "AccessKeyId", "SecretAccessKey", "SessionToken")
+_SENSITIVE_MARKERS = tuple(f'"{key}"' for key in SENSITIVE_KEYS)
+
+# Serialized records longer than this (characters) have their message replaced by a summary
+# (CloudWatch Logs rejects events above 256 KB)
+LOG_MAX_RECORD_LENGTH = int(os.environ.get("LOG_MAX_RECORD_LENGTH", "65536"))
+# Fraction of the DEBUG records that are written, 0 keeps debug logging off
+LOG_DEBUG_SAMPLE_RATE = float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "0"))
+
+# Limits of payload summaries
+SUMMARY_MAX_ITEMS = 20
+SUMMARY_MAX_STRING_LENGTH = 1000
+SUMMARY_MAX_DEPTH = 5
+
 
 def mask_sensitive_data(event):
     # remove sensitive data from request object before logging
-    keys_to_redact = ["authorization", "idJwtToken", "Credentials", "AccessKeyId", "SecretAccessKey", "SessionToken"]
     result = {}
     for k, v in event.items():
         if isinstance(v, dict):
             result[k] = mask_sensitive_data(v)
-        elif k in keys_to_redact:
+        elif k in SENSITIVE_KEYS:
             result[k] = "<redacted>"
         else:
             result[k] = v
     return result
 
 
-def safeLogger(**kwargs):
-    return Logger(
+def summarize(payload, max_items=SUMMARY_MAX_ITEMS, max_string_length=SUMMARY_MAX_STRING_LENGTH,
+              max_depth=SUMMARY_MAX_DEPTH):
+    """Size capped copy of a payload for logging
+
+    Dicts and lists keep their first max_items entries plus a marker with the number of entries
+    left out, strings are cut at max_string_length and nesting below max_depth is replaced by a
+    marker, e.g. logger.info(summarize(page["Contents"])) for a listing of thousands of objects.
+    """
+    if isinstance(payload, str):
+        if len(payload) <= max_string_length:
+            return payload
+        return f"{payload[:max_string_length]}...<{len(payload) - max_string_length} more characters>"
+    if not isinstance(payload, (dict, list, tuple, set)):
+        return payload
+    if max_depth <= 0:
+        return f"<{type(payload).__name__} of {len(payload)} items>"
+
+    if isinstance(payload, dict):
+        result = {}
+        for index, (key, value) in enumerate(payload.items()):
+            if index == max_items:
+                result["..."] = f"<{len(payload) - max_items} more items>"
+                break
+            result[key] = summarize(value, max_items, max_string_length, max_depth - 1)
+        return result
+
+    result = []
+    for index, value in enumerate(payload):
+        if index == max_items:
+            result.append(f"<{len(payload) - max_items} more items>")
+            break
+        result.append(summarize(value, max_items, max_string_length, max_depth - 1))
+    return result
+
+
+class LazyMessage:
+    """Log message computed only when the record is written
+
+    logger.debug(LazyMessage(json.dumps, document)) costs nothing when DEBUG records are dropped.
+    """
+
+    def __init__(self, function, *args, **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def resolve(self):
+        return self.function(*self.args, **self.kwargs)
+
+    def __str__(self):
+        return str(self.resolve())
+
+
+class DebugSampler(logging.Filter):
+    """Let through a fraction of the DEBUG records of a logger, and every record of a higher level"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+def safeLogger(debug_sample_rate=None, **kwargs):
+    """Logger that masks sensitive keys and caps the size of its records
+
+    Args:
+        debug_sample_rate: Fraction of the DEBUG records of this logger that are written
+            (default LOG_DEBUG_SAMPLE_RATE, 0 logs INFO and above only)
+    """
+    if debug_sample_rate is None:
+        debug_sample_rate = LOG_DEBUG_SAMPLE_RATE
+
+    logger = Logger(
         logger_formatter=CustomFormatter(),
         location=location_format,
         datefmt=date_format,
         log_uncaught_exceptions=True,
-        level="INFO",
+        level="DEBUG" if debug_sample_rate > 0 else "INFO",
         **kwargs)
 
+    if debug_sample_rate > 0:
+        # Loggers of the same service share the underlying logger, sample its records once
+        for existing in [f for f in logger._logger.filters if isinstance(f, DebugSampler)]:
+            logger.removeFilter(existing)
+        logger.addFilter(DebugSampler(debug_sample_rate))
+    return logger
+
 
 class CustomFormatter(LambdaPowertoolsFormatter):
+    def _extract_log_message(self, log_record: logging.LogRecord):
+        if isinstance(log_record.msg, LazyMessage):
+            log_record.msg = log_record.msg.resolve()
+        return super()._extract_log_message(log_record=log_record)
+
     def serialize(self, log: dict) -> str:
         """Serialize final structured log dict to JSON str"""
-        log = mask_sensitive_data(event=log)  # rename message key to event
-        return self.json_serializer(log)  # use configured json serializer
+        serialized = self.json_serializer(log)  # use configured json serializer
+
+        # Masking copies the whole record, only do it when a sensitive key is present
+        if any(marker in serialized for marker in _SENSITIVE_MARKERS):
+            log = mask_sensitive_data(event=log)  # rename message key to event
+            serialized = self.json_serializer(log)
+
+        if len(serialized) > LOG_MAX_RECORD_LENGTH:
+            log = {**log, "message": summarize(log.get("message")), "truncated": True}
+            serialized = self.json_serializer(log)
+            if len(serialized) > LOG_MAX_RECORD_LENGTH:
+                log["message"] = summarize(self.json_serializer(log["message"]),
+                                           max_string_length=LOG_MAX_RECORD_LENGTH // 2)
+                serialized = self.json_serializer(log)
+        return serialized
@@ -2,18 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse, parse
 from models.assetLinks import (
     GetAssetLinkMetadataRequestModel,
     CreateAssetLinkMetadataRequestModel,
@@ -36,7 +37,7 @@ retry_config = Config(
 )
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
 logger = safeLogger(service_name="AssetLinksMetadataService")
 
 # Load environment variables
@@ -500,6 +501,7 @@ def handle_delete_request(event):
 # Lambda Handler
 #######################
 
+@trace_invocation
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset link metadata operations"""
     global claims_and_roles
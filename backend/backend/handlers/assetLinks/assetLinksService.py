@@ -3,19 +3,22 @@
 
 import os
 import boto3
+from common.awsClients import lazy_resource
 import json
 import uuid
 from typing import Dict, List, Set, Optional
 from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse, parse
 from models.assetLinks import (
     GetAssetLinksRequestModel,
     GetAssetLinksResponseModel, 
@@ -42,7 +45,7 @@ retry_config = Config(
 )
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
 logger = safeLogger(service_name="AssetLinksService")
 
 # Load environment variables
@@ -69,13 +72,12 @@ asset_storage_table = dynamodb.Table(asset_storage_table_name)
 def get_asset_details(asset_id: str, database_id: str) -> Optional[Dict]:
     """Get asset details from the asset storage table"""
     try:
-        response = asset_storage_table.get_item(
+        return request_asset(database_id, asset_id, lambda: asset_storage_table.get_item(
             Key={
                 'databaseId': database_id,
                 'assetId': asset_id
             }
-        )
-        return response.get('Item')
+        ).get('Item'))
     except Exception as e:
         logger.exception(f"Error getting asset details for {asset_id}: {e}")
         return None
@@ -697,6 +699,8 @@ def handle_delete_request(event):
 # Lambda Handler
 #######################
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset links operations (GET, PUT, and DELETE)"""
     global claims_and_roles
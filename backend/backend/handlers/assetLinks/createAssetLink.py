@@ -3,19 +3,21 @@
 
 import os
 import boto3
+from common.awsClients import lazy_resource
 import json
 import uuid
 from typing import Set, List
 from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse, parse
 from models.assetLinks import CreateAssetLinkRequestModel, CreateAssetLinkResponseModel, RelationshipType
 
 # Configure AWS clients
@@ -27,7 +29,7 @@ retry_config = Config(
 )
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
 logger = safeLogger(service_name="CreateAssetLink")
 
 # Load environment variables
@@ -347,6 +349,7 @@ def handle_post_request(event):
 # Lambda Handler
 #######################
 
+@trace_invocation
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset link creation API"""
     global claims_and_roles
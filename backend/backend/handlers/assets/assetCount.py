@@ -1,14 +1,14 @@
 #  Copyright 2022 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 from boto3.dynamodb.conditions import Key
 from customLogging.logger import safeLogger
 
 logger = safeLogger(service_name="AssetCount")
 
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
 
 
 def update_asset_count(db_database, asset_database, queryParams, databaseId):
@@ -2,30 +2,36 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Any
 from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 from botocore.config import Config
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from common.dynamodb import validate_pagination_info
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset, request_bucket, request_enforcer, forget_asset
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.assetsV3 import (
     AssetFileItemModel, ListAssetFilesRequestModel, ListAssetFilesResponseModel,
     FileInfoRequestModel, FileInfoResponseModel, MoveFileRequestModel,
     CopyFileRequestModel, ArchiveFileRequestModel, UnarchiveFileRequestModel, DeleteFileRequestModel,
     FileOperationResponseModel, RevertFileVersionRequestModel, RevertFileVersionResponseModel,
     SetPrimaryFileRequestModel, SetPrimaryFileResponseModel, CreateFolderRequestModel, CreateFolderResponseModel,
-    DeleteAssetPreviewResponseModel, DeleteAuxiliaryPreviewAssetFilesRequestModel, DeleteAuxiliaryPreviewAssetFilesResponseModel
+    DeleteAssetPreviewResponseModel, DeleteAuxiliaryPreviewAssetFilesRequestModel, DeleteAuxiliaryPreviewAssetFilesResponseModel,
+    BatchFileOperationItemModel, BatchFileOperationsRequestModel, BatchFileOperationResultModel, BatchFileOperationsResponseModel
 )
 
 # Configure AWS clients with retry configuration
@@ -39,10 +45,10 @@ retry_config = Config(
     }
 )
 
-s3_client = boto3.client('s3', config=retry_config)
-s3_resource = boto3.resource('s3', config=retry_config)
-dynamodb = boto3.resource('dynamodb', config=retry_config)
-lambda_client = boto3.client('lambda', config=retry_config)
+s3_client = lazy_client('s3', config=retry_config)
+s3_resource = lazy_resource('s3', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
+lambda_client = lazy_client('lambda', config=retry_config)
 logger = safeLogger(service_name="AssetFiles")
 
 # Load environment variables
@@ -64,6 +70,24 @@ asset_version_files_table = dynamodb.Table(asset_version_files_table_name)
 # Define allowed extensions
 allowed_previewFile_extensions = ['.png', '.jpg', '.jpeg', '.svg', '.gif']
 
+# Batch file operations with more operations than this run as a background job instead of inline
+BATCH_FILE_OPERATIONS_SYNC_MAX_ITEMS = 100
+# Concurrent S3 workers for batch file operations (matches the default S3 client connection pool)
+BATCH_FILE_OPERATIONS_MAX_WORKERS = 10
+# Maximum keys S3 accepts in a single DeleteObjects request
+S3_DELETE_OBJECTS_MAX_KEYS = 1000
+# Maximum listings of a prefix while purging it, including the final listing that confirms it is empty
+PURGE_S3_PREFIX_MAX_PASSES = 3
+# Auxiliary bucket prefix for background batch file operations job requests and status
+BATCH_FILE_OPERATIONS_JOB_PREFIX = "batchFileOperationJobs"
+# Operations a background job runs between two checkpoints of its status
+BATCH_FILE_OPERATIONS_JOB_CHUNK_SIZE = 50
+# Time left to a job invocation when it stops starting chunks and continues in a new invocation
+BATCH_FILE_OPERATIONS_JOB_MARGIN_SECONDS = 120
+# Auxiliary bucket object under an asset's folder caching the primary type of each listed file version,
+# so listing files only reads the S3 object metadata of files that changed since they were last listed
+FILE_PRIMARY_TYPES_CACHE_NAME = ".filePrimaryTypes.json"
+
 #######################
 # Utility Functions
 #######################
@@ -100,8 +124,8 @@ def get_asset_with_permissions(databaseId: str, assetId: str, operation: str, cl
     """
     try:
         # Get the asset from DynamoDB
-        response = asset_table.get_item(Key={'databaseId': databaseId, 'assetId': assetId})
-        asset = response.get('Item', {})
+        asset = request_asset(databaseId, assetId,
+                              lambda: asset_table.get_item(Key={'databaseId': databaseId, 'assetId': assetId}).get('Item'))
         
         if not asset:
             raise VAMSGeneralErrorResponse("Asset not found in database. Note: Files cannot be moved cross-database.")
@@ -110,7 +134,7 @@ def get_asset_with_permissions(databaseId: str, assetId: str, operation: str, cl
         asset["object__type"] = "asset"
         
         if len(claims_and_roles["tokens"]) > 0:
-            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer)
             if not casbin_enforcer.enforce(asset, operation):
                 raise VAMSGeneralErrorResponse("Not authorized to perform this operation on the asset")
         
@@ -125,12 +149,15 @@ def get_default_bucket_details(bucketId):
     """Get default S3 bucket details from database default bucket DynamoDB"""
     try:
 
-        bucket_response = buckets_table.query(
-            KeyConditionExpression=Key('bucketId').eq(bucketId),
-            Limit=1
-        )
-        # Use the first item from the query results
-        bucket = bucket_response.get("Items", [{}])[0] if bucket_response.get("Items") else {}
+        def load_bucket():
+            bucket_response = buckets_table.query(
+                KeyConditionExpression=Key('bucketId').eq(bucketId),
+                Limit=1
+            )
+            # Use the first item from the query results
+            return bucket_response.get("Items", [None])[0] if bucket_response.get("Items") else None
+
+        bucket = request_bucket(bucketId, load_bucket) or {}
         bucket_id = bucket.get('bucketId')
         bucket_name = bucket.get('bucketName')
         base_assets_prefix = bucket.get('baseAssetsPrefix')
@@ -336,8 +363,10 @@ def copy_s3_object(source_bucket: str, source_key: str, dest_bucket: str, dest_k
                 CopySource={'Bucket': source_bucket, 'Key': source_key},
                 Bucket=dest_bucket,
                 Key=dest_key,
-                MetadataDirective='REPLACE',
-                Metadata=metadata
+                ExtraArgs={
+                    'MetadataDirective': 'REPLACE',
+                    'Metadata': metadata
+                }
             )
         else:
             # Standard copy with preserved metadata
@@ -368,16 +397,10 @@ def delete_assetAuxiliary_files(prefix):
     logger.info(f"Deleting Temporary Auxiliary Assets Files Under Folder Prefix: {asset_aux_bucket_name}:{prefix}")
 
     try:
-        # Get all assets in assetAuxiliary bucket (unversioned, temporary files for the auxiliary assets) for deletion
+        # Delete all files in assetAuxiliary bucket (unversioned, temporary files for the auxiliary assets)
         # Use assetLocation key as root folder key for assetAuxiliaryFiles
-        assetAuxiliaryBucketFilesDeleted = []
-        paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=asset_aux_bucket_name, Prefix=prefix):
-            if 'Contents' in page:
-                for item in page['Contents']:
-                    assetAuxiliaryBucketFilesDeleted.append(item['Key'])
-                    logger.info(f"Deleting auxiliary asset file: {item['Key']}")
-                    s3_client.delete_object(Bucket=asset_aux_bucket_name, Key=item['Key'])
+        assetAuxiliaryBucketFilesDeleted, _ = purge_s3_prefix(asset_aux_bucket_name, prefix, all_versions=False)
+        logger.info(f"Deleted {len(assetAuxiliaryBucketFilesDeleted)} auxiliary asset files")
 
     except Exception as e:
         logger.exception(f"Error deleting auxiliary files (they may not exist in the first place): {e}")
@@ -531,171 +554,202 @@ def delete_s3_object_all_versions(bucket: str, key: str) -> bool:
         logger.exception(f"Error deleting all versions of S3 object {key}: {e}")
         return False
 
+def delete_s3_objects_batch(bucket: str, batch: List[Dict]) -> Dict[Tuple[str, Optional[str]], str]:
+    """Delete up to 1000 objects with a single DeleteObjects request
+
+    Objects without a VersionId are archived (delete marker) in versioned buckets, objects with a
+    VersionId are permanently removed.
+
+    Args:
+        bucket: The S3 bucket
+        batch: List of {'Key'} or {'Key', 'VersionId'} dictionaries
+
+    Returns:
+        Dictionary of (key, versionId) to error message for every object that failed to delete
+    """
+    batch_errors = {}
+    try:
+        response = s3_client.delete_objects(Bucket=bucket, Delete={'Objects': batch, 'Quiet': True})
+        for error in response.get('Errors', []):
+            batch_errors[(error['Key'], error.get('VersionId'))] = error.get('Message', error.get('Code', 'Unknown error'))
+    except Exception as e:
+        logger.exception(f"Error deleting batch of {len(batch)} objects from bucket {bucket}: {e}")
+        for obj in batch:
+            batch_errors[(obj['Key'], obj.get('VersionId'))] = "Delete request failed"
+    return batch_errors
+
+def delete_s3_objects_batched(bucket: str, objects: List[Dict]) -> Dict[Tuple[str, Optional[str]], str]:
+    """Delete objects with DeleteObjects in batches of 1000 keys across concurrent workers
+
+    Args:
+        bucket: The S3 bucket
+        objects: List of {'Key'} or {'Key', 'VersionId'} dictionaries
+
+    Returns:
+        Dictionary of (key, versionId) to error message for every object that failed to delete
+    """
+    errors = {}
+    if not objects:
+        return errors
+
+    batches = [objects[i:i + S3_DELETE_OBJECTS_MAX_KEYS] for i in range(0, len(objects), S3_DELETE_OBJECTS_MAX_KEYS)]
+    with ThreadPoolExecutor(max_workers=min(BATCH_FILE_OPERATIONS_MAX_WORKERS, len(batches))) as executor:
+        for batch_errors in executor.map(lambda batch: delete_s3_objects_batch(bucket, batch), batches):
+            errors.update(batch_errors)
+
+    return errors
+
+def purge_s3_prefix(bucket: str, prefix: str, all_versions: bool, checkpoint: Optional[Dict] = None,
+                    deadline: Optional[float] = None, skip_folder_markers: bool = False,
+                    collect_keys: bool = True) -> Tuple[List[str], Optional[Dict]]:
+    """Remove everything under a prefix, one DeleteObjects request per listing page across concurrent workers
+
+    Listing continues while earlier pages are being deleted, and the prefix is listed again from the
+    start until nothing is left to remove. When a deadline is given, no new page is started after it
+    passes and a checkpoint is returned to resume from on the next call.
+
+    Args:
+        bucket: The S3 bucket
+        prefix: The S3 key prefix
+        all_versions: Permanently delete every version and delete marker, otherwise archive current versions
+        checkpoint: Listing position returned by a previous call that stopped at its deadline
+        deadline: Optional time.time() value after which no new listing page is started
+        skip_folder_markers: Leave folder marker objects (keys ending with '/') in place
+        collect_keys: Return the removed keys. Turn off for very large prefixes.
+
+    Returns:
+        Tuple of (removed keys, checkpoint). The checkpoint is None once the whole prefix is done.
+    """
+    removed_keys = {}
+    list_args = {'Bucket': bucket, 'Prefix': prefix, 'MaxKeys': S3_DELETE_OBJECTS_MAX_KEYS}
+    if checkpoint:
+        list_args.update(checkpoint)
+
+    def delete_page(objects: List[Dict]) -> None:
+        errors = delete_s3_objects_batch(bucket, objects)
+        failed_keys = {key for key, _ in errors}
+        if failed_keys:
+            logger.warning(f"Failed to remove {len(failed_keys)} object(s) under prefix {prefix} in bucket {bucket}")
+        if collect_keys:
+            for obj in objects:
+                if obj['Key'] not in failed_keys:
+                    removed_keys[obj['Key']] = True
+
+    next_checkpoint = None
+    with ThreadPoolExecutor(max_workers=BATCH_FILE_OPERATIONS_MAX_WORKERS) as executor:
+        for _ in range(PURGE_S3_PREFIX_MAX_PASSES):
+            pass_from_start = not any(k in list_args for k in ['KeyMarker', 'StartAfter'])
+            pass_found_objects = False
+            in_flight = []
+            while True:
+                if deadline is not None and time.time() >= deadline:
+                    next_checkpoint = {k: v for k, v in list_args.items() if k in ['KeyMarker', 'StartAfter']}
+                    break
+
+                if all_versions:
+                    page = s3_client.list_object_versions(**list_args)
+                    objects = [{'Key': version['Key'], 'VersionId': version['VersionId']}
+                               for version in page.get('Versions', []) + page.get('DeleteMarkers', [])]
+                else:
+                    page = s3_client.list_objects_v2(**list_args)
+                    objects = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+
+                # Version listings continue after a whole key, since the version markers of a page
+                # point at versions that are being deleted. The last key of a truncated page is
+                # listed again in full on the next page.
+                wait_for_page = False
+                if all_versions and page.get('IsTruncated'):
+                    completed = [obj for obj in objects if obj['Key'] != page['NextKeyMarker']]
+                    if completed:
+                        list_args['KeyMarker'] = max(obj['Key'] for obj in completed)
+                        objects = completed
+                    else:
+                        # A single key with more versions than fit in a page, list it again once these are deleted
+                        wait_for_page = True
+                elif page.get('IsTruncated'):
+                    list_args['StartAfter'] = page['Contents'][-1]['Key']
+
+                if skip_folder_markers:
+                    objects = [obj for obj in objects if not obj['Key'].endswith('/')]
+
+                if objects:
+                    pass_found_objects = True
+                    in_flight.append(executor.submit(delete_page, objects))
+
+                # Bound the number of listed pages waiting to be deleted
+                while in_flight and (wait_for_page or len(in_flight) >= BATCH_FILE_OPERATIONS_MAX_WORKERS):
+                    in_flight.pop(0).result()
+
+                if not page.get('IsTruncated'):
+                    break
+
+            for future in in_flight:
+                future.result()
+
+            # Done once a listing from the start of the prefix comes back empty. Otherwise list
+            # again from the start to pick up anything written or missed while paging.
+            if next_checkpoint is not None or (pass_from_start and not pass_found_objects):
+                break
+            list_args.pop('KeyMarker', None)
+            list_args.pop('StartAfter', None)
+
+    return list(removed_keys.keys()), next_checkpoint
+
 def delete_s3_prefix(bucket: str, prefix: str) -> List[str]:
     """Permanently delete all objects under a prefix (current versions only)
-    
+
     Args:
         bucket: The S3 bucket
         prefix: The S3 key prefix
-        
+
     Returns:
         List of deleted file keys
     """
-    deleted_files = []
-    
     try:
-        # List all objects with the prefix
-        paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-            for obj in page.get('Contents', []):
-                key = obj['Key']
-                
-                # Skip if it's a folder marker (key ends with '/')
-                if key.endswith('/'):
-                    continue
-                
-                # Delete the object
-                if delete_s3_object(bucket, key):
-                    deleted_files.append(key)
-    
+        # Folder markers are left in place
+        deleted_files, _ = purge_s3_prefix(bucket, prefix, all_versions=False, skip_folder_markers=True)
+        return deleted_files
     except Exception as e:
         logger.exception(f"Error deleting files under prefix {prefix}: {e}")
-    
-    return deleted_files
+        return []
 
 def delete_s3_prefix_all_versions(bucket: str, prefix: str) -> List[str]:
     """Permanently delete all objects and their versions under a prefix
-    
+
     Args:
         bucket: The S3 bucket
         prefix: The S3 key prefix
-        
+
     Returns:
         List of deleted file keys
     """
-    deleted_files = []
-    
     try:
-        # Get all object versions under the prefix
-        paginator = s3_client.get_paginator('list_object_versions')
-        
-        # Track keys we've already processed to avoid duplicates
-        processed_keys = set()
-        
-        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-            # Process all versions
-            for version in page.get('Versions', []):
-                key = version['Key']
-                
-                # Process folder markers separately
-                if key.endswith('/'):
-                    if key not in processed_keys:
-                        # Delete all versions of this folder marker
-                        if delete_s3_object_all_versions(bucket, key):
-                            deleted_files.append(key)
-                            processed_keys.add(key)
-                    continue
-                
-                # Skip if already processed
-                if key in processed_keys:
-                    continue
-                
-                # Delete all versions of this object
-                if delete_s3_object_all_versions(bucket, key):
-                    deleted_files.append(key)
-                    processed_keys.add(key)
-            
-            # Check for any keys in delete markers that weren't in versions
-            for marker in page.get('DeleteMarkers', []):
-                key = marker['Key']
-                
-                # Process folder markers separately
-                if key.endswith('/'):
-                    if key not in processed_keys:
-                        # Delete all versions of this folder marker
-                        if delete_s3_object_all_versions(bucket, key):
-                            deleted_files.append(key)
-                            processed_keys.add(key)
-                    continue
-                
-                # Skip if already processed
-                if key in processed_keys:
-                    continue
-                
-                # Delete all versions of this object
-                if delete_s3_object_all_versions(bucket, key):
-                    deleted_files.append(key)
-                    processed_keys.add(key)
-        
-        # Check if the prefix folder itself exists and delete it if it does
-        # Ensure the prefix ends with a slash for folder check
-        folder_prefix = prefix if prefix.endswith('/') else prefix + '/'
-        try:
-            # Check if the folder marker exists
-            s3_client.head_object(Bucket=bucket, Key=folder_prefix)
-            # Delete the folder marker if it exists
-            if delete_s3_object_all_versions(bucket, folder_prefix):
-                deleted_files.append(folder_prefix)
-        except ClientError as e:
-            # If the folder doesn't exist, that's fine
-            if e.response['Error']['Code'] != '404' and e.response['Error']['Code'] != 'NoSuchKey':
-                logger.warning(f"Error checking folder marker {folder_prefix}: {e}")
-    
+        # Listing the prefix also covers the prefix folder marker itself
+        deleted_files, _ = purge_s3_prefix(bucket, prefix, all_versions=True)
+        return deleted_files
     except Exception as e:
         logger.exception(f"Error deleting all versions under prefix {prefix}: {e}")
-    
-    return deleted_files
+        return []
 
 def archive_s3_prefix(bucket: str, prefix: str, databaseId: str, assetId: str) -> List[str]:
     """Archive all objects under a prefix
-    
+
     Args:
         bucket: The S3 bucket
         prefix: The S3 key prefix
         databaseId: The database ID
         assetId: The asset ID
-        
+
     Returns:
         List of archived file keys
     """
-    archived_files = []
-    
     try:
-        # List all objects with the prefix
-        paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-            for obj in page.get('Contents', []):
-                key = obj['Key']
-                
-                # Process folder markers separately
-                if key.endswith('/'):
-                    # Archive the folder marker
-                    if delete_s3_object(bucket, key):
-                        archived_files.append(key)
-                    continue
-                
-                # Archive the object
-                if delete_s3_object(bucket, key):
-                    archived_files.append(key)
-        
-        # Check if the prefix folder itself exists and archive it if it does
-        # Ensure the prefix ends with a slash for folder check
-        folder_prefix = prefix if prefix.endswith('/') else prefix + '/'
-        try:
-            # Check if the folder marker exists
-            s3_client.head_object(Bucket=bucket, Key=folder_prefix)
-            # Archive the folder marker if it exists
-            if delete_s3_object(bucket, folder_prefix):
-                archived_files.append(folder_prefix)
-        except ClientError as e:
-            # If the folder doesn't exist, that's fine
-            if e.response['Error']['Code'] != '404' and e.response['Error']['Code'] != 'NoSuchKey':
-                logger.warning(f"Error checking folder marker {folder_prefix}: {e}")
-    
+        # Listing the prefix also covers the prefix folder marker itself
+        archived_files, _ = purge_s3_prefix(bucket, prefix, all_versions=False)
+        return archived_files
     except Exception as e:
         logger.exception(f"Error archiving files under prefix {prefix}: {e}")
-    
-    return archived_files
+        return []
 
 def validate_cross_asset_permissions(source_asset: Dict, dest_asset: Dict, claims_and_roles: Dict) -> bool:
     """Validate permissions for operations involving multiple assets
@@ -927,12 +981,98 @@ def get_s3_object_metadata(bucket: str, key: str, include_versions: bool = False
                 raise VAMSGeneralErrorResponse(f"Error retrieving file metadata.")
         raise VAMSGeneralErrorResponse(f"Error retrieving file metadata.")
 
+def get_file_primary_types_cache_key(asset_prefix: str) -> str:
+    """Get the auxiliary bucket key of the primary type cache of an asset"""
+    if not asset_prefix.endswith('/'):
+        asset_prefix = asset_prefix + '/'
+    return asset_prefix + FILE_PRIMARY_TYPES_CACHE_NAME
+
+def load_file_primary_types(asset_prefix: str) -> Dict:
+    """Load the primary type cache of an asset, empty when it does not exist or can't be read
+
+    Returns:
+        Dictionary of relative file key to {'versionId', 'primaryType'}
+    """
+    try:
+        response = s3_client.get_object(Bucket=asset_aux_bucket_name, Key=get_file_primary_types_cache_key(asset_prefix))
+        return json.loads(response['Body'].read())
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchKey':
+            logger.warning(f"Error reading the file primary types of {asset_prefix}: {e}")
+    except ValueError as e:
+        logger.warning(f"Ignoring invalid file primary types of {asset_prefix}: {e}")
+    return {}
+
+def save_file_primary_types(asset_prefix: str, primary_types: Dict):
+    """Save the primary type cache of an asset, a failure only costs head_object calls on the next listing"""
+    try:
+        s3_client.put_object(
+            Bucket=asset_aux_bucket_name,
+            Key=get_file_primary_types_cache_key(asset_prefix),
+            Body=json.dumps(primary_types).encode('utf-8'),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        logger.warning(f"Error saving the file primary types of {asset_prefix}: {e}")
+
+def set_listed_primary_types(bucket: str, asset_prefix: str, items: List[Dict], complete: bool):
+    """Set the primaryType of listed files from the S3 object metadata
+
+    The metadata is only read with a head_object for files whose version is not in the primary type
+    cache of the asset (new or changed since they were last listed), then the cache is updated.
+
+    Args:
+        bucket: The S3 bucket
+        asset_prefix: The asset root prefix
+        items: Listed items, updated in place
+        complete: Whether the items are every file of the asset, entries of other files are then dropped
+    """
+    primary_types = load_file_primary_types(asset_prefix)
+    changed = False
+
+    for item in items:
+        if item['isFolder'] or item['isArchived']:
+            item['primaryType'] = None
+            continue
+
+        relative_key = item['key'][len(asset_prefix):]
+        cached = primary_types.get(relative_key)
+        if cached and cached.get('versionId') == item['versionId']:
+            item['primaryType'] = cached.get('primaryType')
+            continue
+
+        try:
+            head_args = {'Bucket': bucket, 'Key': item['key']}
+            if item['versionId'] != 'null':
+                head_args['VersionId'] = item['versionId']
+            metadata = s3_client.head_object(**head_args).get('Metadata', {})
+        except Exception as e:
+            logger.warning(f"Error getting the primary type of {item['key']}: {e}")
+            item['primaryType'] = None
+            continue
+
+        item['primaryType'] = metadata.get('vams-primarytype') or None
+        primary_types[relative_key] = {'versionId': item['versionId'], 'primaryType': item['primaryType']}
+        changed = True
+
+    if complete:
+        listed_keys = {item['key'][len(asset_prefix):] for item in items}
+        for relative_key in [relative_key for relative_key in primary_types if relative_key not in listed_keys]:
+            del primary_types[relative_key]
+            changed = True
+
+    if changed:
+        save_file_primary_types(asset_prefix, primary_types)
+
 def list_s3_objects_with_archive_status(bucket: str, prefix: str, query_params: Dict, include_archived: bool = False) -> Dict:
     """List S3 objects with pagination and archive status
     
+    Current versions and delete markers come from the same version listing, so the cost is one
+    list call per page of versions plus the primary type cache, not a call per file.
+
     Args:
         bucket: The S3 bucket
-        prefix: The S3 key prefix
+        prefix: The S3 key prefix (the asset root)
         query_params: Dictionary containing pagination parameters
         include_archived: Whether to include archived files
         
@@ -941,15 +1081,10 @@ def list_s3_objects_with_archive_status(bucket: str, prefix: str, query_params:
     """
     logger.info(f"Listing files from bucket: {bucket}, prefix: {prefix}")
     
-    # Configure pagination
-    pagination_config = {
-        'MaxItems': int(query_params.get('maxItems', 1000)),
-        'PageSize': int(query_params.get('pageSize', 1000))
-    }
-    
-    # Add starting token if provided
-    if query_params.get('startingToken'):
-        pagination_config['StartingToken'] = query_params['startingToken']
+    # Configure pagination, the token is the key of the last returned file
+    max_items = int(query_params.get('maxItems') or 1000)
+    page_size = int(query_params.get('pageSize') or 1000)
+    asset_prefix = prefix
     
     # If prefix filter is provided, append it to the base prefix
     if query_params.get('prefix'):
@@ -957,28 +1092,54 @@ def list_s3_objects_with_archive_status(bucket: str, prefix: str, query_params:
             prefix = prefix + '/'
         prefix = prefix + query_params['prefix'].lstrip('/')
     
+    list_args = {'Bucket': bucket, 'Prefix': prefix, 'MaxKeys': page_size}
+    # Keys up to this one were listed by a previous request or page
+    listed_up_to = query_params.get('startingToken')
+    if listed_up_to:
+        list_args['KeyMarker'] = listed_up_to
+
     # List objects with pagination
     result = {
         "items": []
     }
     
     try:
-        # First, get current objects (non-archived)
-        paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(
-            Bucket=bucket,
-            Prefix=prefix,
-            PaginationConfig=pagination_config
-        ):
-            for obj in page.get('Contents', []):
+        while True:
+            page = s3_client.list_object_versions(**list_args)
+
+            # The versions of a key are listed newest first, so its current state is the entry
+            # marked as latest: a version, or a delete marker when the file is archived
+            previous_versions = {}
+            latest_entries = []
+            for version in page.get('Versions', []):
+                # Older versions of the last key of the previous page
+                if listed_up_to is not None and version['Key'] <= listed_up_to:
+                    continue
+                if version['IsLatest']:
+                    latest_entries.append(version)
+                else:
+                    previous_versions.setdefault(version['Key'], version)
+            for marker in page.get('DeleteMarkers', []):
+                # Folders are never archived
+                if listed_up_to is not None and marker['Key'] <= listed_up_to:
+                    continue
+                if marker['IsLatest'] and include_archived and not marker['Key'].endswith('/'):
+                    latest_entries.append(marker)
+
+            for entry in sorted(latest_entries, key=lambda entry: entry['Key']):
+                if len(result['items']) == max_items:
+                    result['nextToken'] = result['items'][-1]['key']
+                    break
+
                 # Extract filename from key
-                file_name = os.path.basename(obj['Key'])
+                file_name = os.path.basename(entry['Key'])
+                is_archived = 'Size' not in entry
                 
                 # Determine if it's a folder (key ends with '/' or fileName is empty)
-                is_folder = obj['Key'].endswith('/') or not file_name
+                is_folder = entry['Key'].endswith('/') or not file_name
                 
                 # Get relative path by removing the prefix
-                relative_path = obj['Key']
+                relative_path = entry['Key']
                 if relative_path.startswith(prefix):
                     relative_path = relative_path[len(prefix):]
                     # Ensure relative path starts with /
@@ -988,118 +1149,28 @@ def list_s3_objects_with_archive_status(bucket: str, prefix: str, query_params:
                 # Create the item with all required fields
                 item = {
                     'fileName': file_name,
-                    'key': obj['Key'],
+                    'key': entry['Key'],
                     'relativePath': relative_path,
                     'isFolder': is_folder,
-                    'dateCreatedCurrentVersion': obj['LastModified'].isoformat(),
-                    'storageClass': obj.get('StorageClass', 'STANDARD')
+                    'dateCreatedCurrentVersion': entry['LastModified'].isoformat(),
+                    'storageClass': entry.get('StorageClass', 'STANDARD'),
+                    'versionId': entry.get('VersionId') or 'null',
+                    'isArchived': is_archived
                 }
                 
-                # Add size for non-folders
-                if not is_folder:
-                    item['size'] = obj['Size']
-                
-                # Get version ID and check archive status
-                try:
-                    version_info = s3_client.head_object(
-                        Bucket=bucket,
-                        Key=obj['Key']
-                    )
-                    item['versionId'] = version_info.get('VersionId', 'null')
-                    
-                    # Check if file is archived
-                    item['isArchived'] = is_file_archived(bucket, obj['Key'])
-                    
-                    # Add primaryType from S3 metadata (only for non-folder objects)
-                    if not is_folder:
-                        metadata = version_info.get('Metadata', {})
-                        primary_type = metadata.get('vams-primarytype', '')
-                        item['primaryType'] = primary_type if primary_type else None
-                    else:
-                        item['primaryType'] = None
-                    
-                except Exception as e:
-                    logger.warning(f"Error getting version info for {obj['Key']}: {e}")
-                    item['versionId'] = 'null'
-                    item['isArchived'] = False
-                    item['primaryType'] = None
-                
-                # Only add non-archived files unless include_archived is True
-                if not item['isArchived'] or include_archived:
-                    result["items"].append(item)
-            
-            # Add next token if available
-            if 'NextToken' in page:
-                result['nextToken'] = page['NextToken']
-        
-        # If include_archived is True, also get objects with delete markers
-        if include_archived:
-            logger.info("Including archived files with delete markers")
-            # Use list_object_versions to get delete markers
-            try:
-                # Create a new paginator for versions
-                version_paginator = s3_client.get_paginator('list_object_versions')
-                
-                # Track keys we've already processed to avoid duplicates
-                existing_keys = {item['key'] for item in result['items']}
+                # Add size for non-folders, archived files have the size of the version before the delete marker
+                if is_archived:
+                    if entry['Key'] in previous_versions:
+                        item['size'] = previous_versions[entry['Key']].get('Size', 0)
+                elif not is_folder:
+                    item['size'] = entry['Size']
                 
-                for page in version_paginator.paginate(
-                    Bucket=bucket,
-                    Prefix=prefix,
-                    PaginationConfig=pagination_config
-                ):
-                    # Process delete markers
-                    for marker in page.get('DeleteMarkers', []):
-                        key = marker['Key']
-                        
-                        # Skip if we already have this key in our results
-                        if key in existing_keys:
-                            continue
-                        
-                        # Skip folders
-                        if key.endswith('/'):
-                            continue
-                        
-                        # Extract filename and relative path
-                        file_name = os.path.basename(key)
-                        relative_path = key
-                        if relative_path.startswith(prefix):
-                            relative_path = relative_path[len(prefix):]
-                            if not relative_path.startswith('/'):
-                                relative_path = '/' + relative_path
-                        
-                        # Find the latest version before the delete marker
-                        latest_version = None
-                        for version in page.get('Versions', []):
-                            if version['Key'] == key:
-                                latest_version = version
-                                break
-                        
-                        # Create item for the archived file
-                        item = {
-                            'fileName': file_name,
-                            'key': key,
-                            'relativePath': relative_path,
-                            'isFolder': False,
-                            'dateCreatedCurrentVersion': marker['LastModified'].isoformat(),
-                            'storageClass': 'STANDARD',
-                            'versionId': marker['VersionId'],
-                            'isArchived': True
-                        }
-                        
-                        # Add size if we found a version
-                        if latest_version:
-                            item['size'] = latest_version.get('Size', 0)
-                        
-                        # Add to results
-                        result["items"].append(item)
-                        existing_keys.add(key)
-                    
-                    # We don't update the nextToken here as we're just supplementing the main listing
-            
-            except Exception as e:
-                logger.warning(f"Error listing delete markers: {e}")
-                # Continue with what we have, don't fail the whole request
+                result["items"].append(item)
+
+            if 'nextToken' in result or not page.get('IsTruncated'):
+                break
+            list_args['KeyMarker'] = listed_up_to = page['NextKeyMarker']
+            list_args['VersionIdMarker'] = page['NextVersionIdMarker']
     
     except ClientError as e:
         logger.exception(f"Error listing S3 objects: {e}")
@@ -1107,6 +1178,9 @@ def list_s3_objects_with_archive_status(bucket: str, prefix: str, query_params:
             # If the prefix doesn't exist, return empty list
             return result
         raise VAMSGeneralErrorResponse(f"Error listing files.")
+
+    complete = not query_params.get('prefix') and not query_params.get('startingToken') and 'nextToken' not in result
+    set_listed_primary_types(bucket, asset_prefix, result['items'], complete)
     
     logger.info(f"Found {len(result['items'])} files in the path")
     return result
@@ -2009,6 +2083,537 @@ def move_file(databaseId: str, assetId: str, source_path: str, dest_path: str, c
         affectedFiles=affected_files
     )
 
+def get_relative_file_path(key: str, base_key: str) -> str:
+    """Get the asset relative path for reporting a full S3 key
+
+    Args:
+        key: The full S3 object key
+        base_key: The asset base key
+
+    Returns:
+        The key relative to the asset base key, with a leading slash
+    """
+    if key.startswith(base_key):
+        return '/' + key[len(base_key):]
+    return '/' + key
+
+def get_preview_destination_key(preview_key: str, source_key: str, dest_key: str) -> str:
+    """Calculate where a preview file goes when its base file is copied or moved
+
+    Args:
+        preview_key: The preview file key of the source base file
+        source_key: The source base file key
+        dest_key: The destination base file key
+
+    Returns:
+        The destination preview file key
+    """
+    dest_dir = os.path.dirname(dest_key)
+    new_preview_filename = os.path.basename(preview_key).replace(os.path.basename(source_key), os.path.basename(dest_key), 1)
+    return os.path.join(dest_dir, new_preview_filename).replace('\\', '/')
+
+def list_s3_object_version_keys(bucket: str, prefix: str, exact_key: bool) -> List[Dict]:
+    """List every version and delete marker under a prefix, paging through all results
+
+    Args:
+        bucket: The S3 bucket
+        prefix: The S3 key prefix
+        exact_key: Only return versions of the key equal to the prefix
+
+    Returns:
+        List of {'Key', 'VersionId'} dictionaries usable with delete_objects
+    """
+    object_versions = []
+    paginator = s3_client.get_paginator('list_object_versions')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for version in page.get('Versions', []) + page.get('DeleteMarkers', []):
+            if exact_key and version['Key'] != prefix:
+                continue
+            object_versions.append({'Key': version['Key'], 'VersionId': version['VersionId']})
+    return object_versions
+
+def authorize_batch_file_operations(databaseId: str, assetId: str, operations: List[BatchFileOperationItemModel], claims_and_roles: Dict) -> Dict[str, Dict]:
+    """Load and authorize every asset touched by a batch, once per asset and permission
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID the batch runs against
+        operations: The batch operations
+        claims_and_roles: The claims and roles from the request
+
+    Returns:
+        Dictionary of asset ID to asset
+
+    Raises:
+        VAMSGeneralErrorResponse: If an asset is not found or the user doesn't have permissions
+    """
+    # Collect the permissions needed per asset
+    required_permissions = {assetId: set()}
+    for op in operations:
+        if op.operation == "copy":
+            required_permissions[assetId].add("GET")
+            dest_asset_id = op.destinationAssetId or assetId
+            required_permissions.setdefault(dest_asset_id, set()).add("POST")
+        else:
+            required_permissions[assetId].add("POST")
+
+    assets = {}
+    for permission_asset_id, permissions in required_permissions.items():
+        for permission in sorted(permissions):
+            assets[permission_asset_id] = get_asset_with_permissions(databaseId, permission_asset_id, permission, claims_and_roles)
+
+    return assets
+
+def load_batch_assets(databaseId: str, asset_ids: List[str]) -> Dict[str, Dict]:
+    """Load the assets of an already authorized batch
+
+    Args:
+        databaseId: The database ID
+        asset_ids: The asset IDs touched by the batch
+
+    Returns:
+        Dictionary of asset ID to asset
+    """
+    assets = {}
+    for batch_asset_id in set(asset_ids):
+        asset = request_asset(databaseId, batch_asset_id, lambda: asset_table.get_item(
+            Key={'databaseId': databaseId, 'assetId': batch_asset_id}).get('Item'))
+        if not asset:
+            raise VAMSGeneralErrorResponse("Asset not found in database.")
+        assets[batch_asset_id] = asset
+    return assets
+
+def plan_batch_file_operation(index: int, op: BatchFileOperationItemModel, assetId: str, locations: Dict[str, Tuple[str, str]]) -> Dict:
+    """Validate a single batch operation and work out the S3 copies and deletes it needs
+
+    Args:
+        index: The position of the operation in the batch
+        op: The batch operation
+        assetId: The asset ID the batch runs against
+        locations: Dictionary of asset ID to (bucket, base key)
+
+    Returns:
+        Plan dictionary for the operation. 'error' is set if the operation can't run.
+    """
+    bucket, base_key = locations[assetId]
+    dest_asset_id = op.destinationAssetId or assetId
+    dest_bucket, dest_base_key = locations[dest_asset_id]
+    plan = {
+        'index': index,
+        'op': op,
+        'destAssetId': dest_asset_id,
+        'sourceKey': None,
+        'destKey': None,
+        'copies': [],
+        'deletes': [],
+        'affectedFiles': [],
+        'error': None
+    }
+
+    try:
+        if op.filePath == "/" or op.filePath == "":
+            raise VAMSGeneralErrorResponse(f"Cannot {op.operation} the top-level asset folder")
+
+        source_key = resolve_asset_file_path(base_key, op.filePath)
+        plan['sourceKey'] = source_key
+
+        if op.operation in ["copy", "move"]:
+            if is_preview_file(op.filePath):
+                raise VAMSGeneralErrorResponse(f"Cannot directly {op.operation} preview files. {op.operation.capitalize()} the base file instead.")
+
+            dest_key = resolve_asset_file_path(dest_base_key, op.destinationPath)
+            plan['destKey'] = dest_key
+
+            try:
+                s3_client.head_object(Bucket=bucket, Key=source_key)
+            except ClientError as e:
+                if e.response['Error']['Code'] in ['NoSuchKey', '404']:
+                    raise VAMSGeneralErrorResponse("Source file not found.")
+                raise VAMSGeneralErrorResponse("Error checking source file.")
+
+            if check_destination_file_exists(dest_bucket, dest_key, op.destinationPath):
+                raise VAMSGeneralErrorResponse("Destination file already exists.")
+
+            plan['copies'].append((source_key, dest_key))
+            for preview_file in find_preview_files_for_base(bucket, source_key):
+                plan['copies'].append((preview_file, get_preview_destination_key(preview_file, source_key, dest_key)))
+
+            plan['affectedFiles'] = [get_relative_file_path(dest, dest_base_key) for _, dest in plan['copies']]
+            if op.operation == "move":
+                plan['deletes'] = [{'Key': source} for source, _ in plan['copies']]
+                plan['affectedFiles'] = [get_relative_file_path(source, base_key) for source, _ in plan['copies']] + plan['affectedFiles']
+
+        elif op.operation == "archive":
+            if op.isPrefix:
+                paginator = s3_client.get_paginator('list_objects_v2')
+                for page in paginator.paginate(Bucket=bucket, Prefix=source_key):
+                    plan['deletes'].extend({'Key': obj['Key']} for obj in page.get('Contents', []))
+                if not plan['deletes']:
+                    raise VAMSGeneralErrorResponse("No files found under prefix.")
+            else:
+                try:
+                    s3_client.head_object(Bucket=bucket, Key=source_key)
+                except ClientError as e:
+                    if e.response['Error']['Code'] in ['NoSuchKey', '404']:
+                        if is_file_archived(bucket, source_key):
+                            raise VAMSGeneralErrorResponse("File is already archived.")
+                        raise VAMSGeneralErrorResponse("File not found.")
+                    raise VAMSGeneralErrorResponse("Error checking file.")
+                plan['deletes'].append({'Key': source_key})
+                # Archive associated preview files along with base files
+                if not is_preview_file(op.filePath):
+                    plan['deletes'].extend({'Key': preview} for preview in find_preview_files_for_base(bucket, source_key))
+
+            plan['affectedFiles'] = [get_relative_file_path(obj['Key'], base_key) for obj in plan['deletes']]
+
+        elif op.operation == "delete":
+            if op.isPrefix:
+                plan['deletes'] = list_s3_object_version_keys(bucket, source_key, exact_key=False)
+                if not plan['deletes']:
+                    raise VAMSGeneralErrorResponse("No files found under prefix.")
+            else:
+                if is_preview_file(op.filePath):
+                    raise VAMSGeneralErrorResponse("Cannot directly delete preview files. Delete the base file instead.")
+                plan['deletes'] = list_s3_object_version_keys(bucket, source_key, exact_key=True)
+                if not plan['deletes']:
+                    raise VAMSGeneralErrorResponse("File not found.")
+                for preview_file in find_preview_files_for_base(bucket, source_key):
+                    plan['deletes'].extend(list_s3_object_version_keys(bucket, preview_file, exact_key=True))
+
+            plan['affectedFiles'] = sorted({get_relative_file_path(obj['Key'], base_key) for obj in plan['deletes']})
+
+    except VAMSGeneralErrorResponse as e:
+        plan['error'] = str(e)
+    except Exception as e:
+        logger.exception(f"Error planning batch file operation {index}: {e}")
+        plan['error'] = "Error processing file operation."
+
+    return plan
+
+def execute_batch_file_operations(databaseId: str, assetId: str, operations: List[BatchFileOperationItemModel], assets: Dict[str, Dict], first_index: int = 0) -> List[BatchFileOperationResultModel]:
+    """Run a batch of file operations against already authorized assets
+
+    Operations are validated concurrently, copies run concurrently, and all archive, delete and
+    move source removals are combined into DeleteObjects batches. A failure only fails the
+    operation it belongs to.
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID the batch runs against
+        operations: The batch operations
+        assets: Dictionary of asset ID to asset for every asset in the batch
+        first_index: Position of the first operation in the request, for chunks of a background job
+
+    Returns:
+        List of per-operation results in request order
+    """
+    locations = {batch_asset_id: get_asset_s3_location(asset) for batch_asset_id, asset in assets.items()}
+    bucket, base_key = locations[assetId]
+
+    # Validate every operation and collect the S3 work it needs
+    with ThreadPoolExecutor(max_workers=BATCH_FILE_OPERATIONS_MAX_WORKERS) as executor:
+        plans = list(executor.map(
+            lambda indexed_op: plan_batch_file_operation(indexed_op[0], indexed_op[1], assetId, locations),
+            enumerate(operations, first_index)))
+
+    # Operations in the same batch can't write to the same destination or remove the same file twice
+    claimed_dest_keys = set()
+    claimed_source_keys = set()
+    for plan in plans:
+        if plan['error']:
+            continue
+        op = plan['op']
+        if plan['destKey']:
+            dest_claim = (plan['destAssetId'], plan['destKey'])
+            if dest_claim in claimed_dest_keys:
+                plan['error'] = "Destination file is already targeted by another operation in this batch."
+                continue
+            claimed_dest_keys.add(dest_claim)
+        if op.operation != "copy":
+            if plan['sourceKey'] in claimed_source_keys:
+                plan['error'] = "File is already targeted by another operation in this batch."
+                continue
+            claimed_source_keys.add(plan['sourceKey'])
+
+    # Copy files for copy and move operations
+    def run_copies(plan: Dict) -> None:
+        source_bucket = bucket
+        dest_bucket = locations[plan['destAssetId']][0]
+        for position, (source_key, dest_key) in enumerate(plan['copies']):
+            copied = copy_s3_object(
+                source_bucket,
+                source_key,
+                dest_bucket,
+                dest_key,
+                source_asset_id=assetId,
+                source_database_id=databaseId,
+                dest_asset_id=plan['destAssetId'],
+                dest_database_id=databaseId
+            )
+            if not copied:
+                if position == 0:
+                    plan['error'] = f"Failed to {plan['op'].operation} file."
+                    return
+                logger.error(f"Failed to copy preview file from {source_key} to {dest_key}")
+
+    copy_plans = [plan for plan in plans if not plan['error'] and plan['copies']]
+    if copy_plans:
+        with ThreadPoolExecutor(max_workers=BATCH_FILE_OPERATIONS_MAX_WORKERS) as executor:
+            list(executor.map(run_copies, copy_plans))
+
+    # Remove move sources and archive/delete targets in DeleteObjects batches
+    delete_owners = {}
+    delete_objects = []
+    for plan in plans:
+        if plan['error']:
+            continue
+        for obj in plan['deletes']:
+            object_id = (obj['Key'], obj.get('VersionId'))
+            if object_id not in delete_owners:
+                delete_owners[object_id] = []
+                delete_objects.append(obj)
+            delete_owners[object_id].append(plan)
+
+    delete_errors = delete_s3_objects_batched(bucket, delete_objects)
+    for object_id, error_message in delete_errors.items():
+        logger.error(f"Failed to remove {object_id[0]} (version {object_id[1]}): {error_message}")
+        for plan in delete_owners.get(object_id, []):
+            if plan['op'].operation == "move":
+                plan['error'] = "File was copied to the destination but the source file could not be removed."
+            else:
+                plan['error'] = f"Failed to {plan['op'].operation} file."
+
+    # Keep auxiliary files in step with the asset files
+    def run_auxiliary(plan: Dict) -> None:
+        op = plan['op']
+        if op.operation == "copy":
+            copy_auxiliary_files(plan['sourceKey'], plan['destKey'])
+        elif op.operation == "move":
+            move_auxiliary_files(plan['sourceKey'], plan['destKey'])
+        elif op.operation == "delete":
+            delete_assetAuxiliary_files(plan['sourceKey'])
+
+    completed_plans = [plan for plan in plans if not plan['error']]
+    if completed_plans:
+        with ThreadPoolExecutor(max_workers=BATCH_FILE_OPERATIONS_MAX_WORKERS) as executor:
+            list(executor.map(run_auxiliary, completed_plans))
+
+    # Send one email per changed asset
+    changed_asset_ids = set()
+    for plan in completed_plans:
+        changed_asset_ids.add(plan['destAssetId'] if plan['op'].operation == "copy" else assetId)
+    for changed_asset_id in changed_asset_ids:
+        send_subscription_email(databaseId, changed_asset_id)
+
+    results = []
+    for plan in plans:
+        op = plan['op']
+        if plan['error']:
+            results.append(BatchFileOperationResultModel(
+                index=plan['index'], operation=op.operation, filePath=op.filePath, success=False, message=plan['error']))
+        else:
+            results.append(BatchFileOperationResultModel(
+                index=plan['index'],
+                operation=op.operation,
+                filePath=op.filePath,
+                success=True,
+                message=f"Successfully completed {op.operation} of {len(plan['affectedFiles'])} file(s)",
+                affectedFiles=plan['affectedFiles']
+            ))
+    return results
+
+def build_batch_file_operations_response(results: List[BatchFileOperationResultModel], jobId: Optional[str] = None, totalOperations: Optional[int] = None) -> BatchFileOperationsResponseModel:
+    """Summarize per-operation results into a batch response, RUNNING while a job has operations left"""
+    succeeded_count = len([result for result in results if result.success])
+    failed_count = len(results) - succeeded_count
+    if totalOperations is None:
+        totalOperations = len(results)
+    return BatchFileOperationsResponseModel(
+        jobId=jobId,
+        status="COMPLETED" if len(results) >= totalOperations else "RUNNING",
+        message=f"Completed {succeeded_count} of {totalOperations} file operation(s)" +
+                (f", {failed_count} failed" if failed_count else ""),
+        totalOperations=totalOperations,
+        succeededCount=succeeded_count,
+        failedCount=failed_count,
+        results=results
+    )
+
+def get_batch_file_operations_job_key(databaseId: str, assetId: str, jobId: str, name: str) -> str:
+    """Get the auxiliary bucket key of a batch file operations job object"""
+    return f"{BATCH_FILE_OPERATIONS_JOB_PREFIX}/{databaseId}/{assetId}/{jobId}/{name}.json"
+
+def save_batch_file_operations_job_status(databaseId: str, assetId: str, response: BatchFileOperationsResponseModel) -> None:
+    """Write the status of a batch file operations job"""
+    s3_client.put_object(
+        Bucket=asset_aux_bucket_name,
+        Key=get_batch_file_operations_job_key(databaseId, assetId, response.jobId, "status"),
+        Body=json.dumps(response.dict()),
+        ContentType='application/json'
+    )
+
+def invoke_batch_file_operations_job(databaseId: str, assetId: str, jobId: str, function_name: str) -> None:
+    """Run a batch file operations job in a new asynchronous invocation of this function"""
+    lambda_client.invoke(
+        FunctionName=function_name,
+        InvocationType='Event',
+        Payload=json.dumps({'batchFileOperationsJob': {'databaseId': databaseId, 'assetId': assetId, 'jobId': jobId}})
+    )
+
+def start_batch_file_operations_job(databaseId: str, assetId: str, request_model: BatchFileOperationsRequestModel, function_name: str) -> BatchFileOperationsResponseModel:
+    """Queue an authorized batch to run in the background on this function
+
+    The operations are stored in the auxiliary bucket since a large batch can exceed the
+    asynchronous invoke payload limit.
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        request_model: The authorized batch request
+        function_name: The name of this Lambda function
+
+    Returns:
+        BatchFileOperationsResponseModel with the queued job ID
+    """
+    jobId = str(uuid.uuid4())
+    s3_client.put_object(
+        Bucket=asset_aux_bucket_name,
+        Key=get_batch_file_operations_job_key(databaseId, assetId, jobId, "request"),
+        Body=json.dumps(request_model.dict()),
+        ContentType='application/json'
+    )
+
+    response = BatchFileOperationsResponseModel(
+        jobId=jobId,
+        status="QUEUED",
+        message=f"Queued {len(request_model.operations)} file operation(s)",
+        totalOperations=len(request_model.operations)
+    )
+    save_batch_file_operations_job_status(databaseId, assetId, response)
+
+    try:
+        invoke_batch_file_operations_job(databaseId, assetId, jobId, function_name)
+    except Exception as e:
+        logger.exception(f"Error starting batch file operations job {jobId}: {e}")
+        raise VAMSGeneralErrorResponse("Error starting batch file operations job.")
+
+    return response
+
+def run_batch_file_operations_job(job: Dict, context) -> None:
+    """Run a queued batch file operations job, continuing in a new invocation before the timeout
+
+    Operations run in chunks. The results of the finished operations are saved with the job status
+    after each chunk and the job resumes after them, so a continuation or a retry never runs a
+    finished copy, move or delete again. Only the chunk in progress when an invocation is killed by
+    its timeout runs again, its finished copies and moves then fail their destination and source
+    checks instead of running twice.
+
+    Args:
+        job: The job payload with databaseId, assetId and jobId
+        context: The Lambda context
+    """
+    databaseId = job['databaseId']
+    assetId = job['assetId']
+    jobId = job['jobId']
+    deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - BATCH_FILE_OPERATIONS_JOB_MARGIN_SECONDS
+
+    request_object = s3_client.get_object(
+        Bucket=asset_aux_bucket_name,
+        Key=get_batch_file_operations_job_key(databaseId, assetId, jobId, "request")
+    )
+    request_model = BatchFileOperationsRequestModel(**json.loads(request_object['Body'].read()))
+    total_operations = len(request_model.operations)
+
+    status_object = s3_client.get_object(
+        Bucket=asset_aux_bucket_name,
+        Key=get_batch_file_operations_job_key(databaseId, assetId, jobId, "status")
+    )
+    response = BatchFileOperationsResponseModel(**json.loads(status_object['Body'].read()))
+    if response.status in ["COMPLETED", "FAILED"]:
+        logger.info(f"Batch file operations job {jobId} already finished with status {response.status}")
+        return
+
+    # Skip the operations a previous invocation finished
+    results = list(response.results)
+    if response.status == "QUEUED":
+        save_batch_file_operations_job_status(
+            databaseId, assetId, build_batch_file_operations_response(results, jobId, total_operations))
+    finished = True
+    try:
+        # Assets were authorized when the job was queued
+        asset_ids = [assetId] + [op.destinationAssetId for op in request_model.operations if op.destinationAssetId]
+        assets = load_batch_assets(databaseId, asset_ids)
+
+        while len(results) < total_operations:
+            # Every invocation runs at least one chunk
+            if len(results) > len(response.results) and time.time() >= deadline:
+                finished = False
+                break
+            start = len(results)
+            chunk = request_model.operations[start:start + BATCH_FILE_OPERATIONS_JOB_CHUNK_SIZE]
+            results.extend(execute_batch_file_operations(databaseId, assetId, chunk, assets, start))
+            save_batch_file_operations_job_status(
+                databaseId, assetId, build_batch_file_operations_response(results, jobId, total_operations))
+
+        response = build_batch_file_operations_response(results, jobId, total_operations)
+    except Exception as e:
+        logger.exception(f"Error running batch file operations job {jobId}: {e}")
+        response = build_batch_file_operations_response(results, jobId, total_operations)
+        response.status = "FAILED"
+        response.message = f"Batch file operations job failed after {len(results)} of {total_operations} file operation(s)"
+
+    save_batch_file_operations_job_status(databaseId, assetId, response)
+    if not finished:
+        logger.info(f"Continuing batch file operations job {jobId} from operation {len(results)}")
+        invoke_batch_file_operations_job(databaseId, assetId, jobId, context.function_name)
+
+def batch_file_operations(databaseId: str, assetId: str, request_model: BatchFileOperationsRequestModel, claims_and_roles: Dict, function_name: str) -> BatchFileOperationsResponseModel:
+    """Run many file operations on an asset, inline or as a background job for large batches
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        request_model: The batch request
+        claims_and_roles: The claims and roles from the request
+        function_name: The name of this Lambda function, for background jobs
+
+    Returns:
+        BatchFileOperationsResponseModel with per-operation results or the queued job
+    """
+    assets = authorize_batch_file_operations(databaseId, assetId, request_model.operations, claims_and_roles)
+
+    if len(request_model.operations) > BATCH_FILE_OPERATIONS_SYNC_MAX_ITEMS:
+        return start_batch_file_operations_job(databaseId, assetId, request_model, function_name)
+
+    results = execute_batch_file_operations(databaseId, assetId, request_model.operations, assets)
+    return build_batch_file_operations_response(results)
+
+def get_batch_file_operations_job(databaseId: str, assetId: str, jobId: str, claims_and_roles: Dict) -> BatchFileOperationsResponseModel:
+    """Get the status and results of a batch file operations job
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        jobId: The job ID
+        claims_and_roles: The claims and roles from the request
+
+    Returns:
+        BatchFileOperationsResponseModel with the job status
+    """
+    get_asset_with_permissions(databaseId, assetId, "GET", claims_and_roles)
+
+    try:
+        status_object = s3_client.get_object(
+            Bucket=asset_aux_bucket_name,
+            Key=get_batch_file_operations_job_key(databaseId, assetId, jobId, "status")
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] in ['NoSuchKey', '404']:
+            raise VAMSGeneralErrorResponse("Batch file operations job not found.")
+        raise VAMSGeneralErrorResponse("Error retrieving batch file operations job.")
+
+    return BatchFileOperationsResponseModel(**json.loads(status_object['Body'].read()))
+
 def revert_file_version(databaseId: str, assetId: str, file_path: str, version_id: str, claims_and_roles: Dict) -> RevertFileVersionResponseModel:
     """Revert a file to a previous version by copying it as the new current version
     
@@ -3227,6 +3832,7 @@ def delete_asset_preview(databaseId: str, assetId: str, claims_and_roles: Dict)
         
         # Update the asset record in DynamoDB
         asset_table.put_item(Item=asset)
+        forget_asset(databaseId, assetId)
         
         # Send email notification for asset change
         send_subscription_email(databaseId, assetId)
@@ -3472,6 +4078,161 @@ def handle_set_primary_file(event, context) -> APIGatewayProxyResponseV2:
         logger.exception(f"Internal error: {e}")
         return internal_error()
 
+def handle_batch_file_operations(event, context) -> APIGatewayProxyResponseV2:
+    """Handle POST /batchFileOperations requests
+
+    Args:
+        event: The API Gateway event
+        context: The Lambda context
+
+    Returns:
+        APIGatewayProxyResponseV2 with the response
+    """
+    try:
+        # Get claims and roles
+        claims_and_roles = request_to_claims(event)
+
+        # Check API authorization
+        if len(claims_and_roles["tokens"]) > 0:
+            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            if not casbin_enforcer.enforceAPI(event):
+                return authorization_error()
+
+        # Get path parameters
+        path_params = event.get('pathParameters', {})
+        if 'databaseId' not in path_params:
+            return validation_error(body={'message': "No database ID in API Call"})
+
+        if 'assetId' not in path_params:
+            return validation_error(body={'message': "No asset ID in API Call"})
+
+        # Validate path parameters
+        (valid, message) = validate({
+            'databaseId': {
+                'value': path_params['databaseId'],
+                'validator': 'ID'
+            },
+            'assetId': {
+                'value': path_params['assetId'],
+                'validator': 'ASSET_ID'
+            },
+        })
+
+        if not valid:
+            return validation_error(body={'message': message})
+
+        # Parse request body with enhanced error handling
+        body = event.get('body')
+        if not body:
+            return validation_error(body={'message': "Request body is required"})
+
+        # Parse JSON body safely
+        if isinstance(body, str):
+            try:
+                body = json.loads(body)
+            except json.JSONDecodeError as e:
+                logger.exception(f"Invalid JSON in request body: {e}")
+                return validation_error(body={'message': "Invalid JSON in request body"})
+        elif isinstance(body, dict):
+            body = body
+        else:
+            logger.error("Request body is not a string")
+            return validation_error(body={'message': "Request body cannot be parsed"})
+
+        # Parse request model
+        request_model = parse(body, model=BatchFileOperationsRequestModel)
+
+        # Process request
+        response = batch_file_operations(
+            path_params['databaseId'],
+            path_params['assetId'],
+            request_model,
+            claims_and_roles,
+            context.function_name
+        )
+
+        return success(body=response.dict())
+
+    except ValidationError as v:
+        logger.exception(f"Validation error: {v}")
+        return validation_error(body={'message': str(v)})
+    except VAMSGeneralErrorResponse as v:
+        logger.exception(f"VAMS error: {v}")
+        return general_error(body={'message': str(v)})
+    except Exception as e:
+        logger.exception(f"Internal error: {e}")
+        return internal_error()
+
+def handle_get_batch_file_operations_job(event, context) -> APIGatewayProxyResponseV2:
+    """Handle GET /batchFileOperations/{jobId} requests
+
+    Args:
+        event: The API Gateway event
+        context: The Lambda context
+
+    Returns:
+        APIGatewayProxyResponseV2 with the response
+    """
+    try:
+        # Get claims and roles
+        claims_and_roles = request_to_claims(event)
+
+        # Check API authorization
+        if len(claims_and_roles["tokens"]) > 0:
+            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            if not casbin_enforcer.enforceAPI(event):
+                return authorization_error()
+
+        # Get path parameters
+        path_params = event.get('pathParameters', {})
+        if 'databaseId' not in path_params:
+            return validation_error(body={'message': "No database ID in API Call"})
+
+        if 'assetId' not in path_params:
+            return validation_error(body={'message': "No asset ID in API Call"})
+
+        if 'jobId' not in path_params:
+            return validation_error(body={'message': "No job ID in API Call"})
+
+        # Validate path parameters
+        (valid, message) = validate({
+            'databaseId': {
+                'value': path_params['databaseId'],
+                'validator': 'ID'
+            },
+            'assetId': {
+                'value': path_params['assetId'],
+                'validator': 'ASSET_ID'
+            },
+            'jobId': {
+                'value': path_params['jobId'],
+                'validator': 'UUID'
+            },
+        })
+
+        if not valid:
+            return validation_error(body={'message': message})
+
+        # Process request
+        response = get_batch_file_operations_job(
+            path_params['databaseId'],
+            path_params['assetId'],
+            path_params['jobId'],
+            claims_and_roles
+        )
+
+        return success(body=response.dict())
+
+    except ValidationError as v:
+        logger.exception(f"Validation error: {v}")
+        return validation_error(body={'message': str(v)})
+    except VAMSGeneralErrorResponse as v:
+        logger.exception(f"VAMS error: {v}")
+        return general_error(body={'message': str(v)})
+    except Exception as e:
+        logger.exception(f"Internal error: {e}")
+        return internal_error()
+
 def handle_list_files(event, context) -> APIGatewayProxyResponseV2:
     """Handle GET /listFiles requests
     
@@ -3543,6 +4304,8 @@ def handle_list_files(event, context) -> APIGatewayProxyResponseV2:
 # Lambda Handler
 #######################
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset file operations
     
@@ -3554,6 +4317,11 @@ def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
         APIGatewayProxyResponseV2 with the response
     """
     try:
+        # Background batch file operations jobs invoked by this function
+        if 'batchFileOperationsJob' in event:
+            run_batch_file_operations_job(event['batchFileOperationsJob'], context)
+            return success(body={'message': "Batch file operations job finished"})
+
         # Get API path and method
         path = event['requestContext']['http']['path']
         method = event['requestContext']['http']['method']
@@ -3581,6 +4349,10 @@ def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
             return handle_delete_auxiliary_preview_asset_files(event, context)
         elif method == 'POST' and '/revertFileVersion/' in path:
             return handle_revert_file_version(event, context)
+        elif method == 'POST' and path.endswith('/batchFileOperations'):
+            return handle_batch_file_operations(event, context)
+        elif method == 'GET' and '/batchFileOperations/' in path:
+            return handle_get_batch_file_operations_job(event, context)
         elif method == 'PUT' and path.endswith('/setPrimaryFile'):
             return handle_set_primary_file(event, context)
         else:
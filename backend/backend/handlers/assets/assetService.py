@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import uuid
 import time
@@ -12,16 +12,18 @@ from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 from botocore.config import Config
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from handlers.assets.assetCount import update_asset_count
-from handlers.assets.assetFiles import delete_s3_prefix_all_versions
+from handlers.assets.assetFiles import purge_s3_prefix
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset, request_bucket, forget_asset
 from common.dynamodb import validate_pagination_info
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.assetsV3 import (
     GetAssetRequestModel, GetAssetsRequestModel, UpdateAssetRequestModel,
     ArchiveAssetRequestModel, DeleteAssetRequestModel, AssetResponseModel,
@@ -40,11 +42,11 @@ retry_config = Config(
     }
 )
 
-dynamodb = boto3.resource('dynamodb', config=retry_config)
-dynamodb_client = boto3.client('dynamodb', config=retry_config)
-lambda_client = boto3.client('lambda', config=retry_config)
-sns_client = boto3.client('sns', config=retry_config)
-s3 = boto3.client('s3', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
+dynamodb_client = lazy_client('dynamodb', config=retry_config)
+lambda_client = lazy_client('lambda', config=retry_config)
+sns_client = lazy_client('sns', config=retry_config)
+s3 = lazy_client('s3', config=retry_config)
 logger = safeLogger(service_name="AssetService")
 
 # Global variables for claims and roles
@@ -69,6 +71,11 @@ except Exception as e:
     logger.exception("Failed loading environment variables")
     raise e
 
+# Time the delete asset API spends purging S3 before handing the rest to a background job
+ASSET_DELETE_SYNC_PURGE_SECONDS = 20
+# Time left in a background purge invocation when it checkpoints and continues in a new invocation
+ASSET_PURGE_JOB_MARGIN_SECONDS = 60
+
 # Initialize DynamoDB tables
 buckets_table = dynamodb.Table(s3_asset_buckets_table)
 asset_table = dynamodb.Table(asset_database)
@@ -89,12 +96,15 @@ def get_default_bucket_details(bucketId):
     """Get default S3 bucket details from database default bucket DynamoDB"""
     try:
 
-        bucket_response = buckets_table.query(
-            KeyConditionExpression=Key('bucketId').eq(bucketId),
-            Limit=1
-        )
-        # Use the first item from the query results
-        bucket = bucket_response.get("Items", [{}])[0] if bucket_response.get("Items") else {}
+        def load_bucket():
+            bucket_response = buckets_table.query(
+                KeyConditionExpression=Key('bucketId').eq(bucketId),
+                Limit=1
+            )
+            # Use the first item from the query results
+            return bucket_response.get("Items", [None])[0] if bucket_response.get("Items") else None
+
+        bucket = request_bucket(bucketId, load_bucket) or {}
         bucket_id = bucket.get('bucketId')
         bucket_name = bucket.get('bucketName')
         base_assets_prefix = bucket.get('baseAssetsPrefix')
@@ -257,51 +267,6 @@ def mark_file_as_archived(key, bucket):
         Key=key
     )
 
-def delete_assetAuxiliary_files(assetLocation):
-    """Delete auxiliary files for an asset
-    
-    Args:
-        assetLocation: The asset location object with Key (dict or AssetLocationModel)
-    """
-    # Convert to AssetLocationModel if it's a dictionary
-    if isinstance(assetLocation, dict):
-        try:
-            location_model = AssetLocationModel(**assetLocation)
-        except ValidationError as e:
-            logger.warning(f"Invalid asset location format: {e}")
-            return
-    elif isinstance(assetLocation, AssetLocationModel):
-        location_model = assetLocation
-    else:
-        logger.warning("Invalid asset location type")
-        return
-
-    key = location_model.Key
-    if not key:
-        return
-
-    # Add the folder delimiter to the end of the key
-    key = key + '/'
-
-    logger.info(f"Deleting Temporary Auxiliary Assets Files Under Folder: {s3_assetAuxiliary_bucket}:{key}")
-
-    try:
-        # Get all assets in assetAuxiliary bucket (unversioned, temporary files for the auxiliary assets) for deletion
-        # Use assetLocation key as root folder key for assetAuxiliaryFiles
-        assetAuxiliaryBucketFilesDeleted = []
-        paginator = s3.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=s3_assetAuxiliary_bucket, Prefix=key):
-            if 'Contents' in page:
-                for item in page['Contents']:
-                    assetAuxiliaryBucketFilesDeleted.append(item['Key'])
-                    logger.info(f"Deleting auxiliary asset file: {item['Key']}")
-                    s3.delete_object(Bucket=s3_assetAuxiliary_bucket, Key=item['Key'])
-
-    except Exception as e:
-        logger.exception(f"Error deleting auxiliary files: {e}")
-
-    return
-
 def archive_multi_assetFiles(location, bucket):
     """Archive all files in a multi-file asset
     
@@ -328,24 +293,13 @@ def archive_multi_assetFiles(location, bucket):
     # Get bucket from location or use default
     logger.info(f'Archiving folder with multiple files from bucket: {bucket}')
 
-    paginator = s3.get_paginator('list_objects_v2')
-    files = []
-    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-        if 'Contents' in page:
-            for obj in page.get('Contents', []):
-                files.append(obj['Key'])
-
-    for key in files:
-        try:
-            response = mark_file_as_archived(key, bucket)
-            logger.info(f"S3 archive response for {key}: {response}")
-
-        except s3.exceptions.InvalidObjectState as ios:
-            logger.exception(f"S3 object already archived: {key}")
-            logger.exception(ios)
+    try:
+        # Archive all current files under the asset prefix with batched delete markers
+        archived_keys, _ = purge_s3_prefix(bucket, prefix, all_versions=False)
+        logger.info(f"Archived {len(archived_keys)} files under {bucket}:{prefix}")
 
-        except Exception as e:
-            logger.exception(f"Error archiving file {key}: {e}")
+    except Exception as e:
+        logger.exception(f"Error archiving files under {prefix}: {e}")
 
     return
 
@@ -433,6 +387,156 @@ def delete_s3_objects(prefix, bucket):
     
     return deleted_keys
 
+def query_all_items(table, **query_args):
+    """Query a DynamoDB table, following LastEvaluatedKey through every page
+
+    Args:
+        table: The DynamoDB table
+        query_args: Arguments for table.query
+
+    Returns:
+        List of all items
+    """
+    items = []
+    while True:
+        response = table.query(**query_args)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def batch_delete_items(table, keys):
+    """Delete items from a DynamoDB table with batch writes (unprocessed items are retried by the writer)
+
+    Args:
+        table: The DynamoDB table
+        keys: List of item key dictionaries
+
+    Returns:
+        Number of deleted items
+    """
+    if not keys:
+        return 0
+    with table.batch_writer(overwrite_by_pkeys=list(keys[0].keys())) as batch:
+        for key in keys:
+            batch.delete_item(Key=key)
+    return len(keys)
+
+def get_asset_purge_tasks(asset, bucket_name):
+    """Get the S3 prefixes to remove when permanently deleting an asset
+
+    Args:
+        asset: The asset dictionary
+        bucket_name: The asset bucket name
+
+    Returns:
+        List of {'bucket', 'prefix', 'allVersions'} purge tasks
+    """
+    tasks = []
+    asset_prefix = asset.get("assetLocation", {}).get("Key")
+    if asset_prefix:
+        tasks.append({'bucket': bucket_name, 'prefix': asset_prefix, 'allVersions': True})
+        # Auxiliary files live under the asset location folder in the (unversioned) auxiliary bucket
+        auxiliary_prefix = asset_prefix if asset_prefix.endswith('/') else asset_prefix + '/'
+        tasks.append({'bucket': s3_assetAuxiliary_bucket, 'prefix': auxiliary_prefix, 'allVersions': False})
+
+    preview_prefix = asset.get("previewLocation", {}).get("Key")
+    if preview_prefix:
+        tasks.append({'bucket': bucket_name, 'prefix': preview_prefix, 'allVersions': True})
+
+    return tasks
+
+def run_asset_purge(tasks, checkpoint=None, deadline=None):
+    """Run S3 purge tasks in order until they are done or the deadline passes
+
+    Args:
+        tasks: List of purge tasks from get_asset_purge_tasks
+        checkpoint: Listing checkpoint of the first task from a previous run
+        deadline: Optional time.time() value to stop at
+
+    Returns:
+        None when all tasks are done, otherwise {'tasks', 'checkpoint'} to resume from
+    """
+    while tasks:
+        task = tasks[0]
+        logger.info(f"Purging S3 objects with prefix {task['prefix']} from bucket {task['bucket']}")
+        _, next_checkpoint = purge_s3_prefix(
+            task['bucket'],
+            task['prefix'],
+            all_versions=task['allVersions'],
+            checkpoint=checkpoint,
+            deadline=deadline,
+            collect_keys=False
+        )
+        if next_checkpoint is not None:
+            return {'tasks': tasks, 'checkpoint': next_checkpoint}
+        tasks = tasks[1:]
+        checkpoint = None
+    return None
+
+def start_asset_purge_job(databaseId, assetId, purge_state, function_name):
+    """Continue an asset S3 purge asynchronously on this function
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        purge_state: Remaining tasks and checkpoint from run_asset_purge
+        function_name: The name of this Lambda function
+    """
+    logger.info(f"Continuing S3 purge of asset {assetId} in the background from {purge_state['checkpoint']}")
+    lambda_client.invoke(
+        FunctionName=function_name,
+        InvocationType='Event',
+        Payload=json.dumps({'assetPurgeJob': {'databaseId': databaseId, 'assetId': assetId, **purge_state}})
+    )
+
+def run_asset_purge_job(job, context):
+    """Run a background asset S3 purge, checkpointing into a new invocation before the timeout
+
+    Args:
+        job: The job payload with databaseId, assetId, tasks and checkpoint
+        context: The Lambda context
+    """
+    deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - ASSET_PURGE_JOB_MARGIN_SECONDS
+    remaining = run_asset_purge(job['tasks'], job.get('checkpoint'), deadline)
+    if remaining:
+        start_asset_purge_job(job['databaseId'], job['assetId'], remaining, context.function_name)
+    else:
+        logger.info(f"Finished S3 purge of asset {job['assetId']}")
+
+def purge_asset_files(databaseId, assetId, asset, bucket_name, context):
+    """Purge an asset's S3 objects, handing large assets to a background job after a short synchronous run
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        asset: The asset dictionary
+        bucket_name: The asset bucket name
+        context: The Lambda context of the API request
+
+    Returns:
+        "complete" when all objects are gone, "in progress" when a background job continues the purge,
+        "incomplete" when the job could not start and the rest of the purge did not fit in this invocation
+    """
+    purge_state = run_asset_purge(
+        get_asset_purge_tasks(asset, bucket_name),
+        deadline=time.time() + ASSET_DELETE_SYNC_PURGE_SECONDS
+    )
+    if not purge_state:
+        return "complete"
+
+    try:
+        start_asset_purge_job(databaseId, assetId, purge_state, context.function_name)
+        return "in progress"
+    except Exception as e:
+        # Keep going inline until the invocation is nearly out of time; the asset records are kept when
+        # files remain so that the delete can be retried
+        logger.exception(f"Error starting the background S3 purge of asset {assetId}, purging inline: {e}")
+        deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - ASSET_PURGE_JOB_MARGIN_SECONDS
+        if run_asset_purge(purge_state['tasks'], purge_state['checkpoint'], deadline):
+            return "incomplete"
+        return "complete"
+
 #######################
 # Business Logic Functions
 #######################
@@ -452,14 +556,14 @@ def get_asset_details(databaseId, assetId, showArchived=False):
         # If showArchived is False, we only look in the active assets table
         # If showArchived is True, we first look in the active table, then try the archived suffix
         db_id = databaseId
-        response = asset_table.get_item(Key={'databaseId': db_id, 'assetId': assetId})
-        item = response.get('Item')
+        item = request_asset(db_id, assetId,
+                             lambda: asset_table.get_item(Key={'databaseId': db_id, 'assetId': assetId}).get('Item'))
         
         # If not found and showArchived is True, try with the archived suffix
         if not item and showArchived:
             archived_db_id = f"{databaseId}#deleted"
-            response = asset_table.get_item(Key={'databaseId': archived_db_id, 'assetId': assetId})
-            item = response.get('Item')
+            item = request_asset(archived_db_id, assetId, lambda: asset_table.get_item(
+                Key={'databaseId': archived_db_id, 'assetId': assetId}).get('Item'))
             
             # If found in archived, add status field if not present
             if item and 'status' not in item:
@@ -646,6 +750,7 @@ def update_asset(databaseId, assetId, update_data, claims_and_roles):
     # Save the updated asset
     try:
         asset_table.put_item(Item=asset)
+        forget_asset(databaseId, assetId)
         
         # Create response
         timestamp = datetime.utcnow().isoformat()
@@ -728,6 +833,8 @@ def archive_asset(databaseId, assetId, request_model, claims_and_roles):
         
         # Delete from original location
         asset_table.delete_item(Key={'databaseId': databaseId, 'assetId': assetId})
+        forget_asset(databaseId, assetId)
+        forget_asset(archived_db_id, assetId)
         
         # Update asset count
         update_asset_count(db_database, asset_database, {}, databaseId)
@@ -747,7 +854,7 @@ def archive_asset(databaseId, assetId, request_model, claims_and_roles):
         logger.exception(f"Error archiving asset: {e}")
         raise VAMSGeneralErrorResponse(f"Error archiving asset.")
 
-def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles):
+def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles, context):
     """Permanently delete an asset from all systems
     
     Args:
@@ -755,6 +862,7 @@ def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles)
         assetId: The asset ID
         request_model: DeleteAssetRequestModel with delete options
         claims_and_roles: User claims and roles for authorization
+        context: The Lambda context of the API request
         
     Returns:
         AssetOperationResponseModel with operation result
@@ -818,29 +926,12 @@ def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles)
         #send email for asset file change
         send_subscription_email(databaseId, assetId)
         
-        # 1. Delete all S3 objects (assets files and preview)
-        if "assetLocation" in asset and "Key" in asset["assetLocation"]:
-            prefix = asset["assetLocation"]["Key"]
-            if prefix:
-                # Get bucket from assetLocation or use default
-                logger.info(f"Deleting S3 asset objects and all versions with prefix {prefix} from bucket {bucket_name}")
-                
-                # Delete all objects and all versions with this prefix
-                deleted_keys = delete_s3_prefix_all_versions(bucket_name, prefix)
-                deleted_items["s3_objects"].extend(deleted_keys)
-                
-                # Also delete any auxiliary files
-                delete_assetAuxiliary_files(asset["assetLocation"])
-
-        if "previewLocation" in asset and "Key" in asset["previewLocation"]:
-            prefix = asset["previewLocation"]["Key"]
-            if prefix:
-                # Get bucket from assetLocation or use default
-                logger.info(f"Deleting S3 preview objects and all versions with prefix {prefix} from bucket {bucket_name}")
-                
-                # Delete all objects and all versions with this prefix
-                deleted_keys = delete_s3_prefix_all_versions(bucket_name, prefix)
-                deleted_items["s3_objects"].extend(deleted_keys)
+        # 1. Delete all S3 objects (assets files, auxiliary files and preview)
+        # Large assets continue in a background job from where the API request stopped
+        purge_status = purge_asset_files(databaseId, assetId, asset, bucket_name, context)
+        if purge_status == "incomplete":
+            raise VAMSGeneralErrorResponse("Not all asset files could be removed, retry the delete to continue.")
+        deleted_items["s3_objects"].append(purge_status)
         
         # 2. Delete from asset table (both active and archived locations)
         # First try the original database ID
@@ -851,6 +942,8 @@ def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles)
         # Then try the archived version
         archived_db_id = f"{original_db_id}#deleted"
         asset_table.delete_item(Key={'databaseId': archived_db_id, 'assetId': assetId})
+        forget_asset(original_db_id, assetId)
+        forget_asset(archived_db_id, assetId)
         deleted_items["dynamodb_tables"].append(f"{asset_database} (databaseId={archived_db_id})")
         
         # 3. Delete from metadata table if available
@@ -860,71 +953,54 @@ def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles)
         
         # 4. Delete from asset links table if available
         if asset_links_table:
-            # Query and delete links where this asset is the source
+            link_keys = []
+
+            # Links where this asset is the source
             try:
-                response = asset_links_table.query(
-                    KeyConditionExpression=Key('assetIdFrom').eq(assetId)
-                )
-                
-                for item in response.get('Items', []):
+                for item in query_all_items(asset_links_table, KeyConditionExpression=Key('assetIdFrom').eq(assetId)):
                     if 'assetIdTo' in item:
-                        asset_links_table.delete_item(Key={
-                            'assetIdFrom': assetId,
-                            'assetIdTo': item['assetIdTo']
-                        })
-                        deleted_items["dynamodb_tables"].append(f"{asset_links_table_name} (assetIdFrom={assetId}, assetIdTo={item['assetIdTo']})")
+                        link_keys.append({'assetIdFrom': assetId, 'assetIdTo': item['assetIdTo']})
             except Exception as e:
-                logger.warning(f"Error deleting asset links where asset is source: {e}")
+                logger.warning(f"Error querying asset links where asset is source: {e}")
             
-            # Query and delete links where this asset is the target
-            # This requires using a GSI, so we need to query first
+            # Links where this asset is the target (requires the GSI)
             try:
-                response = asset_links_table.query(
-                    IndexName='AssetIdToGSI',
-                    KeyConditionExpression=Key('assetIdTo').eq(assetId)
-                )
-                
-                for item in response.get('Items', []):
+                for item in query_all_items(asset_links_table, IndexName='AssetIdToGSI', KeyConditionExpression=Key('assetIdTo').eq(assetId)):
                     if 'assetIdFrom' in item:
-                        asset_links_table.delete_item(Key={
-                            'assetIdFrom': item['assetIdFrom'],
-                            'assetIdTo': assetId
-                        })
-                        deleted_items["dynamodb_tables"].append(f"{asset_links_table_name} (assetIdFrom={item['assetIdFrom']}, assetIdTo={assetId})")
+                        link_keys.append({'assetIdFrom': item['assetIdFrom'], 'assetIdTo': assetId})
+            except Exception as e:
+                logger.warning(f"Error querying asset links where asset is target: {e}")
+
+            try:
+                deleted_count = batch_delete_items(asset_links_table, link_keys)
+                deleted_items["dynamodb_tables"].append(f"{asset_links_table_name} ({deleted_count} items)")
             except Exception as e:
-                logger.warning(f"Error deleting asset links where asset is target: {e}")
+                logger.warning(f"Error deleting asset links: {e}")
         
         # 5. Delete from asset uploads table if available
         if asset_upload_table:
             try:
                 # Query using the GSI to find uploads for this asset
-                response = asset_upload_table.query(
-                    IndexName='AssetIdGSI',
-                    KeyConditionExpression=Key('assetId').eq(assetId)
-                )
-                
-                for item in response.get('Items', []):
-                    if 'uploadId' in item:
-                        asset_upload_table.delete_item(Key={'uploadId': item['uploadId'], 'assetId': assetId})
-                        deleted_items["dynamodb_tables"].append(f"{asset_upload_table_name} (uploadId={item['uploadId']}, assetId={assetId})")
+                upload_keys = [
+                    {'uploadId': item['uploadId'], 'assetId': assetId}
+                    for item in query_all_items(asset_upload_table, IndexName='AssetIdGSI', KeyConditionExpression=Key('assetId').eq(assetId))
+                    if 'uploadId' in item
+                ]
+                deleted_count = batch_delete_items(asset_upload_table, upload_keys)
+                deleted_items["dynamodb_tables"].append(f"{asset_upload_table_name} ({deleted_count} items)")
             except Exception as e:
                 logger.warning(f"Error deleting asset uploads: {e}")
         
         # 6. Delete from comments table if available
         if comment_table:
             try:
-                # Query to find all comments for this asset
-                response = comment_table.query(
-                    KeyConditionExpression=Key('assetId').eq(assetId)
-                )
-                
-                for item in response.get('Items', []):
-                    if 'assetVersionId:commentId' in item:
-                        comment_table.delete_item(Key={
-                            'assetId': assetId,
-                            'assetVersionId:commentId': item['assetVersionId:commentId']
-                        })
-                        deleted_items["dynamodb_tables"].append(f"{comment_table_name} (assetId={assetId}, assetVersionId:commentId={item['assetVersionId:commentId']})")
+                comment_keys = [
+                    {'assetId': assetId, 'assetVersionId:commentId': item['assetVersionId:commentId']}
+                    for item in query_all_items(comment_table, KeyConditionExpression=Key('assetId').eq(assetId))
+                    if 'assetVersionId:commentId' in item
+                ]
+                deleted_count = batch_delete_items(comment_table, comment_keys)
+                deleted_items["dynamodb_tables"].append(f"{comment_table_name} ({deleted_count} items)")
             except Exception as e:
                 logger.warning(f"Error deleting asset comments: {e}")
         
@@ -932,38 +1008,27 @@ def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles)
         if versions_table and asset_versions_files_table:
             try:
                 # First get all version IDs for this asset
-                response = versions_table.query(
-                    KeyConditionExpression=Key('assetId').eq(assetId)
-                )
+                version_items = query_all_items(versions_table, KeyConditionExpression=Key('assetId').eq(assetId))
                 
                 # For each version, delete the corresponding file versions
-                for version_item in response.get('Items', []):
+                file_version_keys = []
+                for version_item in version_items:
                     if 'assetVersionId' in version_item:
-                        asset_version_id = version_item['assetVersionId']
-                        partition_key = f"{assetId}:{asset_version_id}"
-                        
-                        # Query to find all file versions for this asset version
-                        file_response = asset_versions_files_table.query(
-                            KeyConditionExpression=Key('assetId:assetVersionId').eq(partition_key)
-                        )
-                        
-                        # Delete each file version
-                        for file_item in file_response.get('Items', []):
+                        partition_key = f"{assetId}:{version_item['assetVersionId']}"
+                        for file_item in query_all_items(asset_versions_files_table, KeyConditionExpression=Key('assetId:assetVersionId').eq(partition_key)):
                             if 'fileKey' in file_item:
-                                asset_versions_files_table.delete_item(Key={
-                                    'assetId:assetVersionId': partition_key,
-                                    'fileKey': file_item['fileKey']
-                                })
-                                deleted_items["dynamodb_tables"].append(f"{asset_versions_files_table_name} (assetId:assetVersionId={partition_key}, fileKey={file_item['fileKey']})")
+                                file_version_keys.append({'assetId:assetVersionId': partition_key, 'fileKey': file_item['fileKey']})
+                deleted_count = batch_delete_items(asset_versions_files_table, file_version_keys)
+                deleted_items["dynamodb_tables"].append(f"{asset_versions_files_table_name} ({deleted_count} items)")
                 
                 # Delete from versions table after getting all version IDs
-                for version_item in response.get('Items', []):
-                    if 'assetVersionId' in version_item:
-                        versions_table.delete_item(Key={
-                            'assetId': assetId,
-                            'assetVersionId': version_item['assetVersionId']
-                        })
-                        deleted_items["dynamodb_tables"].append(f"{asset_versions_table_name} (assetId={assetId}, assetVersionId={version_item['assetVersionId']})")
+                version_keys = [
+                    {'assetId': assetId, 'assetVersionId': version_item['assetVersionId']}
+                    for version_item in version_items
+                    if 'assetVersionId' in version_item
+                ]
+                deleted_count = batch_delete_items(versions_table, version_keys)
+                deleted_items["dynamodb_tables"].append(f"{asset_versions_table_name} ({deleted_count} items)")
             except Exception as e:
                 logger.warning(f"Error deleting asset file versions: {e}")
         
@@ -974,11 +1039,14 @@ def delete_asset_permanent(databaseId, assetId, request_model, claims_and_roles)
         now = datetime.utcnow().isoformat()
         return AssetOperationResponseModel(
             success=True,
-            message=f"Asset {assetId} permanently deleted from all systems",
+            message=f"Asset {assetId} permanently deleted from all systems" +
+                    (". Remaining asset files are being removed in the background" if purge_status == "in progress" else ""),
             assetId=assetId,
             operation="delete",
             timestamp=now
         )
+    except VAMSGeneralErrorResponse:
+        raise
     except Exception as e:
         logger.exception(f"Error permanently deleting asset: {e}")
         raise VAMSGeneralErrorResponse(f"Error permanently deleting asset.")
@@ -1297,11 +1365,12 @@ def handle_put_request(event):
         logger.exception(f"Error handling PUT request: {e}")
         return internal_error()
 
-def handle_delete_request(event):
+def handle_delete_request(event, context):
     """Handle DELETE requests for assets
     
     Args:
         event: API Gateway event
+        context: The Lambda context
         
     Returns:
         APIGatewayProxyResponseV2 response
@@ -1369,7 +1438,8 @@ def handle_delete_request(event):
                 path_parameters['databaseId'],
                 path_parameters['assetId'],
                 request_model,
-                claims_and_roles
+                claims_and_roles,
+                context
             )
             return success(body=result.dict())
             
@@ -1394,9 +1464,17 @@ def handle_delete_request(event):
         logger.exception(f"Error handling DELETE request: {e}")
         return internal_error()
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset service APIs"""
     global claims_and_roles
+
+    # Background S3 purge of a permanently deleted asset, invoked by this function
+    if 'assetPurgeJob' in event:
+        run_asset_purge_job(event['assetPurgeJob'], context)
+        return success(body={'message': "Asset purge job finished"})
+
     claims_and_roles = request_to_claims(event)
     
     try:
@@ -1420,7 +1498,7 @@ def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
         elif method == 'PUT':
             return handle_put_request(event)
         elif method == 'DELETE':
-            return handle_delete_request(event)
+            return handle_delete_request(event, context)
         else:
             return validation_error(body={'message': "Method not allowed"})
             
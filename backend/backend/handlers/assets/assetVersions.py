@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import uuid
 from datetime import datetime
@@ -11,13 +11,15 @@ from boto3.dynamodb.conditions import Key
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset, request_bucket, request_enforcer, forget_asset
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.assetsV3 import (
     AssetFileVersionItemModel, CreateAssetVersionRequestModel, RevertAssetVersionRequestModel,
     GetAssetVersionRequestModel, GetAssetVersionsRequestModel, AssetVersionFileModel,
@@ -34,11 +36,11 @@ retry_config = Config(
 
 # Configure AWS clients
 region = os.environ.get('AWS_REGION', 'us-east-1')
-dynamodb = boto3.resource('dynamodb', config=retry_config)
-dynamodb_client = boto3.client('dynamodb', config=retry_config)
-s3_client = boto3.client('s3', config=retry_config)
-s3_resource = boto3.resource('s3', config=retry_config)
-lambda_client = boto3.client('lambda', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
+dynamodb_client = lazy_client('dynamodb', config=retry_config)
+s3_client = lazy_client('s3', config=retry_config)
+s3_resource = lazy_resource('s3', config=retry_config)
+lambda_client = lazy_client('lambda', config=retry_config)
 logger = safeLogger(service_name="AssetVersions")
 
 # Global variables for claims and roles
@@ -70,12 +72,15 @@ def get_default_bucket_details(bucketId):
     """Get default S3 bucket details from database default bucket DynamoDB"""
     try:
 
-        bucket_response = buckets_table.query(
-            KeyConditionExpression=Key('bucketId').eq(bucketId),
-            Limit=1
-        )
-        # Use the first item from the query results
-        bucket = bucket_response.get("Items", [{}])[0] if bucket_response.get("Items") else {}
+        def load_bucket():
+            bucket_response = buckets_table.query(
+                KeyConditionExpression=Key('bucketId').eq(bucketId),
+                Limit=1
+            )
+            # Use the first item from the query results
+            return bucket_response.get("Items", [None])[0] if bucket_response.get("Items") else None
+
+        bucket = request_bucket(bucketId, load_bucket) or {}
         bucket_id = bucket.get('bucketId')
         bucket_name = bucket.get('bucketName')
         base_assets_prefix = bucket.get('baseAssetsPrefix')
@@ -133,8 +138,8 @@ def get_asset_with_permissions(databaseId: str, assetId: str, operation: str, cl
     """
     try:
         # Get the asset from DynamoDB
-        response = asset_table.get_item(Key={'databaseId': databaseId, 'assetId': assetId})
-        asset = response.get('Item', {})
+        asset = request_asset(databaseId, assetId,
+                              lambda: asset_table.get_item(Key={'databaseId': databaseId, 'assetId': assetId}).get('Item'))
         
         if not asset:
             raise VAMSGeneralErrorResponse("Asset not found in database")
@@ -143,7 +148,7 @@ def get_asset_with_permissions(databaseId: str, assetId: str, operation: str, cl
         asset["object__type"] = "asset"
         
         if len(claims_and_roles["tokens"]) > 0:
-            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer)
             if not casbin_enforcer.enforce(asset, operation):
                 raise VAMSGeneralErrorResponse("Not authorized to perform this operation on the asset")
         
@@ -659,6 +664,7 @@ def update_asset_current_version_reference(asset: Dict, new_assetVersionId: str)
         
         # Save updated asset
         asset_table.put_item(Item=asset)
+        forget_asset(asset['databaseId'], asset['assetId'])
         return True
         
     except Exception as e:
@@ -1434,6 +1440,8 @@ def handle_get_version(event, context) -> APIGatewayProxyResponseV2:
 # Lambda Handler
 #######################
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset version operations
     
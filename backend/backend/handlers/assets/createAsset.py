@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_paginator, lazy_resource
 import json
 import uuid
 from datetime import datetime
@@ -10,14 +10,16 @@ from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
+from common.tagCatalog import get_tag_catalog
 from handlers.assets.assetCount import update_asset_count
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.assetsV3 import CreateAssetRequestModel, CreateAssetResponseModel
 
 # Configure AWS clients
@@ -29,10 +31,10 @@ retry_config = Config(
 )
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', config=retry_config)
-dynamodb_client = boto3.client('dynamodb', config=retry_config)
-sns_client = boto3.client('sns', config=retry_config)
-s3_client = boto3.client('s3', config=retry_config)
+dynamodb = lazy_resource('dynamodb', config=retry_config)
+dynamodb_client = lazy_client('dynamodb', config=retry_config)
+sns_client = lazy_client('sns', config=retry_config)
+s3_client = lazy_client('s3', config=retry_config)
 logger = safeLogger(service_name="CreateAsset")
 
 # Load environment variables
@@ -52,7 +54,7 @@ asset_table = dynamodb.Table(asset_storage_table_name)
 database_table = dynamodb.Table(db_database)
 buckets_table = dynamodb.Table(s3_asset_buckets_table)
 deserializer = TypeDeserializer()
-paginator = dynamodb_client.get_paginator('scan')
+paginator = lazy_paginator(dynamodb_client, 'scan')
 
 #######################
 # Utility Functions
@@ -148,143 +150,16 @@ def create_sns_topic_for_asset(database_id, asset_id):
         raise VAMSGeneralErrorResponse(f"Error creating SNS topic.")
 
 
-def get_set_tag_types(tags):
-    """Get unique tag types for a list of tags"""
-    uniqueSetTagTypes = []
-
-    # If no tags provided, return no tag types
-    if tags is None or len(tags) == 0:
-        return uniqueSetTagTypes
-
-    # Loop to get all tag results (to know their tag types)
-    rawTagItems = []
-    page_iteratorTags = paginator.paginate(
-        TableName=tag_table_name,
-        PaginationConfig={
-            'MaxItems': 1000,
-            'PageSize': 1000,
-        }
-    ).build_full_result()
-    if(len(page_iteratorTags["Items"]) > 0):
-        rawTagItems.extend(page_iteratorTags["Items"])
-        while("NextToken" in page_iteratorTags):
-            page_iteratorTags = paginator.paginate(
-                TableName=tag_table_name,
-                PaginationConfig={
-                    'MaxItems': 1000,
-                    'PageSize': 1000,
-                    'StartingToken': page_iteratorTags["NextToken"]
-                }
-            ).build_full_result()
-            if(len(page_iteratorTags["Items"]) > 0):
-                rawTagItems.extend(page_iteratorTags["Items"])
-
-    # Loop through every tag in the database
-    for tag in rawTagItems:
-        deserialized_document = {k: deserializer.deserialize(v) for k, v in tag.items()}
-
-        # If the tags provided matches the tag looked up, add to uniqueSetTagTypes if it's not already part of the array
-        if deserialized_document["tagName"] in tags:
-            if deserialized_document["tagTypeName"] not in uniqueSetTagTypes:
-                uniqueSetTagTypes.append(deserialized_document["tagTypeName"])
-
-    return uniqueSetTagTypes
-
-def get_required_tag_types():
-    """Get tag types that are required for assets"""
-    # Loop to get all tag results for tag type
-    rawTagTypeItems = []
-    page_iteratorTags = paginator.paginate(
-        TableName=tag_type_table_name,
-        PaginationConfig={
-            'MaxItems': 1000,
-            'PageSize': 1000,
-        }
-    ).build_full_result()
-    if(len(page_iteratorTags["Items"]) > 0):
-        rawTagTypeItems.extend(page_iteratorTags["Items"])
-        while("NextToken" in page_iteratorTags):
-            page_iteratorTags = paginator.paginate(
-                TableName=tag_type_table_name,
-                PaginationConfig={
-                    'MaxItems': 1000,
-                    'PageSize': 1000,
-                    'StartingToken': page_iteratorTags["NextToken"]
-                }
-            ).build_full_result()
-            if(len(page_iteratorTags["Items"]) > 0):
-                rawTagTypeItems.extend(page_iteratorTags["Items"])
-
-    # Get tags associated and then exclude tag types from required if no tags associated
-    # Loop to get all tag results for tag type
-    rawTagItems = []
-    page_iteratorTags = paginator.paginate(
-        TableName=tag_table_name,
-        PaginationConfig={
-            'MaxItems': 1000,
-            'PageSize': 1000,
-        }
-    ).build_full_result()
-    if(len(page_iteratorTags["Items"]) > 0):
-        rawTagItems.extend(page_iteratorTags["Items"])
-        while("NextToken" in page_iteratorTags):
-            page_iteratorTags = paginator.paginate(
-                TableName=tag_table_name,
-                PaginationConfig={
-                    'MaxItems': 1000,
-                    'PageSize': 1000,
-                    'StartingToken': page_iteratorTags["NextToken"]
-                }
-            ).build_full_result()
-            if(len(page_iteratorTags["Items"]) > 0):
-                rawTagItems.extend(page_iteratorTags["Items"])
-
-    tags = []
-    for tag in rawTagItems:
-        deserialized_document = {k: deserializer.deserialize(v) for k, v in tag.items()}
-        tags.append(deserialized_document)
-
-    formatted_tag_results = {}
-    for tagResult in tags:
-        tagName = tagResult["tagName"]
-        tagTypeName = tagResult["tagTypeName"]
-
-        if tagTypeName not in formatted_tag_results:
-            formatted_tag_results[tagTypeName] = [tagName]
-        else:
-            formatted_tag_results[tagTypeName].append(tagName)
-
-    # Final tag required loops
-    tagTypesRequired = []
-    for tagType in rawTagTypeItems:
-        deserialized_document = {k: deserializer.deserialize(v) for k, v in tagType.items()}
-
-        # if tagtype has "required" set to true and there are tags in formatted_tag_results for the type, add to list
-        if deserialized_document.get("required", "False") == "True":
-            if deserialized_document["tagTypeName"] in formatted_tag_results:
-                tagTypesRequired.append(deserialized_document["tagTypeName"])
-
-    return tagTypesRequired
-
 def verify_all_required_tags_satisfied(assetTags):
     """Verify that all required tag types are satisfied by the asset tags"""
-    assetTagTypes = get_set_tag_types(assetTags)
-    requiredTagTypes = get_required_tag_types()
-    missingTagTypesForError = []
-
-    if requiredTagTypes is None or len(requiredTagTypes) == 0:
-        return True
-    else:
-        for requiredTagType in requiredTagTypes:
-            if requiredTagType not in assetTagTypes:
-                missingTagTypesForError.append(requiredTagType)
+    tag_catalog = get_tag_catalog(tag_table_name, tag_type_table_name)
+    missingTagTypesForError = tag_catalog.get_missing_required_tag_types(assetTags)
 
     if len(missingTagTypesForError) == 0:
         return True
 
     # Raise error with list of required tag types missing from assets
-    if len(missingTagTypesForError) > 0:
-        raise ValueError(f"Asset Details are missing tags of required tag types: {missingTagTypesForError}")
+    raise ValueError(f"Asset Details are missing tags of required tag types: {missingTagTypesForError}")
 
 def create_prefix_folder(bucket, prefix):
     """Create a prefix folder in S3 bucket"""
@@ -466,6 +341,7 @@ def create_asset(request_model: CreateAssetRequestModel, claims_and_roles, s3Ext
 # Lambda Handler
 #######################
 
+@trace_invocation
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset creation API"""
     global claims_and_roles
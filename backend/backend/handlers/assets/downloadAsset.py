@@ -2,22 +2,26 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
+import base64
 from boto3.dynamodb.conditions import Key
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
-from common.s3 import validateS3AssetExtensionsAndContentType
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset, request_bucket
+from common.s3 import validateS3AssetExtensionsAndContentType, validateUnallowedFileExtensionAndContentType
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.assetsV3 import (
-    DownloadAssetRequestModel, DownloadAssetResponseModel
+    DownloadAssetRequestModel, DownloadAssetResponseModel,
+    DownloadAssetManifestItemModel, DownloadAssetManifestResponseModel
 )
 
 #Set environment variable for S3 client configuration
@@ -27,8 +31,8 @@ os.environ["AWS_S3_US_EAST_1_REGIONAL_ENDPOINT"] = "regional"
 # Configure AWS clients
 region = os.environ['AWS_REGION']
 s3_config = Config(signature_version='s3v4', s3={'addressing_style': 'path'})
-s3 = boto3.client('s3', region_name=region, config=s3_config)
-dynamodb = boto3.resource('dynamodb')
+s3 = lazy_client('s3', region_name=region, config=s3_config)
+dynamodb = lazy_resource('dynamodb')
 logger = safeLogger(service_name="DownloadAsset")
 
 # Constants
@@ -39,6 +43,7 @@ try:
     s3_asset_buckets_table = os.environ["S3_ASSET_BUCKETS_STORAGE_TABLE_NAME"]
     asset_storage_table_name = os.environ["ASSET_STORAGE_TABLE_NAME"]
     token_timeout = os.environ["PRESIGNED_URL_TIMEOUT_SECONDS"]
+    asset_file_versions_table_name = os.environ["ASSET_FILE_VERSIONS_STORAGE_TABLE_NAME"]
 except Exception as e:
     logger.exception("Failed loading environment variables")
     raise e
@@ -46,6 +51,7 @@ except Exception as e:
 # Initialize DynamoDB tables
 buckets_table = dynamodb.Table(s3_asset_buckets_table)
 asset_table = dynamodb.Table(asset_storage_table_name)
+asset_file_versions_table = dynamodb.Table(asset_file_versions_table_name)
 
 #######################
 # Utility Functions
@@ -55,12 +61,15 @@ def get_default_bucket_details(bucketId):
     """Get default S3 bucket details from database default bucket DynamoDB"""
     try:
 
-        bucket_response = buckets_table.query(
-            KeyConditionExpression=Key('bucketId').eq(bucketId),
-            Limit=1
-        )
-        # Use the first item from the query results
-        bucket = bucket_response.get("Items", [{}])[0] if bucket_response.get("Items") else {}
+        def load_bucket():
+            bucket_response = buckets_table.query(
+                KeyConditionExpression=Key('bucketId').eq(bucketId),
+                Limit=1
+            )
+            # Use the first item from the query results
+            return bucket_response.get("Items", [None])[0] if bucket_response.get("Items") else None
+
+        bucket = request_bucket(bucketId, load_bucket) or {}
         bucket_id = bucket.get('bucketId')
         bucket_name = bucket.get('bucketName')
         base_assets_prefix = bucket.get('baseAssetsPrefix')
@@ -89,16 +98,19 @@ def get_default_bucket_details(bucketId):
 def get_asset_details(databaseId, assetId):
     """Get asset details from DynamoDB"""
     try:
-        response = asset_table.query(
-            KeyConditionExpression=Key('databaseId').eq(databaseId) & Key('assetId').eq(assetId),
-            ScanIndexForward=False
-        )
-        
-        if not response.get('Items'):
-            return None
+        def load_asset():
+            response = asset_table.query(
+                KeyConditionExpression=Key('databaseId').eq(databaseId) & Key('assetId').eq(assetId),
+                ScanIndexForward=False
+            )
             
-        # Return the first (most recent) item
-        return response['Items'][0]
+            if not response.get('Items'):
+                return None
+                
+            # Return the first (most recent) item
+            return response['Items'][0]
+
+        return request_asset(databaseId, assetId, load_asset)
     except Exception as e:
         logger.exception(f"Error getting asset details: {e}")
         raise VAMSGeneralErrorResponse(f"Error retrieving asset.")
@@ -354,10 +366,203 @@ def download_asset_preview(databaseId, assetId, request_model):
         logger.exception(f"Error generating presigned URL: {e}")
         raise VAMSGeneralErrorResponse(f"Error generating download URL.")
 
+def list_manifest_objects(bucket, prefix, max_items, starting_token):
+    """List one page of current objects under a prefix
+    
+    Args:
+        bucket: S3 bucket name
+        prefix: S3 key prefix to list
+        max_items: Maximum number of keys to list
+        starting_token: Continuation token from a previous page
+        
+    Returns:
+        Tuple of (list of manifest object dictionaries, next token)
+    """
+    params = {
+        'Bucket': bucket,
+        'Prefix': prefix,
+        'MaxKeys': max_items
+    }
+    if starting_token:
+        params['ContinuationToken'] = starting_token
+
+    response = s3.list_objects_v2(**params)
+
+    objects = []
+    for obj in response.get('Contents', []):
+        # Skip folder markers (keys ending with '/')
+        if obj['Key'].endswith('/'):
+            continue
+        objects.append({
+            'key': obj['Key'],
+            'size': obj.get('Size'),
+            'etag': obj.get('ETag', '').strip('"'),
+            'versionId': None
+        })
+
+    return objects, response.get('NextContinuationToken')
+
+def list_manifest_version_objects(assetId, assetVersionId, asset_base_key, prefix, max_items, starting_token):
+    """List one page of the files recorded for an asset version under a prefix
+    
+    Records outside of the prefix are filtered out before the page is counted, so a page only ends
+    short of max_items when it is the last one.
+    
+    Args:
+        assetId: Asset ID
+        assetVersionId: Asset version ID
+        asset_base_key: Base key of the asset location
+        prefix: S3 key prefix to filter files on
+        max_items: Maximum number of files of the page
+        starting_token: Token from a previous page
+        
+    Returns:
+        Tuple of (list of manifest object dictionaries, next token)
+    """
+    exclusive_start_key = None
+    if starting_token:
+        try:
+            exclusive_start_key = json.loads(base64.b64decode(starting_token).decode('utf-8'))
+        except Exception:
+            raise VAMSGeneralErrorResponse("Invalid startingToken")
+
+    objects = []
+    while True:
+        query_params = {
+            'KeyConditionExpression': Key('assetId:assetVersionId').eq(f"{assetId}:{assetVersionId}"),
+            'Limit': max_items
+        }
+        if exclusive_start_key:
+            query_params['ExclusiveStartKey'] = exclusive_start_key
+        response = asset_file_versions_table.query(**query_params)
+        items = response.get('Items', [])
+
+        for position, item in enumerate(items):
+            key = normalize_s3_path(asset_base_key, item.get('fileKey', ''))
+            if not key.startswith(prefix) or key.endswith('/'):
+                continue
+            objects.append({
+                'key': key,
+                'size': int(item['size']) if item.get('size') is not None else None,
+                'etag': item.get('etag'),
+                'versionId': item.get('versionId')
+            })
+
+            if len(objects) == max_items:
+                # The next page starts after the last file of this one
+                if position == len(items) - 1 and not response.get('LastEvaluatedKey'):
+                    return objects, None
+                last_key = {'assetId:assetVersionId': item['assetId:assetVersionId'], 'fileKey': item['fileKey']}
+                return objects, base64.b64encode(json.dumps(last_key).encode('utf-8')).decode('utf-8')
+
+        exclusive_start_key = response.get('LastEvaluatedKey')
+        if not exclusive_start_key:
+            return objects, None
+
+def download_asset_manifest(databaseId, assetId, request_model):
+    """Generate a page of presigned download URLs for all files of an asset, folder or asset version
+    
+    Files come from a single listing sweep per page (S3 listing for current files, the asset file
+    versions table for an asset version) instead of one download API call per file. The listing
+    already carries the size and etag of each file, so no file is read with a HEAD request.
+    
+    Args:
+        databaseId: Database ID
+        assetId: Asset ID
+        request_model: DownloadAssetRequestModel instance
+        
+    Returns:
+        DownloadAssetManifestResponseModel instance
+    """
+    # Get asset details
+    asset = get_asset_details(databaseId, assetId)
+    if not asset:
+        raise VAMSGeneralErrorResponse("Asset not found in database")
+        
+    # Check if asset is distributable
+    if not asset.get('isDistributable', False):
+        raise VAMSGeneralErrorResponse("Asset not distributable")
+        
+    # Get asset location
+    asset_location = asset.get('assetLocation')
+    if not asset_location:
+        raise VAMSGeneralErrorResponse("Asset location not found")
+        
+    # Get bucket details from bucketId
+    bucketDetails = get_default_bucket_details(asset.get('bucketId'))
+    asset_bucket = bucketDetails['bucketName']
+    asset_base_key = asset_location.get('Key')
+    if not asset_base_key.endswith('/'):
+        asset_base_key += '/'
+
+    # Determine the folder prefix to build the manifest for
+    if request_model.key:
+        if request_model.key.startswith(asset_base_key):
+            prefix = request_model.key
+        else:
+            prefix = normalize_s3_path(asset_base_key, request_model.key)
+        # A folder, 'models' must not match 'models2/...'
+        if not prefix.endswith('/'):
+            prefix += '/'
+    else:
+        prefix = asset_base_key
+
+    if request_model.assetVersionId:
+        objects, next_token = list_manifest_version_objects(
+            assetId, request_model.assetVersionId, asset_base_key, prefix,
+            request_model.maxItems, request_model.startingToken)
+    else:
+        objects, next_token = list_manifest_objects(
+            asset_bucket, prefix, request_model.maxItems, request_model.startingToken)
+
+    skipped_files = []
+    files = []
+    try:
+        for obj in objects:
+            relative_path = obj['key'][len(asset_base_key):]
+            # Content types are not known from a listing, so skip unallowed extensions and force a
+            # non-executable content type on the signed response instead of heading every object
+            if not validateUnallowedFileExtensionAndContentType(obj['key'], ''):
+                skipped_files.append(relative_path)
+                continue
+
+            params = {
+                'Bucket': asset_bucket,
+                'Key': obj['key'],
+                'ResponseContentType': 'application/octet-stream'
+            }
+            if obj.get('versionId'):
+                params['VersionId'] = obj['versionId']
+
+            files.append(DownloadAssetManifestItemModel(
+                relativePath=relative_path,
+                size=obj.get('size'),
+                etag=obj.get('etag'),
+                versionId=obj.get('versionId'),
+                downloadUrl=s3.generate_presigned_url(
+                    'get_object',
+                    Params=params,
+                    ExpiresIn=int(token_timeout)
+                )
+            ))
+    except Exception as e:
+        logger.exception(f"Error generating presigned URLs: {e}")
+        raise VAMSGeneralErrorResponse("Error generating download URLs.")
+
+    return DownloadAssetManifestResponseModel(
+        files=files,
+        skippedFiles=skipped_files,
+        expiresIn=int(token_timeout),
+        assetVersionId=request_model.assetVersionId,
+        NextToken=next_token
+    )
+
 #######################
 # Lambda Handler
 #######################
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset download API"""
     claims_and_roles = request_to_claims(event)
@@ -428,6 +633,8 @@ def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
         try:
             if request_model.downloadType == "assetFile":
                 response = download_asset_file(database_id, asset_id, request_model)
+            elif request_model.downloadType == "assetManifest":
+                response = download_asset_manifest(database_id, asset_id, request_model)
             else:  # assetPreview
                 response = download_asset_preview(database_id, asset_id, request_model)
                 
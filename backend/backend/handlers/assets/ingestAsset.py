@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import uuid
 from botocore.config import Config
@@ -12,10 +12,12 @@ from common.constants import STANDARD_JSON_RESPONSE
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.s3 import validateS3AssetExtensionsAndContentType
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from models.common import (
+    parse,
     APIGatewayProxyResponseV2, internal_error, success, 
     validation_error, general_error, authorization_error, 
     VAMSGeneralErrorResponse
@@ -30,11 +32,11 @@ from models.assetsV3 import (
 # Configure AWS clients
 region = os.environ['AWS_REGION']
 s3_config = Config(signature_version='s3v4', s3={'addressing_style': 'path'})
-s3 = boto3.client('s3', region_name=region, config=s3_config)
+s3 = lazy_client('s3', region_name=region, config=s3_config)
 
-lambda_client = boto3.client('lambda')
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
+lambda_client = lazy_client('lambda')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
 logger = safeLogger(service_name="IngestAsset")
 
 # Load environment variables
@@ -305,6 +307,7 @@ def complete_ingest(request_model: IngestAssetCompleteRequestModel, claims_and_r
 # Lambda Handler
 #######################
 
+@trace_invocation
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for asset ingest API"""
     global claims_and_roles
@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import base64
 import sys
@@ -11,9 +11,12 @@ from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
+from common.dynamodb import validate_pagination_info
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset
 from common.s3 import validateUnallowedFileExtensionAndContentType
 
 # Standardized retry configuration merged with existing S3 config
@@ -26,13 +29,22 @@ s3_config = Config(
     }
 )
 
-s3_client = boto3.client('s3', config=s3_config)
-dynamodb = boto3.resource('dynamodb', config=s3_config)
+s3_client = lazy_client('s3', config=s3_config)
+dynamodb = lazy_resource('dynamodb', config=s3_config)
 logger = safeLogger(service_name="StreamAuxiliaryPreviewAsset")
 
+# Maximum number of auxiliary preview files signed per stream session page (maxItems). Each presigned
+# URL carries the session token (~1.5KB), this keeps a page far below the 6MB Lambda response limit
+STREAM_SESSION_MAX_FILES = 250
+
+# Expiration of the presigned URLs of a stream session. Viewers request a new session page when it
+# expires, PRESIGNED_URL_TIMEOUT_SECONDS is meant for downloads and is used only when it is shorter
+STREAM_SESSION_URL_TIMEOUT_SECONDS = 900
+
 try:
     auxasset_bucket_name = os.environ["ASSET_AUXILIARY_BUCKET_NAME"]
     asset_storage_table_name = os.environ["ASSET_STORAGE_TABLE_NAME"]
+    token_timeout = os.environ["PRESIGNED_URL_TIMEOUT_SECONDS"]
 except Exception as e:
     logger.exception("Failed loading environment variables")
     raise e
@@ -43,13 +55,12 @@ asset_table = dynamodb.Table(asset_storage_table_name)
 def get_asset_details(databaseId, assetId):
     """Get asset details from DynamoDB"""
     try:
-        response = asset_table.get_item(
+        return request_asset(databaseId, assetId, lambda: asset_table.get_item(
             Key={
                 'databaseId': databaseId,
                 'assetId': assetId
             }
-        )
-        return response.get('Item')
+        ).get('Item'))
     except Exception as e:
         logger.exception(f"Error getting asset details: {e}")
         raise Exception(f"Error retrieving asset.")
@@ -84,6 +95,66 @@ def resolve_asset_file_path(asset_base_key: str, file_path: str) -> str:
         logger.info(f"Combined base key '{asset_base_key}' with file path '{file_path}' to get '{resolved_path}'")
         return resolved_path
 
+def create_stream_session(object_key, max_items=STREAM_SESSION_MAX_FILES, starting_token=None):
+    """
+    Sign read access to one page of the auxiliary preview files in the folder of the requested object key.
+
+    Viewers that issue many range reads (e.g. Potree octrees) use the returned presigned URLs to read
+    directly from S3 after a single authorization check, instead of proxying each range through this lambda.
+
+    Args:
+        object_key: The resolved S3 key of a preview file or folder (ending in '/')
+        max_items: Maximum number of files listed for the page
+        starting_token: NextToken of the previous page
+
+    Returns:
+        Dictionary with the session prefix, URL expiration, a map of relative file keys to presigned URLs
+        and the NextToken of the next page when there is one
+    """
+    session_prefix = object_key if object_key.endswith('/') else object_key.rsplit('/', 1)[0] + '/'
+    expires_in = min(STREAM_SESSION_URL_TIMEOUT_SECONDS, int(token_timeout))
+
+    list_params = {
+        'Bucket': auxasset_bucket_name,
+        'Prefix': session_prefix,
+        'MaxKeys': int(max_items)
+    }
+    if starting_token:
+        list_params['ContinuationToken'] = starting_token
+    page = s3_client.list_objects_v2(**list_params)
+
+    files = {}
+    for obj in page.get('Contents', []):
+        key = obj['Key']
+        if key.endswith('/'):
+            continue
+
+        # Content types are not known from a listing, so skip unallowed extensions and force a
+        # non-executable content type on the signed response instead of heading every object
+        if not validateUnallowedFileExtensionAndContentType(key, ''):
+            continue
+
+        files[key[len(session_prefix):]] = s3_client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': auxasset_bucket_name,
+                'Key': key,
+                'ResponseContentType': 'application/octet-stream'
+            },
+            ExpiresIn=expires_in
+        )
+
+    session = {
+        'sessionPrefix': session_prefix,
+        'expiresIn': expires_in,
+        'files': files
+    }
+    if page.get('NextContinuationToken'):
+        session['NextToken'] = page['NextContinuationToken']
+    return session
+
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     #logger.info(str(event))
@@ -116,6 +187,12 @@ def lambda_handler(event, context):
     except:
         range_header = ""
 
+    # Get the "If-None-Match" header from the request headers for conditional fetches
+    try:
+        if_none_match_header = request_headers.get('if-none-match')
+    except:
+        if_none_match_header = ""
+
     # # Get the "content-type" header from the request headers
     # try:
     #     content_type_header = request_headers.get('content-type')
@@ -123,6 +200,8 @@ def lambda_handler(event, context):
     #     content_type_header = ""
 
     path_parameters = event.get('pathParameters', {})
+    query_parameters = event.get('queryStringParameters') or {}
+    stream_session = str(query_parameters.get('streamSession', 'false')).lower() == 'true'
 
     # Get the object key which comes after the base path of the API Call
     assetId = path_parameters.get('assetId', "") 
@@ -184,6 +263,15 @@ def lambda_handler(event, context):
             assetLocationKey = asset_object.get('assetLocation').get("Key")
             object_key = resolve_asset_file_path(assetLocationKey, object_key)
 
+            # Session mode returns signed direct access to the preview folder instead of streaming a single range
+            if stream_session:
+                validate_pagination_info(query_parameters, STREAM_SESSION_MAX_FILES)
+                response = STANDARD_JSON_RESPONSE
+                response['statusCode'] = 200
+                response['body'] = json.dumps({"message": create_stream_session(
+                    object_key, query_parameters['maxItems'], query_parameters['startingToken'])})
+                return response
+
             # Prepare the S3 GetObject request parameters
             s3_params = {
                 'Bucket': auxasset_bucket_name,
@@ -194,6 +282,10 @@ def lambda_handler(event, context):
             if range_header and range_header != None and range_header != "":
                 s3_params['Range'] = range_header
 
+            # Add the "If-None-Match" header to the S3 GetObject request if it exists
+            if if_none_match_header and if_none_match_header != None and if_none_match_header != "":
+                s3_params['IfNoneMatch'] = if_none_match_header
+
             # # Add the "content-type" header to the S3 GetObject request if it exists
             # if content_type_header and content_type_header != None and content_type_header != "":
             #     s3_params['ResponseContentType'] = content_type_header
@@ -229,6 +321,7 @@ def lambda_handler(event, context):
                         'Accept-Ranges': response['ResponseMetadata']['HTTPHeaders']['accept-ranges'],
                         'Content-Type': response['ResponseMetadata']['HTTPHeaders']['content-type'],
                         'Content-Length': response['ResponseMetadata']['HTTPHeaders']['content-length'],
+                        'ETag': response['ResponseMetadata']['HTTPHeaders'].get('etag', ''),
                 }
             }
 
@@ -279,6 +372,17 @@ def lambda_handler(event, context):
             return api_gateway_response
 
         except ClientError as e:
+            # Object has not changed since the ETag the client already holds
+            if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+                return {
+                    'statusCode': 304,
+                    'body': '',
+                    'headers': {
+                        'Access-Control-Allow-Headers': 'Range',
+                        'ETag': if_none_match_header,
+                    }
+                }
+
             logger.exception(e)
             message = "Error Fetching Auxiliary Preview File from Path Provided"
             error_response = {
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import uuid
 import time
@@ -13,15 +13,17 @@ from botocore.config import Config
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_asset, request_bucket, forget_asset
 from botocore.exceptions import ClientError
 from common.s3 import validateS3AssetExtensionsAndContentType, validateUnallowedFileExtensionAndContentType
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, general_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.assetsV3 import (
     InitializeUploadRequestModel, InitializeUploadResponseModel, UploadPartModel, UploadFileResponseModel,
     CompleteUploadRequestModel, CompleteUploadResponseModel, FileCompletionResult,
@@ -46,11 +48,11 @@ s3_config = Config(
     }
 )
 
-s3 = boto3.client('s3', region_name=region, config=s3_config)
-s3_resource = boto3.resource('s3', region_name=region, config=s3_config)
-lambda_client = boto3.client('lambda', config=s3_config)
-dynamodb = boto3.resource('dynamodb', config=s3_config)
-dynamodb_client = boto3.client('dynamodb', config=s3_config)
+s3 = lazy_client('s3', region_name=region, config=s3_config)
+s3_resource = lazy_resource('s3', region_name=region, config=s3_config)
+lambda_client = lazy_client('lambda', config=s3_config)
+dynamodb = lazy_resource('dynamodb', config=s3_config)
+dynamodb_client = lazy_client('dynamodb', config=s3_config)
 logger = safeLogger(service_name="UploadFile")
 
 # Constants
@@ -151,12 +153,15 @@ def get_default_bucket_details(bucketId):
     """Get default S3 bucket details from database default bucket DynamoDB"""
     try:
 
-        bucket_response = buckets_table.query(
-            KeyConditionExpression=Key('bucketId').eq(bucketId),
-            Limit=1
-        )
-        # Use the first item from the query results
-        bucket = bucket_response.get("Items", [{}])[0] if bucket_response.get("Items") else {}
+        def load_bucket():
+            bucket_response = buckets_table.query(
+                KeyConditionExpression=Key('bucketId').eq(bucketId),
+                Limit=1
+            )
+            # Use the first item from the query results
+            return bucket_response.get("Items", [None])[0] if bucket_response.get("Items") else None
+
+        bucket = request_bucket(bucketId, load_bucket) or {}
         bucket_id = bucket.get('bucketId')
         bucket_name = bucket.get('bucketName')
         base_assets_prefix = bucket.get('baseAssetsPrefix')
@@ -185,13 +190,12 @@ def get_default_bucket_details(bucketId):
 def get_asset_details(databaseId, assetId):
     """Get asset details from DynamoDB"""
     try:
-        response = asset_table.get_item(
+        return request_asset(databaseId, assetId, lambda: asset_table.get_item(
             Key={
                 'databaseId': databaseId,
                 'assetId': assetId
             }
-        )
-        return response.get('Item')
+        ).get('Item'))
     except Exception as e:
         logger.exception(f"Error getting asset details: {e}")
         raise VAMSGeneralErrorResponse(f"Error retrieving asset.")
@@ -200,6 +204,7 @@ def save_asset_details(asset_data):
     """Save asset details to DynamoDB"""
     try:
         asset_table.put_item(Item=asset_data)
+        forget_asset(asset_data['databaseId'], asset_data['assetId'])
     except Exception as e:
         logger.exception(f"Error saving asset details: {e}")
         raise VAMSGeneralErrorResponse(f"Error saving asset.")
@@ -395,14 +400,25 @@ def send_subscription_email(database_id, asset_id):
     except Exception as e:
         logger.exception(f"Error invoking send_email Lambda function: {e}")
 
-def copy_s3_object(source_bucket, source_key, dest_bucket, dest_key):
-    """Copy an object from one S3 location to another"""
+def copy_s3_object(source_bucket, source_key, dest_bucket, dest_key, metadata=None, content_type=None):
+    """Copy an object from one S3 location to another
+
+    When metadata is given it replaces the source object metadata on the copy, so objects can be
+    stamped while they are moved instead of being copied onto themselves afterwards.
+    """
     try:
+        extra_args = None
+        if metadata is not None:
+            extra_args = {'MetadataDirective': 'REPLACE', 'Metadata': metadata}
+            if content_type:
+                extra_args['ContentType'] = content_type
+
         # Use s3_resource for managed transfer to handle large files
         s3_resource.meta.client.copy(
             CopySource={'Bucket': source_bucket, 'Key': source_key},
             Bucket=dest_bucket,
-            Key=dest_key
+            Key=dest_key,
+            ExtraArgs=extra_args
         )
         return True
     except Exception as e:
@@ -1002,7 +1018,15 @@ def complete_external_upload(uploadId: str, request_model: CompleteExternalUploa
                 'relativeKey': file.relativeKey,
                 'temp_s3_key': file.tempKey,
                 'final_s3_key': final_s3_key,
-                'uploadIdS3': "external"
+                'uploadIdS3': "external",
+                # Stamp the asset and upload on the final object as part of the move
+                'metadata': {
+                    **head_response.get('Metadata', {}),
+                    'databaseid': databaseId,
+                    'assetid': assetId,
+                    'uploadid': uploadId
+                },
+                'contentType': head_response.get('ContentType')
             }
             
             # Add to successful files list
@@ -1100,7 +1124,9 @@ def complete_external_upload(uploadId: str, request_model: CompleteExternalUploa
             bucket_name, 
             file_detail['temp_s3_key'], 
             bucket_name, 
-            file_detail['final_s3_key']
+            file_detail['final_s3_key'],
+            metadata=file_detail['metadata'],
+            content_type=file_detail['contentType']
         )
         
         if not copy_success:
@@ -1185,6 +1211,41 @@ def complete_external_upload(uploadId: str, request_model: CompleteExternalUploa
     else:
         return response
 
+def complete_external_upload_for_user(uploadId: str, request_model: CompleteExternalUploadRequestModel, claims_and_roles) -> CompleteUploadResponseModel:
+    """Complete an external upload for callers inside other functions (e.g. workflow output processing)
+
+    Checks POST permission on the asset for the given claims and roles; API route permissions are
+    checked by the API handler.
+
+    Args:
+        uploadId: The external upload ID
+        request_model: The external upload completion request
+        claims_and_roles: Claims and roles of the user the upload is completed for
+
+    Returns:
+        CompleteUploadResponseModel with the result of each file
+
+    Raises:
+        VAMSGeneralErrorResponse: When the asset doesn't exist or isn't authorized
+    """
+    asset = get_asset_details(request_model.databaseId, request_model.assetId)
+    if not asset:
+        raise VAMSGeneralErrorResponse("Asset not found")
+
+    asset["object__type"] = "asset"
+    allowed = False
+    if len(claims_and_roles["tokens"]) > 0:
+        casbin_enforcer = CasbinEnforcer(claims_and_roles)
+        allowed = casbin_enforcer.enforce(asset, "POST")
+    if not allowed:
+        raise VAMSGeneralErrorResponse("Not authorized to upload files to the asset")
+
+    response = complete_external_upload(uploadId, request_model, claims_and_roles)
+    # All files failing comes back as an error response
+    if isinstance(response, dict) and 'statusCode' in response and 'body' in response:
+        return CompleteUploadResponseModel(**json.loads(response['body']))
+    return response
+
 def complete_upload(uploadId: str, request_model: CompleteUploadRequestModel, claims_and_roles):
     """Complete a multipart upload and update the asset"""
     assetId = request_model.assetId
@@ -1701,6 +1762,8 @@ def complete_upload(uploadId: str, request_model: CompleteUploadRequestModel, cl
 # Lambda Handler
 #######################
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for file upload APIs"""
     global claims_and_roles
@@ -3,9 +3,10 @@
 
 import json
 from handlers.auth import request_to_claims
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import os
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import to_update_expr
 from boto3.dynamodb.conditions import Key
 from handlers.authz import CasbinEnforcer
@@ -18,8 +19,8 @@ claims_and_roles = {}
 logger = safeLogger(service="AuthConstraintsService")
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', region_name=region)
-dynamodb_client = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb', region_name=region)
+dynamodb_client = lazy_client('dynamodb')
 
 constraintsTableName = os.environ['AUTH_TABLE_NAME']
 
@@ -293,6 +294,7 @@ def delete_constraint(event, response):
     response['body'] = {"message": "Constraint deleted."}
 
 
+@trace_invocation
 def lambda_handler(event, context):
     global claims_and_roles
     response = STANDARD_JSON_RESPONSE
@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import json
-import boto3
+from common.awsClients import lazy_resource
 import botocore.exceptions
 import os
 from customConfigCommon.customAuthLoginProfile import customAuthProfileLoginWriteOverride
@@ -10,10 +10,11 @@ from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from common.constants import STANDARD_JSON_RESPONSE
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.validators import validate
 
 logger = safeLogger(service_name="AuthLoginProfile")
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 
 claims_and_roles = {}
 main_rest_response = STANDARD_JSON_RESPONSE
@@ -58,6 +59,7 @@ def get_user(userId):
     )
     return {"message": {"Items": [response["Item"]]}}
 
+@trace_invocation
 def lambda_handler(event, _):
     response = STANDARD_JSON_RESPONSE
 
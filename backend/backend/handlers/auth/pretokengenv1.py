@@ -2,16 +2,17 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import json
-import boto3
+from common.awsClients import lazy_resource
 import os
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import to_update_expr
 from boto3.dynamodb.conditions import Key
 
 logger = safeLogger(service="PreTokenGen")
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', region_name=region)
+dynamodb = lazy_resource('dynamodb', region_name=region)
 authEntTable = dynamodb.Table(os.environ['AUTH_TABLE_NAME'])
 userRoleTable = dynamodb.Table(os.environ['USER_ROLES_TABLE_NAME'])
 
@@ -68,6 +69,7 @@ def remember_observed_claims(claims: set):
     )
 
 
+@trace_invocation
 def lambda_handler(event, context):
 
     logger.info(event)
@@ -9,9 +9,11 @@ from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from common.constants import STANDARD_JSON_RESPONSE
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 logger = safeLogger(service_name="Routes")
 
+@trace_invocation
 def lambda_handler(event, _):
 
     response = STANDARD_JSON_RESPONSE
@@ -1,14 +1,11 @@
 # Copyright 2023 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import boto3
+from common.awsClients import lazy_client, lazy_paginator
+from common.callTracing import trace_call, CATEGORY_AUTHZ
 import os
 import time
 from boto3.dynamodb.types import TypeDeserializer
-from casbin import FastEnforcer
-from casbin import model
-from casbin.persist.adapters import string_adapter
-from simpleeval import AttributeDoesNotExist
 from customLogging.logger import safeLogger
 from handlers.auth import request_to_claims
 from datetime import datetime, timedelta
@@ -38,6 +35,14 @@ CASBIN_NO_DICTIONARY_LOCKING = False
 #
 POLICY_TEXT_DENY_ALL = "g,,\0,*,deny\np,,,*,deny"
 
+# Constraints assigned to the user directly or through the role. Kept on one line, local DynamoDB
+# emulators (moto) do not parse line breaks in expressions
+#
+CONSTRAINTS_FILTER_EXPRESSION = (
+    "entityType = :constraintEntityType and "
+    "(userPermissions[0].userId = :userId or groupPermissions[0].groupId = :roleName)"
+)
+
 # Tracks users and their policy_text (which could span multiple roles)
 #
 casbin_user_policy_map = {} if CASBIN_NO_DICTIONARY_LOCKING else locked_dict.LockedDict()
@@ -49,8 +54,8 @@ casbin_user_enforcer_map = {} if CASBIN_NO_DICTIONARY_LOCKING else locked_dict.L
 logger = safeLogger(service="AuthzInit")
 
 deserializer = TypeDeserializer()
-_dynamodb_client = boto3.client("dynamodb")
-paginator = _dynamodb_client.get_paginator("scan")
+_dynamodb_client = lazy_client("dynamodb")
+paginator = lazy_paginator(_dynamodb_client, "scan")
 
 # Determine if MFA is enabled from claims
 def is_mfa_enabled(claims_and_roles):
@@ -160,10 +165,7 @@ class CasbinEnforcerService:
         #
         page_iterator = paginator.paginate(
             TableName=self._auth_table_name,
-            FilterExpression="""
-                entityType = :constraintEntityType and
-                (userPermissions[0].userId = :userId or groupPermissions[0].groupId = :roleName)
-                """,
+            FilterExpression=CONSTRAINTS_FILTER_EXPRESSION,
             PaginationConfig={
                 "MaxItems": 1000,
                 "PageSize": 1000,
@@ -189,10 +191,7 @@ class CasbinEnforcerService:
             nextToken = page_iterator['NextToken']
             page_iterator = paginator.paginate(
                 TableName=self._auth_table_name,
-                FilterExpression="""
-                    entityType = :constraintEntityType and
-                    (userPermissions[0].userId = :userId or groupPermissions[0].groupId = :roleName)
-                    """,
+                FilterExpression=CONSTRAINTS_FILTER_EXPRESSION,
                 PaginationConfig={
                     "MaxItems": 1000,
                     "PageSize": 1000,
@@ -484,6 +483,11 @@ class CasbinEnforcerService:
                 self._enforcer = None
 
     def _create_casbin_enforcer_helper(self, policy_text):
+        # casbin is imported when the first enforcer is built, handlers that never enforce skip its import
+        from casbin import FastEnforcer
+        from casbin import model
+        from casbin.persist.adapters import string_adapter
+
         new_model = model.Model()
         new_model.load_model_from_text(self._model_text)
         new_string_adapter = string_adapter.StringAdapter(policy_text)
@@ -491,6 +495,11 @@ class CasbinEnforcerService:
         return _enforcer
 
     def enforce(self, obj, act):
+        # Timed on the invocation trace, including policy refreshes (their DynamoDB calls are traced too)
+        with trace_call(CATEGORY_AUTHZ, "casbin.enforce"):
+            return self._enforce(obj, act)
+
+    def _enforce(self, obj, act):
         global CASBIN_REFRESH_POLICY_SECONDS
         global casbin_user_policy_map
 
@@ -522,6 +531,9 @@ class CasbinEnforcerService:
                 self._enforcer = None
                 return False
 
+        # Loaded with casbin when the enforcer was built
+        from simpleeval import AttributeDoesNotExist
+
         enhanced_object = PERMISSION_CONSTRAINT_FIELDS.copy()
         enhanced_object.update(obj)
 
@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import datetime
 from common.validators import validate
@@ -11,14 +11,15 @@ from handlers.authz import CasbinEnforcer
 from common.dynamodb import get_asset_object_from_id
 from common.constants import STANDARD_JSON_RESPONSE
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 
 # Create a logger object to log the events
 logger = safeLogger(service="AddComment")
 
-dynamodb = boto3.resource("dynamodb")
-s3c = boto3.client("s3")
+dynamodb = lazy_resource("dynamodb")
+s3c = lazy_client("s3")
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -68,6 +69,7 @@ def add_comment(assetId: str, assetVersionIdAndCommentId: str, userId: str, even
     return response
 
 
+@trace_invocation
 def lambda_handler(event: dict, context: dict) -> dict:
     """
     Lambda handler for API calls that try to add a comment
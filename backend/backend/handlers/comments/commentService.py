@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
@@ -12,6 +12,7 @@ from handlers.authz import CasbinEnforcer
 from common.constants import STANDARD_JSON_RESPONSE
 from common.dynamodb import get_asset_object_from_id
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 
 claims_and_roles = {}
@@ -19,8 +20,8 @@ claims_and_roles = {}
 # Create a logger object to log the events
 logger = safeLogger(service="CommentService")
 
-dynamodb = boto3.resource("dynamodb")
-dynamodb_client = boto3.client("dynamodb")
+dynamodb = lazy_resource("dynamodb")
+dynamodb_client = lazy_client("dynamodb")
 main_rest_response = STANDARD_JSON_RESPONSE
 comment_database = None
 
@@ -421,6 +422,7 @@ def delete_handler(response: dict, pathParameters: dict, event: dict) -> dict:
         return response
 
 
+@trace_invocation
 def lambda_handler(event: dict, context: dict) -> dict:
     """
     Lambda handler for the API calls directed to commentService
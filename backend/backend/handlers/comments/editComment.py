@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import datetime
 from common.validators import validate
@@ -12,14 +12,15 @@ from handlers.authz import CasbinEnforcer
 from common.constants import STANDARD_JSON_RESPONSE
 from common.dynamodb import get_asset_object_from_id
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 
 # Create a logger object to log the events
 logger = safeLogger(service="EditComment")
 
-dynamodb = boto3.resource("dynamodb")
-s3c = boto3.client("s3")
+dynamodb = lazy_resource("dynamodb")
+s3c = lazy_client("s3")
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -83,6 +84,7 @@ def edit_comment(assetId: str, assetVersionIdAndCommentId: str, userId: str, eve
     return response
 
 
+@trace_invocation
 def lambda_handler(event: dict, context: dict) -> dict:
     """
     Lambda handler for API calls that try to add a comment
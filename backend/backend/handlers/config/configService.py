@@ -3,16 +3,18 @@
 
 import json
 import os
-import boto3
+from common.awsClients import lazy_client
 from boto3.dynamodb.types import TypeDeserializer
 from common.constants import STANDARD_JSON_RESPONSE
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 logger = safeLogger(service="ConfigService")
-dynamo_client = boto3.client('dynamodb')
+dynamo_client = lazy_client('dynamodb')
 deserializer = TypeDeserializer()
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     try:
@@ -2,22 +2,23 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 import datetime
 from botocore.exceptions import ClientError
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.dynamodb import to_update_expr
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, VAMSGeneralErrorResponse, parse
 from models.databases import CreateDatabaseRequestModel, CreateDatabaseResponseModel
 
 # Configure AWS clients
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 logger = safeLogger(service_name="CreateDatabase")
 
 # Load environment variables
@@ -99,6 +100,7 @@ def create_database(request_model: CreateDatabaseRequestModel):
 # Lambda Handler
 #######################
 
+@trace_invocation
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for database creation API"""
     claims_and_roles = request_to_claims(event)
@@ -3,23 +3,24 @@
 
 import json
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from common.dynamodb import validate_pagination_info
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
-from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse
+from common.callTracing import trace_invocation
+from models.common import APIGatewayProxyResponseV2, internal_error, success, validation_error, authorization_error, general_error, VAMSGeneralErrorResponse, parse
 from models.databases import GetDatabaseResponseModel, GetDatabasesRequestModel, GetDatabasesResponseModel, DeleteDatabaseResponseModel, BucketModel, GetBucketsRequestModel, GetBucketsResponseModel
 
 # Configure AWS clients
-dynamodb = boto3.resource('dynamodb')
-dbClient = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+dbClient = lazy_client('dynamodb')
 deserializer = TypeDeserializer()
 logger = safeLogger(service_name="DatabaseService")
 
@@ -448,6 +449,7 @@ def get_buckets_handler(query_parameters, claims_and_roles):
 # Lambda Handler
 #######################
 
+@trace_invocation
 def lambda_handler(event, context: LambdaContext) -> APIGatewayProxyResponseV2:
     """Lambda handler for database service API"""
     logger.info(event)
@@ -0,0 +1,437 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Rebuild the search index without downtime
+
+The index name of the AOS_INDEX_NAME_PARAM parameter is used as an alias. A reindex job builds a
+new versioned index ({alias}-v{timestamp}) from the asset table, the metadata table and the asset
+buckets while searches and the indexing handlers keep using the alias, then moves the alias to the
+new index in one _aliases request. An index created by the deployment under the alias name is
+replaced the same way.
+
+The asset table is read with a parallel scan, every segment runs in its own invocation of this
+function and continues in a new invocation before the timeout. The progress of each segment is
+saved in the auxiliary bucket after every page, so a failed job can be resumed.
+
+Changes the indexing handlers make while the job runs are recorded as replay documents of the new
+index (common/indexGeneration.py) and applied again before and after the alias is moved. Assets are
+indexed one at a time, a segment continues in a new invocation after the asset that passed its deadline.
+
+The typeahead suggestions of the indexed assets and files are written to the suggestion index of the
+alias (common/searchSuggestions.py) as the job goes, which also fills it for assets indexed before
+it existed.
+
+The function is invoked directly, e.g. with the AWS CLI:
+    {"action": "start", "segments": 8}
+    {"action": "status", "jobId": "..."}
+    {"action": "resume", "jobId": "..."}
+    {"action": "cancel", "jobId": "..."}
+"""
+
+import json
+import os
+import time
+import uuid
+from common.awsClients import lazy_client, lazy_resource, opensearch_module
+from common.callTracing import trace_invocation
+from common.indexGeneration import REINDEX_REPLAY_CHANGE_FIELD, REINDEX_REPLAY_RECTYPE, bump_index_generation, \
+    bumps_index_generation, get_reindex_build_index, set_reindex_build_index
+from common.searchSuggestions import asset_suggestions, suggest_index_name, suggestion_asset_fields
+from customLogging.logger import safeLogger
+from handlers.indexing.streams import ASSET_DOCUMENT_FIELDS, AOSIndexAssetMetadata, AOSIndexS3Objects, \
+    bulk_write_documents
+
+logger = safeLogger(service="ReindexSearch")
+
+REINDEX_JOB_PREFIX = "reindexJobs"
+REINDEX_DEFAULT_SEGMENTS = 8
+REINDEX_MAX_SEGMENTS = 64
+# Assets read per scan page, the segment progress is saved after each page
+REINDEX_SCAN_PAGE_SIZE = 100
+REINDEX_JOB_MARGIN_SECONDS = 120
+REINDEX_REPLAY_PAGE_SIZE = 500
+# Indexing handlers that wrote through the alias right before it moved record their changes a little
+# later. After the move, recorded changes are applied as they arrive until none arrived for
+# REINDEX_SWAP_QUIET_SECONDS, polling every REINDEX_SWAP_POLL_SECONDS for at most REINDEX_SWAP_SETTLE_SECONDS
+REINDEX_SWAP_POLL_SECONDS = 5
+REINDEX_SWAP_QUIET_SECONDS = 15
+REINDEX_SWAP_SETTLE_SECONDS = 60
+# Document of the new index created by the invocation that finalizes the job, a second
+# invocation (two segments finishing at the same time) fails to create it and stops
+REINDEX_FINALIZE_DOCUMENT_ID = "#vams-reindex-finalize"
+
+client = lazy_client('lambda')
+s3c = lazy_client('s3')
+dynamodb = lazy_resource('dynamodb')
+
+bucket_name_assetAuxiliary = os.environ["S3_ASSETAUXILIARY_STORAGE_BUCKET"]
+asset_Database = os.environ["ASSET_STORAGE_TABLE_NAME"]
+
+
+def get_job_key(jobId, name):
+    """Get the auxiliary bucket key of a reindex job object"""
+    return f"{REINDEX_JOB_PREFIX}/{jobId}/{name}.json"
+
+
+def save_job_object(jobId, name, body):
+    s3c.put_object(
+        Bucket=bucket_name_assetAuxiliary,
+        Key=get_job_key(jobId, name),
+        Body=json.dumps(body),
+        ContentType='application/json'
+    )
+
+
+def load_job_object(jobId, name):
+    response = s3c.get_object(
+        Bucket=bucket_name_assetAuxiliary,
+        Key=get_job_key(jobId, name)
+    )
+    return json.loads(response['Body'].read())
+
+
+def load_segments(job):
+    return [load_job_object(job['jobId'], f"segments/{segment}") for segment in range(job['segments'])]
+
+
+def get_search_index():
+    """opensearch-py client and the index name (alias) of the search index"""
+    s3index = AOSIndexS3Objects.from_env()
+    return s3index.aosclient, s3index.indexName
+
+
+def invoke_job(payload, function_name):
+    client.invoke(
+        FunctionName=function_name,
+        InvocationType='Event',
+        Payload=json.dumps(payload)
+    )
+
+
+def get_alias_indexes(aosclient, alias):
+    """Indexes the alias points to
+
+    Returns:
+        (index names, True when the name is a concrete index rather than an alias)
+    """
+    try:
+        indexes = list(aosclient.indices.get_alias(name=alias).keys())
+        return indexes, False
+    except opensearch_module().NotFoundError:
+        if aosclient.indices.exists(index=alias):
+            return [alias], True
+        return [], False
+
+
+def create_build_index(aosclient, alias, indexName):
+    """Create the new index with the mappings and settings of the live index
+
+    Replicas and refreshes are turned off while the index is built, the live values are returned to restore them.
+    """
+    mappings = next(iter(aosclient.indices.get_mapping(index=alias).values()))["mappings"]
+    live_settings = next(iter(aosclient.indices.get_settings(index=alias).values()))["settings"]["index"]
+    settings = {
+        "number_of_shards": live_settings.get("number_of_shards"),
+        "number_of_replicas": 0,
+        "refresh_interval": "-1",
+    }
+    if "analysis" in live_settings:
+        settings["analysis"] = live_settings["analysis"]
+    aosclient.indices.create(index=indexName, body={"settings": {"index": settings}, "mappings": mappings})
+    return {
+        "numberOfReplicas": live_settings.get("number_of_replicas"),
+        "refreshInterval": live_settings.get("refresh_interval"),
+    }
+
+
+def index_assets(s3index, assets, deadline=None):
+    """Index assets of the asset table and their files into the index of s3index, and their
+    suggestions into the suggestion index of s3index
+
+    The asset documents are written together, then the files of one asset after the other.
+
+    Args:
+        deadline: Optional time.time() value, no further asset's files are indexed once it passed
+
+    Returns:
+        Number of assets indexed with their files, in the order of assets
+    """
+    assets_by_database = {}
+    for asset in assets:
+        assets_by_database.setdefault(asset['databaseId'], []).append(asset)
+
+    documents = []
+    suggestions = []
+    for databaseId, database_assets in assets_by_database.items():
+        metadata = s3index.metadataTable.batch_get_items(databaseId, [asset['assetId'] for asset in database_assets])
+        for asset in database_assets:
+            asset_fields = {field: asset[field] for field in ASSET_DOCUMENT_FIELDS if field in asset}
+            image = {"databaseId": databaseId, "assetId": asset['assetId']} | \
+                metadata.get(asset['assetId'], {}) | asset_fields
+            image = {key: value for key, value in image.items() if not key.startswith("_")}
+            documents.append((asset['assetId'], AOSIndexAssetMetadata.asset_document(image)))
+            if s3index.suggestIndexName:
+                suggestions.extend((s3index.suggestIndexName, id, suggestion) for id, suggestion in asset_suggestions(
+                    suggestion_asset_fields(databaseId, asset['assetId'], asset.get('assetName'),
+                                            asset.get('assetType'), asset.get('tags'))).items())
+    bulk_write_documents(s3index.aosclient, s3index.indexName, documents, otherIndexDocuments=suggestions)
+
+    for indexed, asset in enumerate(assets, start=1):
+        if asset.get('bucketId'):
+            asset_fields = {field: asset[field] for field in ASSET_DOCUMENT_FIELDS + ("bucketId",) if field in asset}
+            s3index.index_asset_files(asset['databaseId'], asset['assetId'], asset_fields)
+        if deadline is not None and time.time() > deadline:
+            return indexed
+    return len(assets)
+
+
+def replay_changes(aosclient, job):
+    """Apply the changes the indexing handlers recorded while the index was built
+
+    Deletes are applied first, then every changed asset is indexed again from the tables and the
+    asset bucket, so the order the changes were recorded in doesn't matter.
+
+    Returns:
+        Number of applied changes
+    """
+    indexName = job['buildIndex']
+    s3index = AOSIndexS3Objects(aosclient, indexName, suggestIndexName=suggest_index_name(job['alias']))
+    table = dynamodb.Table(asset_Database)
+    applied = 0
+    while True:
+        aosclient.indices.refresh(index=indexName)
+        hits = aosclient.search(index=indexName, body={
+            "query": {"term": {"_rectype": REINDEX_REPLAY_RECTYPE}},
+            "size": REINDEX_REPLAY_PAGE_SIZE,
+        })["hits"]["hits"]
+        if not hits:
+            return applied
+
+        changes = [json.loads(hit["_source"][REINDEX_REPLAY_CHANGE_FIELD]) for hit in hits]
+        deletedAssetIds = {change['deletedAssetId'] for change in changes if 'deletedAssetId' in change}
+        changedAssets = {(change['databaseId'], change['assetId'].split("/")[0])
+                         for change in changes if 'assetId' in change}
+
+        bulk_write_documents(aosclient, indexName,
+                             deletedIds=[change['deletedId'] for change in changes if 'deletedId' in change])
+        assets = []
+        for databaseId, assetId in sorted(changedAssets):
+            asset = table.get_item(Key={"databaseId": databaseId, "assetId": assetId}, ConsistentRead=True).get("Item")
+            if asset is None:
+                deletedAssetIds.add(assetId)
+            else:
+                assets.append(asset)
+        for assetId in deletedAssetIds:
+            aosclient.delete_by_query(index=indexName, body={"query": {"term": {"str_assetid.raw": assetId}}},
+                                      params={"refresh": "true", "conflicts": "proceed"})
+        index_assets(s3index, assets)
+
+        bulk_write_documents(aosclient, indexName, deletedIds=[hit["_id"] for hit in hits])
+        applied += len(hits)
+
+
+def settle_changes(aosclient, job):
+    """Apply the changes recorded after the alias moved as they arrive, until they stop arriving"""
+    started = last_change = time.time()
+    while True:
+        if replay_changes(aosclient, job):
+            last_change = time.time()
+        now = time.time()
+        if now - last_change >= REINDEX_SWAP_QUIET_SECONDS or now - started >= REINDEX_SWAP_SETTLE_SECONDS:
+            return
+        time.sleep(REINDEX_SWAP_POLL_SECONDS)
+
+
+def start_job(event, context):
+    """Create the new index and start one invocation per scan segment"""
+    segments = int(event.get('segments', REINDEX_DEFAULT_SEGMENTS))
+    if not 1 <= segments <= REINDEX_MAX_SEGMENTS:
+        raise ValueError(f"segments must be between 1 and {REINDEX_MAX_SEGMENTS}")
+    if os.environ.get('AOS_TYPE') != "es":
+        # Serverless collections support neither index aliases nor a refresh interval
+        raise ValueError("Reindexing behind an alias requires a provisioned OpenSearch domain")
+
+    aosclient, alias = get_search_index()
+    building = get_reindex_build_index(aosclient, alias)
+    if building:
+        raise ValueError(f"Another reindex job is building {building}, resume or cancel it first")
+
+    jobId = str(uuid.uuid4())
+    job = {
+        'jobId': jobId,
+        'status': "BUILDING",
+        'alias': alias,
+        'buildIndex': f"{alias}-v{time.strftime('%Y%m%d%H%M%S', time.gmtime())}",
+        'segments': segments,
+        'startedAt': time.time(),
+    }
+    job['liveSettings'] = create_build_index(aosclient, alias, job['buildIndex'])
+    save_job_object(jobId, "job", job)
+
+    # From here on the indexing handlers record their changes for the new index
+    set_reindex_build_index(aosclient, alias, job['buildIndex'])
+
+    for segment in range(segments):
+        save_job_object(jobId, f"segments/{segment}", {
+            'segment': segment, 'done': False, 'lastEvaluatedKey': None, 'assetCount': 0})
+        invoke_job({'reindexSegment': {'jobId': jobId, 'segment': segment}}, context.function_name)
+    logger.info(f"Started reindex job {jobId} building {job['buildIndex']} with {segments} segments")
+    return job
+
+
+def run_segment(payload, context):
+    """Index the assets of one scan segment, continuing in a new invocation before the timeout"""
+    deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - REINDEX_JOB_MARGIN_SECONDS
+    job = load_job_object(payload['jobId'], "job")
+    if job['status'] != "BUILDING":
+        logger.info(f"Reindex job {job['jobId']} is {job['status']}, segment {payload['segment']} stops")
+        return
+
+    progress = load_job_object(job['jobId'], f"segments/{payload['segment']}")
+    aosclient, _ = get_search_index()
+    s3index = AOSIndexS3Objects(aosclient, job['buildIndex'], suggestIndexName=suggest_index_name(job['alias']))
+    table = dynamodb.Table(asset_Database)
+
+    while not progress['done']:
+        scan = {"Segment": progress['segment'], "TotalSegments": job['segments'], "Limit": REINDEX_SCAN_PAGE_SIZE}
+        if progress['lastEvaluatedKey']:
+            scan["ExclusiveStartKey"] = progress['lastEvaluatedKey']
+        page = table.scan(**scan)
+        assets = page.get("Items", [])
+        indexed = index_assets(s3index, assets, deadline)
+        progress['assetCount'] += indexed
+        if indexed < len(assets):
+            # Scans continue after the key of any item of the segment, the next invocation starts after the last indexed asset
+            progress['lastEvaluatedKey'] = {"databaseId": assets[indexed - 1]['databaseId'],
+                                            "assetId": assets[indexed - 1]['assetId']}
+        else:
+            progress['lastEvaluatedKey'] = page.get("LastEvaluatedKey")
+        progress['done'] = progress['lastEvaluatedKey'] is None
+        save_job_object(job['jobId'], f"segments/{progress['segment']}", progress)
+
+        if not progress['done'] and time.time() > deadline:
+            logger.info(f"Continuing segment {progress['segment']} of reindex job {job['jobId']}")
+            invoke_job({'reindexSegment': payload}, context.function_name)
+            return
+
+    if all(segment['done'] for segment in load_segments(job)):
+        finalize_job(job, aosclient)
+
+
+def finalize_job(job, aosclient):
+    """Apply the recorded changes, move the alias to the new index and drop the previous index"""
+    opensearchpy = opensearch_module()
+    indexName = job['buildIndex']
+    try:
+        aosclient.create(index=indexName, id=REINDEX_FINALIZE_DOCUMENT_ID, body={"_rectype": "reindexfinalize"})
+    except opensearchpy.ConflictError:
+        logger.info(f"Reindex job {job['jobId']} is already being finalized")
+        return
+
+    try:
+        job['status'] = "FINALIZING"
+        save_job_object(job['jobId'], "job", job)
+        replay_changes(aosclient, job)
+
+        aosclient.indices.put_settings(index=indexName, body={"index": {
+            "number_of_replicas": job['liveSettings']['numberOfReplicas'],
+            "refresh_interval": job['liveSettings']['refreshInterval'],
+        }})
+        aosclient.indices.refresh(index=indexName)
+
+        # Indexing handlers that wrote through the alias before it moved read the state of the new index
+        set_reindex_build_index(aosclient, indexName, indexName)
+        previous, concrete = get_alias_indexes(aosclient, job['alias'])
+        if indexName not in previous:
+            if concrete:
+                actions = [{"remove_index": {"index": job['alias']}}]
+            else:
+                actions = [{"remove": {"index": index, "alias": job['alias']}} for index in previous]
+            aosclient.indices.update_aliases(body={"actions": actions + [{"add": {"index": indexName, "alias": job['alias']}}]})
+            job['previousIndexes'] = [] if concrete else previous
+        logger.info(f"Moved alias {job['alias']} of reindex job {job['jobId']} to {indexName}")
+
+        settle_changes(aosclient, job)
+        set_reindex_build_index(aosclient, indexName, None)
+        # Changes recorded between the last poll and the end of the job
+        replay_changes(aosclient, job)
+        bump_index_generation(aosclient, indexName)
+        aosclient.delete(index=indexName, id=REINDEX_FINALIZE_DOCUMENT_ID)
+        for index in job.get('previousIndexes', []):
+            aosclient.indices.delete(index=index, ignore_unavailable=True)
+
+        job.update({'status': "COMPLETED", 'completedAt': time.time()})
+    except Exception as e:
+        logger.exception(f"Error finalizing reindex job {job['jobId']}: {e}")
+        job.update({'status': "FAILED", 'message': "Finalizing the reindex job failed, resume it to try again"})
+    save_job_object(job['jobId'], "job", job)
+
+
+def resume_job(event, context):
+    """Start the unfinished segments of a job again, or finalize it again when all segments are done"""
+    job = load_job_object(event['jobId'], "job")
+    if job['status'] in ("COMPLETED", "CANCELLED"):
+        raise ValueError(f"Reindex job {job['jobId']} is {job['status']}")
+
+    segments = load_segments(job)
+    if job['status'] == "FINALIZING" or all(segment['done'] for segment in segments):
+        aosclient, _ = get_search_index()
+        try:
+            aosclient.delete(index=job['buildIndex'], id=REINDEX_FINALIZE_DOCUMENT_ID)
+        except opensearch_module().NotFoundError:
+            pass
+        job['status'] = "BUILDING"
+        finalize_job(job, aosclient)
+        return job
+
+    job['status'] = "BUILDING"
+    save_job_object(job['jobId'], "job", job)
+    for segment in segments:
+        if not segment['done']:
+            invoke_job({'reindexSegment': {'jobId': job['jobId'], 'segment': segment['segment']}},
+                       context.function_name)
+    return job
+
+
+def cancel_job(event):
+    """Stop a job that did not move the alias yet and delete its index"""
+    job = load_job_object(event['jobId'], "job")
+    if job['status'] == "COMPLETED":
+        raise ValueError(f"Reindex job {job['jobId']} is COMPLETED")
+
+    aosclient, alias = get_search_index()
+    if job['buildIndex'] in get_alias_indexes(aosclient, alias)[0]:
+        raise ValueError(f"The alias already points to the index of reindex job {job['jobId']}, resume it instead")
+    set_reindex_build_index(aosclient, alias, None)
+    aosclient.indices.delete(index=job['buildIndex'], ignore_unavailable=True)
+    job['status'] = "CANCELLED"
+    save_job_object(job['jobId'], "job", job)
+    return job
+
+
+def get_job_status(event):
+    job = load_job_object(event['jobId'], "job")
+    segments = load_segments(job)
+    job['segmentsDone'] = len([segment for segment in segments if segment['done']])
+    job['assetCount'] = sum(segment['assetCount'] for segment in segments)
+    return job
+
+
+@trace_invocation
+@bumps_index_generation
+def lambda_handler(event, context):
+    if 'reindexSegment' in event:
+        run_segment(event['reindexSegment'], context)
+        return
+
+    logger.info(event)
+    action = event.get('action')
+    if action == "start":
+        return start_job(event, context)
+    if action == "resume":
+        return resume_job(event, context)
+    if action == "cancel":
+        return cancel_job(event)
+    if action == "status":
+        return get_job_status(event)
+    raise ValueError("action must be one of start, status, resume or cancel")
@@ -6,29 +6,31 @@ the business logic below manages mapping the Amazon S3 information to VAMS asset
 import json
 import os
 import re
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import time
 from botocore.config import Config
 from datetime import datetime
 from handlers.metadata import to_update_expr
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from handlers.assets.createAsset import create_asset
 from models.assetsV3 import CreateAssetRequestModel
 from handlers.databases.createDatabase import create_database
 from models.databases import CreateDatabaseRequestModel
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.parser import parse, ValidationError
+from pydantic import ValidationError
+from models.common import parse
 from typing import Dict, List, Optional, Any, Union, Tuple
 from botocore.exceptions import ClientError
 from boto3.dynamodb.conditions import Key
 from common.validators import validate
 
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-sns_client = boto3.client('sns')
-s3_client = boto3.client('s3')
-lambda_client = boto3.client('lambda')
-dynamodb_client = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+sns_client = lazy_client('sns')
+s3_client = lazy_client('s3')
+lambda_client = lazy_client('lambda')
+dynamodb_client = lazy_client('dynamodb')
 logger = safeLogger(service_name="sqsBucketSync")
 
 reservedPrefixFolders = ['temp-upload', 'temp-uploads', 'preview','previews', 'pipeline', 'piplines']
@@ -870,7 +872,7 @@ def process_s3_record(record: Dict) -> Tuple[bool, str]:
         return True, f"Successfully processed {object_key}"
     except Exception as e:
         logger.exception(f"Error processing S3 record: {e}")
-        return False, f"Error processing S3 record.}"
+        return False, "Error processing S3 record."
 
 def on_storage_event_created(event):
     """
@@ -1041,6 +1043,7 @@ def parse_event(event):
     logger.warning("Could not parse event into a standard format, returning original event")
     return event
 
+@trace_invocation
 def lambda_handler_created(event, context):
     """
     Handler for file creation events from SQS
@@ -1082,6 +1085,7 @@ def lambda_handler_created(event, context):
         # We don't run the indexing lambda on unhandled exceptions to avoid potential data corruption
         # This is a change from the previous behavior where we would still run the indexing lambda
 
+@trace_invocation
 def lambda_handler_deleted(event, context):
     """
     Handler for file deleted events from SQS
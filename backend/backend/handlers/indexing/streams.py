@@ -3,29 +3,56 @@
 
 import json
 import boto3
+from common.awsClients import lazy_client, lazy_resource, opensearch_module, create_opensearch_client
 import os
 from decimal import Decimal
-from urllib.parse import urlparse
 import time
 import re
-from opensearchpy import OpenSearch, \
-    RequestsHttpConnection, AWSV4SignerAuth, NotFoundError
 from boto3.dynamodb.types import TypeDeserializer
 from common import get_ssm_parameter_value
 from boto3.dynamodb.conditions import Key
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.dynamodb import batch_get_items
+from common.indexGeneration import bumps_index_generation, mark_index_changed
+from common.searchSuggestions import asset_suggestions, file_suggestion, file_suggestion_id, suggest_index_name, \
+    suggestion_asset_fields, SUGGEST_TYPE_FILE
 from botocore.exceptions import ClientError
 
 logger = safeLogger(service="IndexingStreams")
 
-s3client = boto3.client("s3")
-dynamodbClient = boto3.client("dynamodb")
-dynamodbResource = boto3.resource('dynamodb')
+s3client = lazy_client("s3")
+dynamodbClient = lazy_client("dynamodb")
+dynamodbResource = lazy_resource('dynamodb')
 deserialize = TypeDeserializer().deserialize
 
+
 s3_asset_buckets_table = os.environ["S3_ASSET_BUCKETS_STORAGE_TABLE_NAME"]
 buckets_table = dynamodbResource.Table(s3_asset_buckets_table)
 
+# S3 objects of an asset indexed per bulk metadata read (one S3 listing page)
+S3_INDEXING_BATCH_SIZE = 1000
+# Documents written or deleted per OpenSearch _bulk request
+OPENSEARCH_BULK_MAX_DOCUMENTS = 500
+# Deletes and updates by query run as sliced tasks on provisioned domains, polled until they complete
+BY_QUERY_TASK_POLL_SECONDS = 1
+BY_QUERY_TASK_MAX_WAIT_SECONDS = 600
+# Rounds of a delete by query run again while documents of the query are left (indexed while it ran)
+DELETE_BY_QUERY_MAX_ROUNDS = 3
+# Hits deleted per search where delete by query tasks are not available (serverless collections)
+DELETE_BY_SEARCH_PAGE_SIZE = 1000
+# Asset table fields written into the search document of an asset
+ASSET_DOCUMENT_FIELDS = ("assetName", "description", "assetType", "tags")
+# Fields of file documents that come from the S3 object (lower case, without the type prefix),
+# file documents are indexed again from S3 when an asset field of the same name changes
+S3_OBJECT_FIELDS = {"key", "lastmodified", "etag", "size", "storageclass", "checksumalgorithm", "restorestatus",
+                    "fileext"}
+# Sets the changed asset fields of the file documents of an asset and removes the deleted ones
+PROPAGATE_ASSET_FIELDS_SCRIPT = """
+for (entry in params.changed.entrySet()) { ctx._source[entry.getKey()] = entry.getValue(); }
+for (field in params.removed) { ctx._source.remove(field); }
+"""
+
 #
 # Single doc Example
 #
@@ -63,6 +90,33 @@ class ValidationError(Exception):
         self.resp = resp
 
 
+def bulk_write_documents(client, indexName, documents=(), deletedIds=(), otherIndexDocuments=()):
+    """Index and delete documents of a search index with _bulk requests
+
+    Args:
+        documents: (document ID, document) pairs to index
+        deletedIds: IDs of the documents to delete, documents that don't exist are ignored
+        otherIndexDocuments: (index name, document ID, document) triples of other indexes (the
+            suggestion index) to index in the same requests
+    """
+    actions = [({"index": {"_index": indexName, "_id": id}}, body) for id, body in documents] + \
+        [({"index": {"_index": index, "_id": id}}, body) for index, id, body in otherIndexDocuments] + \
+        [({"delete": {"_index": indexName, "_id": id}}, None) for id in deletedIds]
+    for start in range(0, len(actions), OPENSEARCH_BULK_MAX_DOCUMENTS):
+        body = []
+        for action, document in actions[start:start + OPENSEARCH_BULK_MAX_DOCUMENTS]:
+            body.append(action)
+            if document is not None:
+                body.append(document)
+        response = client.bulk(body=body)
+        if not response.get("errors"):
+            continue
+        failed = [result for item in response.get("items", []) for operation, result in item.items()
+                  if result.get("status", 200) >= 300 and not (operation == "delete" and result.get("status") == 404)]
+        if failed:
+            raise Exception(f"Unable to write {len(failed)} documents of the search index: {failed[0].get('error')}")
+
+
 class MetadataTable():
 
     def __init__(self, table):
@@ -118,6 +172,31 @@ class MetadataTable():
 
         return result
 
+    def get_metadata_with_prefixes(self, databaseId, assetId, paths):
+        """Effective metadata of many S3 keys of one asset, merged like get_metadata_with_prefix
+
+        All prefix keys of the paths are deduplicated and read with BatchGetItem, instead of one
+        get_item per prefix of every key.
+
+        Returns:
+            Dictionary of path to metadata without private (underscore) keys
+        """
+        path_keys = {path: [assetId] + self.generate_prefixes2(path) for path in paths}
+        items = self.batch_get_items(databaseId, [key for keys in path_keys.values() for key in keys])
+
+        result = {}
+        for path, keys in path_keys.items():
+            metadata = {}
+            for key in keys:
+                metadata = metadata | items.get(key, {})
+            result[path] = {key: value for key, value in metadata.items() if not key.startswith('_')}
+        return result
+
+    def batch_get_items(self, databaseId, keys):
+        """Metadata records of many keys of one database by key, keys without a record are left out"""
+        keys = [{"databaseId": databaseId, "assetId": key} for key in dict.fromkeys(keys)]
+        return {item["assetId"]: item for item in batch_get_items(self.table, keys)}
+
     def get_metadata(self, databaseId, assetId):
         resp = self.table.get_item(
             Key={
@@ -135,49 +214,45 @@ class MetadataTable():
 
         return resp['Item']
     
-    def write_asset_table_updated_event(self, databaseId, assetId):
-        self.table.update_item(
-            Key={
-                "databaseId": databaseId,
-                "assetId": assetId,
-            },
-            UpdateExpression="SET #_asset_table_updated = :_asset_table_updated",
-            ExpressionAttributeNames={
-                "#_asset_table_updated": "_asset_table_updated",
-            },
-            ExpressionAttributeValues={
-                ":_asset_table_updated": Decimal(time.time()),
-            },
-        )
+    def get_prefix_items(self, databaseId, assetId):
+        """Metadata records of the files and folders of an asset, without private (underscore) keys"""
+        items = []
+        query = {"KeyConditionExpression": Key("databaseId").eq(databaseId) & Key("assetId").begins_with(assetId + "/")}
+        while True:
+            response = self.table.query(**query)
+            items.extend({key: value for key, value in item.items() if not key.startswith('_')}
+                         for item in response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
 class AOSIndexS3Objects():
     def __init__(self,
-                 aosclient, indexName, metadataTable=MetadataTable.from_env):
+                 aosclient, indexName, metadataTable=MetadataTable.from_env, suggestIndexName=None):
         self.aosclient = aosclient
         self.indexName = indexName
         self.metadataTable = metadataTable()
+        # File name suggestions are written to this index, none when it is None
+        self.suggestIndexName = suggestIndexName
+        # Bucket details by bucket ID, assets of a database share a few buckets
+        self._bucket_details = {}
 
     @staticmethod
     def from_env(env=os.environ):
         region = env.get('AWS_REGION')
         service = env.get('AOS_TYPE')  # aoss (serverless) or es (provisioned)
         credentials = boto3.Session().get_credentials()
-        auth = AWSV4SignerAuth(credentials, region, service)
+        auth = opensearch_module().AWSV4SignerAuth(credentials, region, service)
         host = get_ssm_parameter_value('AOS_ENDPOINT_PARAM', region, env)
         indexName = get_ssm_parameter_value(
             'AOS_INDEX_NAME_PARAM', region, env)
-        aosclient = OpenSearch(
-            hosts=[{'host': urlparse(host).hostname, 'port': 443}],
-            http_auth=auth,
-            use_ssl=True,
-            verify_certs=True,
-            connection_class=RequestsHttpConnection,
-            pool_maxsize=20,
-        )
-        return AOSIndexS3Objects(aosclient, indexName)
+        aosclient = create_opensearch_client(host, auth)
+        return AOSIndexS3Objects(aosclient, indexName, suggestIndexName=suggest_index_name(indexName))
     
     def _get_default_bucket_details(self, bucketId):
         """Get default S3 bucket details from database default bucket DynamoDB"""
+        if bucketId in self._bucket_details:
+            return self._bucket_details[bucketId]
         try:
 
             bucket_response = buckets_table.query(
@@ -202,11 +277,12 @@ class AOSIndexS3Objects():
             if base_assets_prefix.startswith('/'):
                 base_assets_prefix = base_assets_prefix[1:]
 
-            return {
+            self._bucket_details[bucketId] = {
                 'bucketId': bucket_id,
                 'bucketName': bucket_name,
                 'baseAssetsPrefix': base_assets_prefix
             }
+            return self._bucket_details[bucketId]
         except Exception as e:
             logger.exception(f"Error getting bucket details: {e}")
             raise Exception(f"Error getting bucket details.")
@@ -227,18 +303,14 @@ class AOSIndexS3Objects():
             del s3object['Owner']
         s3object['fileext'] = s3object['Key'].split('.')[-1]
 
-        logger.info("s3object")
-        logger.info(s3object)
-        logger.info("metadata")
-        logger.info(metadata)
         result = {
             x: y
             for k, v in (s3object | metadata).items()
             for x, y in AOSIndexAssetMetadata._determine_field_name(k, v)
         }
         result['_rectype'] = 's3object'
-        logger.info("aos s3")
-        logger.info(result)
+        # Runs for every indexed file, debug only
+        logger.debug({"s3object": s3object, "metadata": metadata, "aos": result})
         return result
 
     def get_asset_fields(self, databaseId, assetId):
@@ -249,41 +321,54 @@ class AOSIndexS3Objects():
                 "assetId": assetId,
                 "databaseId": databaseId,
             },
-            AttributesToGet=[
-                'assetName', "description", "assetType", "tags", "bucketId"
-            ],
+            AttributesToGet=list(ASSET_DOCUMENT_FIELDS) + ["bucketId"],
         )
 
         return result.get('Item')
 
-    def process_single_s3_object(self, databaseId, assetId,
-                                 s3object, asset_fields=None):
-        if asset_fields is None:
-            asset_fields = self.get_asset_fields(databaseId, assetId)
-        metadata = self.metadataTable.get_metadata_with_prefix(
-            databaseId, assetId, s3object.get("Key"))
+    def _s3_object_document(self, s3object, asset_fields, metadata):
         metadata = metadata | asset_fields
 
         # enables delete by assetId
         if "assetId" in metadata and "/" in metadata['assetId']:
             metadata['assetId'] = metadata['assetId'].split("/")[0]
 
-        aosrecord = self._metadata_and_s3_object_to_opensearch(
-            s3object, metadata)
+        return self._metadata_and_s3_object_to_opensearch(s3object, metadata)
+
+    def process_single_s3_object(self, databaseId, assetId,
+                                 s3object, asset_fields=None, metadata=None):
+        if asset_fields is None:
+            asset_fields = self.get_asset_fields(databaseId, assetId)
+        if metadata is None:
+            metadata = self.metadataTable.get_metadata_with_prefix(
+                databaseId, assetId, s3object.get("Key"))
+
+        aosrecord = self._s3_object_document(s3object, asset_fields, metadata)
+        mark_index_changed(self.aosclient, self.indexName, {"databaseId": databaseId, "assetId": assetId})
         self.aosclient.index(
             index=self.indexName,
             body=aosrecord,
             id=s3object['Key'],
             #refresh = True
         )
+        if self.suggestIndexName:
+            suggestionId, suggestion = file_suggestion(self._suggestion_asset(databaseId, assetId, asset_fields),
+                                                       s3object['Key'])
+            self.aosclient.index(index=self.suggestIndexName, body=suggestion, id=suggestionId)
 
     def delete_item(self, key):
+        mark_index_changed(self.aosclient, self.indexName, {"deletedId": key})
+        if self.suggestIndexName:
+            try:
+                self.aosclient.delete(index=self.suggestIndexName, id=file_suggestion_id(key))
+            except opensearch_module().NotFoundError:
+                logger.info("no file name suggestion of " + key)
         try:
             return self.aosclient.delete(
                 index=self.indexName,
                 id=key,
             )
-        except NotFoundError:
+        except opensearch_module().NotFoundError:
             logger.exception("caught not found error on "+key+"likely already deleted.")
 
     def process_item(self, databaseId, assetIdOrPrefix):
@@ -302,26 +387,55 @@ class AOSIndexS3Objects():
             logger.info("prefix is None")
             logger.info(assetIdOrPrefix)
 
+        self.index_asset_files(databaseId, assetId, asset_fields, assetIdOrPrefix)
+
+    def index_asset_files(self, databaseId, assetId, asset_fields, prefix=None):
+        """Index the S3 objects of an asset, or of one of its key prefixes
+
+        Args:
+            asset_fields: Asset table fields of the asset, including bucketId
+        """
         bucket_details = self._get_default_bucket_details(asset_fields['bucketId'])
         bucket = bucket_details['bucketName']
 
-        for s3object in self._get_s3_object_keys_generator(assetIdOrPrefix, bucket):
-            self.process_single_s3_object(databaseId, assetId,
-                                          s3object, asset_fields)
+        batch = []
+        for s3object in self._get_s3_object_keys_generator(prefix or assetId, bucket):
+            batch.append(s3object)
+            if len(batch) == S3_INDEXING_BATCH_SIZE:
+                self._process_s3_object_batch(databaseId, assetId, batch, asset_fields)
+                batch = []
+        if batch:
+            self._process_s3_object_batch(databaseId, assetId, batch, asset_fields)
+
+    @staticmethod
+    def _suggestion_asset(databaseId, assetId, asset_fields):
+        return suggestion_asset_fields(databaseId, assetId, asset_fields.get("assetName"),
+                                       asset_fields.get("assetType"), asset_fields.get("tags"))
+
+    def _process_s3_object_batch(self, databaseId, assetId, s3objects, asset_fields):
+        # One bulk metadata read and one bulk write for the whole batch
+        metadata_by_key = self.metadataTable.get_metadata_with_prefixes(
+            databaseId, assetId, [s3object["Key"] for s3object in s3objects])
+        documents = [
+            (s3object["Key"], self._s3_object_document(s3object, asset_fields, metadata_by_key[s3object["Key"]]))
+            for s3object in s3objects
+        ]
+        suggestions = []
+        if self.suggestIndexName:
+            asset = self._suggestion_asset(databaseId, assetId, asset_fields)
+            suggestions = [(self.suggestIndexName, *file_suggestion(asset, s3object["Key"])) for s3object in s3objects]
+        mark_index_changed(self.aosclient, self.indexName, {"databaseId": databaseId, "assetId": assetId})
+        bulk_write_documents(self.aosclient, self.indexName, documents, otherIndexDocuments=suggestions)
 
 
 class AOSIndexAssetMetadata():
 
-    def __init__(self, host, auth, region, service, indexName):
-        self.client = OpenSearch(
-            hosts=[{'host': urlparse(host).hostname, 'port': 443}],
-            http_auth=auth,
-            use_ssl=True,
-            verify_certs=True,
-            connection_class=RequestsHttpConnection,
-            pool_maxsize=20
-        )
+    def __init__(self, host, auth, region, service, indexName, suggestIndexName=None):
+        self.client = create_opensearch_client(host, auth)
         self.indexName = indexName
+        self.service = service
+        # Asset name and tag suggestions are written to this index, none when it is None
+        self.suggestIndexName = suggestIndexName
 
     @staticmethod
     def from_env(env=os.environ):
@@ -330,7 +444,7 @@ class AOSIndexAssetMetadata():
         region = env.get('AWS_REGION')
         service = env.get('AOS_TYPE')  # aoss (serverless) or es (provisioned)
         credentials = boto3.Session().get_credentials()
-        auth = AWSV4SignerAuth(credentials, region, service)
+        auth = opensearch_module().AWSV4SignerAuth(credentials, region, service)
         host = get_ssm_parameter_value('AOS_ENDPOINT_PARAM', region, env)
         indexName = get_ssm_parameter_value(
             'AOS_INDEX_NAME_PARAM', region, env)
@@ -340,7 +454,8 @@ class AOSIndexAssetMetadata():
             region=region,
             service=service,
             auth=auth,
-            indexName=indexName)
+            indexName=indexName,
+            suggestIndexName=suggest_index_name(indexName))
 
     @staticmethod
     def _determine_field_type(data):
@@ -435,60 +550,282 @@ class AOSIndexAssetMetadata():
             name=field_name, data_type=data_type), _data_conv())]
 
     @staticmethod
-    def _process_item(item):
+    def asset_document(image):
+        """Search document of an asset from its metadata record merged with its asset table fields"""
         result = {
             x: y
-            for k, v in item["dynamodb"]["NewImage"].items()
-            for x, y in AOSIndexAssetMetadata._determine_field_name(
-                k, deserialize(v))
+            for k, v in image.items()
+            for x, y in AOSIndexAssetMetadata._determine_field_name(k, v)
         }
         result['_rectype'] = 'asset'
         return result
 
+    @staticmethod
+    def _process_item(item):
+        return AOSIndexAssetMetadata.asset_document(
+            {k: deserialize(v) for k, v in item["dynamodb"]["NewImage"].items()})
+
     def process_item(self, item):
         try:
-            body = AOSIndexAssetMetadata._process_item(item)
-            return self.client.index(
-                index=self.indexName,
-                body=body,
-                id=item['dynamodb']['Keys']['assetId']['S'],
-                #refresh = True,
-            )
+            return self.index_document(
+                item['dynamodb']['Keys']['databaseId']['S'],
+                item['dynamodb']['Keys']['assetId']['S'],
+                AOSIndexAssetMetadata._process_item(item))
         except Exception as e:
             logger.exception(item)
             raise e
 
+    def index_document(self, databaseId, assetId, document):
+        mark_index_changed(self.client, self.indexName, {"databaseId": databaseId, "assetId": assetId})
+        return self.client.index(
+            index=self.indexName,
+            body=document,
+            id=assetId,
+            #refresh = True,
+        )
+
+    def index_suggestions(self, databaseId, assetId, previous, document):
+        """Write the name and tag suggestions of an asset from its search document
+
+        The suggestions of removed tags are deleted. The asset fields of the file name suggestions
+        are updated when the asset was renamed, retyped or retagged.
+
+        Args:
+            previous: The search document of the asset before the change, None for a new asset
+        """
+        if not self.suggestIndexName:
+            return
+
+        def suggestion_asset(databaseId, document):
+            return suggestion_asset_fields(databaseId, assetId, document.get("str_assetname"),
+                                           document.get("str_assettype"), document.get("list_tags"))
+
+        asset = suggestion_asset(databaseId, document)
+        previous_asset = None if previous is None else suggestion_asset(
+            previous.get("str_databaseid", databaseId), previous)
+        if asset == previous_asset:
+            return
+
+        suggestions = asset_suggestions(asset)
+        previous_suggestions = {} if previous_asset is None else asset_suggestions(previous_asset)
+        bulk_write_documents(self.client, self.suggestIndexName, suggestions.items(),
+                             [id for id in previous_suggestions if id not in suggestions])
+        if previous_asset is not None:
+            self._update_file_suggestions(assetId, asset)
+
+    def _update_file_suggestions(self, assetId, asset):
+        """Set the asset fields of the file name suggestions of an asset with an update by query task
+
+        The task is not waited for. Serverless collections have no update by query, their file
+        documents and file name suggestions are indexed again (propagate_asset_fields).
+        """
+        if self.service != "es":
+            return
+        query = {"bool": {"filter": [{"term": {"assetId": assetId}}, {"term": {"type": SUGGEST_TYPE_FILE}}]}}
+        self.client.update_by_query(
+            index=self.suggestIndexName,
+            body={"query": query, "script": {"source": PROPAGATE_ASSET_FIELDS_SCRIPT, "lang": "painless",
+                                             "params": {"changed": asset, "removed": []}}},
+            params={"conflicts": "proceed", "wait_for_completion": "false"},
+        )
+
+    def get_document(self, assetId):
+        """The indexed document of an asset, None when it isn't indexed"""
+        try:
+            return self.client.get(index=self.indexName, id=assetId)["_source"]
+        except opensearch_module().NotFoundError:
+            return None
+
+    def propagate_asset_fields(self, databaseId, assetId, previous, document, metadataTable):
+        """Write the changed asset fields into the file documents of the asset with one update by query task
+
+        File documents carry the asset table fields and the asset metadata of their asset. Instead of
+        indexing every file again from S3 and the metadata table, only the fields that differ from the
+        previously indexed asset document are written.
+
+        Args:
+            previous: The asset document before the change, see get_document()
+            document: The new asset document
+
+        Returns:
+            True when the file documents are up to date, False when they have to be indexed again
+            (new asset, serverless collection, a changed field that file metadata overrides or a failed task)
+        """
+        if previous is None or self.service != "es":
+            return False
+        changed = {field: value for field, value in document.items()
+                   if field != "_rectype" and previous.get(field) != value}
+        removed = [field for field in previous if field != "_rectype" and field not in document]
+        if not changed and not removed:
+            return True
+
+        fields = set(changed) | set(removed)
+        if any(field.split("_", 1)[-1] in S3_OBJECT_FIELDS for field in fields):
+            return False
+        for item in metadataTable.get_prefix_items(databaseId, assetId):
+            for key, value in item.items():
+                if any(name in fields for name, _ in self._determine_field_name(key, value)):
+                    return False
+
+        mark_index_changed(self.client, self.indexName, {"databaseId": databaseId, "assetId": assetId})
+        try:
+            task = self.client.update_by_query(
+                index=self.indexName,
+                body={
+                    "query": {"bool": {"filter": [
+                        {"term": {"str_assetid.raw": assetId}},
+                        {"term": {"_rectype": "s3object"}},
+                    ]}},
+                    "script": {
+                        "lang": "painless",
+                        "source": PROPAGATE_ASSET_FIELDS_SCRIPT,
+                        "params": {"changed": changed, "removed": removed},
+                    },
+                },
+                params={"slices": "auto", "conflicts": "proceed", "wait_for_completion": "false"},
+            )["task"]
+            response = self._wait_for_task(task)
+        except Exception as e:
+            logger.warning(f"Unable to update the file documents of asset {assetId} by query: {str(e)}")
+            return False
+        logger.info(f"Updated {sorted(fields)} of {response.get('updated', 0)} file documents of asset {assetId}")
+        return True
+
     def delete_item(self, assetId):
+        mark_index_changed(self.client, self.indexName, {"deletedId": assetId})
         try:
             return self.client.delete(
                 index=self.indexName,
                 id=assetId,
             )
-        except NotFoundError:
+        except opensearch_module().NotFoundError:
             logger.exception("caught not found error on opensearch asset record "+assetId+" likely already deleted.")
             return None
 
     def delete_item_by_query(self, assetId):
-        results = self.client.search(
-            index=self.indexName,
-            body={
-                "query": {
-                    "match": {
-                        "str_assetid": assetId
-                    }
-                }
-            }
+        """Delete the asset document and every file document of an asset
+
+        Returns:
+            Number of deleted documents
+        """
+        mark_index_changed(self.client, self.indexName, {"deletedAssetId": assetId})
+        self._delete_suggestions(assetId)
+        # Exact asset ID, the analyzed field also matches other assets sharing a part of the ID
+        query = {"query": {"term": {"str_assetid.raw": assetId}}}
+        if self.service != "es":
+            return self._delete_by_search(query)
+
+        deleted = 0
+        for _ in range(DELETE_BY_QUERY_MAX_ROUNDS):
+            deleted += self._delete_by_query_task(query)
+            # Completion check, documents indexed while the task ran are deleted by another round
+            remaining = self.client.count(index=self.indexName, body=query)["count"]
+            if remaining == 0:
+                return deleted
+        logger.warning(f"{remaining} search documents of asset {assetId} are left after deleting by query")
+        return deleted
+
+    def _delete_suggestions(self, assetId):
+        """Delete the name, tag and file name suggestions of an asset, without waiting for a task"""
+        if not self.suggestIndexName:
+            return
+        query = {"query": {"term": {"assetId": assetId}}}
+        if self.service != "es":
+            self._delete_by_search(query, self.suggestIndexName)
+            return
+        self.client.delete_by_query(
+            index=self.suggestIndexName,
+            body=query,
+            params={"conflicts": "proceed", "wait_for_completion": "false"},
         )
 
-        ids = [
-            r.get('_id')
-            for r in results.get("hits", {}).get("hits", [])
-            if "_id" in r
-        ]
-        return [
-            self.delete_item(item)
-            for item in ids
-        ]
+    def _delete_by_query_task(self, query):
+        """Delete the documents of a query with a sliced delete by query task and wait for it to complete"""
+        task = self.client.delete_by_query(
+            index=self.indexName,
+            body=query,
+            params={"slices": "auto", "conflicts": "proceed", "refresh": "true", "wait_for_completion": "false"},
+        )["task"]
+        return self._wait_for_task(task).get("deleted", 0)
+
+    def _wait_for_task(self, task):
+        """Wait for a by query task to complete
+
+        Returns:
+            The task response
+
+        Raises:
+            Exception: When the task failed or did not complete in BY_QUERY_TASK_MAX_WAIT_SECONDS
+        """
+        deadline = time.time() + BY_QUERY_TASK_MAX_WAIT_SECONDS
+        status = self.client.tasks.get(task_id=task)
+        while not status.get("completed"):
+            if time.time() > deadline:
+                raise Exception(f"Task {task} did not complete in {BY_QUERY_TASK_MAX_WAIT_SECONDS} seconds")
+            time.sleep(BY_QUERY_TASK_POLL_SECONDS)
+            status = self.client.tasks.get(task_id=task)
+
+        response = status.get("response", {})
+        if status.get("error") or response.get("failures"):
+            raise Exception(f"Task {task} failed: {status.get('error') or response['failures'][0]}")
+        return response
+
+    def _delete_by_search(self, query, indexName=None):
+        """Delete the documents of a query page by page with _bulk requests, from the search index by default
+
+        Pages follow each other with search_after on the document ID, so documents that were deleted but
+        are still found until the collection refreshes don't hold up the next page. A count confirms the
+        deletion like on provisioned domains. Until the collection refreshes it also counts the deleted
+        documents, so another pass runs and the deletion is complete when it finds no other documents.
+
+        Returns:
+            Number of deleted documents
+        """
+        indexName = indexName or self.indexName
+        deleted = set()
+        for _ in range(DELETE_BY_QUERY_MAX_ROUNDS):
+            found = len(deleted)
+            search_after = None
+            while True:
+                body = {**query, "size": DELETE_BY_SEARCH_PAGE_SIZE, "_source": False, "sort": [{"_id": "asc"}]}
+                if search_after is not None:
+                    body["search_after"] = search_after
+                hits = self.client.search(index=indexName, body=body).get("hits", {}).get("hits", [])
+                ids = [hit["_id"] for hit in hits if hit["_id"] not in deleted]
+                if ids:
+                    bulk_write_documents(self.client, indexName, deletedIds=ids)
+                    deleted.update(ids)
+                if len(hits) < DELETE_BY_SEARCH_PAGE_SIZE:
+                    break
+                search_after = hits[-1]["sort"]
+
+            if self.client.count(index=indexName, body=query)["count"] == 0 or len(deleted) == found:
+                return len(deleted)
+            # Documents indexed while the pages were read, or deleted ones before the collection refreshed
+            time.sleep(BY_QUERY_TASK_POLL_SECONDS)
+        logger.warning(f"Search documents of {indexName} may be left after deleting {len(deleted)} by search")
+        return len(deleted)
+
+
+def index_asset(client, s3index, databaseId, assetId, document, asset_fields=None):
+    """Index the search document of an asset, then bring the file documents of the asset up to date
+
+    Args:
+        asset_fields: Asset table fields of the asset, including bucketId. Read from the asset
+            table when None
+    """
+    previous = client.get_document(assetId)
+    logger.info(client.index_document(databaseId, assetId, document))
+    client.index_suggestions(databaseId, assetId, previous, document)
+
+    # Asset field and asset metadata changes only update the changed fields of the file documents
+    s3_index = s3index()
+    if client.propagate_asset_fields(databaseId, assetId, previous, document, s3_index.metadataTable):
+        return
+    if asset_fields is None:
+        s3_index.process_item(databaseId, assetId)
+    else:
+        s3_index.index_asset_files(databaseId, assetId, asset_fields)
 
 
 def get_asset_fields(keys):
@@ -514,9 +851,7 @@ def get_asset_fields(keys):
         result = dynamodbClient.get_item(
             TableName=os.environ.get("ASSET_STORAGE_TABLE_NAME"),
             Key=keys,
-            AttributesToGet=[
-                'assetName', "description", "assetType", "tags"
-            ],
+            AttributesToGet=list(ASSET_DOCUMENT_FIELDS),
         )
 
         if result.get("Item") is None:
@@ -590,7 +925,6 @@ def handle_s3_event_record_removed(record, s3index_fn):
 def handle_s3_event_record(record,
                            bucketName = '',
                            bucketPrefix = '',
-                           metadata_fn=MetadataTable.from_env,
                            get_asset_fields_fn=get_asset_fields,
                            s3index_fn=AOSIndexS3Objects.from_env,
                            sleep_fn=time.sleep):
@@ -633,8 +967,6 @@ def handle_s3_event_record(record,
         logger.info(record)
         return
 
-    metadata = metadata_fn()
-
     head_result = s3client.head_object(
         Bucket=record['s3']['bucket']['name'],
         Key=record['s3']['object']['key'],
@@ -655,16 +987,8 @@ def handle_s3_event_record(record,
     if databaseId is None or assetId is None:
         logger.info("databaseId or assetId not found in s3 metadata, skipping file as we may not we ingested yet or external")
 
-    # see if records exist for the asset and metadata tables
-    metadata_record = None
-    attempt = 0
-    while metadata_record is None and attempt < 60:
-        metadata_record = metadata.get_metadata(databaseId, assetId)
-        attempt += 1
-        if metadata_record is None:
-            logger.info("metadata record not available yet")
-            sleep_fn(1)
-
+    # see if the record exists in the asset table. Assets don't need a metadata record, the
+    # metadata of the file is merged from whatever records exist when it is indexed
     asset_record = None
     attempt = 0
     while asset_record is None and attempt < 60:
@@ -680,9 +1004,6 @@ def handle_s3_event_record(record,
     if asset_record is None:
         raise Exception("unable to get asset records after 1 minute")
 
-    if metadata_record is None:
-        raise Exception("unable to get metadata records after 1 minute")
-
     s3index = s3index_fn()
 
     s3index.process_single_s3_object(
@@ -695,6 +1016,8 @@ def handle_s3_event_record(record,
         },
     )
 
+@trace_invocation
+@bumps_index_generation
 def lambda_handler_a(event, context,
                      index=AOSIndexAssetMetadata.from_env,
                      s3index=AOSIndexS3Objects.from_env,
@@ -719,16 +1042,32 @@ def lambda_handler_a(event, context,
                 record['dynamodb']['Keys']['assetId']['S'])
 
         #Asset table inserted / updated
-        #Note: updates metadata table for asset updated which triggers the "lambda_handler_m" handler through DynamoDB streams (hack fix for now)
-        if record['eventName'] == 'MODIFY' or record['eventName'] == 'INSERT':   
+        #Note: indexed here from the stream image, without a metadata table write that triggers "lambda_handler_m"
+        if record['eventName'] == 'MODIFY' or record['eventName'] == 'INSERT':
             logger.info("insert or modify asset table record")
             databaseId = record['dynamodb']['Keys']['databaseId']['S']
             assetId = record['dynamodb']['Keys']['assetId']['S']
-            metadataTable.write_asset_table_updated_event(
-                databaseId, assetId)
+            image = {k: deserialize(v) for k, v in record['dynamodb']['NewImage'].items()}
+
+            # The asset table fields override the asset metadata, like in lambda_handler_m
+            metadata = metadataTable.get_metadata(databaseId, assetId) or {}
+            document = AOSIndexAssetMetadata.asset_document(
+                {"databaseId": databaseId, "assetId": assetId} | metadata |
+                {k: image[k] for k in ASSET_DOCUMENT_FIELDS if k in image})
+
+            asset_fields = None
+            if "bucketId" in image:
+                asset_fields = {k: image[k] for k in ASSET_DOCUMENT_FIELDS + ("bucketId",) if k in image}
+            try:
+                index_asset(client, s3index, databaseId, assetId, document, asset_fields)
+            except Exception as e:
+                logger.exception(record)
+                raise e
 
 
 
+@trace_invocation
+@bumps_index_generation
 def lambda_handler_m(event, context,
                      index=AOSIndexAssetMetadata.from_env,
                      s3index=AOSIndexS3Objects.from_env,
@@ -844,10 +1183,10 @@ def lambda_handler_m(event, context,
                     record['dynamodb']['Keys']['assetId']['S'])
             else:
                 logger.info("processing asset and s3 objects")
-                logger.info(client.process_item(record))
-                s3index().process_item(
-                    record['dynamodb']['Keys']['databaseId']['S'],
-                    record['dynamodb']['Keys']['assetId']['S'])
+                index_asset(client, s3index,
+                            record['dynamodb']['Keys']['databaseId']['S'],
+                            record['dynamodb']['Keys']['assetId']['S'],
+                            AOSIndexAssetMetadata._process_item(record))
         except Exception as e:
             logger.exception(e)
             raise e
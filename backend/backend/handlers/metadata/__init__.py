@@ -2,20 +2,22 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-import boto3
+from common.awsClients import lazy_resource
 import json
 import os
 from datetime import datetime
 from boto3.dynamodb.conditions import Key
 from customLogging.logger import safeLogger
 from common.validators import validate
+from common.requestContext import request_bucket, forget_metadata
+from common.dynamodb import batch_get_items
 
 # region Logging
 logger = safeLogger(service="InitMetadata")
 # endregion
 
 region = os.environ['AWS_REGION']
-dynamodb = boto3.resource('dynamodb', region_name=region)
+dynamodb = lazy_resource('dynamodb', region_name=region)
 metadata_table = dynamodb.Table(os.environ['METADATA_STORAGE_TABLE_NAME'])
 buckets_table = dynamodb.Table(os.environ['S3_ASSET_BUCKETS_STORAGE_TABLE_NAME'])
 
@@ -65,12 +67,15 @@ def get_default_bucket_details(bucketId):
     """Get default S3 bucket details from database default bucket DynamoDB"""
     try:
 
-        bucket_response = buckets_table.query(
-            KeyConditionExpression=Key('bucketId').eq(bucketId),
-            Limit=1
-        )
-        # Use the first item from the query results
-        bucket = bucket_response.get("Items", [{}])[0] if bucket_response.get("Items") else {}
+        def load_bucket():
+            bucket_response = buckets_table.query(
+                KeyConditionExpression=Key('bucketId').eq(bucketId),
+                Limit=1
+            )
+            # Use the first item from the query results
+            return bucket_response.get("Items", [None])[0] if bucket_response.get("Items") else None
+
+        bucket = request_bucket(bucketId, load_bucket) or {}
         bucket_id = bucket.get('bucketId')
         bucket_name = bucket.get('bucketName')
         base_assets_prefix = bucket.get('baseAssetsPrefix')
@@ -118,7 +123,7 @@ def to_update_expr(record):
 def create_or_update(databaseId, assetId, metadata):
     metadata['_metadata_last_updated'] = datetime.now().isoformat()
     keys_map, values_map, expr = to_update_expr(metadata)
-    return metadata_table.update_item(
+    response = metadata_table.update_item(
         Key={
             "databaseId": databaseId,
             "assetId": assetId,
@@ -127,6 +132,40 @@ def create_or_update(databaseId, assetId, metadata):
         ExpressionAttributeValues=values_map,
         UpdateExpression=expr,
     )
+    forget_metadata(databaseId, assetId)
+    return response
+
+
+def batch_get_metadata(databaseId, keys):
+    """Read the metadata records of many keys (asset IDs, file and folder paths) of one database
+
+    Args:
+        databaseId: The database ID
+        keys: Metadata table asset IDs, duplicates are read once
+
+    Returns:
+        Dictionary of key to metadata record, keys without a record are left out
+    """
+    keys = [{"databaseId": databaseId, "assetId": key} for key in dict.fromkeys(keys)]
+    return {item["assetId"]: item for item in batch_get_items(metadata_table, keys)}
+
+
+def batch_write_metadata(databaseId, records):
+    """Write complete metadata records (not merged with the stored ones) of one database
+
+    Records go through the table batch_writer, which sends 25 puts per BatchWriteItem request and
+    resends unprocessed items until every record is written.
+
+    Args:
+        databaseId: The database ID
+        records: Dictionary of metadata table asset ID (asset ID, file or folder path) to metadata record
+    """
+    updated = datetime.now().isoformat()
+    with metadata_table.batch_writer(overwrite_by_pkeys=["databaseId", "assetId"]) as writer:
+        for key, metadata in records.items():
+            writer.put_item(Item={**metadata, "_metadata_last_updated": updated, "databaseId": databaseId, "assetId": key})
+    for key in records:
+        forget_metadata(databaseId, key)
 
 
 class ValidationError(Exception):
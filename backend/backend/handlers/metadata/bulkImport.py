@@ -0,0 +1,437 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import csv
+import io
+import json
+import os
+import time
+import uuid
+from common.awsClients import lazy_client, lazy_resource
+from common.validators import validate
+from handlers.metadata import build_response, batch_get_metadata, batch_write_metadata, get_default_bucket_details, \
+    normalize_s3_path, ValidationError
+from handlers.metadataschema.schema import MetadataSchema
+from handlers.auth import request_to_claims
+from handlers.authz import CasbinEnforcer
+from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped
+from common.dynamodb import get_asset_object_from_id, batch_get_items
+
+claims_and_roles = {}
+logger = safeLogger(service="BulkImportMetadata")
+
+# Imports are run by a background job on this function
+METADATA_IMPORT_JOB_PREFIX = "metadataImportJobs"
+METADATA_IMPORT_MAX_RECORDS = 100000
+# Records validated and written together, the status is saved after each chunk
+METADATA_IMPORT_CHUNK_SIZE = 1000
+METADATA_IMPORT_JOB_MARGIN_SECONDS = 60
+METADATA_IMPORT_MAX_REPORTED_ERRORS = 10000
+# Columns of a CSV import that address the record, every other column is a metadata field
+METADATA_IMPORT_CSV_KEY_COLUMNS = ("assetId", "prefix")
+
+client = lazy_client('lambda')
+s3c = lazy_client('s3')
+dynamodb = lazy_resource('dynamodb')
+
+bucket_name_assetAuxiliary = os.environ["S3_ASSETAUXILIARY_STORAGE_BUCKET"]
+asset_Database = os.environ["ASSET_STORAGE_TABLE_NAME"]
+
+
+def get_import_job_key(databaseId, jobId, name):
+    """Get the auxiliary bucket key of a metadata import job object"""
+    return f"{METADATA_IMPORT_JOB_PREFIX}/{databaseId}/{jobId}/{name}.json"
+
+
+def save_import_job_object(databaseId, jobId, name, body):
+    s3c.put_object(
+        Bucket=bucket_name_assetAuxiliary,
+        Key=get_import_job_key(databaseId, jobId, name),
+        Body=json.dumps(body),
+        ContentType='application/json'
+    )
+
+
+def load_import_job_object(databaseId, jobId, name):
+    response = s3c.get_object(
+        Bucket=bucket_name_assetAuxiliary,
+        Key=get_import_job_key(databaseId, jobId, name)
+    )
+    return json.loads(response['Body'].read())
+
+
+def get_compiled_schema(databaseId):
+    return MetadataSchema.from_env().get_compiled_schema(databaseId)
+
+
+def read_csv_records(bucket, key):
+    """Read the records of a CSV import
+
+    The header row names the columns: assetId, an optional prefix (file or folder key of the asset)
+    and one column per metadata field. Empty cells are left out of the record.
+
+    Returns:
+        List of records like the records of a JSON import
+    """
+    body = s3c.get_object(Bucket=bucket, Key=key)['Body'].read().decode('utf-8-sig')
+    records = []
+    for row in csv.DictReader(io.StringIO(body)):
+        records.append({
+            'assetId': row.get('assetId') or '',
+            'prefix': row.get('prefix') or None,
+            'metadata': {name: value for name, value in row.items()
+                         if name and name not in METADATA_IMPORT_CSV_KEY_COLUMNS and value},
+        })
+    return records
+
+
+def validate_import_record(record, schema):
+    """Check the address and version 1 metadata of an import record and the values of its schema fields
+
+    Returns:
+        List of error messages, empty when the record is valid
+    """
+    if not isinstance(record, dict) or not isinstance(record.get('metadata'), dict):
+        return ["record must be an object with assetId and metadata"]
+
+    validations = {
+        'assetId': {
+            'value': record.get('assetId', ''),
+            'validator': 'ASSET_ID'
+        },
+    }
+    if record.get('prefix') is not None:
+        validations['filePathPrefix'] = {
+            'value': record['prefix'],
+            'validator': 'RELATIVE_FILE_PATH'
+        }
+    (valid, message) = validate(validations)
+    if not valid:
+        return [message]
+
+    metadata = record['metadata']
+    if not metadata:
+        return ["metadata is empty"]
+    for name, value in metadata.items():
+        if not isinstance(name, str) or not isinstance(value, str):
+            return ["metadata version 1 requires string keys and values"]
+        if name.startswith('_') or name in ('databaseId', 'assetId'):
+            return [f"{name} is a reserved metadata field"]
+    return schema.validate_values(metadata)
+
+
+def add_import_error(status, row, record, errors):
+    status['failedCount'] += 1
+    if len(status['errors']) < METADATA_IMPORT_MAX_REPORTED_ERRORS:
+        status['errors'].append({
+            'row': row,
+            'assetId': record.get('assetId') if isinstance(record, dict) else None,
+            'prefix': record.get('prefix') if isinstance(record, dict) else None,
+            'errors': errors,
+        })
+
+
+def get_authorized_asset_ids(databaseId, assetIds, casbin_enforcer):
+    """Get the asset IDs the importing user is allowed to POST metadata on
+
+    Args:
+        databaseId: The database ID
+        assetIds: Asset IDs to check
+        casbin_enforcer: Enforcer of the importing user
+
+    Returns:
+        Set of authorized asset IDs
+    """
+    assets = batch_get_items(dynamodb.Table(asset_Database),
+                             [{'databaseId': databaseId, 'assetId': assetId} for assetId in assetIds])
+
+    authorized = set()
+    for asset in assets:
+        # Add Casbin Enforcer to check if the importing user has permissions to POST the asset:
+        asset.update({
+            "object__type": "asset"
+        })
+        if casbin_enforcer.enforce(asset, "POST"):
+            authorized.add(asset['assetId'])
+    return authorized
+
+
+def import_record_chunk(databaseId, records, first_row, schema, casbin_enforcer, authorized_assets, status):
+    """Validate a chunk of import records and write the valid ones
+
+    Records of the same asset, file or folder are merged in order, their values are checked per row
+    so errors point at the failing row. Each merged record is read once, validated against the stored
+    metadata like the metadata API does and written with one batch write for the chunk.
+
+    Args:
+        databaseId: The database ID
+        records: The records of the chunk
+        first_row: Row number of the first record of the chunk
+        schema: CompiledMetadataSchema of the database
+        casbin_enforcer: Enforcer of the importing user
+        authorized_assets: Dictionary of asset ID to authorization result, shared by the chunks
+        status: The job status, updated in place
+    """
+    new_asset_ids = list({record['assetId'] for record in records
+                          if isinstance(record, dict) and isinstance(record.get('assetId'), str)
+                          and record['assetId'] and record['assetId'] not in authorized_assets})
+    if new_asset_ids:
+        authorized = get_authorized_asset_ids(databaseId, new_asset_ids, casbin_enforcer)
+        authorized_assets.update({assetId: assetId in authorized for assetId in new_asset_ids})
+
+    # metadata table asset ID -> merged record
+    pending = {}
+    for offset, record in enumerate(records):
+        row = first_row + offset
+        errors = validate_import_record(record, schema)
+        if not errors and not authorized_assets.get(record['assetId']):
+            errors = ["Asset does not exist or is not authorized"]
+        if errors:
+            add_import_error(status, row, record, errors)
+            continue
+
+        key = record.get('prefix') or record['assetId']
+        entry = pending.setdefault(key, {'assetId': record['assetId'], 'metadata': {}, 'records': []})
+        entry['metadata'].update(record['metadata'])
+        entry['records'].append((row, record))
+
+    stored = batch_get_metadata(databaseId, list(pending))
+    writes = {}
+    for key, entry in pending.items():
+        record = {name: value for name, value in stored.get(key, {}).items() if name not in ('databaseId', 'assetId')}
+        errors = schema.validate_update(entry['metadata'], record, asset_record=key == entry['assetId'])
+        if errors:
+            for row, record in entry['records']:
+                add_import_error(status, row, record, errors)
+            continue
+        writes[key] = record | entry['metadata']
+        status['importedCount'] += len(entry['records'])
+
+    batch_write_metadata(databaseId, writes)
+
+
+def import_records(request, records, status, deadline):
+    """Import the records of a job from its saved position
+
+    Args:
+        request: The import job request
+        records: The records of the job
+        status: The job status, updated in place
+        deadline: time.time() value to stop at
+
+    Returns:
+        True when every record was processed, False when stopped at the deadline
+    """
+    databaseId = request['databaseId']
+    # The schema is compiled once per invocation, not per record
+    schema = get_compiled_schema(databaseId)
+    # Assets are authorized as the user that queued the import
+    casbin_enforcer = CasbinEnforcer(request_to_claims({'requestContext': request['requestContext']}))
+    authorized_assets = {}
+
+    while status['nextRecordIndex'] < len(records):
+        start = status['nextRecordIndex']
+        chunk = records[start:start + METADATA_IMPORT_CHUNK_SIZE]
+        import_record_chunk(databaseId, chunk, start + 1, schema, casbin_enforcer, authorized_assets, status)
+        status['nextRecordIndex'] = start + len(chunk)
+        save_import_job_object(databaseId, status['jobId'], "status", status)
+
+        # Every invocation imports at least one chunk
+        if status['nextRecordIndex'] < len(records) and time.time() >= deadline:
+            return False
+
+    return True
+
+
+def start_import_job(databaseId, jobId, function_name):
+    client.invoke(
+        FunctionName=function_name,
+        InvocationType='Event',
+        Payload=json.dumps({'metadataImportJob': {'databaseId': databaseId, 'jobId': jobId}})
+    )
+
+
+def run_import_job(job, context):
+    """Run a queued metadata import job, continuing in a new invocation before the timeout
+
+    Args:
+        job: The job payload with databaseId and jobId
+        context: The Lambda context
+    """
+    databaseId = job['databaseId']
+    jobId = job['jobId']
+    deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - METADATA_IMPORT_JOB_MARGIN_SECONDS
+
+    request = load_import_job_object(databaseId, jobId, "request")
+    status = load_import_job_object(databaseId, jobId, "status")
+
+    try:
+        if status['totalRecords'] is None:
+            records = read_csv_records(request['csvLocation']['bucket'], request['csvLocation']['key'])
+            if len(records) > METADATA_IMPORT_MAX_RECORDS:
+                raise ValidationError(400, f"CSV file has more than {METADATA_IMPORT_MAX_RECORDS} records")
+            save_import_job_object(databaseId, jobId, "records", records)
+            status.update({'status': "RUNNING", 'totalRecords': len(records)})
+            save_import_job_object(databaseId, jobId, "status", status)
+        else:
+            records = load_import_job_object(databaseId, jobId, "records")
+            status['status'] = "RUNNING"
+
+        finished = import_records(request, records, status, deadline)
+        if finished:
+            status.update({
+                'status': "COMPLETED",
+                'message': f"Imported {status['importedCount']} record(s), {status['failedCount']} record(s) failed"
+            })
+    except ValidationError as e:
+        status.update({'status': "FAILED", 'message': e.resp})
+        finished = True
+    except Exception as e:
+        logger.exception(f"Error running metadata import job {jobId}: {e}")
+        status.update({'status': "FAILED", 'message': "Metadata import job failed"})
+        finished = True
+
+    save_import_job_object(databaseId, jobId, "status", status)
+    if not finished:
+        logger.info(f"Continuing metadata import job {jobId} from record {status['nextRecordIndex']}")
+        start_import_job(databaseId, jobId, context.function_name)
+
+
+def get_csv_location(databaseId, csvFile):
+    """Resolve the S3 location of a CSV import file of an asset the current user can read
+
+    Raises:
+        ValidationError: 400 for an invalid file reference, 403 when the asset doesn't exist or isn't authorized
+    """
+    (valid, message) = validate({
+        'csvAssetId': {
+            'value': csvFile.get('assetId', ''),
+            'validator': 'ASSET_ID'
+        },
+        'csvKey': {
+            'value': csvFile.get('key', ''),
+            'validator': 'RELATIVE_FILE_PATH'
+        },
+    })
+    if not valid:
+        raise ValidationError(400, {"message": message})
+
+    asset = get_asset_object_from_id(databaseId, csvFile['assetId'])
+    if not asset or not CasbinEnforcer(claims_and_roles).enforce(asset, "GET"):
+        raise ValidationError(403, {"message": "Not Authorized"})
+
+    bucket_details = get_default_bucket_details(asset['bucketId'])
+    asset_base_key = asset.get('assetLocation', {}).get('Key', f"{bucket_details['baseAssetsPrefix']}{asset['assetId']}/")
+    return {'bucket': bucket_details['bucketName'], 'key': normalize_s3_path(asset_base_key, csvFile['key'])}
+
+
+def queue_import(event, context, databaseId):
+    """Handle POST /database/{databaseId}/metadata/imports"""
+    body = event.get('body')
+    try:
+        body = json.loads(body) if isinstance(body, str) else body
+    except json.JSONDecodeError:
+        raise ValidationError(400, {"message": "Request body cannot be parsed"})
+    if not isinstance(body, dict):
+        raise ValidationError(400, {"message": "missing request body"})
+    if body.get('version') != "1":
+        raise ValidationError(400, {"message": "version must be 1"})
+
+    records = body.get('records')
+    csvFile = body.get('csvFile')
+    if (records is None) == (csvFile is None):
+        raise ValidationError(400, {"message": "Either records or csvFile is required"})
+    if records is not None and (not isinstance(records, list) or not 0 < len(records) <= METADATA_IMPORT_MAX_RECORDS):
+        raise ValidationError(400, {"message": f"records must be a list of 1 to {METADATA_IMPORT_MAX_RECORDS} records"})
+    if csvFile is not None and not isinstance(csvFile, dict):
+        raise ValidationError(400, {"message": "csvFile must be an object with assetId and key"})
+
+    jobId = str(uuid.uuid4())
+    request = {
+        'databaseId': databaseId,
+        'executingUserName': claims_and_roles["tokens"][0],
+        'requestContext': event['requestContext'],
+    }
+    if csvFile is not None:
+        request['csvLocation'] = get_csv_location(databaseId, csvFile)
+    else:
+        # The records are stored in the auxiliary bucket since they can exceed the asynchronous invoke payload limit
+        save_import_job_object(databaseId, jobId, "records", records)
+    save_import_job_object(databaseId, jobId, "request", request)
+
+    status = {
+        'jobId': jobId,
+        'status': "QUEUED",
+        'message': "Queued metadata import",
+        'totalRecords': len(records) if records is not None else None,
+        'nextRecordIndex': 0,
+        'importedCount': 0,
+        'failedCount': 0,
+        'errors': [],
+    }
+    save_import_job_object(databaseId, jobId, "status", status)
+    start_import_job(databaseId, jobId, context.function_name)
+    return build_response(200, json.dumps(status))
+
+
+def get_import_status(databaseId, jobId):
+    """Handle GET /database/{databaseId}/metadata/imports/{jobId}, only the importing user can read the status"""
+    (valid, message) = validate({
+        'jobId': {
+            'value': jobId,
+            'validator': 'UUID'
+        },
+    })
+    if not valid:
+        raise ValidationError(400, {"message": message})
+
+    try:
+        request = load_import_job_object(databaseId, jobId, "request")
+        status = load_import_job_object(databaseId, jobId, "status")
+    except s3c.exceptions.NoSuchKey:
+        raise ValidationError(404, {"message": "Metadata import job does not exist"})
+    if request['executingUserName'] != claims_and_roles["tokens"][0]:
+        raise ValidationError(404, {"message": "Metadata import job does not exist"})
+    return build_response(200, json.dumps(status))
+
+
+@trace_invocation
+@request_scoped
+def lambda_handler(event, context):
+    global claims_and_roles
+    if 'metadataImportJob' in event:
+        run_import_job(event['metadataImportJob'], context)
+        return
+
+    logger.info(event)
+    try:
+        pathParameters = event.get('pathParameters', {})
+        (valid, message) = validate({
+            'databaseId': {
+                'value': pathParameters.get('databaseId', ''),
+                'validator': 'ID'
+            },
+        })
+        if not valid:
+            raise ValidationError(400, {"message": message})
+
+        claims_and_roles = request_to_claims(event)
+        if len(claims_and_roles["tokens"]) == 0 or not CasbinEnforcer(claims_and_roles).enforceAPI(event):
+            logger.error("403: Not Authorized")
+            return build_response(403, json.dumps({
+                "status": "Not Authorized",
+                "requestid": event['requestContext']['requestId']
+            }))
+
+        if event['requestContext']['http']['method'] == 'GET':
+            return get_import_status(pathParameters['databaseId'], pathParameters.get('jobId', ''))
+        return queue_import(event, context, pathParameters['databaseId'])
+
+    except ValidationError as ex:
+        logger.exception(ex)
+        return build_response(ex.code, json.dumps(ex.resp))
+    except Exception as e:
+        logger.exception(e)
+        return build_response(500, "Internal Server Error")
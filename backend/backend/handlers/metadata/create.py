@@ -6,12 +6,52 @@ from handlers.metadata import build_response, create_or_update, validate_event,
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped
 from common.dynamodb import get_asset_object_from_id
 
 claims_and_roles = {}
 logger = safeLogger(service="CreateUpdateMetadata")
 
 
+def save_asset_metadata(databaseId, assetId, metadata, claims_and_roles, prefix=None):
+    """Create or update the metadata of an asset, or of a file or folder of the asset when a prefix is given
+
+    Service entry point for callers inside other functions (e.g. workflows). Checks POST permission on
+    the asset for the given claims and roles; API route permissions are checked by the API handler.
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        metadata: Version 1 metadata dictionary of string keys and values
+        claims_and_roles: Claims and roles of the user the metadata is saved for
+        prefix: Optional file or folder key of the asset
+
+    Raises:
+        ValidationError: 403 when the asset doesn't exist or isn't authorized
+    """
+    asset_of_metadata = get_asset_object_from_id(databaseId, assetId)
+    if not asset_of_metadata:
+        raise ValidationError(403, {"status": "Not Authorized"})
+
+    # Add Casbin Enforcer to check if the current user has permissions to POST the asset:
+    asset_of_metadata.update({
+        "object__type": "asset"
+    })
+    allowed = False
+    if len(claims_and_roles["tokens"]) > 0:
+        casbin_enforcer = CasbinEnforcer(claims_and_roles)
+        if casbin_enforcer.enforce(asset_of_metadata, "POST"):
+            allowed = True
+    if not allowed:
+        raise ValidationError(403, {"status": "Not Authorized"})
+
+    #Use prefix (if given) now that we have done base asset ID checks
+    create_or_update(databaseId, prefix or assetId, metadata)
+
+
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context):
     global claims_and_roles
     logger.info(event)
@@ -30,31 +70,21 @@ def lambda_handler(event, context):
                 method_allowed_on_api = True
 
         if method_allowed_on_api:
-            asset_of_metadata = get_asset_object_from_id(databaseId, assetId)
-            if asset_of_metadata:
-                allowed = False
-                # Add Casbin Enforcer to check if the current user has permissions to POST the asset:
-                asset_of_metadata.update({
-                    "object__type": "asset"
-                })
-                if len(claims_and_roles["tokens"]) > 0:
-                    casbin_enforcer = CasbinEnforcer(claims_and_roles)
-                    if casbin_enforcer.enforce(asset_of_metadata, "POST"):
-                        allowed = True
-
-                #Use prefix (if given) now that we have done base asset ID checks
-                if ('queryStringParameters' in event and 'prefix' in event['queryStringParameters']):
-                    assetId = event['queryStringParameters']['prefix']
-
-                if allowed:
-                    create_or_update(databaseId, assetId, body['metadata'])
-                    return build_response(200, json.dumps({"status": "OK"}))
-                else:
-                    logger.error("403: Not Authorized")
-                    return build_response(403, json.dumps({
-                        "status": "Not Authorized",
-                        "requestid": event['requestContext']['requestId']
-                    }))
+            prefix = None
+            if ('queryStringParameters' in event and 'prefix' in event['queryStringParameters']):
+                prefix = event['queryStringParameters']['prefix']
+
+            try:
+                save_asset_metadata(databaseId, assetId, body['metadata'], claims_and_roles, prefix)
+            except ValidationError as ex:
+                if ex.code != 403:
+                    raise
+                logger.error("403: Not Authorized")
+                return build_response(403, json.dumps({
+                    "status": "Not Authorized",
+                    "requestid": event['requestContext']['requestId']
+                }))
+            return build_response(200, json.dumps({"status": "OK"}))
         else:
             logger.error("403: Not Authorized")
             return build_response(403, json.dumps({
@@ -9,6 +9,8 @@ from handlers.authz import CasbinEnforcer
 
 from common.dynamodb import get_asset_object_from_id
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, forget_metadata
 
 claims_and_roles = {}
 logger = safeLogger(service="DeleteMetadata")
@@ -21,6 +23,7 @@ def delete_item(databaseId, assetId):
             "assetId": assetId,
         },
     )
+    forget_metadata(databaseId, assetId)
 
     # Disabled as we are not sure how metadata will be restricted. Currently, it is being restricted,
     # if the user has view/edit permissions on the asset
@@ -56,6 +59,8 @@ def delete_item(databaseId, assetId):
     #     raise ValidationError(404, "Metadata not found")
 
 
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context):
     logger.info(event)
 
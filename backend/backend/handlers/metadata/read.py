@@ -2,10 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
-from handlers.metadata import build_response, metadata_table, validate_event, ValidationError, normalize_s3_path
+from handlers.metadata import build_response, metadata_table, validate_event, ValidationError, normalize_s3_path, \
+    batch_get_metadata
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_metadata
 from common.dynamodb import get_asset_object_from_id
 from decimal import Decimal
 from common.dynamodb import validate_pagination_info
@@ -31,42 +34,142 @@ def get_metadata_with_prefix(databaseId, assetId, prefix):
     if prefix is not None:
 
         for paths in generate_prefixes(prefix):
-            resp = metadata_table.get_item(
+            item = request_metadata(databaseId, paths, lambda: metadata_table.get_item(
                 Key={
                     "databaseId": databaseId,
                     "assetId": paths,
                 }
-            )
-            if "Item" in resp:
-                result = resp['Item'] | result
-        try:
-            asset_metadata = get_metadata(databaseId, assetId)
-            result = asset_metadata | result
-            return result
-        except ValidationError:
-            return result
+            ).get("Item"))
+            if item is not None:
+                result = item | result
+        return get_metadata(databaseId, assetId) | result
     else:
         return get_metadata(databaseId, assetId)
 
 
 def get_metadata(databaseId, assetId):
-    resp = metadata_table.get_item(
+    item = request_metadata(databaseId, assetId, lambda: metadata_table.get_item(
         Key={
             "databaseId": databaseId,
             "assetId": assetId,
         }
-    )
-    if "Item" not in resp:
-        raise ValidationError(404, "Item Not Found")
+    ).get("Item"))
+    # Assets only get a metadata record once metadata is saved for them
+    if item is None:
+        return {}
 
     # Convert values that are of type decimal to string (to prevent JSON parse errors on response return)
-    for key, value in resp['Item'].items():
+    for key, value in item.items():
         if isinstance(value, Decimal):
-            resp['Item'][key] = str(value)
+            item[key] = str(value)
 
-    return resp['Item']
+    return item
 
 
+def get_metadata_for_paths(databaseId, assetId, paths):
+    """Effective metadata of many files or folders of one asset
+
+    Resolves every path like get_metadata_with_prefix (the metadata of the path and of each parent
+    folder, the most specific winning, over the asset metadata) from one deduplicated set of keys read
+    with BatchGetItem, instead of one get_item per prefix of every path.
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        paths: File or folder keys of the asset
+
+    Returns:
+        Dictionary of path to metadata, with decimal values converted to strings
+    """
+    path_keys = {path: [assetId] + list(reversed(generate_prefixes(path))) for path in paths}
+    items = batch_get_metadata(databaseId, [key for keys in path_keys.values() for key in keys])
+
+    result = {}
+    for path, keys in path_keys.items():
+        metadata = {}
+        for key in keys:
+            metadata = metadata | items.get(key, {})
+        result[path] = {key: str(value) if isinstance(value, Decimal) else value for key, value in metadata.items()}
+    return result
+
+
+def check_asset_read_permission(databaseId, assetId, claims_and_roles):
+    """Raise ValidationError 403 unless the asset exists and the claims and roles may GET it"""
+    asset_of_metadata = get_asset_object_from_id(databaseId, assetId)
+    if not asset_of_metadata:
+        raise ValidationError(403, "Not Authorized")
+
+    # Add Casbin Enforcer to check if the current user has permissions to GET the asset:
+    asset_of_metadata.update({
+        "object__type": "asset"
+    })
+    allowed = False
+    if len(claims_and_roles["tokens"]) > 0:
+        casbin_enforcer = CasbinEnforcer(claims_and_roles)
+        if casbin_enforcer.enforce(asset_of_metadata, "GET"):
+            allowed = True
+    if not allowed:
+        raise ValidationError(403, "Not Authorized")
+
+
+def read_asset_metadata(databaseId, assetId, prefix, claims_and_roles):
+    """Read the metadata of an asset, merged with the metadata of a file or folder when a prefix is given
+
+    Service entry point for callers inside other functions (e.g. workflows). Checks GET permission on
+    the asset for the given claims and roles; API route permissions are checked by the API handler.
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        prefix: Optional file or folder key of the asset
+        claims_and_roles: Claims and roles of the user the metadata is read for
+
+    Returns:
+        Metadata dictionary without private (underscore) keys
+
+    Raises:
+        ValidationError: 403 when the asset doesn't exist or isn't authorized
+    """
+    check_asset_read_permission(databaseId, assetId, claims_and_roles)
+
+    metadata = get_metadata_with_prefix(databaseId, assetId, prefix)
+
+    # remove private keys that start with underscores
+    for key in list(metadata.keys()):
+        if key.startswith("_"):
+            del metadata[key]
+
+    return metadata
+
+
+def read_asset_metadata_for_paths(databaseId, assetId, paths, claims_and_roles):
+    """Read the effective metadata of many files or folders of an asset
+
+    Service entry point like read_asset_metadata, with one permission check and one bulk read for
+    all paths (see get_metadata_for_paths).
+
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        paths: File or folder keys of the asset
+        claims_and_roles: Claims and roles of the user the metadata is read for
+
+    Returns:
+        Dictionary of path to metadata without private (underscore) keys
+
+    Raises:
+        ValidationError: 403 when the asset doesn't exist or isn't authorized
+    """
+    check_asset_read_permission(databaseId, assetId, claims_and_roles)
+
+    return {
+        path: {key: value for key, value in metadata.items() if not key.startswith("_")}
+        for path, metadata in get_metadata_for_paths(databaseId, assetId, paths).items()
+    }
+
+
+@trace_invocation
+@request_scoped
 def lambda_handler(event, context):
     global claims_and_roles
     logger.info(event)
@@ -91,34 +194,11 @@ def lambda_handler(event, context):
                 method_allowed_on_api = True
 
         if method_allowed_on_api:
-            asset_of_metadata = get_asset_object_from_id(databaseId, assetId)
-            if asset_of_metadata:
-                allowed = False
-                # Add Casbin Enforcer to check if the current user has permissions to GET the asset:
-                asset_of_metadata.update({
-                    "object__type": "asset"
-                })
-                if len(claims_and_roles["tokens"]) > 0:
-                    casbin_enforcer = CasbinEnforcer(claims_and_roles)
-                    if casbin_enforcer.enforce(asset_of_metadata, "GET"):
-                        allowed = True
-
-                if allowed:
-                    metadata = get_metadata_with_prefix(databaseId, assetId, prefix)
-
-                    # remove private keys that start with underscores
-                    for key in list(metadata.keys()):
-                        if key.startswith("_"):
-                            del metadata[key]
-
-                    return build_response(200, json.dumps({
-                        "version": "1",
-                        "metadata": metadata,
-                    }))
-                else:
-                    raise ValidationError(403, "Not Authorized")
-            else:
-                raise ValidationError(403, "Not Authorized")
+            metadata = read_asset_metadata(databaseId, assetId, prefix, claims_and_roles)
+            return build_response(200, json.dumps({
+                "version": "1",
+                "metadata": metadata,
+            }))
         else:
             raise ValidationError(403, "Not Authorized")
 
@@ -1,15 +1,18 @@
 # Copyright 2023 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import datetime
 import json
-import boto3
+from common.awsClients import get_resource, lazy_client
 import os
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.requestContext import request_scoped, request_enforcer
 from common.dynamodb import to_update_expr
 from boto3.dynamodb.conditions import Key
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
 from decimal import Decimal
+from typing import TYPE_CHECKING
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from common.constants import STANDARD_JSON_RESPONSE
@@ -18,11 +21,25 @@ from common.validators import validate
 from common.dynamodb import validate_pagination_info
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
+from locked_dict import locked_dict
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
 
 claims_and_roles = {}
 
+# Compiled schemas are kept until the version row of their database changes. They are also read
+# again after this many seconds, so a schema write whose version bump failed still shows up.
+#
+METADATA_SCHEMA_REFRESH_SECONDS = 60
+
+# Field of the schema table row that holds the schema version of a database. Schema writes add 1
+# to it; the API rejects field names that start with '#', so it can't clash with a schema field.
+#
+METADATA_SCHEMA_VERSION_FIELD = "#schemaVersion"
+
 logger = safeLogger(service="MetadataSchema")
-dynamodb_client = boto3.client('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
 
 # Load environment variables
 try:
@@ -58,6 +75,129 @@ class ValidationError(Exception):
 # - dependsOn: array, other fields that this field depends on and must be filled out first
 # -
 
+METADATA_BOOLEAN_VALUES = ("true", "false")
+
+# Tracks compiled schemas keyed by (schema table name, databaseId)
+#
+_compiled_schema_map = locked_dict.LockedDict()
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_date(value):
+    try:
+        datetime.date.fromisoformat(value.replace("/", "-"))
+        return True
+    except ValueError:
+        return False
+
+
+class CompiledMetadataSchema:
+    """Metadata schema fields of a database prepared once for validating many metadata records
+
+    Value checks follow the metadata editor: numbers must parse, booleans are "true" or "false", dates
+    are YYYY-MM-DD (or YYYY/MM/DD) and inline controlled list values must be one of the listed values.
+    Fields that aren't in the schema are not checked.
+    """
+
+    def __init__(self, fields: list, version: int = 0):
+        self.version = version
+        self.dateTime_Cached = datetime.datetime.now()
+
+        # field name -> value check of its datatype, or None when any non-empty value is accepted
+        self.value_checks = {}
+        self.required = []
+        # field name -> fields that must be filled out when the field is
+        self.depends_on = {}
+
+        for field in fields:
+            name = field["field"]
+            datatype = field.get("dataType") or field.get("datatype") or "string"
+            if datatype == "number":
+                self.value_checks[name] = (_is_number, "must be a number")
+            elif datatype == "boolean":
+                self.value_checks[name] = (lambda value: value in METADATA_BOOLEAN_VALUES, "must be true or false")
+            elif datatype == "date":
+                self.value_checks[name] = (_is_date, "must be a date (YYYY-MM-DD)")
+            elif datatype == "inline-controlled-list":
+                allowed_values = frozenset(value.strip() for value in
+                                           (field.get("inlineControlledListValues") or "").split(","))
+                self.value_checks[name] = (lambda value, allowed_values=allowed_values: value in allowed_values,
+                                           "must be one of the listed values")
+            else:
+                self.value_checks[name] = None
+
+            if field.get("required"):
+                self.required.append(name)
+            if field.get("dependsOn"):
+                self.depends_on[name] = list(field["dependsOn"])
+
+    def is_expired(self, version: int):
+        if self.version != version:
+            return True
+        return (datetime.datetime.now() - datetime.timedelta(seconds=METADATA_SCHEMA_REFRESH_SECONDS)) \
+            > self.dateTime_Cached
+
+    def validate_values(self, metadata: dict) -> list:
+        """Check the values of the schema fields in a metadata record
+
+        Returns:
+            List of error messages, empty when the values are valid
+        """
+        errors = []
+        for name, value in metadata.items():
+            if name not in self.value_checks or value == "":
+                continue
+            check = self.value_checks[name]
+            if check is not None and not check[0](value):
+                errors.append(f"{name} {check[1]}")
+        return errors
+
+    def validate_record(self, metadata: dict, asset_record: bool) -> list:
+        """Check required fields and field dependencies of a complete metadata record
+
+        Args:
+            metadata: The metadata record as stored, after merging updates
+            asset_record: True for the metadata of an asset, required fields only apply to assets
+
+        Returns:
+            List of error messages, empty when the record is valid
+        """
+        errors = []
+        if asset_record:
+            errors.extend(f"{name} is required" for name in self.required if not metadata.get(name))
+        for name, dependencies in self.depends_on.items():
+            if not metadata.get(name):
+                continue
+            errors.extend(f"{name} depends on {dependency}, which is not filled out"
+                          for dependency in dependencies if not metadata.get(dependency))
+        return errors
+
+    def validate_update(self, updates: dict, stored: dict, asset_record: bool) -> list:
+        """Check a metadata update before it is merged into the stored record
+
+        Every metadata writer (the metadata API, bulk imports and workflow outputs) validates with
+        this, so the values, required fields and field dependencies are checked the same way.
+
+        Args:
+            updates: The metadata fields written
+            stored: The stored metadata record, empty when there is none
+            asset_record: True for the metadata of an asset, required fields only apply to assets
+
+        Returns:
+            List of error messages, empty when the update is valid
+        """
+        errors = self.validate_values(updates)
+        if errors:
+            return errors
+        return self.validate_record(stored | updates, asset_record)
+
 
 class MetadataSchema:
 
@@ -66,7 +206,7 @@ class MetadataSchema:
         self.keys_attrs = {f"#{f}": f for f in self.attrs}
 
         self.table_name = table_name
-        self.dynamodb = dynamodb or boto3.resource('dynamodb')
+        self.dynamodb = dynamodb or get_resource('dynamodb')
         self.table = self.dynamodb.Table(table_name)
 
     def verify_database_exists(self, database_id: str):
@@ -86,15 +226,69 @@ class MetadataSchema:
     def from_env():
         return MetadataSchema(os.environ["METADATA_SCHEMA_STORAGE_TABLE_NAME"])
 
+    def get_compiled_schema(self, databaseId: str) -> CompiledMetadataSchema:
+        """Get the schema fields of a database compiled for validating metadata records
+
+        The compiled schema is cached per container until the schema version of the database
+        changes or the refresh interval passes, so repeated metadata writes to a database read
+        the version row instead of every schema field.
+        Used by metadata writers, which authorize on the asset, so the fields are not authorized
+        individually here.
+        """
+        cache_key = (self.table_name, databaseId)
+        # The version is read first: a schema write during the query leaves a newer version behind
+        version = self.get_schema_version(databaseId)
+        compiled = _compiled_schema_map.get(cache_key)
+        if compiled is not None and not compiled.is_expired(version):
+            return compiled
+
+        logger.info("Loading metadata schema")
+        fields = []
+        query_args = {"KeyConditionExpression": Key("databaseId").eq(databaseId)}
+        while True:
+            resp = self.table.query(**query_args)
+            fields.extend(item for item in resp.get("Items", []) if item["field"] != METADATA_SCHEMA_VERSION_FIELD)
+            if "LastEvaluatedKey" not in resp:
+                break
+            query_args["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+        compiled = CompiledMetadataSchema(fields, version)
+        _compiled_schema_map[cache_key] = compiled
+        return compiled
+
+    def get_schema_version(self, databaseId: str) -> int:
+        """Current schema version of a database, 0 before its first schema write"""
+        item = self.table.get_item(
+            Key={"databaseId": databaseId, "field": METADATA_SCHEMA_VERSION_FIELD},
+            ProjectionExpression="schemaVersion",
+            ConsistentRead=True
+        ).get("Item")
+        if item is None or "schemaVersion" not in item:
+            return 0
+        return int(item["schemaVersion"])
+
+    def bump_schema_version(self, databaseId: str):
+        """Invalidate the compiled schemas of a database cached by every container after a schema write"""
+        try:
+            self.table.update_item(
+                Key={"databaseId": databaseId, "field": METADATA_SCHEMA_VERSION_FIELD},
+                UpdateExpression="ADD schemaVersion :one",
+                ExpressionAttributeValues={":one": 1}
+            )
+        except Exception:
+            # The write itself succeeded, compiled schemas are still read again after the refresh interval
+            logger.exception("Failed to bump the metadata schema version")
+
     def get_schema(self, databaseId: str, field: str):
+        if field == METADATA_SCHEMA_VERSION_FIELD:
+            return None
         resp = self.table.get_item(Key={"databaseId": databaseId, "field": field})
-        metadataSchema = resp["Item"]
+        metadataSchema = resp.get("Item")
         allowed = False
 
         if "Item" in resp:
             metadataSchema.update({"object__type": "metadataSchema"})
             if len(claims_and_roles["tokens"]) > 0:
-                casbin_enforcer = CasbinEnforcer(claims_and_roles)
+                casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer)
                 if casbin_enforcer.enforce(metadataSchema, "GET"):
                     allowed = True
             return resp["Item"] if allowed else None
@@ -107,7 +301,7 @@ class MetadataSchema:
         allowed = False
 
         if len(claims_and_roles["tokens"]) > 0:
-            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer)
             if casbin_enforcer.enforce(schema_object, "POST"):
                 allowed = True
 
@@ -127,6 +321,7 @@ class MetadataSchema:
                 ExpressionAttributeNames=keys_map,
                 ExpressionAttributeValues=values_map,
             )
+            self.bump_schema_version(databaseId)
             return resp
         else:
             return 403
@@ -139,7 +334,7 @@ class MetadataSchema:
         }
         allowed = False
         if len(claims_and_roles["tokens"]) > 0:
-            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer)
             if casbin_enforcer.enforce(schema_object, "DELETE"):
                 allowed = True
 
@@ -150,6 +345,7 @@ class MetadataSchema:
                     "field": field
                 }
             )
+            self.bump_schema_version(databaseId)
             return resp
         else:
             return 403
@@ -173,12 +369,14 @@ class MetadataSchema:
 
             schemas = pageIterator["Items"]
 
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer) if len(claims_and_roles["tokens"]) > 0 else None
             for metadataSchema in schemas:
+                if metadataSchema.get("field") == METADATA_SCHEMA_VERSION_FIELD:
+                    continue
                 metadataSchema.update({
                     "object__type": "metadataSchema"
                 })
-                if len(claims_and_roles["tokens"]) > 0:
-                    casbin_enforcer = CasbinEnforcer(claims_and_roles)
+                if casbin_enforcer is not None:
                     if casbin_enforcer.enforce(metadataSchema, "GET"):
                         result["Items"].append(metadataSchema)
 
@@ -200,14 +398,16 @@ class MetadataSchema:
 
             schemas = pageIterator["Items"]
 
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer) if len(claims_and_roles["tokens"]) > 0 else None
             for metadataSchema in schemas:
                 deserialized_document = {k: deserializer.deserialize(v) for k, v in metadataSchema.items()}
+                if deserialized_document.get("field") == METADATA_SCHEMA_VERSION_FIELD:
+                    continue
 
                 metadataSchema.update({
                     "object__type": "metadataSchema"
                 })
-                if len(claims_and_roles["tokens"]) > 0:
-                    casbin_enforcer = CasbinEnforcer(claims_and_roles)
+                if casbin_enforcer is not None:
                     if casbin_enforcer.enforce(deserialized_document, "GET"):
                         result["Items"].append(deserialized_document)
 
@@ -217,13 +417,15 @@ class MetadataSchema:
         return result
 
 
-def get_request_to_claims(event: APIGatewayProxyEvent):
+def get_request_to_claims(event: 'APIGatewayProxyEvent'):
     return request_to_claims(event)
 
 # databaseId is part of pathParameters
 
 
-def lambda_handler(event: APIGatewayProxyEvent, context: LambdaContext,
+@trace_invocation
+@request_scoped
+def lambda_handler(event: 'APIGatewayProxyEvent', context: LambdaContext,
                    claims_fn=get_request_to_claims,
                    metadata_schema_fn=MetadataSchema.from_env):
 
@@ -271,7 +473,7 @@ def lambda_handler(event: APIGatewayProxyEvent, context: LambdaContext,
 
         method_allowed_on_api = False
         if len(claims_and_roles["tokens"]) > 0:
-            casbin_enforcer = CasbinEnforcer(claims_and_roles)
+            casbin_enforcer = request_enforcer(claims_and_roles, CasbinEnforcer)
             if casbin_enforcer.enforceAPI(event):
                 method_allowed_on_api = True
 
@@ -304,6 +506,8 @@ def lambda_handler(event: APIGatewayProxyEvent, context: LambdaContext,
             
             if "field" not in body:
                 raise ValidationError(400, "Missing field in path on POST/PUT request")
+            if str(body["field"]).startswith("#"):
+                raise ValidationError(400, "Schema field names can't start with #")
             
             resp = schema.update_schema(databaseId, body["field"], body)
 
@@ -315,6 +519,8 @@ def lambda_handler(event: APIGatewayProxyEvent, context: LambdaContext,
         elif method == "DELETE" and method_allowed_on_api:
             if "field" not in event['pathParameters']:
                 raise ValidationError(400, "Missing field in path on delete request")
+            if event['pathParameters']['field'].startswith("#"):
+                raise ValidationError(400, "Schema field names can't start with #")
 
             resp = schema.delete_schema(databaseId, event['pathParameters']['field'])
             if resp == 403:
@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import get_client, get_resource, lazy_resource
 import json
 import datetime
 import random
@@ -12,6 +12,7 @@ from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from botocore.exceptions import ClientError
 
 from common.dynamodb import to_update_expr
@@ -20,7 +21,7 @@ from handlers.workflows import update_pipeline_workflows
 claims_and_roles = {}
 logger = safeLogger(service="CreatePipeline")
 
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 db_table = dynamodb.Table(os.environ["DATABASE_STORAGE_TABLE_NAME"])
 
 # Hard-coded allowed values for pipeline fields
@@ -120,8 +121,8 @@ class CreatePipeline():
 
     @staticmethod
     def from_env():
-        dynamodb = boto3.resource('dynamodb')
-        lambda_client = boto3.client('lambda')
+        dynamodb = get_resource('dynamodb')
+        lambda_client = get_client('lambda')
         return CreatePipeline(
             dynamodb,
             lambda_client,
@@ -288,6 +289,7 @@ class CreatePipeline():
         logger.info("Starting Pipeline Enablement")
 
 
+@trace_invocation
 def lambda_handler(event, context, create_pipeline_fn=CreatePipeline.from_env):
     logger.info(event)
     create_pipeline = create_pipeline_fn()
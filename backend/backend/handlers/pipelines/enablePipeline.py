@@ -2,18 +2,19 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 logger = safeLogger(service="EnablePipeline")
 main_rest_response = STANDARD_JSON_RESPONSE
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 try:
     pipeline_Database = os.environ["PIPELINE_STORAGE_TABLE_NAME"]
 except:
@@ -73,6 +74,7 @@ def enablePipeline(databaseId, pipelineId):
     }
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     logger.info(event)
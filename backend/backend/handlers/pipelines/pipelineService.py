@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
@@ -12,14 +12,15 @@ from botocore.exceptions import ClientError
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 
 claims_and_roles = {}
 logger = safeLogger(service="PipelineService")
 
-dynamodb = boto3.resource('dynamodb')
-dynamodbClient = boto3.client('dynamodb')
-lambda_client = boto3.client('lambda')
+dynamodb = lazy_resource('dynamodb')
+dynamodbClient = lazy_client('dynamodb')
+lambda_client = lazy_client('lambda')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 pipeline_database = None
@@ -300,6 +301,7 @@ def delete_handler(event, response, pathParameters, queryParameters):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     global claims_and_roles
     response = STANDARD_JSON_RESPONSE
@@ -1,5 +1,5 @@
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 import uuid
 import datetime
@@ -10,10 +10,11 @@ from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 logger = safeLogger(service="CreateRole")
 
 main_rest_response = STANDARD_JSON_RESPONSE
@@ -140,6 +141,7 @@ def update_role(body):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
 
@@ -1,5 +1,5 @@
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 
 from common.constants import STANDARD_JSON_RESPONSE
@@ -7,6 +7,7 @@ from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
@@ -14,8 +15,8 @@ from boto3.dynamodb.types import TypeDeserializer
 claims_and_roles = {}
 logger = safeLogger(service="RoleService")
 
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -116,6 +117,7 @@ def get_handler(response, pathParameters, queryParameters):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     pathParameters = event.get('pathParameters', {})
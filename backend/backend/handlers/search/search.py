@@ -1,24 +1,74 @@
 # Copyright 2023 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
+import base64
+import hashlib
 import json
+import time
 from handlers.auth import request_to_claims
 import boto3
+from common.awsClients import lazy_client, lazy_resource, opensearch_module, create_opensearch_client
 import os
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
+from common.indexGeneration import get_index_generation
+from common.searchSuggestions import SUGGEST_TYPES, suggest_index_name, suggestion_query, unique_suggestions
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
-from urllib.parse import urlparse
-from opensearchpy import OpenSearch, RequestsHttpConnection, AWSV4SignerAuth, RequestError
+from typing import TYPE_CHECKING
 from common.validators import validate
 from common import get_ssm_parameter_value
 from handlers.authz import CasbinEnforcer
 from common.constants import STANDARD_JSON_RESPONSE
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
+from locked_dict import locked_dict
+
+if TYPE_CHECKING:
+    from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEvent
 
 logger = safeLogger(service="Search")
+
+
 claims_and_roles = {}
 
+# Hits read from OpenSearch per export page, each page is authorized and returned on its own
+SEARCH_EXPORT_DEFAULT_PAGE_SIZE = 1000
+SEARCH_EXPORT_MAX_PAGE_SIZE = 5000
+# How long an export's point in time stays open between two page requests
+SEARCH_EXPORT_KEEP_ALIVE = "5m"
+
+# Duration a cached aggregation (facet) result is reused while the index generation is unchanged.
+# Indexers bump the generation after writing; this bounds staleness for writes the generation
+# missed, e.g. documents that only became searchable on the next index refresh.
+#
+AGGREGATION_CACHE_SECONDS = 30
+AGGREGATION_CACHE_MAX_ENTRIES = 500
+
+# The generation of an index is read again at most this often. Searches in between reuse it without
+# a request for the generation document, so facets show indexed changes after up to this long.
+#
+INDEX_GENERATION_CHECK_SECONDS = 5
+
+# Cached aggregations keyed by aggregation_cache_key(), value: (index generation, time cached, aggregations)
+#
+_aggregation_cache = locked_dict.LockedDict()
+
+# Last generation read of each index by index name, value: (index generation, time read)
+#
+_index_generations = locked_dict.LockedDict()
+
+# Typeahead suggestions (GET /search/suggest) run on every keystroke. The databases a user may read
+# are reused for SUGGEST_DATABASES_CACHE_SECONDS, like the Casbin policies of the user.
+#
+SUGGEST_DEFAULT_SIZE = 10
+SUGGEST_MAX_SIZE = 25
+SUGGEST_MAX_PREFIX_LENGTH = 100
+SUGGEST_DATABASES_CACHE_SECONDS = 30
+SUGGEST_DATABASES_CACHE_MAX_ENTRIES = 500
+
+# Allowed database IDs keyed by the caller's claims and roles, value: (time cached, database IDs)
+#
+_suggest_databases_cache = locked_dict.LockedDict()
+
 try:
     asset_table = os.environ['ASSET_STORAGE_TABLE_NAME']
     database_table = os.environ['DATABASE_STORAGE_TABLE_NAME']
@@ -27,8 +77,8 @@ except Exception as e:
     logger.exception("Failed loading environment variables")
     raise
 
-dbResource = boto3.resource('dynamodb')
-dbClient = boto3.client('dynamodb')
+dbResource = lazy_resource('dynamodb')
+dbClient = lazy_client('dynamodb')
 deserializer = TypeDeserializer()
 
 #
@@ -490,16 +540,246 @@ def property_token_filter_to_opensearch_query(token_filter, uniqueMappingFieldsF
 
     return query
 
+
+def aggregation_cache_key(query):
+    """
+    Key of the aggregations of a search query: the query criteria and the aggregations requested,
+    without paging, sorting and highlighting. The criteria include the database filter built from the
+    caller's permissions, so callers with different authorization scopes never share an entry.
+    """
+    normalized = {
+        "query": query.get("query"),
+        "aggs": query.get("aggs"),
+        "min_score": query.get("min_score"),
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_cached_aggregations(cache_key, generation):
+    if generation is None:
+        return None
+    cached = _aggregation_cache.get(cache_key)
+    if cached is None:
+        return None
+    cached_generation, cached_at, aggregations = cached
+    if cached_generation != generation or time.time() - cached_at > AGGREGATION_CACHE_SECONDS:
+        _aggregation_cache.pop(cache_key, None)
+        return None
+    return aggregations
+
+
+def cache_aggregations(cache_key, generation, aggregations):
+    if generation is None or aggregations is None:
+        return
+    # Drop the oldest entries first, entries are kept in insertion order
+    for stale_key in list(_aggregation_cache.keys())[:max(0, len(_aggregation_cache) - AGGREGATION_CACHE_MAX_ENTRIES + 1)]:
+        _aggregation_cache.pop(stale_key, None)
+    _aggregation_cache[cache_key] = (generation, time.time(), aggregations)
+
+
+def point_in_time_supported(env=os.environ):
+    """Point in time searches are available on provisioned OpenSearch domains, not on serverless collections"""
+    return env.get('AOS_TYPE') == "es"
+
+
+def export_query(token_filter, uniqueMappingFieldsForGeneralQuery, page_size, search_after=None):
+    """
+    Converts a property token filter to the OpenSearch query of one export page.
+    Pages are walked with search_after, the document ID breaks ties between equal sort values.
+    """
+    query = property_token_filter_to_opensearch_query(token_filter, uniqueMappingFieldsForGeneralQuery, size=page_size)
+    del query["from"]
+    del query["highlight"]
+    del query["aggs"]
+    query["sort"] = query["sort"] + [{"_id": "asc"}]
+    query["track_total_hits"] = False
+    if search_after is not None:
+        query["search_after"] = search_after
+    return query
+
+
+def encode_export_cursor(pit_id, search_after):
+    cursor = json.dumps({"pitId": pit_id, "searchAfter": search_after})
+    return base64.urlsafe_b64encode(cursor.encode("utf-8")).decode("ascii")
+
+
+def decode_export_cursor(cursor):
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(decoded.get("searchAfter"), list):
+            raise ValueError("searchAfter is not a list")
+        return decoded.get("pitId"), decoded["searchAfter"]
+    except Exception:
+        raise ValidationError(400, {"message": "Invalid export cursor"})
+
+
+def authorize_hits(hits):
+    """Returns the hits the user may GET, by the asset fields of each hit"""
+    if len(claims_and_roles["tokens"]) == 0:
+        return []
+
+    casbin_enforcer = CasbinEnforcer(claims_and_roles)
+    filtered_hits = []
+    for hit in hits:
+
+        #Exclude if deleted (this is a catch-all and should already be filtered through the input query)
+        if hit["_source"]["str_databaseid"].endswith("#deleted"):
+            continue
+
+        #Casbin ABAC check
+        hit_document = {
+            "databaseId": hit["_source"].get("str_databaseid", ""),
+            "assetName": hit["_source"].get("str_assetname", ""),
+            "tags": hit["_source"].get("list_tags", ""),
+            "assetType": hit["_source"].get("str_assettype", ""),
+            "object__type": "asset" #for the purposes of checking ABAC, this should always be type "asset" until ABAC is implemented with asset files object types
+        }
+
+        if casbin_enforcer.enforce(hit_document, "GET"):
+            filtered_hits.append(hit)
+    return filtered_hits
+
+
+def export_search(body, search_ao):
+    """
+    Returns one page of an export of every authorized hit of a search.
+
+    The first request opens a point in time (on provisioned domains) so that the following pages
+    read the same snapshot of the index. Every response carries the cursor of the next page, or None
+    after the last page; the client sends it back with the same search body. Only one page of hits is
+    held in memory, however large the result set is.
+    """
+    (valid, message) = validate({
+        'pageSize': {
+            'value': str(body.get("pageSize", SEARCH_EXPORT_DEFAULT_PAGE_SIZE)),
+            'validator': 'NUMBER'
+        },
+    })
+    if not valid:
+        raise ValidationError(400, {"message": message})
+    page_size = int(body.get("pageSize", SEARCH_EXPORT_DEFAULT_PAGE_SIZE))
+    if page_size < 1 or page_size > SEARCH_EXPORT_MAX_PAGE_SIZE:
+        raise ValidationError(400, {"message": f"pageSize must be between 1 and {SEARCH_EXPORT_MAX_PAGE_SIZE}"})
+
+    if body.get("cursor"):
+        pit_id, search_after = decode_export_cursor(body["cursor"])
+    else:
+        pit_id = search_ao.open_point_in_time(SEARCH_EXPORT_KEEP_ALIVE) if point_in_time_supported() else None
+        search_after = None
+
+    uniqueMappingFieldsForGeneralQuery = []
+    if body.get("query"):
+        uniqueMappingFieldsForGeneralQuery = get_unique_mapping_fields(search_ao.mapping())
+
+    query = export_query(body, uniqueMappingFieldsForGeneralQuery, page_size, search_after)
+    try:
+        result = search_ao.search_page(query, pit_id)
+    except opensearch_module().NotFoundError:
+        if not pit_id:
+            raise
+        # The point in time expired between two pages, resume from the cursor on the live index
+        logger.warning("Export point in time expired, resuming without it")
+        pit_id = None
+        query.pop("pit", None)
+        result = search_ao.search_page(query)
+    hits = result["hits"]["hits"]
+    # The point in time ID can change between requests, the latest one must be used
+    pit_id = result.get("pit_id", pit_id)
+
+    cursor = None
+    if len(hits) == page_size:
+        cursor = encode_export_cursor(pit_id, hits[-1]["sort"])
+    elif pit_id:
+        search_ao.close_point_in_time(pit_id)
+
+    return {
+        "hits": [{"_id": hit["_id"], "_source": hit["_source"]} for hit in authorize_hits(hits)],
+        "scannedCount": len(hits),
+        "cursor": cursor,
+    }
+
+
+def allowed_database_ids():
+    """IDs of the databases the user may read, cached per claims and roles"""
+    cache_key = json.dumps(claims_and_roles, sort_keys=True, default=str)
+    cached = _suggest_databases_cache.get(cache_key)
+    if cached is not None and time.time() - cached[0] <= SUGGEST_DATABASES_CACHE_SECONDS:
+        return cached[1]
+
+    database_ids = [database["databaseId"] for database in get_databases().get("Items", [])]
+    # Drop the oldest entries first, entries are kept in insertion order
+    for stale_key in list(_suggest_databases_cache.keys())[:max(0, len(_suggest_databases_cache) - SUGGEST_DATABASES_CACHE_MAX_ENTRIES + 1)]:
+        _suggest_databases_cache.pop(stale_key, None)
+    _suggest_databases_cache[cache_key] = (time.time(), database_ids)
+    return database_ids
+
+
+def suggestion_authorizer():
+    """
+    Returns whether the user may GET the asset of a suggestion, by the asset fields each suggestion carries.
+    The suggestions of an asset (its name, tags and files) share one Casbin check.
+    """
+    if len(claims_and_roles["tokens"]) == 0:
+        return lambda source: False
+
+    casbin_enforcer = CasbinEnforcer(claims_and_roles)
+    decisions = {}
+
+    def authorized(source):
+        asset = {
+            "databaseId": source.get("databaseId", ""),
+            "assetName": source.get("assetName", ""),
+            "tags": source.get("tags", []),
+            "assetType": source.get("assetType", ""),
+            "object__type": "asset"
+        }
+        decision_key = json.dumps(asset, sort_keys=True)
+        if decision_key not in decisions:
+            decisions[decision_key] = casbin_enforcer.enforce(asset, "GET")
+        return decisions[decision_key]
+
+    return authorized
+
+
+def suggest(params, search_ao):
+    """
+    Returns the typeahead suggestions of a prefix: asset names, file names and tags that have a word
+    starting with the prefix, in the databases the user may read.
+
+    Suggestions are read from the suggestion index (common/searchSuggestions.py), not with a search
+    of the search index, and the authorized databases are cached, so a keystroke costs one small query.
+    """
+    prefix = (params.get("prefix") or "").strip()
+    if not prefix or len(prefix) > SUGGEST_MAX_PREFIX_LENGTH:
+        raise ValidationError(400, {"message": f"prefix must have 1 to {SUGGEST_MAX_PREFIX_LENGTH} characters"})
+    (valid, message) = validate({
+        'size': {
+            'value': str(params.get("size", SUGGEST_DEFAULT_SIZE)),
+            'validator': 'NUMBER'
+        },
+    })
+    if not valid:
+        raise ValidationError(400, {"message": message})
+    size = int(params.get("size", SUGGEST_DEFAULT_SIZE))
+    if size < 1 or size > SUGGEST_MAX_SIZE:
+        raise ValidationError(400, {"message": f"size must be between 1 and {SUGGEST_MAX_SIZE}"})
+    types = SUGGEST_TYPES
+    if params.get("type"):
+        types = params["type"].split(",")
+        if any(suggestion_type not in SUGGEST_TYPES for suggestion_type in types):
+            raise ValidationError(400, {"message": f"type must be one of {', '.join(SUGGEST_TYPES)}"})
+
+    database_ids = allowed_database_ids()
+    if not database_ids:
+        return {"suggestions": []}
+
+    hits = search_ao.suggest(suggestion_query(prefix, database_ids, size, types))["hits"]["hits"]
+    return {"suggestions": unique_suggestions(hits, size, suggestion_authorizer())}
+
+
 class SearchAOS():
     def __init__(self, host, auth, indexName):
-        self.client = OpenSearch(
-            hosts=[{'host': urlparse(host).hostname, 'port': 443}],
-            http_auth=auth,
-            use_ssl=True,
-            verify_certs=True,
-            connection_class=RequestsHttpConnection,
-            pool_maxsize=20
-        )
+        self.client = create_opensearch_client(host, auth)
         self.indexName = indexName
 
     @staticmethod
@@ -516,7 +796,7 @@ class SearchAOS():
             return
         else:
             credentials = boto3.Session().get_credentials()
-            auth = AWSV4SignerAuth(credentials, region, service)
+            auth = opensearch_module().AWSV4SignerAuth(credentials, region, service)
             host = get_ssm_parameter_value('AOS_ENDPOINT_PARAM', region, env)
             indexName = get_ssm_parameter_value(
                 'AOS_INDEX_NAME_PARAM', region, env)
@@ -554,14 +834,47 @@ class SearchAOS():
             # Re-raise the exception if it's not a mapping error we can handle
             raise e
 
+    def search_page(self, query, pit_id=None):
+        logger.info("aos export query")
+        logger.info(query)
+        if pit_id:
+            # Point in time searches name the index through the point in time, not the path
+            query["pit"] = {"id": pit_id, "keep_alive": SEARCH_EXPORT_KEEP_ALIVE}
+            return self.client.search(body=query)
+        return self.client.search(body=query, index=self.indexName)
+
+    def open_point_in_time(self, keep_alive):
+        return self.client.create_point_in_time(index=self.indexName, keep_alive=keep_alive)["pit_id"]
+
+    def close_point_in_time(self, pit_id):
+        try:
+            self.client.delete_point_in_time(body={"pit_id": [pit_id]})
+        except Exception as e:
+            # Points in time expire after their keep alive, a failed close only keeps it open until then
+            logger.warning(f"Unable to close point in time: {str(e)}")
+
+    def index_generation(self):
+        """Generation of the index, read from OpenSearch at most every INDEX_GENERATION_CHECK_SECONDS"""
+        checked = _index_generations.get(self.indexName)
+        if checked is not None and time.time() - checked[1] < INDEX_GENERATION_CHECK_SECONDS:
+            return checked[0]
+        generation = get_index_generation(self.client, self.indexName)
+        if generation is not None:
+            _index_generations[self.indexName] = (generation, time.time())
+        return generation
+
+    def suggest(self, query):
+        return self.client.search(body=query, index=suggest_index_name(self.indexName))
+
     def mapping(self):
         return self.client.indices.get_mapping(
             self.indexName).get(self.indexName)
 
 
 
+@trace_invocation
 def lambda_handler(
-    event: APIGatewayProxyEvent,
+    event: 'APIGatewayProxyEvent',
     context: LambdaContext,
     search_fn=SearchAOS.from_env,
 ):
@@ -593,6 +906,13 @@ def lambda_handler(
             if aos_disabled == "false":
 
                 search_ao = search_fn()
+                #Typeahead suggestions of a prefix, from the suggestion index instead of a full search
+                if event['requestContext']['http'].get('path', '').endswith("/suggest"):
+                    return {
+                        'statusCode': 200,
+                        'body': json.dumps(suggest(event.get('queryStringParameters') or {}, search_ao))
+                    }
+
                 #Get's return a mapping for the search index (no actual asset data returned so no ABAC check)
                 if event['requestContext']['http']['method'] == "GET":
                     return {
@@ -610,6 +930,13 @@ def lambda_handler(
                         'body': json.dumps({"message": "Invalid JSON in request body"})
                     }
 
+                #Export pages walk the whole result set with cursors instead of from/size
+                if event['requestContext']['http'].get('path', '').endswith("/export"):
+                    return {
+                        'statusCode': 200,
+                        'body': json.dumps(export_search(body, search_ao))
+                    }
+
                 #POST Parameters
                 logger.info("Validating POST parameters")
                 (valid, message) = validate({
@@ -637,27 +964,19 @@ def lambda_handler(
                 #get query
                 query = property_token_filter_to_opensearch_query(body, uniqueMappingFieldsForGeneralQuery)
 
-                result = search_ao.search(query)
-                filtered_hits = []
-                for hit in result["hits"]["hits"]:
-
-                    #Exclude if deleted (this is a catch-all and should already be filtered through the input query)
-                    if hit["_source"]["str_databaseid"].endswith("#deleted"):
-                        continue
-
-                    #Casbin ABAC check
-                    hit_document = {
-                        "databaseId": hit["_source"].get("str_databaseid", ""),
-                        "assetName": hit["_source"].get("str_assetname", ""),
-                        "tags": hit["_source"].get("list_tags", ""),
-                        "assetType": hit["_source"].get("str_assettype", ""),
-                        "object__type": "asset" #for the purposes of checking ABAC, this should always be type "asset" until ABAC is implemented with asset files object types
-                    }
+                #Facets only change with the index, reuse them while its generation is unchanged
+                cache_key = aggregation_cache_key(query)
+                generation = search_ao.index_generation()
+                aggregations = get_cached_aggregations(cache_key, generation)
+                if aggregations is not None:
+                    del query["aggs"]
 
-                    if len(claims_and_roles["tokens"]) > 0:
-                        casbin_enforcer = CasbinEnforcer(claims_and_roles)
-                        if casbin_enforcer.enforce(hit_document, "GET"):
-                            filtered_hits.append(hit)
+                result = search_ao.search(query)
+                if aggregations is not None:
+                    result["aggregations"] = aggregations
+                else:
+                    cache_aggregations(cache_key, generation, result.get("aggregations"))
+                filtered_hits = authorize_hits(result["hits"]["hits"])
 
                 #If a body.from and body.size is specified for paginiation, reduce down the filtered_hits to that range
                 #Otherwise return full list
@@ -718,7 +1037,7 @@ def lambda_handler(
             'statusCode': ex.code,
             'body': json.dumps(ex.resp)
         }
-    except RequestError as e:
+    except opensearch_module().RequestError as e:
         # Handle OpenSearch RequestError specifically
         logger.exception(f"OpenSearch RequestError: {str(e)}")
         if "No mapping found" in str(e) and "in order to sort on" in str(e):
@@ -2,14 +2,15 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client
 import json
 from common.constants import STANDARD_JSON_RESPONSE
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 logger = safeLogger(service="SendEmail")
-dynamodb_client = boto3.client('dynamodb')
-sns_client = boto3.client('sns')
+dynamodb_client = lazy_client('dynamodb')
+sns_client = lazy_client('sns')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -21,6 +22,7 @@ except:
         {"message": "Failed Loading Environment Variables"})
 
 
+@trace_invocation
 def lambda_handler(event, context):
 
     assetId = event["assetId"]
@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 
 from common.constants import STANDARD_JSON_RESPONSE
@@ -11,10 +11,11 @@ from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from common.dynamodb import get_asset_object_from_id
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 logger = safeLogger(service="CheckSubscriptionService")
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -57,6 +58,7 @@ def check_subscriptions(body):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
 
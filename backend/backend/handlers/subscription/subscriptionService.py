@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 
 from botocore.exceptions import ClientError
@@ -12,6 +12,7 @@ from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from common.dynamodb import get_asset_object_from_id
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
@@ -19,9 +20,9 @@ from boto3.dynamodb.types import TypeDeserializer
 claims_and_roles = {}
 logger = safeLogger(service="SubscriptionService")
 
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
-sns_client = boto3.client('sns')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
+sns_client = lazy_client('sns')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -417,6 +418,7 @@ def delete_subscription(body):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     try:
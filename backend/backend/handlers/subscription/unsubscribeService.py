@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 
 from handlers.auth import request_to_claims
@@ -11,13 +11,14 @@ from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from common.dynamodb import get_asset_object_from_id
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 logger = safeLogger(service="UnsubscriptionService")
 main_rest_response = STANDARD_JSON_RESPONSE
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
-sns_client = boto3.client('sns')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
+sns_client = lazy_client('sns')
 
 try:
     subscription_table_name = os.environ["SUBSCRIPTIONS_STORAGE_TABLE_NAME"]
@@ -110,6 +111,7 @@ def delete_subscription(body):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     try:
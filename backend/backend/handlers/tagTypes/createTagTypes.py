@@ -2,18 +2,20 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 
 from common.validators import validate
 from common.constants import STANDARD_JSON_RESPONSE
+from common.tagCatalog import bump_tag_catalog_version
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 logger = safeLogger(service="CreateTagType")
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -33,6 +35,7 @@ def create_tag_type(body):
         "required": body.get("required", "False")
     }
     table.put_item(Item=item, ConditionExpression="attribute_not_exists(tagTypeName)")
+    bump_tag_catalog_version(tag_type_db_table_name)
     return json.dumps({"message": 'Succeeded'})
 
 
@@ -49,9 +52,11 @@ def update_tag(body):
         },
         ConditionExpression='attribute_exists(tagTypeName)'
     )
+    bump_tag_catalog_version(tag_type_db_table_name)
     return json.dumps({"message": 'Succeeded'})
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
 
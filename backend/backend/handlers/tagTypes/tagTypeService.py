@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 
 from boto3.dynamodb.conditions import Key
@@ -10,14 +10,16 @@ from boto3.dynamodb.types import TypeDeserializer
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.validators import validate
 from common.dynamodb import validate_pagination_info
 from common.constants import STANDARD_JSON_RESPONSE
+from common.tagCatalog import get_tag_catalog, bump_tag_catalog_version, TAG_CATALOG_VERSION_ITEM
 
 claims_and_roles = {}
 logger = safeLogger(service="TagTypeService")
-dynamodb = boto3.resource('dynamodb')
-dynamodbClient = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+dynamodbClient = lazy_client('dynamodb')
 main_rest_response = STANDARD_JSON_RESPONSE
 
 try:
@@ -34,8 +36,11 @@ def get_tag_types(response, query_params):
     paginator = dynamodbClient.get_paginator('scan')
 
 
+    # The tag catalog version stamp shares the table, it is not a tag type
     page_iteratorTagTypes = paginator.paginate(
         TableName=tag_type_db_table_name,
+        FilterExpression="tagTypeName <> :versionItem",
+        ExpressionAttributeValues={":versionItem": {"S": TAG_CATALOG_VERSION_ITEM}},
         PaginationConfig={
             'MaxItems': int(query_params['maxItems']),
             'PageSize': int(query_params['pageSize']),
@@ -43,55 +48,8 @@ def get_tag_types(response, query_params):
         }
     ).build_full_result()
 
-    #Loop to get all tag results for tag type
-    rawTagItems = []
-    page_iteratorTags = paginator.paginate(
-        TableName=tag_db_table_name,
-        PaginationConfig={
-            'MaxItems': 1000,
-            'PageSize': 1000,
-        }
-    ).build_full_result()
-    if(len(page_iteratorTags["Items"]) > 0):
-        rawTagItems.extend(page_iteratorTags["Items"])
-        while("NextToken" in page_iteratorTags):
-            page_iteratorTags = paginator.paginate(
-                TableName=tag_db_table_name,
-                PaginationConfig={
-                    'MaxItems': 1000,
-                    'PageSize': 1000,
-                    'StartingToken': page_iteratorTags["NextToken"]
-                }
-            ).build_full_result()
-            if(len(page_iteratorTags["Items"]) > 0):
-                rawTagItems.extend(page_iteratorTags["Items"])
-
-
-    authorized_tags = []
-    for tag in rawTagItems:
-        deserialized_document = {k: deserializer.deserialize(v) for k, v in tag.items()}
-
-        #Commented out permissions check as it behooves users who do have access to see tag types to see all the tags associated, even if they don't have permission to use them
-        # # Add Casbin Enforcer to check if the current user has permissions to GET the Tag
-        # deserialized_document.update({
-        #     "object__type": "tag"
-        # })
-        # if len(claims_and_roles["tokens"]) > 0:
-        #     casbin_enforcer = CasbinEnforcer(claims_and_roles)
-        #     if casbin_enforcer.enforce(deserialized_document, "GET"):
-
-        authorized_tags.append(deserialized_document)
-
-    formatted_tag_results = {}
-
-    for tagResult in authorized_tags:
-        tagName = tagResult["tagName"]
-        tagTypeName = tagResult["tagTypeName"]
-
-        if tagTypeName not in formatted_tag_results:
-            formatted_tag_results[tagTypeName] = [tagName]
-        else:
-            formatted_tag_results[tagTypeName].append(tagName)
+    #Tags for each tag type come from the tag catalog
+    tag_catalog = get_tag_catalog(tag_db_table_name, tag_type_db_table_name)
 
     formattedTagTypeResults = {
         "Items": []
@@ -104,8 +62,7 @@ def get_tag_types(response, query_params):
             "tagTypeName": deserialized_document["tagTypeName"],
             "description": deserialized_document["description"],
             "required": deserialized_document.get("required", "False"),
-            "tags": [] if deserialized_document["tagTypeName"] not in formatted_tag_results else formatted_tag_results[
-                deserialized_document["tagTypeName"]]
+            "tags": tag_catalog.get_tags_for_tag_type(deserialized_document["tagTypeName"])
         }
 
         # Add Casbin Enforcer to check if the current user has permissions to GET the Tag Type
@@ -178,6 +135,7 @@ def delete_tag_type(response, pathParameters):
                 Key={'tagTypeName': tag_type_name},
                 ConditionExpression='attribute_exists(tagTypeName)'
             )
+            bump_tag_catalog_version(tag_type_db_table_name)
             response['statusCode'] = 200
             response['body'] = json.dumps({"message": "Success"})
             return response
@@ -191,6 +149,7 @@ def delete_tag_type(response, pathParameters):
         return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     logger.info(event)
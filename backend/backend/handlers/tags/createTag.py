@@ -2,19 +2,21 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_resource
 import json
 
 import botocore.exceptions
 from common.constants import STANDARD_JSON_RESPONSE
+from common.tagCatalog import bump_tag_catalog_version
 from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 claims_and_roles = {}
 logger = safeLogger(service="CreateTag")
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -52,6 +54,7 @@ def create_tag(body):
         response['body'] = json.dumps({"message": "Invalid tag type specified."})
         return response
 
+    bump_tag_catalog_version(tag_type_db_table_name)
     return json.dumps({"message": 'Succeeded'})
 
 
@@ -90,9 +93,11 @@ def update_tag(body):
         response['body'] = json.dumps({"message": "TagTypeName or TagName don't exists."})
         return response
 
+    bump_tag_catalog_version(tag_type_db_table_name)
     return json.dumps({"message": 'Succeeded'})
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     global claims_and_roles
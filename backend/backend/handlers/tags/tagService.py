@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_paginator, lazy_resource
 import json
 
 from boto3.dynamodb.conditions import Key
@@ -10,17 +10,19 @@ from boto3.dynamodb.types import TypeDeserializer
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.validators import validate
 from common.dynamodb import validate_pagination_info
 from common.constants import STANDARD_JSON_RESPONSE
+from common.tagCatalog import get_tag_catalog, bump_tag_catalog_version
 
 claims_and_roles = {}
 logger = safeLogger(service="TagService")
-dynamodb = boto3.resource('dynamodb')
-dynamodbClient = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+dynamodbClient = lazy_client('dynamodb')
 main_rest_response = STANDARD_JSON_RESPONSE
 deserializer = TypeDeserializer()
-paginator = dynamodbClient.get_paginator('scan')
+paginator = lazy_paginator(dynamodbClient, 'scan')
 
 try:
     tag_db_table_name = os.environ["TAGS_STORAGE_TABLE_NAME"]
@@ -73,6 +75,7 @@ def delete_handler(response, pathParameters):
                 Key={'tagName': tag_name},
                 ConditionExpression='attribute_exists(tagName)'
             )
+            bump_tag_catalog_version(tag_type_db_table_name)
             response['statusCode'] = 200
             response['body'] = json.dumps({"message": "Success"})
             return response
@@ -85,48 +88,10 @@ def delete_handler(response, pathParameters):
         response['message'] = "Record not found"
         return response
 
-def get_tag_types():
-
-    rawTagTypeItems = []
-    page_iteratorTagTypes = paginator.paginate(
-        TableName=tag_type_db_table_name,
-        PaginationConfig={
-            'MaxItems': 1000,
-            'PageSize': 1000,
-        }
-    ).build_full_result()
-    if(len(page_iteratorTagTypes["Items"]) > 0):
-        rawTagTypeItems.extend(page_iteratorTagTypes["Items"])
-        while("NextToken" in page_iteratorTagTypes):
-            page_iteratorTagTypes = paginator.paginate(
-                TableName=tag_type_db_table_name,
-                PaginationConfig={
-                    'MaxItems': 1000,
-                    'PageSize': 1000,
-                    'StartingToken': page_iteratorTagTypes["NextToken"]
-                }
-            ).build_full_result()
-            if(len(page_iteratorTagTypes["Items"]) > 0):
-                rawTagTypeItems.extend(page_iteratorTagTypes["Items"])
-
-    tagTypeResults = []
-    for tagTypeResult in rawTagTypeItems:
-        deserialized_document = {k: deserializer.deserialize(v) for k, v in tagTypeResult.items()}
-
-        tagType = {
-            "tagTypeName": deserialized_document["tagTypeName"],
-            "required": deserialized_document.get("required", "False"),
-        }
-
-        tagTypeResults.append(tagType)
-
-    return tagTypeResults
-
-
 def get_tags(query_params):
 
-    #Get tag types for required tags designation
-    tagTypes = get_tag_types()
+    #Get tag catalog for required tags designation
+    tag_catalog = get_tag_catalog(tag_db_table_name, tag_type_db_table_name)
 
     page_iteratorTags = paginator.paginate(
         TableName=tag_db_table_name,
@@ -145,11 +110,8 @@ def get_tags(query_params):
         deserialized_document = {k: deserializer.deserialize(v) for k, v in tag.items()}
 
         #For each tag type coming back from tags, add "[R]" to the end if it matches to a required tag type
-        for tagType in tagTypes:
-            if deserialized_document["tagTypeName"] == tagType["tagTypeName"]:
-                if tagType["required"] == "True":
-                    deserialized_document["tagTypeName"] = deserialized_document["tagTypeName"] + " [R]"
-                break
+        if tag_catalog.is_tag_type_required(deserialized_document["tagTypeName"]):
+            deserialized_document["tagTypeName"] = deserialized_document["tagTypeName"] + " [R]"
 
         # Add Casbin Enforcer to check if the current user has permissions to GET the Tag
         deserialized_document.update({
@@ -173,6 +135,7 @@ def get_handler(response, queryParameters):
     return response
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
 
@@ -1,5 +1,5 @@
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import json
 import datetime
 
@@ -8,14 +8,15 @@ from common.constants import STANDARD_JSON_RESPONSE
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.types import TypeDeserializer
 
 claims_and_roles = {}
 logger = safeLogger(service="UserRolesService")
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
 
 main_rest_response = STANDARD_JSON_RESPONSE
 
@@ -376,6 +377,7 @@ def get_user_roles(query_params):
 ########################################################
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     try:
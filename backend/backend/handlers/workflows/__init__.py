@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import botocore
 import json
 
@@ -15,8 +15,8 @@ from botocore.exceptions import ClientError
 claims_and_roles = {}
 logger = safeLogger(service="WorkflowCommon")
 
-dynamodb = boto3.resource('dynamodb')
-sf_client = boto3.client('stepfunctions')
+dynamodb = lazy_resource('dynamodb')
+sf_client = lazy_client('stepfunctions')
 main_rest_response = STANDARD_JSON_RESPONSE
 
 # update all workflows that are associated with a pipeline
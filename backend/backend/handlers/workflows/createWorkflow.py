@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import botocore
 import json
 import datetime
@@ -15,6 +15,7 @@ from common.constants import STANDARD_JSON_RESPONSE
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 
 import stepfunctions
 from stepfunctions.steps import (
@@ -42,10 +43,10 @@ logger = safeLogger(service="CreateWorkflow")
 main_rest_response = STANDARD_JSON_RESPONSE
 
 claims_and_roles = {}
-lambda_client= boto3.client('lambda')
-sf_client = boto3.client('stepfunctions')
+lambda_client= lazy_client('lambda')
+sf_client = lazy_client('stepfunctions')
 #sts_client = boto3.client('sts')
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_resource('dynamodb')
 
 try:
     workflow_Database = os.environ["WORKFLOW_STORAGE_TABLE_NAME"]
@@ -313,6 +314,7 @@ def create_lambda_step(pipeline, input_s3_asset_file_uri, output_s3_asset_files_
     )
 
 
+@trace_invocation
 def lambda_handler(event, context):
     global claims_and_roles
     response = STANDARD_JSON_RESPONSE
@@ -2,26 +2,46 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import json
-import boto3
+import time
+import uuid
+import fnmatch
+from common.awsClients import lazy_client, lazy_resource
 import botocore
 from boto3.dynamodb.conditions import Key
 from boto3.dynamodb.conditions import Attr
 import os
 from common.validators import validate
 from common.constants import STANDARD_JSON_RESPONSE
+from common.dynamodb import batch_get_items
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
+from handlers.metadata.read import read_asset_metadata
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from urllib.parse import unquote_plus
+from concurrent.futures import ThreadPoolExecutor
 
 claims_and_roles = {}
 logger = safeLogger(service="ExecuteWorkflow")
 
+# Bulk executions are dispatched by a background job on this function
+BULK_EXECUTION_JOB_PREFIX = "bulkWorkflowExecutionJobs"
+BULK_EXECUTION_DEFAULT_CONCURRENCY = 10
+BULK_EXECUTION_MAX_CONCURRENCY = 100
+BULK_EXECUTION_MAX_ASSET_IDS = 1000
+BULK_EXECUTION_LIST_WORKERS = 10
+# Delay before a job with maxConcurrency executions running checks them again
+BULK_EXECUTION_RETRY_DELAY_SECONDS = 60
+BULK_EXECUTION_STATUS_SAVE_SECONDS = 10
+BULK_EXECUTION_JOB_MARGIN_SECONDS = 60
+BULK_EXECUTION_MAX_REPORTED_FAILURES = 100
+
 try:
-    client = boto3.client('lambda')
-    s3c = boto3.client('s3')
-    sfn_client = boto3.client('stepfunctions')
-    dynamodb = boto3.resource('dynamodb')
+    client = lazy_client('lambda')
+    s3c = lazy_client('s3')
+    sfn_client = lazy_client('stepfunctions')
+    sqs_client = lazy_client('sqs')
+    dynamodb = lazy_resource('dynamodb')
 except Exception as e:
     logger.exception("Failed Loading Error Functions")
 
@@ -34,7 +54,7 @@ try:
     workflow_database = os.environ["WORKFLOW_STORAGE_TABLE_NAME"]
     workflow_execution_database = os.environ["WORKFLOW_EXECUTION_STORAGE_TABLE_NAME"]
     bucket_name_assetAuxiliary = os.environ["S3_ASSETAUXILIARY_STORAGE_BUCKET"]
-    metadata_read_function = os.environ['METADATA_READ_LAMBDA_FUNCTION_NAME']
+    bulk_execution_retry_queue_url = os.environ["BULK_EXECUTION_RETRY_QUEUE_URL"]
 except:
     logger.exception("Failed loading environment variables")
 
@@ -84,10 +104,6 @@ def get_pipelines(databaseId, pipelineId):
     return response['Items']
 
 
-def _metadata_lambda(payload): return client.invoke(FunctionName=metadata_read_function,
-                                           InvocationType='RequestResponse', Payload=json.dumps(payload).encode('utf-8'))
-
-
 def resolve_asset_file_path(asset_base_key: str, file_path: str) -> str:
     """
     Intelligently resolve the full S3 key, avoiding duplication if file_path already contains the asset base key.
@@ -118,56 +134,29 @@ def resolve_asset_file_path(asset_base_key: str, file_path: str) -> str:
         logger.info(f"Combined base key '{asset_base_key}' with file path '{file_path}' to get '{resolved_path}'")
         return resolved_path
 
-def get_asset_metadata(databaseId, assetId, keyPrefix, event):
-    try:
-        l_payload = {
-            "pathParameters": {
-                "databaseId": databaseId,
-                "assetId": assetId
-            }
-        }
+def get_asset_metadata(databaseId, assetId, keyPrefix, claims_and_roles):
+    """Get the metadata of an asset, merged with the file specific metadata when the key is a file
 
-        #If keyprefix doesn't end-with a /, add additional data to get the files specific metadata too
-        if not keyPrefix.endswith("/"):
-            l_payload.update({
-                "queryStringParameters": {
-                "prefix": keyPrefix
-            }
-            })
-        
-        l_payload.update({
-            "requestContext": {
-                "http": {
-                    "path": "event['requestContext']['http']['path']",
-                    "method": event['requestContext']['http']['method']
-                },
-                "authorizer": event['requestContext']['authorizer']
-            }
-        })
+    Args:
+        databaseId: The database ID
+        assetId: The asset ID
+        keyPrefix: The asset folder or file key
+        claims_and_roles: Claims and roles of the executing user
 
-        logger.info("Fetching metadata:")
-        logger.info(l_payload)
-        metadata_response = _metadata_lambda(l_payload)
-        logger.info("metaData read response:")
-        logger.info(metadata_response)
-        stream = metadata_response.get('Payload', "")
-        response_body = {}
-        if stream:
-            json_response = json.loads(stream.read().decode("utf-8"))
-            logger.info("uploadAsset payload:", json_response)
-            if "body" in json_response:
-                response_body = json.loads(json_response['body'])
-
-                # if "asset" in response_body:
-                #     assets.append(response_body['asset'])
-        return response_body
+    Returns:
+        Metadata dictionary, empty when it can't be read
+    """
+    try:
+        #If keyprefix doesn't end-with a /, get the files specific metadata too
+        prefix = None if keyPrefix.endswith("/") else keyPrefix
+        return read_asset_metadata(databaseId, assetId, prefix, claims_and_roles)
     except Exception as e:
         logger.exception("Failed fetching metadata")
         logger.exception(e)
         return {}
 
 
-def launchWorkflow(inputAssetBucket, inputAssetFileKey, workflow_arn, database_id, asset_id, workflow_database_id, workflow_id, executingUserName, executingRequestContext, inputMetadata = {}):
+def launchWorkflow(inputAssetBucket, inputAssetFileKey, workflow_arn, database_id, asset_id, workflow_database_id, workflow_id, executingUserName, executingRequestContext, inputMetadata = {}, inputAssetFileEtag = None):
 
     logger.info("Launching workflow with arn: "+workflow_arn)
 
@@ -206,12 +195,53 @@ def launchWorkflow(inputAssetBucket, inputAssetFileKey, workflow_arn, database_i
             'execution_arn': response['executionArn'],
             'startDate': "",
             'stopDate': "",
-            'executionStatus': "NEW"
+            'executionStatus': "NEW",
+            #Input file and version used to skip files already processed by bulk executions
+            'inputAssetFileKey': inputAssetFileKey,
+            'inputAssetFileEtag': inputAssetFileEtag or ""
         }
     )
     return executionId
 
 
+def build_input_metadata(asset, metadata):
+    """Build the VAMS input metadata passed to a workflow execution
+
+    Args:
+        asset: The asset dictionary
+        metadata: The asset or file metadata
+
+    Returns:
+        Input metadata dictionary
+    """
+    #remove databaseId/assetId from metadata if exists
+    metadata.pop('databaseId', None)
+    metadata.pop('assetId', None)
+
+    return {
+        "VAMS": {
+            "assetData": {
+                "assetName":asset.get("assetName", ""),
+                "description": asset.get("description", ""),
+                "tags": asset.get("tags", [])
+            },
+            "assetMetadata": metadata
+        },
+        #"User": {}
+    }
+
+
+def get_file_etag(bucket, key):
+    """Get the ETag of a file, or None for folders and files that can't be read"""
+    if key.endswith('/'):
+        return None
+    try:
+        return s3c.head_object(Bucket=bucket, Key=key)['ETag'].strip('"')
+    except Exception as e:
+        logger.warning(f"Unable to read ETag of {key}: {e}")
+        return None
+
+
 def get_asset(databaseId, assetId):
     table = dynamodb.Table(asset_Database)
     response = table.query(
@@ -338,8 +368,513 @@ def get_workflow_executions(databaseId, assetId, workflowDatabaseId, workflowId)
         return result
 
 
+def get_bulk_execution_job_key(databaseId, workflowId, jobId, name):
+    """Get the auxiliary bucket key of a bulk workflow execution job object"""
+    return f"{BULK_EXECUTION_JOB_PREFIX}/{databaseId}/{workflowId}/{jobId}/{name}.json"
+
+
+def save_bulk_execution_job_object(databaseId, workflowId, jobId, name, body):
+    s3c.put_object(
+        Bucket=bucket_name_assetAuxiliary,
+        Key=get_bulk_execution_job_key(databaseId, workflowId, jobId, name),
+        Body=json.dumps(body),
+        ContentType='application/json'
+    )
+
+
+def load_bulk_execution_job_object(databaseId, workflowId, jobId, name):
+    response = s3c.get_object(
+        Bucket=bucket_name_assetAuxiliary,
+        Key=get_bulk_execution_job_key(databaseId, workflowId, jobId, name)
+    )
+    return json.loads(response['Body'].read())
+
+
+def get_authorized_assets(databaseId, assetIds):
+    """Get the assets of a bulk execution the current user is allowed to run workflows on
+
+    Args:
+        databaseId: The database ID
+        assetIds: List of asset IDs, or None for every asset in the database
+
+    Returns:
+        Tuple of (authorized assets, list of asset IDs that don't exist or aren't authorized)
+    """
+    table = dynamodb.Table(asset_Database)
+    assets = []
+    if assetIds is None:
+        query_args = {'KeyConditionExpression': Key('databaseId').eq(databaseId)}
+        while True:
+            response = table.query(**query_args)
+            assets.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    else:
+        assets = batch_get_items(table, [{'databaseId': databaseId, 'assetId': assetId} for assetId in assetIds])
+
+    authorized = []
+    casbin_enforcer = CasbinEnforcer(claims_and_roles) if len(claims_and_roles["tokens"]) > 0 else None
+    for asset in assets:
+        # Add Casbin Enforcer to check if the current user has permissions to POST the asset:
+        asset.update({
+            "object__type": "asset"
+        })
+        if casbin_enforcer and casbin_enforcer.enforce(asset, "POST"):
+            authorized.append({
+                'assetId': asset['assetId'],
+                'bucketId': asset['bucketId'],
+                'assetLocation': asset['assetLocation'],
+                'assetName': asset.get('assetName', ''),
+                'description': asset.get('description', ''),
+                'tags': asset.get('tags', []),
+            })
+
+    authorized_ids = {asset['assetId'] for asset in authorized}
+    rejected = [assetId for assetId in (assetIds or []) if assetId not in authorized_ids]
+    return authorized, rejected
+
+
+def get_asset_file_targets(asset, bucket_name, fileGlob):
+    """List the files of an asset matching a glob as bulk execution targets
+
+    Args:
+        asset: The asset dictionary
+        bucket_name: The asset bucket name
+        fileGlob: Glob matched against file paths relative to the asset root
+
+    Returns:
+        List of {'assetId', 'fileKey', 'etag'} targets
+    """
+    prefix = asset['assetLocation']['Key']
+    if not prefix.endswith('/'):
+        prefix = prefix + '/'
+
+    targets = []
+    paginator = s3c.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            key = obj['Key']
+            # Skip folder markers and preview files
+            if key.endswith('/') or '.previewFile.' in key:
+                continue
+            if fnmatch.fnmatch(key[len(prefix):], fileGlob.lstrip('/')):
+                targets.append({'assetId': asset['assetId'], 'fileKey': key, 'etag': obj['ETag'].strip('"')})
+    return targets
+
+
+def get_bulk_execution_targets(assets, fileGlob):
+    """Resolve the files (or asset roots when no glob is given) a bulk execution runs on
+
+    Args:
+        assets: List of authorized assets
+        fileGlob: Optional glob matched against file paths relative to the asset root
+
+    Returns:
+        List of {'assetId', 'fileKey', 'etag'} targets, grouped by asset
+    """
+    if not fileGlob:
+        return [{'assetId': asset['assetId'], 'fileKey': asset['assetLocation']['Key'], 'etag': None} for asset in assets]
+
+    bucket_names = {}
+    for asset in assets:
+        if asset['bucketId'] not in bucket_names:
+            bucket_names[asset['bucketId']] = get_default_bucket_details(asset['bucketId'])['bucketName']
+
+    targets = []
+    with ThreadPoolExecutor(max_workers=BULK_EXECUTION_LIST_WORKERS) as executor:
+        for asset_targets in executor.map(
+                lambda asset: get_asset_file_targets(asset, bucket_names[asset['bucketId']], fileGlob), assets):
+            targets.extend(asset_targets)
+    return targets
+
+
+def get_asset_workflow_execution_items(databaseId, assetId, workflowDatabaseId, workflowId):
+    """Get the execution table items of a workflow on an asset, keyed by input file key and ETag"""
+    table = dynamodb.Table(workflow_execution_database)
+    query_args = {
+        'IndexName': 'WorkflowLSI',
+        'KeyConditionExpression': Key('databaseId:assetId').eq(f"${databaseId}:${assetId}") &
+                                  Key('workflowDatabaseId:workflowId').eq(f"${workflowDatabaseId}:${workflowId}"),
+    }
+    items = {}
+    while True:
+        response = table.query(**query_args)
+        for item in response.get('Items', []):
+            input_key = (item.get('inputAssetFileKey', ''), item.get('inputAssetFileEtag') or None)
+            items.setdefault(input_key, []).append(item)
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def is_target_already_executed(target, execution_items):
+    """Check if a bulk execution target already has a running or successful execution of the workflow
+
+    Only executions of the same input file and ETag count, so files changed since the last run are
+    executed again. Asset level targets (no ETag) only match executions on the asset root, whatever
+    ETag they recorded, and are only skipped while one is running.
+
+    Args:
+        target: The bulk execution target
+        execution_items: Execution table items from get_asset_workflow_execution_items
+
+    Returns:
+        True when the target should be skipped
+    """
+    if target['etag'] is None:
+        asset_root_key = unquote_plus(target['fileKey'])
+        candidates = [item for (file_key, _), items in execution_items.items() if file_key == asset_root_key for item in items]
+        skip_statuses = ['RUNNING']
+    else:
+        candidates = execution_items.get((unquote_plus(target['fileKey']), target['etag']), [])
+        skip_statuses = ['RUNNING', 'SUCCEEDED']
+
+    for item in candidates:
+        if item.get('stopDate'):
+            if item.get('executionStatus') in skip_statuses:
+                return True
+            continue
+        # Only look up the executions that could match, instead of every unfinished execution on the asset
+        execution = sfn_client.describe_execution(executionArn=item['execution_arn'])
+        if execution['status'] in skip_statuses:
+            return True
+    return False
+
+
+def refresh_running_executions(workflow_arn, status):
+    """Drop finished executions from the running executions of a bulk execution job and count their results"""
+    running_arns = set()
+    paginator = sfn_client.get_paginator('list_executions')
+    for page in paginator.paginate(stateMachineArn=workflow_arn, statusFilter='RUNNING'):
+        running_arns.update(execution['executionArn'] for execution in page.get('executions', []))
+
+    still_running = []
+    for running in status['running']:
+        if running['executionArn'] not in running_arns:
+            # The running listing is eventually consistent, confirm before counting it as finished
+            execution_status = sfn_client.describe_execution(executionArn=running['executionArn'])['status']
+            if execution_status != 'RUNNING':
+                if execution_status == 'SUCCEEDED':
+                    status['succeededCount'] += 1
+                else:
+                    status['failedExecutionCount'] += 1
+                continue
+        still_running.append(running)
+    status['running'] = still_running
+
+
+def add_bulk_execution_failure(status, assetId, fileKey, message):
+    status['failedCount'] += 1
+    if len(status['failures']) < BULK_EXECUTION_MAX_REPORTED_FAILURES:
+        status['failures'].append({'assetId': assetId, 'fileKey': fileKey, 'message': message})
+
+
+def dispatch_bulk_executions(request, targets, status, deadline):
+    """Start the executions of a bulk execution job, keeping at most maxConcurrency running at once
+
+    Args:
+        request: The bulk execution job request
+        targets: List of targets from get_bulk_execution_targets
+        status: The job status, updated in place
+        deadline: time.time() value to stop at
+
+    Returns:
+        None when every target was dispatched, otherwise the seconds to wait before the job continues:
+        0 when stopped at the deadline, BULK_EXECUTION_RETRY_DELAY_SECONDS when maxConcurrency executions
+        are still running
+    """
+    assets = {asset['assetId']: asset for asset in request['assets']}
+    # Metadata is read as the user that queued the job
+    executing_claims_and_roles = request_to_claims({'requestContext': request['requestContext']})
+    bucket_names = {}
+    execution_items_asset_id = None
+    execution_items = {}
+    last_saved = time.time()
+
+    while status['nextTargetIndex'] < len(targets):
+        if time.time() >= deadline:
+            return 0
+
+        if len(status['running']) >= request['maxConcurrency']:
+            refresh_running_executions(request['workflow_arn'], status)
+            if len(status['running']) >= request['maxConcurrency']:
+                # Check again later in a new invocation rather than wait here
+                return BULK_EXECUTION_RETRY_DELAY_SECONDS
+
+        target = targets[status['nextTargetIndex']]
+        status['nextTargetIndex'] += 1
+        asset = assets[target['assetId']]
+        try:
+            # Targets are grouped by asset, so the executions of each asset are only read once
+            if target['assetId'] != execution_items_asset_id:
+                execution_items = get_asset_workflow_execution_items(
+                    request['databaseId'], target['assetId'], request['workflowDatabaseId'], request['workflowId'])
+                execution_items_asset_id = target['assetId']
+
+            if is_target_already_executed(target, execution_items):
+                status['skippedCount'] += 1
+                continue
+
+            if asset['bucketId'] not in bucket_names:
+                bucket_names[asset['bucketId']] = get_default_bucket_details(asset['bucketId'])['bucketName']
+
+            metadata = get_asset_metadata(request['databaseId'], target['assetId'], target['fileKey'], executing_claims_and_roles)
+            inputMetadata = build_input_metadata(asset, metadata)
+
+            executionId = launchWorkflow(bucket_names[asset['bucketId']], target['fileKey'], request['workflow_arn'],
+                                         request['databaseId'], target['assetId'], request['workflowDatabaseId'],
+                                         request['workflowId'], request['executingUserName'], request['requestContext'],
+                                         inputMetadata, target['etag'])
+            status['startedCount'] += 1
+            status['running'].append({
+                'assetId': target['assetId'],
+                'fileKey': target['fileKey'],
+                'executionId': executionId,
+                'executionArn': request['workflow_arn'].replace("stateMachine", "execution") + ":" + executionId
+            })
+        except Exception as e:
+            logger.exception(f"Error starting workflow on {target['fileKey']} of asset {target['assetId']}: {e}")
+            add_bulk_execution_failure(status, target['assetId'], target['fileKey'], "Error starting workflow execution")
+
+        if time.time() - last_saved >= BULK_EXECUTION_STATUS_SAVE_SECONDS:
+            save_bulk_execution_job_object(request['databaseId'], request['workflowId'], status['jobId'], "status", status)
+            last_saved = time.time()
+
+    return None
+
+
+def start_bulk_execution_job(databaseId, workflowId, jobId, function_name, continuationId=None, delay_seconds=0):
+    """Run a bulk execution job asynchronously on this function, through the retry queue when delayed
+
+    Args:
+        databaseId: The database ID
+        workflowId: The workflow ID
+        jobId: The job ID
+        function_name: The name of this Lambda function
+        continuationId: The continuationId of the job status this run continues from
+        delay_seconds: Seconds to wait before the job runs
+    """
+    payload = json.dumps({'bulkWorkflowExecutionJob': {'databaseId': databaseId, 'workflowId': workflowId,
+                                                       'jobId': jobId, 'continuationId': continuationId}})
+    if delay_seconds:
+        sqs_client.send_message(QueueUrl=bulk_execution_retry_queue_url, MessageBody=payload, DelaySeconds=delay_seconds)
+    else:
+        client.invoke(FunctionName=function_name, InvocationType='Event', Payload=payload)
+
+
+def run_bulk_execution_job(job, context):
+    """Run a queued bulk workflow execution job, continuing in a new invocation before the timeout
+
+    Args:
+        job: The job payload with databaseId, workflowId and jobId
+        context: The Lambda context
+    """
+    databaseId = job['databaseId']
+    workflowId = job['workflowId']
+    jobId = job['jobId']
+    deadline = time.time() + context.get_remaining_time_in_millis() / 1000 - BULK_EXECUTION_JOB_MARGIN_SECONDS
+
+    request = load_bulk_execution_job_object(databaseId, workflowId, jobId, "request")
+    status = load_bulk_execution_job_object(databaseId, workflowId, jobId, "status")
+    # Retried invocations and duplicate queue messages continue from a status that already moved on
+    if job.get('continuationId') != status.get('continuationId'):
+        logger.info(f"Skipping stale run of bulk workflow execution job {jobId}")
+        return
+
+    try:
+        if status['totalTargets'] is None:
+            targets = get_bulk_execution_targets(request['assets'], request.get('fileGlob'))
+            save_bulk_execution_job_object(databaseId, workflowId, jobId, "targets", targets)
+            status.update({'status': "RUNNING", 'totalTargets': len(targets), 'message': f"Starting workflow on {len(targets)} target(s)"})
+            save_bulk_execution_job_object(databaseId, workflowId, jobId, "status", status)
+        else:
+            targets = load_bulk_execution_job_object(databaseId, workflowId, jobId, "targets")
+
+        continue_after = dispatch_bulk_executions(request, targets, status, deadline)
+        if continue_after is None:
+            status.update({
+                'status': "COMPLETED",
+                'message': f"Started {status['startedCount']} execution(s), skipped {status['skippedCount']} already executed target(s)"
+            })
+    except Exception as e:
+        logger.exception(f"Error running bulk workflow execution job {jobId}: {e}")
+        status.update({'status': "FAILED", 'message': "Bulk workflow execution job failed"})
+        continue_after = None
+
+    if continue_after is not None:
+        status['continuationId'] = str(uuid.uuid4())
+    save_bulk_execution_job_object(databaseId, workflowId, jobId, "status", status)
+    if continue_after is not None:
+        logger.info(f"Continuing bulk workflow execution job {jobId} from target {status['nextTargetIndex']} in {continue_after}s")
+        start_bulk_execution_job(databaseId, workflowId, jobId, context.function_name, status['continuationId'], continue_after)
+
+
+def handle_bulk_executions(event, context, request_body, response):
+    """Handle POST /database/{databaseId}/workflows/{workflowId}/bulkExecutions to queue a bulk execution
+    and GET /database/{databaseId}/workflows/{workflowId}/bulkExecutions/{jobId} to read its progress
+    """
+    pathParams = event.get('pathParameters', {})
+    method = event['requestContext']['http']['method']
+    required_field_names = ['databaseId', 'workflowId'] + (['jobId'] if method == 'GET' else [])
+    missing_field_names = list(set(required_field_names).difference(pathParams))
+    if missing_field_names:
+        response['statusCode'] = 400
+        response['body'] = json.dumps({"message": 'Missing path parameter(s) (%s) in API call' % (', '.join(missing_field_names))})
+        return response
+
+    validations = {
+        'databaseId': {
+            'value': pathParams['databaseId'],
+            'validator': 'ID'
+        },
+        'workflowId': {
+            'value': pathParams['workflowId'],
+            'validator': 'ID'
+        },
+    }
+    if method == 'GET':
+        validations['jobId'] = {
+            'value': pathParams['jobId'],
+            'validator': 'UUID'
+        }
+    else:
+        validations['workflowDatabaseId'] = {
+            'value': request_body.get('workflowDatabaseId', ''),
+            'validator': 'ID',
+            'allowGlobalKeyword': True
+        }
+        validations['fileGlob'] = {
+            'value': request_body.get('fileGlob', ''),
+            'validator': 'STRING_256',
+            'optional': True
+        }
+    (valid, message) = validate(validations)
+
+    assetIds = request_body.get('assetIds') if method == 'POST' else None
+    maxConcurrency = request_body.get('maxConcurrency', BULK_EXECUTION_DEFAULT_CONCURRENCY) if method == 'POST' else None
+    if valid and assetIds is not None:
+        if not isinstance(assetIds, list) or len(assetIds) == 0 or len(assetIds) > BULK_EXECUTION_MAX_ASSET_IDS:
+            (valid, message) = (False, f"assetIds must be a list of 1 to {BULK_EXECUTION_MAX_ASSET_IDS} asset IDs")
+        for assetId in assetIds if valid else []:
+            (valid, message) = validate({'assetId': {'value': assetId, 'validator': 'ASSET_ID'}})
+            if not valid:
+                break
+    if valid and method == 'POST' and (not isinstance(maxConcurrency, int) or isinstance(maxConcurrency, bool) or
+                                       not 1 <= maxConcurrency <= BULK_EXECUTION_MAX_CONCURRENCY):
+        (valid, message) = (False, f"maxConcurrency must be a number from 1 to {BULK_EXECUTION_MAX_CONCURRENCY}")
+
+    if not valid:
+        logger.error(message)
+        response['statusCode'] = 400
+        response['body'] = json.dumps({"message": message})
+        return response
+
+    if len(claims_and_roles["tokens"]) == 0 or not CasbinEnforcer(claims_and_roles).enforceAPI(event):
+        response['statusCode'] = 403
+        response['body'] = json.dumps({"message": "Not Authorized"})
+        return response
+
+    databaseId = pathParams['databaseId']
+    workflowId = pathParams['workflowId']
+
+    if method == 'GET':
+        try:
+            request = load_bulk_execution_job_object(databaseId, workflowId, pathParams['jobId'], "request")
+            status = load_bulk_execution_job_object(databaseId, workflowId, pathParams['jobId'], "status")
+        except s3c.exceptions.NoSuchKey:
+            response['statusCode'] = 404
+            response['body'] = json.dumps({"message": "Bulk execution job does not exist"})
+            return response
+        workflowDatabaseId = request['workflowDatabaseId']
+    else:
+        workflowDatabaseId = request_body['workflowDatabaseId']
+
+    workflowResponse = get_workflow(workflowDatabaseId, workflowId)
+    if not workflowResponse:
+        response['statusCode'] = 404
+        response['body'] = json.dumps({"message": "Workflow does not exist"})
+        return response
+    workflow = workflowResponse[0]
+    # Add Casbin Enforcer to check if the current user has permissions to the workflow:
+    workflow.update({
+        "object__type": "workflow"
+    })
+    if not CasbinEnforcer(claims_and_roles).enforce(workflow, method):
+        response['statusCode'] = 403
+        response['body'] = json.dumps({"message": "Not Authorized"})
+        return response
+
+    if method == 'GET':
+        response['statusCode'] = 200
+        response['body'] = json.dumps(status)
+        return response
+
+    (pipelines_valid, pipelineName) = validate_pipelines(workflow)
+    if not pipelines_valid:
+        logger.error("Not all pipelines are enabled/accessible")
+        response['statusCode'] = 400
+        response['body'] = json.dumps({'message': 'Pipeline is not enabled/accessible'})
+        return response
+
+    # Assets are authorized up front, the background job runs without the caller's claims
+    (assets, rejectedAssetIds) = get_authorized_assets(databaseId, assetIds)
+    if not assets:
+        response['statusCode'] = 400
+        response['body'] = json.dumps({"message": "No assets found that the workflow can be executed on"})
+        return response
+
+    jobId = str(uuid.uuid4())
+    # The job request is stored in the auxiliary bucket since it can exceed the asynchronous invoke payload limit
+    save_bulk_execution_job_object(databaseId, workflowId, jobId, "request", {
+        'databaseId': databaseId,
+        'workflowDatabaseId': workflowDatabaseId,
+        'workflowId': workflowId,
+        'workflow_arn': workflow['workflow_arn'],
+        'fileGlob': request_body.get('fileGlob') or None,
+        'maxConcurrency': maxConcurrency,
+        'assets': assets,
+        'executingUserName': claims_and_roles["tokens"][0],
+        'requestContext': event['requestContext'],
+    })
+    status = {
+        'jobId': jobId,
+        'status': "QUEUED",
+        'message': f"Queued workflow on {len(assets)} asset(s)",
+        'totalAssets': len(assets),
+        'totalTargets': None,
+        'nextTargetIndex': 0,
+        'startedCount': 0,
+        'skippedCount': 0,
+        'failedCount': 0,
+        'succeededCount': 0,
+        'failedExecutionCount': 0,
+        'running': [],
+        'failures': [],
+        'continuationId': None,
+    }
+    for assetId in rejectedAssetIds:
+        add_bulk_execution_failure(status, assetId, "", "Asset does not exist or is not authorized")
+    save_bulk_execution_job_object(databaseId, workflowId, jobId, "status", status)
+    start_bulk_execution_job(databaseId, workflowId, jobId, context.function_name)
+
+    response['statusCode'] = 200
+    response['body'] = json.dumps(status)
+    return response
+
+
+@trace_invocation
 def lambda_handler(event, context):
     global claims_and_roles
+    if 'bulkWorkflowExecutionJob' in event:
+        run_bulk_execution_job(event['bulkWorkflowExecutionJob'], context)
+        return
+    if 'Records' in event:
+        # Delayed bulk execution job runs from the retry queue
+        for record in event['Records']:
+            run_bulk_execution_job(json.loads(record['body'])['bulkWorkflowExecutionJob'], context)
+        return
+
     response = STANDARD_JSON_RESPONSE
     claims_and_roles = request_to_claims(event)
     logger.info(event)
@@ -357,6 +892,9 @@ def lambda_handler(event, context):
             return response
 
     try:
+        if '/bulkExecutions' in event['requestContext']['http'].get('path', ''):
+            return handle_bulk_executions(event, context, request_body, response)
+
         pathParams = event.get('pathParameters', {})
         logger.info(pathParams)
         # Check for missing fields - TODO: would need to keep these synchronized
@@ -478,29 +1016,14 @@ def lambda_handler(event, context):
                             else:
                                 logger.info(f"Using asset's base prefix key (no particular file): {file_key}")
                             
-                            metadataResponse = get_asset_metadata(pathParams['databaseId'], pathParams['assetId'], file_key, event)
-                            metadata = metadataResponse.get("metadata", {})
-
-                            #remove databaseId/assetId from metadata if exists
-                            metadata.pop('databaseId', None)
-                            metadata.pop('assetId', None)
-
-                            inputMetadata = {
-                                "VAMS": {
-                                    "assetData": {
-                                        "assetName":asset.get("assetName", ""),
-                                        "description": asset.get("description", ""),
-                                        "tags": asset.get("tags", [])
-                                    },
-                                    "assetMetadata": metadata
-                                },
-                                #"User": {}
-                            }
+                            metadata = get_asset_metadata(pathParams['databaseId'], pathParams['assetId'], file_key, claims_and_roles)
+                            inputMetadata = build_input_metadata(asset, metadata)
 
                             logger.info("Launching Workflow:")
                             executionId = launchWorkflow(asset_bucket, file_key, workflow['workflow_arn'], pathParams['databaseId'],
                                                          pathParams['assetId'], request_body.get('workflowDatabaseId'), workflow['workflowId'],
-                                                         executingUserName, executingRequestContext, inputMetadata)
+                                                         executingUserName, executingRequestContext, inputMetadata,
+                                                         get_file_etag(asset_bucket, file_key))
                             response["statusCode"] = 200
                             response['body'] = json.dumps({'message': executionId})
                             return response
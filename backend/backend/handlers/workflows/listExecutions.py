@@ -3,7 +3,7 @@
 
 import json
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import botocore
 from boto3.dynamodb.conditions import Key
 from common.constants import STANDARD_JSON_RESPONSE
@@ -11,13 +11,14 @@ from common.validators import validate
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 
 claims_and_roles = {}
 logger = safeLogger(service="ListExecutionsWorkflow")
 
-sfn = boto3.client('stepfunctions')
-dynamodb = boto3.resource('dynamodb')
+sfn = lazy_client('stepfunctions')
+dynamodb = lazy_resource('dynamodb')
 main_rest_response = STANDARD_JSON_RESPONSE
 
 try:
@@ -168,6 +169,7 @@ def get_executions(database_id, asset_id, workflow_database_id, workflow_id, que
         }
 
 
+@trace_invocation
 def lambda_handler(event, context):
     global claims_and_roles
     response = STANDARD_JSON_RESPONSE
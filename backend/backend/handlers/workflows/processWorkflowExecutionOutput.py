@@ -2,19 +2,25 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import botocore
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from boto3.dynamodb.conditions import Key
 from common.constants import STANDARD_JSON_RESPONSE
 from common.validators import validate
 from handlers.authz import CasbinEnforcer
 from handlers.auth import request_to_claims
+from handlers.metadata import ValidationError as MetadataValidationError
+from handlers.metadata.read import read_asset_metadata
+from handlers.metadata.create import save_asset_metadata
+from handlers.assets.uploadFile import complete_external_upload_for_user
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.s3 import validateS3AssetExtensionsAndContentType
-from models.assetsV3 import AssetUploadTableModel
+from models.assetsV3 import AssetUploadTableModel, CompleteExternalUploadRequestModel
 
 asset_Database = None
 db_Database = None
@@ -25,12 +31,10 @@ logger = safeLogger(service_name="ProcessWorkflowExecutionOutput")
 
 # Constants
 UPLOAD_EXPIRATION_DAYS = 1  # TTL for upload records for pipeline output
+METADATA_FETCH_MAX_WORKERS = 10  # Concurrent reads of pipeline output metadata files
 
 try:
     s3_asset_buckets_table = os.environ["S3_ASSET_BUCKETS_STORAGE_TABLE_NAME"]
-    read_metadata_function = os.environ['READ_METADATA_LAMBDA_FUNCTION_NAME']
-    create_metadata_function = os.environ['CREATE_METADATA_LAMBDA_FUNCTION_NAME']
-    file_upload_function = os.environ['FILE_UPLOAD_LAMBDA_FUNCTION_NAME']
     asset_Database = os.environ["ASSET_STORAGE_TABLE_NAME"]
     asset_upload_table_name = os.environ["ASSET_UPLOAD_TABLE_NAME"]
     db_Database = os.environ["DATABASE_STORAGE_TABLE_NAME"]
@@ -40,22 +44,12 @@ except Exception as e:
     logger.exception("Failed loading environment variables")
     raise
 
-s3c = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
-client = boto3.client('lambda')
+s3c = lazy_client('s3')
+dynamodb = lazy_resource('dynamodb')
 asset_upload_table = dynamodb.Table(asset_upload_table_name)
 buckets_table = dynamodb.Table(s3_asset_buckets_table)
 
 
-def _lambda_read_metadata(payload): return client.invoke(FunctionName=read_metadata_function,
-                                           InvocationType='RequestResponse', Payload=json.dumps(payload).encode('utf-8'))
-
-def _lambda_create_metadata(payload): return client.invoke(FunctionName=create_metadata_function,
-                                           InvocationType='RequestResponse', Payload=json.dumps(payload).encode('utf-8'))
-
-def _lambda_file_ingestion(payload): return client.invoke(FunctionName=file_upload_function,
-                                           InvocationType='RequestResponse', Payload=json.dumps(payload).encode('utf-8'))
-
 # def attach_execution_assets(assets, execution_id, database_id, asset_id, workflow_id):
 #     logger.info("Attaching assets to execution")
 
@@ -123,18 +117,73 @@ def verify_get_path_objects(bucketName: str, pathPrefix: str):
     if(not validateS3AssetExtensionsAndContentType(bucketName, pathPrefix)):
         raise Exception("Pipeline uploaded objects contains a potentially malicious executable type object. Unable to process asset upload.")
 
-    # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.list_objects_v2
-    all_outputs = s3c.list_objects_v2(Bucket=bucketName, Prefix=pathPrefix)
-    if 'IsTruncated' in all_outputs and all_outputs['IsTruncated']:
-        logger.warning(
-            "WARN: s3 object listing exceeds 1,000 objects,"+
-            "this is unexpected for this operation with the bucket and prefix"+
-            bucketName+" "+pathPrefix
-        )
-    logger.info(all_outputs)
+    # Page through every output, pipelines can emit well over 1,000 objects (e.g. tiles or LODs)
+    contents = []
+    paginator = s3c.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucketName, Prefix=pathPrefix):
+        contents.extend(page.get('Contents', []))
+    logger.info(f"Found {len(contents)} pipeline output object(s) under {pathPrefix}")
 
+    all_outputs = {}
+    if contents:
+        all_outputs['Contents'] = contents
     return all_outputs
 
+def read_metadata_output_file(bucketName: str, key: str):
+    """Read and parse a pipeline output metadata JSON file
+
+    Args:
+        bucketName: The S3 bucket
+        key: The metadata file key
+
+    Returns:
+        The parsed dictionary, or an empty dictionary if the file is not JSON parsable
+    """
+    objectData = s3c.get_object(Bucket=bucketName, Key=key)['Body'].read().decode("utf-8")
+    try:
+        data = json.loads(objectData)
+    except Exception as e:
+        logger.error("Metadata object type for Pipeline Process Output File is not JSON parsable")
+        logger.error(e)
+        return {}
+    if not isinstance(data, dict):
+        logger.error("Metadata object for Pipeline Process Output File is not a JSON dictionary")
+        return {}
+    return data
+
+def read_metadata_output_files(bucketName: str, keys):
+    """Read pipeline output metadata JSON files concurrently
+
+    Args:
+        bucketName: The S3 bucket
+        keys: List of metadata file keys
+
+    Returns:
+        List of parsed dictionaries in the same order as keys
+    """
+    if not keys:
+        return []
+    with ThreadPoolExecutor(max_workers=min(METADATA_FETCH_MAX_WORKERS, len(keys))) as executor:
+        return list(executor.map(lambda key: read_metadata_output_file(bucketName, key), keys))
+
+def merge_metadata_output(metadata, data):
+    """Add to or update metadata entries from a pipeline output metadata dictionary
+
+    Args:
+        metadata: The metadata dictionary to update
+        data: The parsed pipeline output metadata
+    """
+    for k, v in data.items():
+        if isinstance(v, dict):
+            logger.warning("Not able to process sub-dictionaries right now for metadata elements")
+        elif isinstance(v, list):
+            #Check if first element is a string, if it is, join all of them together as a comma-deliminated list
+            if v and isinstance(v[0], str):
+                metadata[str(k)] = ",".join(v)
+        else:
+            if(str(k) != 'assetId' and str(k) != 'databaseId' and str(v) != ""):
+                metadata[str(k)] = str(v)
+
 def lookup_existing_asset(database_id, asset_id):
     asset_table = dynamodb.Table(asset_Database)
     asset = asset_table.get_item(
@@ -177,36 +226,10 @@ def create_external_upload_record(asset_id, database_id, upload_type, temporary_
         logger.exception(f"Error creating external upload record: {e}")
         raise e
 
-def update_s3_object_metadata(key, asset_id, database_id, upload_id, bucket_name):
-    """Update S3 object metadata with asset and upload information"""
+def process_external_upload(upload_id, asset_id, database_id, upload_type, files, temporary_prefix, claims_and_roles):
+    """Complete an external upload of pipeline output files through the upload service"""
     try:
-        # Get current object metadata
-        head_response = s3c.head_object(Bucket=bucket_name, Key=key)
-        content_type = head_response.get('ContentType', 'application/octet-stream')
-        
-        # Copy object to itself with new metadata
-        s3c.copy_object(
-            CopySource={'Bucket': bucket_name, 'Key': key},
-            Bucket=bucket_name,
-            Key=key,
-            ContentType=content_type,
-            Metadata={
-                'databaseid': database_id,
-                'assetid': asset_id,
-                'uploadid': upload_id
-            },
-            MetadataDirective='REPLACE'
-        )
-        
-        return True
-    except Exception as e:
-        logger.exception(f"Error updating S3 object metadata: {e}")
-        return False
-
-def process_external_upload(upload_id, asset_id, database_id, upload_type, files, temporary_prefix, request_context):
-    """Process an external upload using the fileIngestion Lambda"""
-    try:
-        # Prepare the request payload
+        # Prepare the request
         file_list = []
         for file_key in files:
             # Extract the file name from the key
@@ -218,56 +241,28 @@ def process_external_upload(upload_id, asset_id, database_id, upload_type, files
                 "tempKey": file_key
             })
         
-        # Create the request body
-        body = {
-            "assetId": asset_id,
-            "databaseId": database_id,
-            "uploadType": upload_type,
-            "files": file_list
-        }
-        
-        # Create the Lambda payload to simulate an API Gateway request
-        lambda_payload = {
-            "requestContext": request_context,
-            "pathParameters": {
-                "uploadId": upload_id
-            },
-            "body": json.dumps(body),
-        }
-        lambda_payload["requestContext"]["http"]["path"] = f"/uploads/{upload_id}/complete/external"
-        lambda_payload["requestContext"]["http"]["httpMethod"] = f"POST"
-        
-        # Invoke the Lambda function
-        response = _lambda_file_ingestion(lambda_payload)
-        
-        # Process the response
-        if response and 'Payload' in response:
-            stream = response['Payload']
-            if stream:
-                json_response = json.loads(stream.read().decode("utf-8"))
-                logger.info("fileIngestion response:")
-                logger.info(json_response)
-                
-                if "statusCode" in json_response and json_response["statusCode"] == 200:
-                    if "body" in json_response:
-                        return json.loads(json_response["body"])
-                    else:
-                        logger.error("No body in fileIngestion response")
-                        return None
-                else:
-                    logger.error(f"Error in fileIngestion response: {json_response}")
-                    return None
-            else:
-                logger.error("No payload stream in fileIngestion response")
-                return None
+        request_model = CompleteExternalUploadRequestModel(
+            assetId=asset_id,
+            databaseId=database_id,
+            uploadType=upload_type,
+            files=file_list
+        )
+
+        response = complete_external_upload_for_user(upload_id, request_model, claims_and_roles)
+        logger.info("External upload response:")
+        logger.info(response.dict())
+
+        if response.overallSuccess or any(result.success for result in response.fileResults):
+            return response.dict()
         else:
-            logger.error("Invalid response from fileIngestion Lambda")
+            logger.error(f"Error completing external upload: {response.message}")
             return None
     except Exception as e:
         logger.exception(f"Error processing external upload: {e}")
         return None
 
 
+@trace_invocation
 def lambda_handler(event, context):
     response = STANDARD_JSON_RESPONSE
     logger.info(event)
@@ -422,15 +417,6 @@ def lambda_handler(event, context):
                                 previewPathKey
                             )
                             
-                            # Update S3 object metadata
-                            update_s3_object_metadata(
-                                preview_file,
-                                event['assetId'],
-                                event['databaseId'],
-                                upload_id,
-                                bucket_name
-                            )
-                            
                             # Process the external upload
                             result = process_external_upload(
                                 upload_id,
@@ -439,7 +425,7 @@ def lambda_handler(event, context):
                                 "assetPreview",
                                 [preview_file],
                                 previewPathKey,
-                                requestContext
+                                claims_and_roles
                             )
                             
                             if result:
@@ -462,62 +448,26 @@ def lambda_handler(event, context):
                     logger.error(e)
 
                 if 'Contents' in objectsFound:
-                    metadata = {}
-
-                    #Get existing metadata through read metadata invoke
-                    l_payload = {
-                        "requestContext": requestContext,
-                        "pathParameters": {
-                            "databaseId": event['databaseId'],
-                            "assetId": event['assetId']
-                        }
-                    }
+                    metadata = None
+
+                    #Get existing metadata (empty for assets without any metadata yet)
                     logger.info("Getting metadata")
-                    logger.info(l_payload)
-                    read_metadata_response = _lambda_read_metadata(l_payload)
-                    logger.info("read metadata response:")
-                    #logger.info(read_metadata_response)
-                    stream = read_metadata_response['Payload']
-                    if stream:
-                        json_response = json.loads(stream.read().decode("utf-8"))
-                        logger.info("readMetadata payload:")
-                        logger.info(json_response)
-                        if "body" in json_response:
-                            response_body = json.loads(json_response['body'])
-                            if "metadata" in response_body:
-                                metadata = response_body['metadata']
-
-                    #Check if we don't yet have any metadata for this asset (shouldn't be possible so another fault must have occured)
-                    if('assetId' in metadata and 'databaseId' in metadata):
+                    try:
+                        metadata = read_asset_metadata(event['databaseId'], event['assetId'], None, claims_and_roles)
+                    except MetadataValidationError as e:
+                        logger.error(f"Unable to read metadata for asset: {e.code}")
+
+                    if metadata is not None:
                         files = [x['Key'] for x in objectsFound['Contents'] if '/' != x['Key'][-1]]
                         logger.info("Files present in pipeline output metadata folder:")
                         logger.info(files)
-                        for file in files:
-                            #Only process files that end in JSON extension for now
-                            if file.lower().endswith('.json'):
-                                objectResponse = s3c.get_object(Bucket=bucket_name, Key=file)
-                                objectData = objectResponse['Body'].read().decode("utf-8")
-                                data = {}
-                                try:
-                                    data = json.loads(objectData)
-                                    logger.info(data)
-                                except Exception as e:
-                                    logger.error("Metadata object type for Pipeline Process Output File is not JSON parsable")
-                                    logger.error(e)
-
-                                #Loop through each key/value in JSON dictionary and add to or update existing entries
-                                for k, v in data.items():
-                                    if isinstance(v, dict):
-                                        logger.warn("Not able to process sub-dictionaries right now for metadata elements")
-                                    elif isinstance(v, list):
-                                        #Check if first element is a string, if it is, join all of them together as a comma-deliminated list
-                                        if isinstance(v[0], str):
-                                            metadata[str(k)] = ",".join(v)
-                                    else:
-                                        if(str(k) != 'assetId' and str(k) != 'databaseId' and str(v) != ""):
-                                            metadata[str(k)] = str(v)
-                            else:
-                                logger.error("Files present in pipeline output metadata folder outside of JSON. Skipping...")
+                        jsonFiles = [file for file in files if file.lower().endswith('.json')]
+                        if len(jsonFiles) != len(files):
+                            logger.error("Files present in pipeline output metadata folder outside of JSON. Skipping...")
+
+                        #Only process files that end in JSON extension for now, merged in listing order
+                        for data in read_metadata_output_files(bucket_name, jsonFiles):
+                            merge_metadata_output(metadata, data)
 
                         logger.info(metadata)
 
@@ -528,38 +478,18 @@ def lambda_handler(event, context):
                         #Make sure we don't have an empty dictionary, and then save
                         if metadata:
                             #Conduct final save of metadata
-                            l_payload = {
-                                "requestContext": requestContext,
-                                "pathParameters": {
-                                    "databaseId": event['databaseId'],
-                                    "assetId": event['assetId']
-                                },
-                                "body": json.dumps({
-                                    "version": "1",
-                                    "metadata": metadata
-                                })
-                            }
                             logger.info("Saving metadata")
-                            logger.info(l_payload)
-                            create_metadata_response = _lambda_create_metadata(l_payload)
-                            logger.info("create metadata response:")
-                            logger.info(read_metadata_response)
-                            stream = create_metadata_response['Payload']
-                            if stream:
-                                json_response = json.loads(stream.read().decode("utf-8"))
-                                logger.info("createMetadata payload:")
-                                logger.info(json_response)
-                                if "statusCode" in json_response:
-                                    #log error if we have anything but a 200 status code
-                                    if(json_response['statusCode'] != 200):
-                                        logger.error("Error code not 200 for saving metadata back to database for asset. Skipping...")
-                                else:
-                                    logger.error("Error status code not present for saving metadata back to database for asset. Skipping...")
+                            logger.info(metadata)
+                            try:
+                                save_asset_metadata(event['databaseId'], event['assetId'], metadata, claims_and_roles)
+                            except Exception as e:
+                                logger.exception(e)
+                                logger.error("Error saving metadata back to database for asset. Skipping...")
                         else:
                             logger.warn("Empty metadata dictionary on save. Skipping....")
 
                     else:
-                        logger.error("Metadata database entry not found for asset. Skipping...")
+                        logger.error("Metadata of asset could not be read. Skipping...")
 
             #Handle asset file outputs
             if('filesPathKey' in event):
@@ -587,16 +517,6 @@ def lambda_handler(event, context):
                                 filesPathKey
                             )
                             
-                            # Update S3 object metadata for each file
-                            for file in files:
-                                update_s3_object_metadata(
-                                    file,
-                                    event['assetId'],
-                                    event['databaseId'],
-                                    upload_id,
-                                    bucket_name
-                                )
-                            
                             # Process the external upload
                             result = process_external_upload(
                                 upload_id,
@@ -605,7 +525,7 @@ def lambda_handler(event, context):
                                 "assetFile",
                                 files,
                                 filesPathKey,
-                                requestContext
+                                claims_and_roles
                             )
                             
                             # if result and "assetType" in result:
@@ -2,7 +2,7 @@
 #  SPDX-License-Identifier: Apache-2.0
 
 import os
-import boto3
+from common.awsClients import lazy_client, lazy_resource
 import botocore
 import json
 from boto3.dynamodb.conditions import Key
@@ -12,14 +12,15 @@ from common.constants import STANDARD_JSON_RESPONSE
 from handlers.auth import request_to_claims
 from handlers.authz import CasbinEnforcer
 from customLogging.logger import safeLogger
+from common.callTracing import trace_invocation
 from common.dynamodb import validate_pagination_info
 
 claims_and_roles = {}
 logger = safeLogger(service="WorkflowService")
 
-dynamodb = boto3.resource('dynamodb')
-dynamodb_client = boto3.client('dynamodb')
-sf_client = boto3.client('stepfunctions')
+dynamodb = lazy_resource('dynamodb')
+dynamodb_client = lazy_client('dynamodb')
+sf_client = lazy_client('stepfunctions')
 main_rest_response = STANDARD_JSON_RESPONSE
 workflow_database = None
 unitTest = {
@@ -306,6 +307,7 @@ def delete_handler(event, response, pathParameters):
     logger.info(response)
     return response
 
+@trace_invocation
 def lambda_handler(event, context):
     global claims_and_roles
     response = STANDARD_JSON_RESPONSE
@@ -7,10 +7,7 @@ from common.validators import validate, relative_file_path_pattern, id_pattern,
 from typing import Dict, List, Optional, Literal, Union, Any
 from typing_extensions import Annotated
 from pydantic import Json, EmailStr, PositiveInt, Field, Extra
-from aws_lambda_powertools.utilities.parser import BaseModel, root_validator, validator, ValidationError
-from aws_lambda_powertools.utilities.parser.models import (
-    APIGatewayProxyEventV2Model
-)
+from pydantic import BaseModel, root_validator, validator, ValidationError
 
 logger = safeLogger(service_name="AssetModelsV3")
 
@@ -405,6 +402,71 @@ class FileOperationResponseModel(BaseModel, extra=Extra.ignore):
     message: str
     affectedFiles: List[str] = []
 
+
+class BatchFileOperationItemModel(BaseModel, extra=Extra.ignore):
+    """Model for a single operation in a batch file operations request"""
+    operation: Literal["copy", "move", "archive", "delete"]
+    # Source path for copy/move
+    filePath: str = Field(min_length=1, strip_whitespace=True, pattern=relative_file_path_pattern)
+    destinationPath: Optional[str] = Field(None, min_length=1, strip_whitespace=True,
+                                           pattern=relative_file_path_pattern)
+    # For copy only
+    destinationAssetId: Optional[str] = Field(None, min_length=4, max_length=256, strip_whitespace=True,
+                                              pattern=id_pattern)
+    isPrefix: Optional[bool] = Field(default=False)  # For archive/delete only
+
+    @root_validator
+    def validate_fields(cls, values):
+        operation = values.get('operation')
+
+        # Destination path required for copy and move, not allowed otherwise
+        if operation in ["copy", "move"] and not values.get('destinationPath'):
+            raise ValueError(f"destinationPath is required for {operation} operations")
+        if operation in ["archive", "delete"] and values.get('destinationPath'):
+            raise ValueError(f"destinationPath is not allowed for {operation} operations")
+
+        if operation != "copy" and values.get('destinationAssetId'):
+            raise ValueError("destinationAssetId is only allowed for copy operations")
+
+        if operation in ["copy", "move"] and values.get('isPrefix'):
+            raise ValueError(f"isPrefix is not allowed for {operation} operations")
+
+        return values
+
+
+class BatchFileOperationsRequestModel(BaseModel, extra=Extra.ignore):
+    """Request model for running many file operations on an asset in one call"""
+    operations: List[BatchFileOperationItemModel] = Field(min_items=1, max_items=10000)
+    confirmPermanentDelete: bool = Field(default=False)  # Safety confirmation, required when any operation is a delete
+
+    @root_validator
+    def validate_fields(cls, values):
+        operations = values.get('operations') or []
+        if any(op.operation == "delete" for op in operations) and not values.get('confirmPermanentDelete'):
+            raise ValueError("Permanent deletion requires confirmation. Set confirmPermanentDelete to true.")
+        return values
+
+
+class BatchFileOperationResultModel(BaseModel, extra=Extra.ignore):
+    """Result of a single operation in a batch file operations request"""
+    index: int  # Position of the operation in the request
+    operation: str
+    filePath: str
+    success: bool
+    message: str
+    affectedFiles: List[str] = []
+
+
+class BatchFileOperationsResponseModel(BaseModel, extra=Extra.ignore):
+    """Response model for batch file operations and batch file operation jobs"""
+    jobId: Optional[str] = None  # Set when the batch runs as a background job
+    status: Literal["QUEUED", "RUNNING", "COMPLETED", "FAILED"]
+    message: str
+    totalOperations: int
+    succeededCount: int = 0
+    failedCount: int = 0
+    results: List[BatchFileOperationResultModel] = []
+
 class RevertFileVersionRequestModel(BaseModel, extra=Extra.ignore):
     """Request model for reverting a file to a previous version"""
     filePath: str = Field(min_length=1, strip_whitespace=True, pattern=relative_file_path_pattern)
@@ -768,9 +830,12 @@ class AssetVersionOperationResponseModel(BaseModel, extra=Extra.ignore):
 ######################## Download Asset API Models ##########################
 class DownloadAssetRequestModel(BaseModel, extra=Extra.ignore):
     """Request model for downloading asset files or previews"""
-    downloadType: Literal["assetFile", "assetPreview"]
+    downloadType: Literal["assetFile", "assetPreview", "assetManifest"]
     key: Optional[str] = Field(None, min_length=1, strip_whitespace=True, pattern=relative_file_path_pattern)
     versionId: Optional[str] = None  # For assetFile only, get specific version
+    assetVersionId: Optional[str] = None  # For assetManifest only, list files of a specific asset version
+    maxItems: int = Field(1000, ge=1, le=1000)  # For assetManifest only, files per manifest page
+    startingToken: Optional[str] = None  # For assetManifest only, NextToken from the previous manifest page
     
     @root_validator
     def validate_fields(cls, values):
@@ -778,8 +843,12 @@ class DownloadAssetRequestModel(BaseModel, extra=Extra.ignore):
         version_id = values.get('versionId')
         
         # Version ID only allowed for assetFile downloads
-        if download_type == "assetPreview" and version_id:
-            raise ValueError("versionId is not allowed for assetPreview downloads")
+        if download_type in ["assetPreview", "assetManifest"] and version_id:
+            raise ValueError(f"versionId is not allowed for {download_type} downloads")
+
+        # Asset version ID only allowed for assetManifest downloads
+        if download_type != "assetManifest" and values.get('assetVersionId'):
+            raise ValueError("assetVersionId is only allowed for assetManifest downloads")
             
         return values
 
@@ -791,6 +860,26 @@ class DownloadAssetResponseModel(BaseModel, extra=Extra.ignore):
     versionId: Optional[str] = None
     message: str = "Download URL generated successfully"
 
+
+class DownloadAssetManifestItemModel(BaseModel, extra=Extra.ignore):
+    """Model for an individual file in an asset download manifest"""
+    relativePath: str
+    size: Optional[int] = None
+    etag: Optional[str] = None
+    versionId: Optional[str] = None
+    downloadUrl: str
+
+
+class DownloadAssetManifestResponseModel(BaseModel, extra=Extra.ignore):
+    """Response model for a page of an asset download manifest"""
+    files: List[DownloadAssetManifestItemModel] = []
+    skippedFiles: List[str] = []  # Files excluded for unallowed extension or content type
+    expiresIn: int = 86400  # URL expiration in seconds (24 hours)
+    downloadType: Literal["assetManifest"] = "assetManifest"
+    assetVersionId: Optional[str] = None
+    NextToken: Optional[str] = None
+    message: str = "Download manifest generated successfully"
+
 ######################## DynamoDB Table Models ##########################
 class AssetUploadTableModel(BaseModel, extra=Extra.ignore):
     """Model for the asset upload tracking table"""
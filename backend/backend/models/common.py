@@ -14,6 +14,27 @@ class APIGatewayProxyResponseV2(TypedDict):
     body: str
 
 
+def parse(event: Any, model):
+    """Parse and validate a request body or query parameters with a pydantic model
+
+    Same result as aws_lambda_powertools.utilities.parser.parse without an envelope, without importing
+    every powertools event model (several hundred milliseconds of cold start).
+
+    Args:
+        event: Dictionary or JSON string to parse
+        model: The pydantic model class
+
+    Returns:
+        The model instance
+
+    Raises:
+        pydantic.ValidationError: When the event does not conform with the model
+    """
+    if isinstance(event, str):
+        return model.parse_raw(event)
+    return model.parse_obj(event)
+
+
 def commonHeaders() -> Dict[str, str]:
     return {
         'Content-Type': 'application/json',
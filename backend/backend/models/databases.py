@@ -3,7 +3,7 @@
 
 from typing import List, Optional, Dict, Any
 from pydantic import Field, Extra
-from aws_lambda_powertools.utilities.parser import BaseModel, root_validator
+from pydantic import BaseModel, root_validator
 from common.validators import validate, id_pattern, object_name_pattern, uuid_pattern
 from customLogging.logger import safeLogger
 
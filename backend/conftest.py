@@ -293,12 +293,12 @@ def setup_mock_imports():
                             databaseId = record['dynamodb']['Keys']['databaseId']['S']
                             if not databaseId.endswith('#deleted'):
                                 assetId = record['dynamodb']['Keys']['assetId']['S']
-                                meta_table.write_asset_table_updated_event(databaseId, assetId)
+                                metadata = meta_table.get_metadata(databaseId, assetId) or {}
+                                index_mock.index_document(databaseId, assetId, metadata)
             return index_mock
         
         def handle_s3_event_record(record, **kwargs):
             s3 = kwargs.get('s3', MagicMock())
-            metadata_fn = kwargs.get('metadata_fn', lambda: MagicMock())()
             get_asset_fields_fn = kwargs.get('get_asset_fields_fn', lambda: None)
             s3index_fn = kwargs.get('s3index_fn', lambda: MagicMock())
             sleep_fn = kwargs.get('sleep_fn', lambda x: None)
@@ -329,21 +329,15 @@ def setup_mock_imports():
                     databaseId = metadata.get('databaseid')
                     
                     if assetId and databaseId:
-                        # Get asset metadata
-                        asset_metadata = metadata_fn.get_metadata(databaseId, assetId)
-                        
-                        # If metadata not found, retry with sleep
-                        if not asset_metadata:
-                            for _ in range(120):
-                                sleep_fn(1)
-                                asset_metadata = metadata_fn.get_metadata(databaseId, assetId)
-                                if asset_metadata:
-                                    break
-                            if not asset_metadata:
-                                raise Exception(f"Metadata not found for {databaseId}/{assetId}")
-                        
-                        # Get asset fields
-                        asset_record = get_asset_fields_fn(record) if get_asset_fields_fn else None
+                        # Wait for the asset record, assets don't need a metadata record
+                        asset_record = None
+                        for _ in range(60):
+                            asset_record = get_asset_fields_fn(record) if get_asset_fields_fn else None
+                            if asset_record:
+                                break
+                            sleep_fn(1)
+                        if not asset_record:
+                            raise Exception(f"Asset record not found for {databaseId}/{assetId}")
                         
                         # Process S3 object
                         s3index = s3index_fn()
@@ -0,0 +1,91 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark Operations and Call Budgets
+
+Every operation of run_benchmarks.py is listed here once, with the AWS and OpenSearch calls it may
+make on BUDGET_DATA_SET. tests/handlers/test_aws_call_budgets.py enforces the budgets and
+tests/benchmarks/test_run_benchmarks.py checks that exactly these operations run, so adding an
+operation means adding it to build_operations() in run_benchmarks.py and to OPERATION_BUDGETS.
+
+The per operation bounds pin how the calls grow with the data, so a call added per listed item
+fails long before it shows up as latency. Update a budget when a change intentionally adds calls.
+"""
+
+from typing import Dict, NamedTuple
+
+# 20 assets with 20 files each, a link tree of depth 2 (6 linked assets, 26 assets in total) and 3 roles
+BUDGET_DATA_SET = {"assets": 20, "files-per-asset": 20, "link-depth": 2, "link-fanout": 2, "roles": 3}
+
+
+class CallBudget(NamedTuple):
+    """Calls an operation may make on BUDGET_DATA_SET"""
+    # Upper bound of the total number of AWS calls
+    aws_calls: int
+    # Upper bound of the AWS calls per operation, e.g. {"s3.HeadObject": 0}
+    operations: Dict[str, int]
+    # Upper bound of the OpenSearch requests
+    opensearch_calls: int = 0
+    # Whether the operation calls an API entry point that returns a status code (not handler internals)
+    api: bool = True
+
+
+OPERATION_BUDGETS = {
+    # 2 + roles scans: roles, user roles, then the constraints of each role
+    "authz.load_user_policy": CallBudget(5, {"dynamodb.Scan": 5}, api=False),
+    # One asset read per listed asset, the bucket of the assets is read once per request
+    "assetService.list_assets": CallBudget(28, {"dynamodb.GetItem": 26, "dynamodb.Query": 2,
+                                                "dynamodb.Scan": 0, "s3.HeadObject": 0}),
+    "assetService.get_asset": CallBudget(3, {"dynamodb.Scan": 0}),
+    # One version listing page and the primary type cache of the asset, whatever the number of files
+    "assetFiles.handle_list_files": CallBudget(5, {"s3.ListObjectVersions": 1, "s3.GetObject": 1, "s3.HeadObject": 0,
+                                                   "s3.ListObjectsV2": 0, "s3.PutObject": 0}),
+    # The index mapping and the query, the index generation of the aggregation cache was read by the warmup
+    # run and is only read again after INDEX_GENERATION_CHECK_SECONDS
+    "search.lambda_handler": CallBudget(1, {"dynamodb.Scan": 1}, opensearch_calls=2),
+    # Walks every page of an export (10 hits per page) with its cursors: opening the point in time, one
+    # query per page and closing it after the last page. The authorized databases are read once per page.
+    "search.export": CallBudget(2, {"dynamodb.Scan": 2}, opensearch_calls=4),
+    # Typeahead suggestions of a prefix of the asset names from the suggestion index, with the authorized
+    # databases cached by the warmup run as between keystrokes. Keep its median wall time under 50 ms.
+    "search.suggest": CallBudget(0, {"dynamodb.Scan": 0}, opensearch_calls=1),
+    # Effective metadata of every file of an asset with one get_item per path prefix, the baseline of the
+    # bulk read below. For a 1,000 file folder:
+    #   --assets 3 --files-per-asset 1000 --link-depth 1 --operation metadata.read_per_file
+    #   --operation metadata.read_for_paths --operation streams.index_asset_files
+    "metadata.read_per_file": CallBudget(60, {"dynamodb.GetItem": 60}, api=False),
+    # The deduplicated prefix keys of all files are read in one batch
+    "metadata.read_for_paths": CallBudget(1, {"dynamodb.BatchGetItem": 1, "dynamodb.GetItem": 0}, api=False),
+    # Asset fields, bucket, one listing page and one bulk metadata read per page, one _bulk request per batch
+    "streams.index_asset_files": CallBudget(4, {"dynamodb.BatchGetItem": 1, "dynamodb.GetItem": 1,
+                                                "s3.ListObjectsV2": 1}, opensearch_calls=1, api=False),
+    # Renames an asset: one query of its file metadata records, whatever the number of files, and one
+    # sliced update by query task for all its file documents and its status. For 100,000 file documents:
+    #   --assets 3 --files-per-asset 2 --link-depth 1 --indexed-files-per-asset 100000
+    #   --operation streams.propagate_asset_fields --operation streams.delete_asset_documents
+    "streams.propagate_asset_fields": CallBudget(1, {"dynamodb.Query": 1}, opensearch_calls=2, api=False),
+    # The asset table stream handler on a rename, from the stream record to the searchable documents: the
+    # asset metadata record and the file metadata records (the asset fields come with the stream record),
+    # then the previous asset document, the asset document, the name and tag suggestions, the update by
+    # query tasks of the file suggestions and of the file documents with its status, the generation bump and
+    # the read of the reindex state the changes are recorded for
+    "streams.index_asset_update": CallBudget(2, {"dynamodb.GetItem": 1, "dynamodb.Query": 1, "dynamodb.UpdateItem": 0},
+                                             opensearch_calls=8, api=False),
+    # Purges the search documents of an asset (the search index only): one sliced delete by query task for
+    # the asset and its files, its status and the completion check, and the delete by query of its suggestions
+    "streams.delete_asset_documents": CallBudget(0, {}, opensearch_calls=4, api=False),
+    # One batch read of the child assets per tree
+    "assetLinksService.child_tree": CallBudget(17, {"dynamodb.BatchGetItem": 1, "dynamodb.Scan": 0}),
+    # The asset is read once per request
+    "uploadFile.initialize": CallBudget(5, {"dynamodb.GetItem": 1, "s3.CreateMultipartUpload": 1, "dynamodb.Scan": 0}),
+    "uploadFile.complete_upload": CallBudget(17, {"s3.HeadObject": 5, "s3.ListObjectsV2": 2, "dynamodb.Scan": 0}),
+    # The work of one import job invocation on one record per file of every asset (e.g. --assets 50
+    # --files-per-asset 1000 for 50,000 records). 400 records: one asset batch read, one metadata batch read
+    # per 100 records, one batch write per 25 records and the job status once per chunk. The compiled schema
+    # is cached by the warmup run, only the schema version row of the database is read.
+    "metadata.bulk_import": CallBudget(23, {"dynamodb.BatchWriteItem": 16, "dynamodb.BatchGetItem": 5,
+                                            "dynamodb.Query": 0, "dynamodb.UpdateItem": 0, "dynamodb.GetItem": 1},
+                                       api=False),
+    "sqsBucketSync.lambda_handler_created": CallBudget(6, {"s3.HeadObject": 3, "s3.ListObjectsV2": 1}, api=False),
+}
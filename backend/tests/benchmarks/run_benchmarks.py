@@ -0,0 +1,640 @@
+"""
+Local Benchmark Suite for VAMS Backend
+
+Runs the real handlers of the hot API and indexing paths against moto, on a synthetic data set of
+configurable size (see synthetic_data.py), and reports wall time and the number of AWS, OpenSearch
+and authorization calls per operation as JSON. Results of two commits can be compared to catch
+call count and latency regressions before deploying.
+
+Every operation runs once to warm up (Casbin policies, bucket caches) and then `--iterations` times,
+each iteration inside a call trace (see backend/common/callTracing.py). The search index is an
+in-memory stand-in for OpenSearch, its requests are counted like real OpenSearch requests.
+
+    python tests/benchmarks/run_benchmarks.py --assets 200 --files-per-asset 20 --output before.json
+    python tests/benchmarks/run_benchmarks.py --assets 200 --files-per-asset 20 --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import (  # noqa: E402
+    BENCHMARK_USER,
+    TABLES,
+    SyntheticDataConfig,
+    benchmark_environment,
+    build_synthetic_dataset,
+)
+
+BACKEND_SOURCE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+RESULTS_SCHEMA_VERSION = 1
+
+# Relative increase of the median wall time of an operation reported as a regression by --compare
+DEFAULT_TIME_TOLERANCE = 0.25
+
+
+class Operation:
+    """A benchmarked handler call
+
+    `prepare` runs before every iteration outside of the measurement (e.g. to upload the parts of
+    a multipart upload the measured call completes) and its return value is passed to `run`.
+    """
+
+    def __init__(self, name: str, run: Callable, prepare: Optional[Callable] = None):
+        self.name = name
+        self.run = run
+        self.prepare = prepare or (lambda iteration: iteration)
+
+
+class InMemorySearchIndex:
+    """Stand-in for the opensearch-py client used by handlers.search.search.SearchAOS
+
+    Serves the synthetic asset documents, accepts the documents of the indexing handlers and records its
+    requests on the running call trace the same way the instrumented OpenSearch transport does. Searches of
+    the suggestion index ({index}-suggest) are served from the indexed suggestion documents.
+    """
+
+    def __init__(self, index_name: str, documents: List[Dict]):
+        self.index_name = index_name
+        self.documents = documents
+        # Documents written by the indexing handlers, by ID
+        self.indexed: Dict[str, Dict] = {}
+        self.indices = self
+        self.tasks = InMemoryTasks(self)
+        # Response of the last delete by query task
+        self.task_response: Dict = {}
+
+    def _trace(self, operation: str):
+        from common.callTracing import CATEGORY_OPENSEARCH, trace_call
+        return trace_call(CATEGORY_OPENSEARCH, operation, self.index_name)
+
+    def get_mapping(self, index: str) -> Dict:
+        with self._trace("opensearch.GET _mapping"):
+            fields = sorted({field for document in self.documents for field in document})
+            return {index: {"mappings": {"properties": {field: {"type": "text"} for field in fields}}}}
+
+    def index(self, index: str, body: Dict, id: str) -> Dict:
+        with self._trace("opensearch.PUT _doc"):
+            self.indexed[id] = body
+            return {"_index": index, "_id": id, "result": "created"}
+
+    def bulk(self, body: List[Dict]) -> Dict:
+        with self._trace("opensearch.POST _bulk"):
+            items = []
+            lines = iter(body)
+            for line in lines:
+                operation, action = next(iter(line.items()))
+                if operation == "index":
+                    self.indexed[action["_id"]] = next(lines)
+                else:
+                    self.indexed.pop(action["_id"], None)
+                items.append({operation: {"_id": action["_id"], "status": 200}})
+            return {"errors": False, "items": items}
+
+    def update(self, index: str, id: str, body: Dict, params: Optional[Dict] = None) -> Dict:
+        with self._trace("opensearch.POST _update"):
+            document = self.indexed.setdefault(id, {})
+            document.update(body["doc"])
+            return {"_index": index, "_id": id, "result": "updated", "get": {"_source": dict(document)}}
+
+    def _matching_ids(self, query: Dict) -> List[str]:
+        # Term queries, alone or as the filters of a bool query
+        terms = [next(iter(term["term"].items())) for term in query.get("bool", {}).get("filter", [query])]
+        return [id for id, document in self.indexed.items()
+                if all(document.get(field.rsplit(".raw", 1)[0]) == value for field, value in terms)]
+
+    def update_by_query(self, index: str, body: Dict, params: Optional[Dict] = None) -> Dict:
+        with self._trace("opensearch.POST _update_by_query"):
+            # Applies the parameters of the asset field propagation script
+            script = body["script"]["params"]
+            ids = self._matching_ids(body["query"])
+            for id in ids:
+                self.indexed[id].update(script["changed"])
+                for field in script["removed"]:
+                    self.indexed[id].pop(field, None)
+            self.task_response = {"total": len(ids), "updated": len(ids), "failures": []}
+            return {"task": "benchmark:2"}
+
+    def delete_by_query(self, index: str, body: Dict, params: Optional[Dict] = None) -> Dict:
+        with self._trace("opensearch.POST _delete_by_query"):
+            ids = self._matching_ids(body["query"])
+            for id in ids:
+                del self.indexed[id]
+            self.task_response = {"deleted": len(ids), "failures": []}
+            return {"task": "benchmark:1"}
+
+    def count(self, index: str, body: Dict) -> Dict:
+        with self._trace("opensearch.POST _count"):
+            return {"count": len(self._matching_ids(body["query"]))}
+
+    def get(self, index: str, id: str) -> Dict:
+        with self._trace("opensearch.GET _doc"):
+            if id not in self.indexed:
+                import opensearchpy
+                raise opensearchpy.NotFoundError(404, "not_found", {"found": False})
+            return {"_index": index, "_id": id, "found": True, "_source": self.indexed[id]}
+
+    def _aggregations(self, aggs: Dict) -> Dict:
+        # Term buckets of the facet aggregations, nested under their filter aggregation like in OpenSearch
+        result = {}
+        for name, aggregation in aggs.items():
+            if "terms" in aggregation:
+                field = aggregation["terms"]["field"].rsplit(".", 1)[0]
+                counts: Dict[str, int] = {}
+                for document in self.documents:
+                    values = document.get(field)
+                    for value in values if isinstance(values, list) else [values]:
+                        if value is not None:
+                            counts[str(value)] = counts.get(str(value), 0) + 1
+                result[name] = {"buckets": [{"key": key, "doc_count": count} for key, count in
+                                            sorted(counts.items(), key=lambda item: -item[1])]}
+            else:
+                result[name] = {"doc_count": len(self.documents), **self._aggregations(aggregation.get("aggs", {}))}
+        return result
+
+    def create_point_in_time(self, index: str, keep_alive: str) -> Dict:
+        with self._trace("opensearch.POST _search/point_in_time"):
+            return {"pit_id": f"{index}-pit"}
+
+    def delete_point_in_time(self, body: Dict) -> Dict:
+        with self._trace("opensearch.DELETE _search/point_in_time"):
+            return {"pits": [{"pit_id": pit_id, "successful": True} for pit_id in body["pit_id"]]}
+
+    def _suggestions(self, body: Dict) -> Dict:
+        # Every word of the match query starts a word of the suggestion, like the edge n-gram analyzer
+        query = body["query"]["bool"]
+        words = query["must"][0]["match"]["suggest"]["query"].lower().split()
+        filters = [next(iter(term["terms"].items())) for term in query["filter"]]
+        hits = [{"_index": self.index_name, "_id": id, "_score": 1.0, "_source": document}
+                for id, document in sorted(self.indexed.items(), key=lambda item: str(item[1].get("value")))
+                if "suggest" in document
+                and all(any(token.startswith(word) for token in document["suggest"].lower().split()) for word in words)
+                and all(document.get(field) in values for field, values in filters)]
+        return {"hits": {"total": {"value": len(hits), "relation": "eq"}, "hits": hits[:int(body["size"])]}}
+
+    def search(self, body: Dict, index: Optional[str] = None) -> Dict:
+        with self._trace("opensearch.POST _search"):
+            if index is not None and index.endswith("-suggest"):
+                return self._suggestions(body)
+            size = int(body.get("size", len(self.documents)))
+            start = int(body.get("from", 0))
+            hits = [{"_index": self.index_name, "_id": f"{document['str_databaseid']}#{document['str_assetid']}",
+                     "_score": 1.0, "_source": document} for document in self.documents]
+            if "search_after" in body:
+                # Export pages are sorted by document ID and continue after the last hit of the previous page
+                hits = sorted(hits, key=lambda hit: hit["_id"])
+                after = body["search_after"][-1]
+                start = next((position for position, hit in enumerate(hits) if hit["_id"] > after), len(hits))
+            for hit in hits[start:start + size]:
+                hit["sort"] = [hit["_score"], hit["_id"]]
+            total = {"value": len(self.documents), "relation": "eq"}
+            result = {"hits": {"total": total, "hits": hits[start:start + size]}}
+            if "aggs" in body:
+                result["aggregations"] = self._aggregations(body["aggs"])
+            return result
+
+
+class InMemoryTasks:
+    """Tasks API of InMemorySearchIndex, delete by query tasks complete immediately"""
+
+    def __init__(self, search_index: InMemorySearchIndex):
+        self.search_index = search_index
+
+    def get(self, task_id: str) -> Dict:
+        with self.search_index._trace("opensearch.GET _tasks"):
+            return {"completed": True, "task": {"id": task_id}, "response": self.search_index.task_response}
+
+
+def api_event(method: str, path: str, path_parameters: Optional[Dict] = None,
+              query_parameters: Optional[Dict] = None, body: Optional[Dict] = None) -> Dict:
+    """API Gateway (HTTP API) event of the benchmark user"""
+    return {
+        "version": "2.0",
+        "routeKey": f"{method} {path}",
+        "rawPath": path,
+        "headers": {"authorization": "Bearer benchmark"},
+        "pathParameters": path_parameters or {},
+        "queryStringParameters": query_parameters or {},
+        "requestContext": {
+            "http": {"method": method, "path": path},
+            "authorizer": {"jwt": {"claims": {"cognito:username": BENCHMARK_USER, "auth_time": 0}}},
+        },
+        "body": json.dumps(body) if body is not None else None,
+    }
+
+
+def s3_event_message(bucket_name: str, key: str) -> Dict:
+    """SQS message carrying an S3 ObjectCreated notification"""
+    record = {
+        "eventSource": "aws:s3",
+        "eventName": "ObjectCreated:Put",
+        "s3": {"bucket": {"name": bucket_name}, "object": {"key": key, "size": 64}},
+    }
+    return {"Records": [{"eventSource": "aws:sqs", "body": json.dumps({"Records": [record]})}]}
+
+
+def build_operations(dataset, s3_client) -> List[Operation]:
+    """The benchmarked operations, in the order they run (read only operations first)"""
+    from handlers import authz
+    from handlers.assetLinks import assetLinksService
+    from handlers.assets import assetFiles, assetService, uploadFile
+    from handlers.indexing import sqsBucketSync, streams
+    from handlers.metadata import bulkImport, read as metadataRead
+    from handlers.search import search
+    from common.searchSuggestions import asset_suggestions, suggest_index_name, suggestion_asset_fields
+
+    database_id, asset_id = dataset.first_asset
+    root_database_id, root_asset_id = dataset.link_root
+    upload_asset_id = dataset.asset_ids[database_id][-1]
+    sync_asset_id = dataset.asset_ids[database_id][len(dataset.asset_ids[database_id]) // 2]
+    uploads_table = TABLES["ASSET_UPLOAD_TABLE_NAME"][0]
+
+    search_client = InMemorySearchIndex(os.environ["AOS_INDEX_NAME_PARAM"], dataset.search_documents)
+
+    def search_fn():
+        search_aos = search.SearchAOS.__new__(search.SearchAOS)
+        search_aos.client = search_client
+        search_aos.indexName = search_client.index_name
+        return search_aos
+
+    def initialize_upload(iteration):
+        return uploadFile.lambda_handler(api_event("POST", "/uploads", body={
+            "assetId": upload_asset_id,
+            "databaseId": database_id,
+            "uploadType": "assetFile",
+            "files": [{"relativeKey": f"/uploads/model-{iteration}.obj", "file_size": 1024}],
+        }), None)
+
+    def clear_uploads(iteration):
+        # Upload initializations are rate limited per user, drop the ones the previous iterations left
+        import boto3
+        table = boto3.resource("dynamodb").Table(uploads_table)
+        for item in table.scan(ProjectionExpression="uploadId, assetId")["Items"]:
+            table.delete_item(Key=item)
+        return iteration
+
+    def upload_parts(iteration):
+        initialized = json.loads(initialize_upload(iteration)["body"])
+        files = []
+        for file in initialized["files"]:
+            upload_key = s3_client.list_multipart_uploads(Bucket=dataset.bucket_name)
+            key = next(upload["Key"] for upload in upload_key["Uploads"] if upload["UploadId"] == file["uploadIdS3"])
+            part = s3_client.upload_part(Bucket=dataset.bucket_name, Key=key, UploadId=file["uploadIdS3"],
+                                         PartNumber=1, Body=b"0" * 1024)
+            files.append({"relativeKey": file["relativeKey"], "uploadIdS3": file["uploadIdS3"],
+                          "parts": [{"PartNumber": 1, "ETag": part["ETag"]}]})
+        return initialized["uploadId"], files
+
+    def complete_upload(prepared):
+        upload_id, files = prepared
+        return uploadFile.lambda_handler(api_event(
+            "POST", f"/uploads/{upload_id}/complete", path_parameters={"uploadId": upload_id},
+            body={"assetId": upload_asset_id, "databaseId": database_id, "uploadType": "assetFile", "files": files},
+        ), None)
+
+    file_keys = [f"{asset_id}/model-{index}.obj" for index in range(dataset.config.files_per_asset)]
+
+    def read_metadata_per_file(iteration):
+        return [metadataRead.get_metadata_with_prefix(database_id, asset_id, key) for key in file_keys]
+
+    import_records = [{"assetId": import_asset_id, "prefix": f"/{import_asset_id}/model-{index}.obj",
+                       "metadata": {"material": "steel", "revision": str(index)}}
+                      for import_asset_id in dataset.asset_ids[database_id]
+                      for index in range(dataset.config.files_per_asset)]
+
+    def export_search(iteration):
+        # Walk every page of the export of all assets, 10 hits per page
+        body = {"tokens": [], "operation": "AND", "pageSize": 10}
+        while True:
+            response = search.lambda_handler(api_event("POST", "/search/export", body=body), None, search_fn=search_fn)
+            cursor = json.loads(response["body"]).get("cursor")
+            if response["statusCode"] != 200 or cursor is None:
+                return response
+            body["cursor"] = cursor
+
+    def import_metadata(iteration):
+        # The work of one import job invocation: one record per file of every asset of the database
+        status = {"jobId": f"benchmark-{iteration}", "nextRecordIndex": 0, "importedCount": 0, "failedCount": 0,
+                  "errors": []}
+        request = {"databaseId": database_id, "requestContext": api_event("POST", "/")["requestContext"]}
+        bulkImport.import_records(request, import_records, status, time.time() + 900)
+        return status
+
+    def s3_index():
+        return streams.AOSIndexS3Objects(search_client, search_client.index_name, streams.MetadataTable.from_env,
+                                         suggestIndexName=suggest_index_name(search_client.index_name))
+
+    def index_asset_files(iteration):
+        s3_index().process_item(database_id, asset_id)
+
+    def asset_index():
+        index = streams.AOSIndexAssetMetadata.__new__(streams.AOSIndexAssetMetadata)
+        index.client = search_client
+        index.indexName = search_client.index_name
+        index.suggestIndexName = suggest_index_name(search_client.index_name)
+        index.service = "es"
+        return index
+
+    def index_suggestions(iteration):
+        # Name and tag suggestions of every synthetic asset, as the streams indexers write them
+        for document in dataset.search_documents:
+            search_client.indexed.update(asset_suggestions(suggestion_asset_fields(
+                document["str_databaseid"], document["str_assetid"], document["str_assetname"],
+                document["str_assettype"], document["list_tags"])))
+        return iteration
+
+    def suggest(iteration):
+        response = search.lambda_handler(api_event("GET", "/search/suggest", query_parameters={
+            "prefix": "benchmark ass", "size": "10"}), None, search_fn=search_fn)
+        if response["statusCode"] == 200 and not json.loads(response["body"])["suggestions"]:
+            raise Exception("No suggestions of the benchmark assets")
+        return response
+
+    def index_asset_file_documents(iteration):
+        # File documents of the asset, seeded outside of the measurement
+        search_client.indexed.update({
+            f"{asset_id}/indexed/file-{index}.obj": {"_rectype": "s3object", "str_assetid": asset_id,
+                                                     "str_assetname": asset_id,
+                                                     "str_key": f"{asset_id}/indexed/file-{index}.obj"}
+            for index in range(dataset.config.indexed_files_per_asset)
+        })
+        return iteration
+
+    def rename_asset(iteration):
+        previous = {"_rectype": "asset", "str_assetid": asset_id, "str_databaseid": database_id,
+                    "str_assetname": asset_id}
+        if not asset_index().propagate_asset_fields(database_id, asset_id, previous,
+                                                    {**previous, "str_assetname": f"renamed-{iteration}"},
+                                                    streams.MetadataTable.from_env()):
+            raise Exception("The renamed asset fields were not propagated to the file documents")
+
+    def asset_table_stream_record(iteration):
+        # Stream record of a rename of the asset, with the file documents and the asset document indexed
+        import boto3
+        index_asset_file_documents(iteration)
+        image = boto3.client("dynamodb").get_item(TableName=os.environ["ASSET_STORAGE_TABLE_NAME"], Key={
+            "databaseId": {"S": database_id}, "assetId": {"S": asset_id}})["Item"]
+        metadata = streams.MetadataTable.from_env().get_metadata(database_id, asset_id) or {}
+        search_client.indexed[asset_id] = streams.AOSIndexAssetMetadata.asset_document(
+            {"databaseId": database_id, "assetId": asset_id} | metadata |
+            {field: streams.deserialize(image[field]) for field in streams.ASSET_DOCUMENT_FIELDS if field in image})
+        image["assetName"] = {"S": f"renamed-{iteration}"}
+        return {"Records": [{"eventName": "MODIFY", "dynamodb": {
+            "Keys": {"databaseId": {"S": database_id}, "assetId": {"S": asset_id}}, "NewImage": image}}]}
+
+    def index_asset_update(event):
+        # Asset table change to searchable asset and file documents, in one stream invocation
+        streams.lambda_handler_a(event, None, index=asset_index, s3index=s3_index)
+        renamed = event["Records"][0]["dynamodb"]["NewImage"]["assetName"]["S"]
+        if search_client.indexed[asset_id]["str_assetname"] != renamed:
+            raise Exception("The renamed asset is not searchable")
+
+    def clear_authorization_caches(iteration):
+        # Policies are cached per user for CASBIN_REFRESH_POLICY_SECONDS, measure loading them
+        authz.casbin_user_policy_map.clear()
+        authz.casbin_user_enforcer_map.clear()
+        return api_event("GET", f"/database/{database_id}/assets", {"databaseId": database_id})
+
+    def put_synced_object(iteration):
+        key = f"{sync_asset_id}/synced/model-{iteration}.obj"
+        s3_client.put_object(Bucket=dataset.bucket_name, Key=key, Body=b"0" * 64)
+        return s3_event_message(dataset.bucket_name, key)
+
+    return [
+        Operation("authz.load_user_policy", lambda event: authz.CasbinEnforcer({
+            "tokens": [dataset.user_id], "roles": [], "externalAttributes": [], "mfaEnabled": False
+        }).enforceAPI(event), clear_authorization_caches),
+        Operation("assetService.list_assets", lambda iteration: assetService.lambda_handler(api_event(
+            "GET", f"/database/{database_id}/assets", {"databaseId": database_id}), None)),
+        Operation("assetService.get_asset", lambda iteration: assetService.lambda_handler(api_event(
+            "GET", f"/database/{database_id}/assets/{asset_id}",
+            {"databaseId": database_id, "assetId": asset_id}), None)),
+        Operation("assetFiles.handle_list_files", lambda iteration: assetFiles.lambda_handler(api_event(
+            "GET", f"/database/{database_id}/assets/{asset_id}/listFiles",
+            {"databaseId": database_id, "assetId": asset_id}), None)),
+        Operation("search.lambda_handler", lambda iteration: search.lambda_handler(api_event(
+            "POST", "/search", body={"tokens": [], "operation": "AND", "from": 0, "size": 100, "query": "benchmark"}),
+            None, search_fn=search_fn)),
+        Operation("search.export", export_search),
+        Operation("search.suggest", suggest, index_suggestions),
+        Operation("metadata.read_per_file", read_metadata_per_file),
+        Operation("metadata.read_for_paths", lambda iteration: metadataRead.get_metadata_for_paths(
+            database_id, asset_id, file_keys)),
+        Operation("streams.index_asset_files", index_asset_files),
+        Operation("streams.propagate_asset_fields", rename_asset, index_asset_file_documents),
+        Operation("streams.index_asset_update", index_asset_update, asset_table_stream_record),
+        Operation("streams.delete_asset_documents", lambda iteration: asset_index().delete_item_by_query(asset_id),
+                  index_asset_file_documents),
+        Operation("assetLinksService.child_tree", lambda iteration: assetLinksService.lambda_handler(api_event(
+            "GET", f"/database/{root_database_id}/assets/{root_asset_id}/asset-links",
+            {"databaseId": root_database_id, "assetId": root_asset_id}, {"childTreeView": "true"}), None)),
+        Operation("uploadFile.initialize", initialize_upload, clear_uploads),
+        Operation("uploadFile.complete_upload", complete_upload, upload_parts),
+        Operation("metadata.bulk_import", import_metadata),
+        Operation("sqsBucketSync.lambda_handler_created",
+                  lambda event: sqsBucketSync.lambda_handler_created(event, None), put_synced_object),
+    ]
+
+
+def _status(response) -> Optional[int]:
+    # Event handlers (sqsBucketSync) return nothing
+    return response.get("statusCode") if isinstance(response, dict) else None
+
+
+def _wall_time_stats(durations: List[float]) -> Dict:
+    ordered = sorted(durations)
+    return {
+        "min": round(ordered[0], 2),
+        "median": round(statistics.median(ordered), 2),
+        "mean": round(statistics.mean(ordered), 2),
+        "p95": round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+def run_operation(operation: Operation, iterations: int, warmup: int) -> Dict:
+    """Run one operation and aggregate its measured iterations
+
+    Returns:
+        Dictionary with the wall time statistics, the call counts (of the iteration with the most AWS
+        calls) and the status codes of the responses
+    """
+    from common.callTracing import invocation_trace
+
+    summaries = []
+    statuses = []
+    for iteration in range(warmup + iterations):
+        prepared = operation.prepare(iteration)
+        with invocation_trace(operation.name) as trace:
+            response = operation.run(prepared)
+        if iteration >= warmup:
+            summaries.append(trace.summary())
+            statuses.append(_status(response))
+
+    heaviest = max(summaries, key=lambda summary: summary["AwsCalls"])
+    return {
+        "wallMs": _wall_time_stats([summary["durationMs"] for summary in summaries]),
+        "awsCalls": heaviest["AwsCalls"],
+        "openSearchCalls": heaviest["OpenSearchCalls"],
+        "authzEnforceCalls": heaviest["AuthzEnforceCalls"],
+        "callsByOperation": {name: stats["count"] for name, stats in sorted(heaviest["operations"].items())},
+        "statusCodes": sorted({status for status in statuses if status is not None}),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_SOURCE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(config: SyntheticDataConfig, iterations: int = 5, warmup: int = 1,
+                   operation_names: Optional[List[str]] = None) -> Dict:
+    """Build the synthetic data set in moto and benchmark the handler operations
+
+    Args:
+        config: Size of the synthetic data set
+        iterations: Measured iterations per operation
+        warmup: Unmeasured iterations per operation that run first
+        operation_names: Only run these operations (default all)
+
+    Returns:
+        Machine readable results (see RESULTS_SCHEMA_VERSION)
+    """
+    from moto import mock_aws
+
+    os.environ.update(benchmark_environment())
+    if BACKEND_SOURCE_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_SOURCE_DIR)
+
+    results = {
+        "schemaVersion": RESULTS_SCHEMA_VERSION,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": config.to_dict(),
+        "iterations": iterations,
+        "warmup": warmup,
+        "operations": {},
+    }
+
+    # Handler logs and per invocation metric documents are written to stdout, keep them out of the results
+    logging.disable(logging.CRITICAL)
+    with mock_aws(), contextlib.redirect_stdout(io.StringIO()):
+        import boto3
+        setup_started = time.perf_counter()
+        dataset = build_synthetic_dataset(config)
+        results["setupMs"] = round((time.perf_counter() - setup_started) * 1000, 2)
+
+        for operation in build_operations(dataset, boto3.client("s3")):
+            if operation_names and operation.name not in operation_names:
+                continue
+            results["operations"][operation.name] = run_operation(operation, iterations, warmup)
+    logging.disable(logging.NOTSET)
+    return results
+
+
+def compare_results(baseline: Dict, current: Dict, time_tolerance: float = DEFAULT_TIME_TOLERANCE) -> List[str]:
+    """Regressions of the current results against a baseline
+
+    An operation regresses when it makes more AWS, OpenSearch or authorization calls than in the
+    baseline, or when its median wall time grew by more than `time_tolerance`.
+
+    Returns:
+        Human readable regression descriptions, empty if there are none
+    """
+    regressions = []
+    if baseline.get("config") != current.get("config"):
+        regressions.append(f"data set sizes differ: baseline {baseline.get('config')} current {current.get('config')}")
+    for name, result in current["operations"].items():
+        before = baseline["operations"].get(name)
+        if before is None:
+            continue
+        for counter in ("awsCalls", "openSearchCalls", "authzEnforceCalls"):
+            if result[counter] > before[counter]:
+                regressions.append(f"{name}: {counter} {before[counter]} -> {result[counter]}")
+        if result["wallMs"]["median"] > before["wallMs"]["median"] * (1 + time_tolerance):
+            regressions.append(
+                f"{name}: median wall time {before['wallMs']['median']} ms -> {result['wallMs']['median']} ms")
+    return regressions
+
+
+def format_table(results: Dict, baseline: Optional[Dict] = None) -> str:
+    lines = [f"{'operation':<40} {'median ms':>10} {'p95 ms':>10} {'aws':>6} {'aos':>5} {'authz':>6}  status"]
+    for name, result in results["operations"].items():
+        before = (baseline or {}).get("operations", {}).get(name)
+        change = f" (was {before['wallMs']['median']} ms, {before['awsCalls']} aws)" if before else ""
+        lines.append(f"{name:<40} {result['wallMs']['median']:>10} {result['wallMs']['p95']:>10} "
+                     f"{result['awsCalls']:>6} {result['openSearchCalls']:>5} {result['authzEnforceCalls']:>6}  "
+                     f"{result['statusCodes']}{change}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = SyntheticDataConfig()
+    parser = argparse.ArgumentParser(description="Benchmark VAMS handlers against moto on synthetic data")
+    parser.add_argument("--databases", type=int, default=defaults.databases)
+    parser.add_argument("--assets", type=int, default=defaults.assets, help="Assets per database")
+    parser.add_argument("--files-per-asset", type=int, default=defaults.files_per_asset)
+    parser.add_argument("--link-depth", type=int, default=defaults.link_depth,
+                        help="Depth of the parent/child link tree")
+    parser.add_argument("--link-fanout", type=int, default=defaults.link_fanout, help="Children per linked asset")
+    parser.add_argument("--roles", type=int, default=defaults.roles, help="Roles of the benchmark user")
+    parser.add_argument("--constraints-per-role", type=int, default=defaults.constraints_per_role)
+    parser.add_argument("--indexed-files-per-asset", type=int, default=defaults.indexed_files_per_asset,
+                        help="File documents of an asset in the search index, updated by "
+                             "streams.propagate_asset_fields and purged by streams.delete_asset_documents")
+    parser.add_argument("--iterations", type=int, default=5, help="Measured iterations per operation")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured iterations per operation")
+    parser.add_argument("--operation", action="append", dest="operations", help="Only run this operation (repeatable)")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON results, exit 1 on regressions")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE,
+                        help="Allowed relative median wall time increase against the baseline")
+    args = parser.parse_args(argv)
+
+    config = SyntheticDataConfig(
+        databases=args.databases,
+        assets=args.assets,
+        files_per_asset=args.files_per_asset,
+        link_depth=args.link_depth,
+        link_fanout=args.link_fanout,
+        roles=args.roles,
+        constraints_per_role=args.constraints_per_role,
+        indexed_files_per_asset=args.indexed_files_per_asset,
+    )
+    results = run_benchmarks(config, args.iterations, args.warmup, args.operations)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print(format_table(results, baseline), file=sys.stderr)
+
+    if baseline is not None:
+        regressions = compare_results(baseline, results, args.time_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
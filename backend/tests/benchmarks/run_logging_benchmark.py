@@ -0,0 +1,147 @@
+"""
+Logging Benchmark for VAMS Backend
+
+Measures the CPU time the indexing handler spends on logging while it indexes a batch of files
+(the s3object, metadata and OpenSearch document of every file, as in
+AOSIndexS3Objects._metadata_and_s3_object_to_opensearch, plus the stream record of every file):
+
+- legacy: every record masked with a full copy, every file logged at INFO
+- formatter: current formatter (masking skipped without sensitive keys, size capped records),
+  every file still logged at INFO
+- current: current formatter and the current indexing code, which logs files at DEBUG only
+- unlogged: logging turned off, the CPU time of the indexing work itself
+
+The logging CPU time of a scenario is its CPU time minus the unlogged one. Records are written to
+an in-memory stream.
+
+    python tests/benchmarks/run_logging_benchmark.py --records 10000
+"""
+
+import argparse
+import datetime
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import benchmark_environment  # noqa: E402
+
+BACKEND_SOURCE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+WARMUP_RECORDS = 500
+
+
+def indexing_inputs(records: int) -> List[tuple]:
+    """Stream record, S3 object and metadata of every indexed file"""
+    inputs = []
+    for i in range(records):
+        asset_id = f"asset-{i // 10}"
+        key = f"{asset_id}/folder/file-{i}.glb"
+        metadata = {"databaseId": "benchmark-db", "assetId": asset_id, "assetName": f"Asset {i // 10}",
+                    "description": "Synthetic asset " * 5, "tags": ["benchmark", "synthetic"],
+                    "material": "steel", "revision": str(i % 7)}
+        stream_record = {"eventName": "MODIFY", "eventSource": "aws:dynamodb",
+                         "dynamodb": {"Keys": {"databaseId": {"S": "benchmark-db"}, "assetId": {"S": asset_id}},
+                                      "NewImage": {name: {"S": str(value)} for name, value in metadata.items()}}}
+        s3object = {"Key": key, "LastModified": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc),
+                    "ETag": f'"{i:032x}"', "Size": 1024 * i, "StorageClass": "STANDARD",
+                    "Owner": {"ID": "owner"}}
+        inputs.append((stream_record, s3object, metadata))
+    return inputs
+
+
+def run_scenario(logger, to_document: Callable, inputs: List[tuple], legacy_calls: bool) -> Dict:
+    """Index every input and return the CPU time and the records written"""
+    from handlers.indexing import streams
+
+    stream = io.StringIO()
+    handler = logger._logger.handlers[0]
+    handler.setStream(stream)
+    streams.logger = logger
+
+    started = time.process_time()
+    for stream_record, s3object, metadata in inputs:
+        logger.info(stream_record)
+        s3object = dict(s3object)
+        if legacy_calls:
+            logger.info("s3object")
+            logger.info(s3object)
+            logger.info("metadata")
+            logger.info(metadata)
+        result = to_document(s3object, metadata)
+        if legacy_calls:
+            logger.info("aos s3")
+            logger.info(result)
+    cpu_seconds = time.process_time() - started
+
+    output = stream.getvalue()
+    return {"cpuMs": round(cpu_seconds * 1000, 2), "recordsWritten": output.count("\n"), "bytesWritten": len(output)}
+
+
+def run_logging_benchmark(records: int) -> Dict:
+    os.environ.update(benchmark_environment())
+    sys.path.insert(0, BACKEND_SOURCE_DIR)
+
+    from customLogging import logger as custom_logger
+    from handlers.indexing import streams
+
+    class LegacyFormatter(custom_logger.CustomFormatter):
+        def serialize(self, log: dict) -> str:
+            return self.json_serializer(custom_logger.mask_sensitive_data(event=log))
+
+    def legacy_logger():
+        logger = custom_logger.safeLogger(service="LoggingBenchmarkLegacy")
+        logger._logger.handlers[0].setFormatter(LegacyFormatter(location=custom_logger.location_format,
+                                                                datefmt=custom_logger.date_format))
+        return logger
+
+    to_document = streams.AOSIndexS3Objects._metadata_and_s3_object_to_opensearch
+    inputs = indexing_inputs(records)
+    scenarios = {
+        "legacy": (legacy_logger(), True),
+        "formatter": (custom_logger.safeLogger(service="LoggingBenchmarkFormatter"), True),
+        "current": (custom_logger.safeLogger(service="LoggingBenchmarkCurrent"), False),
+        "unlogged": (custom_logger.safeLogger(service="LoggingBenchmarkUnlogged"), False),
+    }
+    scenarios["unlogged"][0].setLevel("CRITICAL")
+
+    results = {"records": records, "scenarios": {}}
+    for name, (logger, legacy_calls) in scenarios.items():
+        # Unmeasured warm up pass
+        run_scenario(logger, to_document, inputs[:WARMUP_RECORDS], legacy_calls)
+        results["scenarios"][name] = run_scenario(logger, to_document, inputs, legacy_calls)
+    unlogged_ms = results["scenarios"]["unlogged"]["cpuMs"]
+    for result in results["scenarios"].values():
+        result["loggingCpuMs"] = round(max(result["cpuMs"] - unlogged_ms, 0.0), 2)
+    legacy_ms = results["scenarios"]["legacy"]["loggingCpuMs"]
+    for result in results["scenarios"].values():
+        result["loggingCpuSavedPercent"] = (round(100 * (1 - result["loggingCpuMs"] / legacy_ms), 1)
+                                            if legacy_ms else 0.0)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the logging CPU time of an indexing run")
+    parser.add_argument("--records", type=int, default=10000, help="Indexed files")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_logging_benchmark(args.records)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    for name, result in results["scenarios"].items():
+        print(f"{name:<10} {result['cpuMs']:>10.1f} ms CPU {result['loggingCpuMs']:>10.1f} ms logging "
+              f"{result['recordsWritten']:>8} records {result['loggingCpuSavedPercent']:>6.1f}% logging CPU saved",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
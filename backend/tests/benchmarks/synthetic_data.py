@@ -0,0 +1,347 @@
+"""
+Synthetic VAMS Data for Benchmarks
+
+Builds the VAMS storage tables (keys and indexes as defined in
+infra/lib/nestedStacks/storage/storageBuilder-nestedStack.ts) and the asset bucket, and fills them
+with a synthetic data set of configurable size: databases with assets, files per asset, a tree of
+parent/child asset links of a given depth, and roles with permission constraints for the benchmark
+user. Works against moto (or any endpoint boto3 is configured for).
+
+    with mock_aws():
+        os.environ.update(benchmark_environment())
+        dataset = build_synthetic_dataset(SyntheticDataConfig(assets=200, files_per_asset=20))
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import boto3
+
+REGION = "us-east-1"
+BUCKET_NAME = "vams-benchmark-assets"
+AUXILIARY_BUCKET_NAME = "vams-benchmark-auxiliary"
+BUCKET_ID = "benchmark-bucket"
+BENCHMARK_USER = "benchmark-user"
+ADMIN_ROLE = "benchmark-admin"
+FILE_BODY = b"0" * 64
+
+# Environment variable -> (table name, key schema, global secondary indexes). Keys are
+# (attribute, key type) and every key attribute is a string.
+TABLES = {
+    "ASSET_STORAGE_TABLE_NAME": ("benchmark-assets", [("databaseId", "HASH"), ("assetId", "RANGE")], {
+        "BucketIdGSI": [("bucketId", "HASH"), ("assetId", "RANGE")],
+    }),
+    "DATABASE_STORAGE_TABLE_NAME": ("benchmark-databases", [("databaseId", "HASH")], {}),
+    "S3_ASSET_BUCKETS_STORAGE_TABLE_NAME": ("benchmark-buckets", [
+        ("bucketId", "HASH"), ("bucketName:baseAssetsPrefix", "RANGE")
+    ], {
+        "bucketNameGSI": [("bucketName", "HASH"), ("baseAssetsPrefix", "RANGE")],
+    }),
+    "METADATA_STORAGE_TABLE_NAME": ("benchmark-metadata", [("databaseId", "HASH"), ("assetId", "RANGE")], {}),
+    "ASSET_LINKS_STORAGE_TABLE_NAME": ("benchmark-asset-links", [("assetIdFrom", "HASH"), ("assetIdTo", "RANGE")], {
+        "AssetIdFromGSI": [("assetIdFrom", "HASH")],
+        "AssetIdToGSI": [("assetIdTo", "HASH")],
+    }),
+    "ASSET_LINKS_STORAGE_TABLE_V2_NAME": ("benchmark-asset-links-v2", [("assetLinkId", "HASH")], {
+        "fromAssetGSI": [("fromAssetDatabaseId:fromAssetId", "HASH"), ("toAssetDatabaseId:toAssetId", "RANGE")],
+        "toAssetGSI": [("toAssetDatabaseId:toAssetId", "HASH"), ("fromAssetDatabaseId:fromAssetId", "RANGE")],
+    }),
+    "ASSET_LINKS_METADATA_STORAGE_TABLE_NAME": ("benchmark-asset-links-metadata", [
+        ("assetLinkId", "HASH"), ("metadataKey", "RANGE")
+    ], {}),
+    "ASSET_VERSIONS_STORAGE_TABLE_NAME": ("benchmark-asset-versions", [
+        ("assetId", "HASH"), ("assetVersionId", "RANGE")
+    ], {}),
+    "ASSET_FILE_VERSIONS_STORAGE_TABLE_NAME": ("benchmark-asset-file-versions", [
+        ("assetId:assetVersionId", "HASH"), ("fileKey", "RANGE")
+    ], {}),
+    "ASSET_UPLOAD_TABLE_NAME": ("benchmark-asset-uploads", [("uploadId", "HASH"), ("assetId", "RANGE")], {
+        "AssetIdGSI": [("assetId", "HASH"), ("uploadId", "RANGE")],
+        "DatabaseIdGSI": [("databaseId", "HASH"), ("uploadId", "RANGE")],
+        "UserIdGSI": [("UserId", "HASH"), ("createdAt", "RANGE")],
+    }),
+    "COMMENT_STORAGE_TABLE_NAME": ("benchmark-comments", [
+        ("assetId", "HASH"), ("assetVersionId:commentId", "RANGE")
+    ], {}),
+    "SUBSCRIPTIONS_STORAGE_TABLE_NAME": ("benchmark-subscriptions", [
+        ("eventName", "HASH"), ("entityName_entityId", "RANGE")
+    ], {}),
+    "TAG_STORAGE_TABLE_NAME": ("benchmark-tags", [("tagName", "HASH")], {}),
+    "TAG_TYPES_STORAGE_TABLE_NAME": ("benchmark-tag-types", [("tagTypeName", "HASH")], {}),
+    "METADATA_SCHEMA_STORAGE_TABLE_NAME": ("benchmark-metadata-schema", [
+        ("databaseId", "HASH"), ("field", "RANGE")
+    ], {}),
+    "AUTH_TABLE_NAME": ("benchmark-auth-entities", [("entityType", "HASH"), ("sk", "RANGE")], {}),
+    "ROLES_TABLE_NAME": ("benchmark-roles", [("roleName", "HASH")], {}),
+    "USER_ROLES_TABLE_NAME": ("benchmark-user-roles", [("userId", "HASH"), ("roleName", "RANGE")], {}),
+}
+
+
+class SyntheticDataConfig:
+    """Size of the synthetic data set"""
+
+    def __init__(self, databases: int = 1, assets: int = 50, files_per_asset: int = 10, link_depth: int = 3,
+                 link_fanout: int = 2, roles: int = 3, constraints_per_role: int = 3,
+                 indexed_files_per_asset: int = 1000):
+        # Databases, each with `assets` assets that have `files_per_asset` files in S3
+        self.databases = databases
+        self.assets = assets
+        self.files_per_asset = files_per_asset
+        # Parent/child link tree below the first asset of the first database
+        self.link_depth = link_depth
+        self.link_fanout = link_fanout
+        # Roles of the benchmark user, and additional (narrower) constraints per role that grow the
+        # Casbin policy every authorization check is evaluated against
+        self.roles = roles
+        self.constraints_per_role = constraints_per_role
+        # File documents of one asset in the search index that streams.propagate_asset_fields updates
+        # and streams.delete_asset_documents purges, only written to the in-memory search index (not to S3)
+        self.indexed_files_per_asset = indexed_files_per_asset
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+
+class SyntheticDataset:
+    """Identifiers of the generated data the benchmarks run against"""
+
+    def __init__(self, config: SyntheticDataConfig):
+        self.config = config
+        self.database_ids: List[str] = []
+        # Database ID -> asset IDs
+        self.asset_ids: Dict[str, List[str]] = {}
+        # (databaseId, assetId) of the root of the link tree
+        self.link_root: Optional[Tuple[str, str]] = None
+        # OpenSearch documents of the assets (the fields the search handler reads)
+        self.search_documents: List[Dict] = []
+        self.user_id = BENCHMARK_USER
+        self.bucket_name = BUCKET_NAME
+        self.bucket_id = BUCKET_ID
+
+    @property
+    def first_asset(self) -> Tuple[str, str]:
+        database_id = self.database_ids[0]
+        return database_id, self.asset_ids[database_id][0]
+
+
+def benchmark_environment() -> Dict[str, str]:
+    """Environment variables the handlers read, pointing at the synthetic tables and buckets"""
+    environment = {env: table_name for env, (table_name, _, _) in TABLES.items()}
+    environment.update({
+        "AWS_REGION": REGION,
+        "AWS_DEFAULT_REGION": REGION,
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "ASSET_BUCKET_NAME": BUCKET_NAME,
+        "ASSET_BUCKET_PREFIX": "/",
+        "S3_ASSET_AUXILIARY_BUCKET": AUXILIARY_BUCKET_NAME,
+        "S3_ASSETAUXILIARY_STORAGE_BUCKET": AUXILIARY_BUCKET_NAME,
+        "DEFAULT_DATABASE_ID": "default",
+        "SEND_EMAIL_FUNCTION_NAME": "benchmark-send-email",
+        "INDEXING_FUNCTION_NAME": "benchmark-indexing",
+        "PRESIGNED_URL_TIMEOUT_SECONDS": "86400",
+        "COGNITO_AUTH_ENABLED": "false",
+        "AOS_DISABLED": "false",
+        "AOS_TYPE": "es",
+        "AOS_INDEX_NAME_PARAM": "benchmark-assets-index",
+    })
+    return environment
+
+
+def create_tables(dynamodb_client) -> None:
+    """Create every VAMS storage table"""
+    for table_name, key_schema, indexes in TABLES.values():
+        attributes = {name for name, _ in key_schema}
+        for index_keys in indexes.values():
+            attributes.update(name for name, _ in index_keys)
+        arguments = {
+            "TableName": table_name,
+            "KeySchema": [{"AttributeName": name, "KeyType": key_type} for name, key_type in key_schema],
+            "AttributeDefinitions": [{"AttributeName": name, "AttributeType": "S"} for name in sorted(attributes)],
+            "BillingMode": "PAY_PER_REQUEST",
+        }
+        if indexes:
+            arguments["GlobalSecondaryIndexes"] = [{
+                "IndexName": index_name,
+                "KeySchema": [{"AttributeName": name, "KeyType": key_type} for name, key_type in index_keys],
+                "Projection": {"ProjectionType": "ALL"},
+            } for index_name, index_keys in indexes.items()]
+        dynamodb_client.create_table(**arguments)
+
+
+def _constraint(constraint_id: str, object_type: str, field: str, value: str, role_name: str,
+                permissions: List[str]) -> Dict:
+    return {
+        "entityType": "constraint",
+        "sk": f"constraint#{constraint_id}",
+        "constraintId": constraint_id,
+        "name": constraint_id,
+        "description": "Synthetic benchmark constraint",
+        "objectType": object_type,
+        "criteriaAnd": [{"id": f"{constraint_id}-criteria", "field": field, "operator": "contains", "value": value}],
+        "groupPermissions": [{"id": f"{constraint_id}-{permission}", "groupId": role_name, "permission": permission,
+                              "permissionType": "allow"} for permission in permissions],
+    }
+
+
+def _put_auth_data(tables: Dict, config: SyntheticDataConfig) -> None:
+    role_names = [ADMIN_ROLE] + [f"benchmark-role-{index}" for index in range(max(config.roles - 1, 0))]
+    methods = ["GET", "PUT", "POST", "DELETE"]
+    with tables["ROLES_TABLE_NAME"].batch_writer() as roles, \
+            tables["USER_ROLES_TABLE_NAME"].batch_writer() as user_roles, \
+            tables["AUTH_TABLE_NAME"].batch_writer() as constraints:
+        for role_name in role_names:
+            roles.put_item(Item={"roleName": role_name, "description": role_name, "mfaRequired": False,
+                                 "createdOn": datetime.utcnow().isoformat()})
+            user_roles.put_item(Item={"userId": BENCHMARK_USER, "roleName": role_name})
+
+        # Full access through the admin role
+        for object_type, field in (("api", "route__path"), ("database", "databaseId"), ("asset", "databaseId")):
+            constraints.put_item(
+                Item=_constraint(f"{ADMIN_ROLE}-{object_type}", object_type, field, ".*", ADMIN_ROLE, methods))
+
+        # Narrower constraints of the other roles, they only grow the policy
+        for role_name in role_names[1:]:
+            for index in range(config.constraints_per_role):
+                constraints.put_item(Item=_constraint(f"{role_name}-{index}", "asset", "assetName",
+                                                      f"restricted-{index}", role_name, ["GET"]))
+
+
+def _asset_item(database_id: str, asset_id: str, index: int) -> Dict:
+    return {
+        "databaseId": database_id,
+        "assetId": asset_id,
+        "assetName": f"Benchmark asset {index}",
+        "description": f"Synthetic benchmark asset {index}",
+        "isDistributable": True,
+        "tags": [f"tag-{index % 5}"],
+        "assetType": ".obj",
+        "currentVersionId": "0",
+        "bucketId": BUCKET_ID,
+        "assetLocation": {"Key": f"{asset_id}/"},
+    }
+
+
+def _version_item(asset_id: str) -> Dict:
+    return {
+        "assetId": asset_id,
+        "assetVersionId": "0",
+        "dateCreated": datetime.utcnow().isoformat(),
+        "comment": "Initial version",
+        "description": "Initial version",
+        "specifiedPipelines": [],
+        "createdBy": BENCHMARK_USER,
+        "isCurrentVersion": True,
+    }
+
+
+def _search_document(asset: Dict) -> Dict:
+    return {
+        "_rectype": "asset",
+        "str_databaseid": asset["databaseId"],
+        "str_assetid": asset["assetId"],
+        "str_assetname": asset["assetName"],
+        "str_description": asset["description"],
+        "str_assettype": asset["assetType"],
+        "list_tags": asset["tags"],
+    }
+
+
+def _link_tree(root_asset_id: str, depth: int, fanout: int) -> List[Tuple[str, str]]:
+    """(parent, child) asset ID pairs of a complete tree, child IDs are generated"""
+    pairs = []
+    parents = [root_asset_id]
+    for level in range(1, depth + 1):
+        children = []
+        for parent in parents:
+            for index in range(fanout):
+                child = f"{parent}-l{level}c{index}" if parent != root_asset_id else f"linked-l{level}c{index}"
+                pairs.append((parent, child))
+                children.append(child)
+        parents = children
+    return pairs
+
+
+def build_synthetic_dataset(config: SyntheticDataConfig, region: str = REGION) -> SyntheticDataset:
+    """Create the tables and buckets and write the synthetic data set
+
+    Args:
+        config: Size of the data set
+        region: AWS region of the tables and buckets
+
+    Returns:
+        SyntheticDataset with the generated identifiers
+    """
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    s3 = boto3.client("s3", region_name=region)
+    create_tables(dynamodb.meta.client)
+    tables = {env: dynamodb.Table(table_name) for env, (table_name, _, _) in TABLES.items()}
+    for bucket in (BUCKET_NAME, AUXILIARY_BUCKET_NAME):
+        s3.create_bucket(Bucket=bucket)
+
+    dataset = SyntheticDataset(config)
+    tables["S3_ASSET_BUCKETS_STORAGE_TABLE_NAME"].put_item(Item={
+        "bucketId": BUCKET_ID,
+        "bucketName:baseAssetsPrefix": f"{BUCKET_NAME}:/",
+        "bucketName": BUCKET_NAME,
+        "baseAssetsPrefix": "/",
+    })
+    _put_auth_data(tables, config)
+
+    with tables["DATABASE_STORAGE_TABLE_NAME"].batch_writer() as databases, \
+            tables["ASSET_STORAGE_TABLE_NAME"].batch_writer() as assets, \
+            tables["ASSET_VERSIONS_STORAGE_TABLE_NAME"].batch_writer() as versions, \
+            tables["ASSET_LINKS_STORAGE_TABLE_V2_NAME"].batch_writer() as links, \
+            tables["METADATA_STORAGE_TABLE_NAME"].batch_writer() as metadata:
+
+        def put_asset(database_id: str, asset_id: str, index: int, file_count: int) -> None:
+            asset = _asset_item(database_id, asset_id, index)
+            assets.put_item(Item=asset)
+            versions.put_item(Item=_version_item(asset_id))
+            # Metadata of the asset, of its folder and of every tenth file
+            metadata.put_item(Item={"databaseId": database_id, "assetId": asset_id, "material": "steel",
+                                    "revision": str(index % 7)})
+            metadata.put_item(Item={"databaseId": database_id, "assetId": f"{asset_id}/", "site": "benchmark"})
+            for file_index in range(file_count):
+                key = f"{asset_id}/model-{file_index}.obj"
+                s3.put_object(Bucket=BUCKET_NAME, Key=key, Body=FILE_BODY,
+                              Metadata={"databaseid": database_id, "assetid": asset_id})
+                if file_index % 10 == 0:
+                    metadata.put_item(Item={"databaseId": database_id, "assetId": key, "material": "aluminium"})
+            dataset.search_documents.append(_search_document(asset))
+
+        for database_index in range(config.databases):
+            database_id = f"benchmark-db-{database_index}"
+            dataset.database_ids.append(database_id)
+            dataset.asset_ids[database_id] = []
+            databases.put_item(Item={
+                "databaseId": database_id,
+                "description": f"Synthetic benchmark database {database_index}",
+                "defaultBucketId": BUCKET_ID,
+                "assetCount": config.assets,
+                "dateCreated": json.dumps(datetime.utcnow().isoformat()),
+            })
+            for asset_index in range(config.assets):
+                asset_id = f"asset-{database_index}-{asset_index}"
+                dataset.asset_ids[database_id].append(asset_id)
+                put_asset(database_id, asset_id, asset_index, config.files_per_asset)
+
+        # Link tree below the first asset, the linked assets have one file each
+        database_id, root_asset_id = dataset.first_asset
+        dataset.link_root = (database_id, root_asset_id)
+        for link_index, (parent, child) in enumerate(_link_tree(root_asset_id, config.link_depth, config.link_fanout)):
+            put_asset(database_id, child, config.assets + link_index, 1)
+            links.put_item(Item={
+                "assetLinkId": f"link-{link_index}",
+                "fromAssetDatabaseId:fromAssetId": f"{database_id}:{parent}",
+                "toAssetDatabaseId:toAssetId": f"{database_id}:{child}",
+                "fromAssetDatabaseId": database_id,
+                "fromAssetId": parent,
+                "toAssetDatabaseId": database_id,
+                "toAssetId": child,
+                "relationshipType": "parentChild",
+                "tags": [],
+            })
+
+    return dataset
@@ -0,0 +1,58 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from backend.tests.benchmarks.budgets import OPERATION_BUDGETS
+from backend.tests.benchmarks.run_benchmarks import compare_results
+
+RUNNER = os.path.join(os.path.dirname(__file__), "run_benchmarks.py")
+
+
+@pytest.fixture(scope="module")
+def tiny_results(tmp_path_factory):
+    """
+    Run the benchmark suite on a tiny data set in a separate interpreter (the handlers need the real
+    common and handlers packages that conftest.py replaces)
+
+    Returns:
+        dict: The JSON results
+    """
+    output = tmp_path_factory.mktemp("benchmarks") / "results.json"
+    completed = subprocess.run(
+        [sys.executable, RUNNER, "--assets", "3", "--files-per-asset", "2", "--link-depth", "2",
+         "--iterations", "1", "--output", str(output)],
+        capture_output=True, text=True, timeout=300,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    return json.loads(output.read_text())
+
+
+def test_every_operation_runs_against_the_synthetic_data(tiny_results):
+    assert tiny_results["config"]["assets"] == 3
+    assert set(tiny_results["operations"]) == set(OPERATION_BUDGETS)
+    for name, result in tiny_results["operations"].items():
+        assert result["awsCalls"] + result["openSearchCalls"] > 0, name
+        assert result["awsCalls"] == sum(count for operation, count in result["callsByOperation"].items()
+                                         if not operation.startswith(("casbin.", "opensearch."))), name
+        if OPERATION_BUDGETS[name].api:
+            assert result["statusCodes"] == [200], name
+
+
+def test_compare_reports_call_count_and_wall_time_regressions(tiny_results):
+    assert compare_results(tiny_results, tiny_results) == []
+
+    baseline = json.loads(json.dumps(tiny_results))
+    baseline["operations"]["assetService.get_asset"]["awsCalls"] -= 1
+    baseline["operations"]["search.lambda_handler"]["wallMs"]["median"] /= 2
+
+    regressions = compare_results(baseline, tiny_results, time_tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("assetService.get_asset: awsCalls")
+    assert regressions[1].startswith("search.lambda_handler: median wall time")
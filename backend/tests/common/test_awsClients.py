@@ -0,0 +1,68 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest.mock import patch, MagicMock
+from botocore.config import Config
+
+from backend.backend.common import awsClients
+
+
+def test_clients_are_created_on_first_use_and_shared():
+    with patch.object(awsClients.boto3, "client", side_effect=lambda *args, **kwargs: MagicMock()) as mock_client:
+        s3_client = awsClients.lazy_client("s3")
+        other_module_s3_client = awsClients.lazy_client("s3")
+        assert mock_client.call_count == 0
+
+        s3_client.list_buckets()
+        other_module_s3_client.list_buckets()
+
+    mock_client.assert_called_once()
+    config = mock_client.call_args.kwargs["config"]
+    assert config.max_pool_connections == awsClients.MAX_POOL_CONNECTIONS
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive is True
+
+
+def test_module_config_is_merged_over_the_defaults():
+    s3_config = Config(signature_version="s3v4", s3={"addressing_style": "path"})
+    with patch.object(awsClients.boto3, "client", side_effect=lambda *args, **kwargs: MagicMock()) as mock_client:
+        awsClients.get_client("s3", config=s3_config)
+        awsClients.get_client("s3", config=Config(signature_version="s3v4", s3={"addressing_style": "path"}))
+        awsClients.get_client("s3")
+
+    assert mock_client.call_count == 2
+    config = mock_client.call_args_list[0].kwargs["config"]
+    assert config.signature_version == "s3v4"
+    assert config.max_pool_connections == awsClients.MAX_POOL_CONNECTIONS
+
+
+def test_injected_clients_apply_to_proxies_bound_at_import(aws_client_registry, ddb_resource):
+    stub_lambda = MagicMock()
+    lambda_client = aws_client_registry.lazy_client("lambda")
+    table = aws_client_registry.lazy_resource("dynamodb").Table("injectedTable")
+    ddb_resource.create_table(
+        TableName="injectedTable",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+
+    aws_client_registry.set_aws_client("lambda", stub_lambda)
+    aws_client_registry.set_aws_resource("dynamodb", ddb_resource)
+    lambda_client.invoke(FunctionName="test")
+    table.put_item(Item={"id": "1"})
+
+    stub_lambda.invoke.assert_called_once_with(FunctionName="test")
+    assert ddb_resource.Table("injectedTable").get_item(Key={"id": "1"})["Item"] == {"id": "1"}
+
+
+def test_opensearch_clients_target_the_endpoint_host_and_are_traced():
+    opensearchpy = awsClients.opensearch_module()
+    with patch.object(opensearchpy, "OpenSearch") as mock_opensearch:
+        client = awsClients.create_opensearch_client("https://search-vams.us-east-1.es.amazonaws.com", auth="signer")
+
+    kwargs = mock_opensearch.call_args.kwargs
+    assert kwargs["hosts"] == [{"host": "search-vams.us-east-1.es.amazonaws.com", "port": 443}]
+    assert kwargs["http_auth"] == "signer"
+    assert kwargs["pool_maxsize"] == awsClients.OPENSEARCH_POOL_MAXSIZE
+    assert client is mock_opensearch.return_value
@@ -0,0 +1,105 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from backend.backend.common import callTracing
+
+BUCKET = "test-tracing-bucket"
+
+
+@pytest.fixture(scope="function")
+def traced_s3(aws_client_registry, s3_client, tmp_path):
+    """
+    Bind a moto S3 client to the client registry and write invocation summaries to a temporary file
+
+    Returns:
+        tuple: Lazy S3 client and the path of the JSON lines sink
+    """
+    s3_client.create_bucket(Bucket=BUCKET)
+    for i in range(3):
+        s3_client.put_object(Bucket=BUCKET, Key=f"file-{i}.obj", Body=b"data")
+    aws_client_registry.set_aws_client("s3", s3_client)
+    sink = tmp_path / "calls.jsonl"
+    with patch.object(callTracing, "CALL_TRACING_FILE", str(sink)):
+        yield aws_client_registry.lazy_client("s3"), sink
+
+
+def test_invocation_summary_counts_aws_calls_per_operation(traced_s3, capsys):
+    s3, sink = traced_s3
+
+    @callTracing.trace_invocation
+    def lambda_handler(event, context):
+        keys = [item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET)["Contents"]]
+        # N+1 lookups, from worker threads like the handlers do
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda key: s3.head_object(Bucket=BUCKET, Key=key), keys))
+        with pytest.raises(ClientError):
+            s3.head_object(Bucket=BUCKET, Key="missing.obj")
+        return {"statusCode": 200}
+
+    assert lambda_handler({}, None) == {"statusCode": 200}
+
+    summary = json.loads(sink.read_text().splitlines()[-1])
+    assert summary["handler"] == "test_callTracing"
+    assert summary["AwsCalls"] == 5
+    assert summary["operations"]["s3.HeadObject"]["count"] == 4
+    assert summary["operations"]["s3.HeadObject"]["errors"] == 1
+    assert summary["operations"]["s3.ListObjectsV2"]["count"] == 1
+    assert len(summary["slowestCalls"]) == callTracing.SLOWEST_CALLS_COUNT
+    assert all(call["detail"] == BUCKET for call in summary["slowestCalls"])
+
+    emf = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert emf["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Handler"]]
+    assert {"AwsCalls", "AwsCallTime", "InvocationTime"} <= {
+        metric["Name"] for metric in emf["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+    assert emf["Handler"] == "test_callTracing" and emf["AwsCalls"] == 5
+
+    # Calls outside an invocation are not recorded
+    s3.list_objects_v2(Bucket=BUCKET)
+    assert len(sink.read_text().splitlines()) == 1
+
+
+def test_nested_handlers_record_into_the_outer_invocation(traced_s3):
+    s3, sink = traced_s3
+
+    @callTracing.trace_invocation
+    def lambda_handler_inner(event, context):
+        return s3.head_object(Bucket=BUCKET, Key="file-0.obj")
+
+    @callTracing.trace_invocation
+    def lambda_handler(event, context):
+        lambda_handler_inner(event, context)
+        with callTracing.trace_call(callTracing.CATEGORY_AUTHZ, "casbin.enforce"):
+            pass
+        return callTracing.current_trace()
+
+    trace = lambda_handler({}, None)
+
+    assert trace.call_count(callTracing.CATEGORY_AWS) == 1
+    assert trace.call_count(operation="casbin.enforce") == 1
+    summaries = [json.loads(line) for line in sink.read_text().splitlines()]
+    assert [summary["handler"] for summary in summaries] == ["test_callTracing"]
+    assert summaries[0]["AuthzEnforceCalls"] == 1
+
+
+def test_opensearch_requests_are_recorded_per_api():
+    perform_request = MagicMock(return_value={"hits": {"hits": []}})
+    transport = SimpleNamespace(perform_request=perform_request)
+    client = callTracing.instrument_opensearch_client(SimpleNamespace(transport=transport))
+
+    with callTracing.invocation_trace("search") as trace:
+        client.transport.perform_request("POST", "/assets/_search", body={"query": {"match_all": {}}})
+        client.transport.perform_request("DELETE", "/assets/_doc/asset-1")
+        client.transport.perform_request("HEAD", "/assets")
+
+    assert perform_request.call_count == 3
+    assert sorted(trace.operations) == ["opensearch.DELETE _doc", "opensearch.HEAD index", "opensearch.POST _search"]
+    assert trace.summary()["OpenSearchCalls"] == 3
+    assert trace.slowest_calls[0]["detail"] == "assets"
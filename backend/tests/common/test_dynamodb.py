@@ -0,0 +1,58 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.backend.common import dynamodb
+
+
+def batch_table(unprocessed_rounds=0):
+    """
+    Table whose client returns every key as an item, the first unprocessed_rounds responses only read one key
+
+    Returns:
+        Tuple of (table, the keys of each BatchGetItem request)
+    """
+    requests = []
+
+    def batch_get_item(RequestItems):
+        keys = RequestItems["items"]["Keys"]
+        requests.append(keys)
+        if len(requests) <= unprocessed_rounds:
+            return {"Responses": {"items": keys[:1]}, "UnprocessedKeys": {"items": {"Keys": keys[1:]}}}
+        return {"Responses": {"items": keys}, "UnprocessedKeys": {}}
+
+    table = MagicMock()
+    table.name = "items"
+    table.meta.client.batch_get_item.side_effect = batch_get_item
+    return table, requests
+
+
+def test_keys_are_read_100_per_request():
+    table, requests = batch_table()
+    keys = [{"databaseId": "db", "assetId": f"asset-{i}"} for i in range(250)]
+
+    assert dynamodb.batch_get_items(table, keys) == keys
+    assert [len(request) for request in requests] == [100, 100, 50]
+
+
+def test_unprocessed_keys_are_read_again_with_backoff():
+    table, requests = batch_table(unprocessed_rounds=2)
+    keys = [{"databaseId": "db", "assetId": f"asset-{i}"} for i in range(3)]
+
+    with patch.object(dynamodb.time, "sleep") as sleep:
+        items = dynamodb.batch_get_items(table, keys)
+
+    assert sorted(item["assetId"] for item in items) == ["asset-0", "asset-1", "asset-2"]
+    assert [len(request) for request in requests] == [3, 2, 1]
+    assert sleep.call_count == 2
+
+
+def test_reading_fails_when_dynamodb_keeps_throttling():
+    table, _ = batch_table(unprocessed_rounds=100)
+    keys = [{"databaseId": "db", "assetId": f"asset-{i}"} for i in range(20)]
+
+    with patch.object(dynamodb.time, "sleep"), pytest.raises(Exception, match="kept throttling"):
+        dynamodb.batch_get_items(table, keys)
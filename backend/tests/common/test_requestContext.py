@@ -0,0 +1,68 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from backend.backend.common import requestContext
+
+
+def test_reads_are_memoized_within_a_request_only():
+    loader = MagicMock(return_value={"assetId": "asset-1", "tags": ["a"]})
+
+    @requestContext.request_scoped
+    def handler():
+        first = requestContext.request_asset("db", "asset-1", loader)
+        first["tags"].append("changed")
+        return first, requestContext.request_asset("db", "asset-1", loader)
+
+    first, second = handler()
+    assert loader.call_count == 1
+    # Callers get copies, modifying one does not leak into the next read
+    assert second == {"assetId": "asset-1", "tags": ["a"]}
+
+    handler()
+    assert loader.call_count == 2
+
+
+def test_reads_outside_a_request_are_not_memoized():
+    loader = MagicMock(return_value={"bucketName": "bucket"})
+
+    requestContext.request_bucket("bucket-1", loader)
+    requestContext.request_bucket("bucket-1", loader)
+
+    assert loader.call_count == 2
+    assert requestContext.current_request_context() is None
+
+
+def test_missing_records_and_forgotten_records_are_read_again():
+    missing = MagicMock(return_value=None)
+    metadata = MagicMock(return_value={"material": "steel"})
+
+    with requestContext.request_context() as context:
+        assert requestContext.request_asset("db", "missing", missing) is None
+        assert requestContext.request_asset("db", "missing", missing) is None
+        requestContext.request_metadata("db", "asset-1", metadata)
+        requestContext.forget_metadata("db", "asset-1")
+        requestContext.request_metadata("db", "asset-1", metadata)
+        requestContext.request_metadata("db", "asset-1", metadata)
+
+    assert missing.call_count == 2
+    assert metadata.call_count == 2
+    assert context.hits == 1
+
+
+def test_enforcer_is_shared_per_user_and_nested_contexts_share_the_outer_one():
+    factory = MagicMock(side_effect=lambda claims_and_roles: object())
+    claims = {"tokens": ["user-1"], "roles": []}
+
+    with requestContext.request_context() as outer:
+        enforcer = requestContext.request_enforcer(claims, factory)
+        with requestContext.request_context() as inner:
+            assert inner is outer
+            assert requestContext.request_enforcer(claims, factory) is enforcer
+        requestContext.request_enforcer({"tokens": ["user-2"]}, factory)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _: requestContext.request_enforcer(claims, factory), range(4)))
+
+    assert factory.call_count == 2
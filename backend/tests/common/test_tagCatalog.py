@@ -0,0 +1,100 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import boto3
+import pytest
+from unittest.mock import patch
+
+from backend.backend.common import tagCatalog
+
+
+@pytest.fixture(scope="function")
+def tag_tables(ddb_resource):
+    """
+    Create tag and tag type tables with a required and an optional tag type
+
+    Args:
+        ddb_resource: Mocked DynamoDB resource
+
+    Returns:
+        tuple: Mocked tag table and tag type table
+    """
+    tag_type_table = ddb_resource.create_table(
+        TableName="tagTypesStorageTable",
+        BillingMode="PAY_PER_REQUEST",
+        KeySchema=[{"AttributeName": "tagTypeName", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "tagTypeName", "AttributeType": "S"}],
+    )
+    tag_table = ddb_resource.create_table(
+        TableName="tagsStorageTable",
+        BillingMode="PAY_PER_REQUEST",
+        KeySchema=[{"AttributeName": "tagName", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "tagName", "AttributeType": "S"}],
+    )
+
+    tag_type_table.put_item(Item={"tagTypeName": "category", "description": "Category", "required": "True"})
+    tag_type_table.put_item(Item={"tagTypeName": "status", "description": "Status", "required": "False"})
+    # Required tag type without tags can never be satisfied, so it is not enforced
+    tag_type_table.put_item(Item={"tagTypeName": "empty", "description": "Empty", "required": "True"})
+    tag_table.put_item(Item={"tagName": "vehicle", "description": "Vehicle", "tagTypeName": "category"})
+    tag_table.put_item(Item={"tagName": "building", "description": "Building", "tagTypeName": "category"})
+    tag_table.put_item(Item={"tagName": "draft", "description": "Draft", "tagTypeName": "status"})
+
+    dynamodb_client = boto3.client("dynamodb", region_name="us-east-1")
+    with patch.object(tagCatalog, "paginator", dynamodb_client.get_paginator("scan")), \
+            patch.object(tagCatalog, "dynamodb_client", dynamodb_client):
+        tagCatalog._tag_catalog_map.clear()
+        yield tag_table, tag_type_table
+
+
+def test_catalog_indexes_tags_and_required_tag_types(tag_tables):
+    catalog = tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable")
+
+    assert catalog.tag_type_by_tag == {"vehicle": "category", "building": "category", "draft": "status"}
+    assert sorted(catalog.get_tags_for_tag_type("category")) == ["building", "vehicle"]
+    assert catalog.get_tags_for_tag_type("empty") == []
+    assert catalog.is_tag_type_required("category")
+    assert not catalog.is_tag_type_required("status")
+    assert catalog.required_tag_types == ["category"]
+
+
+def test_missing_required_tag_types(tag_tables):
+    catalog = tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable")
+
+    assert catalog.get_missing_required_tag_types(["vehicle", "draft"]) == []
+    assert catalog.get_missing_required_tag_types(["draft"]) == ["category"]
+    assert catalog.get_missing_required_tag_types(["unknown"]) == ["category"]
+    assert catalog.get_missing_required_tag_types(None) == ["category"]
+
+
+def test_catalog_is_cached_until_version_bump(tag_tables):
+    tag_table, tag_type_table = tag_tables
+    catalog = tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable")
+
+    tag_table.put_item(Item={"tagName": "final", "description": "Final", "tagTypeName": "status"})
+    assert tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable") is catalog
+
+    # The version lives in the tag type table, so a bump from the tag functions reaches every container
+    tagCatalog.bump_tag_catalog_version("tagTypesStorageTable")
+    version_item = tag_type_table.get_item(Key={"tagTypeName": tagCatalog.TAG_CATALOG_VERSION_ITEM})["Item"]
+    assert version_item["catalogVersion"] == 1
+    refreshed = tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable")
+    assert refreshed is not catalog
+    assert refreshed.tag_type_by_tag["final"] == "status"
+    # The version item is not a tag type
+    assert tagCatalog.TAG_CATALOG_VERSION_ITEM not in refreshed.required_by_tag_type
+    assert tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable") is refreshed
+
+
+def test_tags_of_a_tag_type_are_a_copy(tag_tables):
+    catalog = tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable")
+
+    catalog.get_tags_for_tag_type("category").append("mutated")
+    assert "mutated" not in catalog.get_tags_for_tag_type("category")
+
+
+def test_catalog_reloads_after_refresh_interval(tag_tables, monkeypatch):
+    catalog = tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable")
+
+    monkeypatch.setattr(tagCatalog, "TAG_CATALOG_REFRESH_SECONDS", -1)
+    assert tagCatalog.get_tag_catalog("tagsStorageTable", "tagTypesStorageTable") is not catalog
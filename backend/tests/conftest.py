@@ -20,6 +20,9 @@ class MockSafeLogger:
     def __init__(self, service=None, service_name=None):
         self.service = service_name if service_name is not None else service
         
+    def debug(self, message):
+        pass
+
     def info(self, message):
         pass
         
@@ -97,6 +100,22 @@ from backend.tests.utils.api_test_utils import (
     create_cognito_auth_claims,
     create_api_gateway_event_with_auth
 )
+from backend.tests.utils.aws_call_budget import aws_call_budget as _aws_call_budget  # noqa: E402
+
+# Handlers under test use the real AWS client registry, call tracing, request context and search index
+# generation, clients are only created when first used
+from backend.backend.common import callTracing  # noqa: E402
+sys.modules['common.callTracing'] = callTracing
+from backend.backend.common import awsClients  # noqa: E402
+sys.modules['common.awsClients'] = awsClients
+from backend.backend.common import requestContext  # noqa: E402
+sys.modules['common.requestContext'] = requestContext
+from backend.backend.common import indexGeneration  # noqa: E402
+sys.modules['common.indexGeneration'] = indexGeneration
+from backend.backend.common import searchSuggestions  # noqa: E402
+sys.modules['common.searchSuggestions'] = searchSuggestions
+from backend.backend.common.dynamodb import batch_get_items  # noqa: E402
+sys.modules['common.dynamodb'].batch_get_items = batch_get_items
 
 # Set default environment variables for tests
 os.environ["COMMENT_STORAGE_TABLE_NAME"] = "commentStorageTable"
@@ -110,6 +129,8 @@ os.environ["AWS_REGION"] = "us-east-1"
 os.environ["S3_ASSET_BUCKETS_STORAGE_TABLE_NAME"] = "s3AssetBucketsStorageTable"
 os.environ["DATABASE_STORAGE_TABLE_NAME"] = "databaseStorageTable"
 os.environ["S3_ASSET_AUXILIARY_BUCKET"] = "test-asset-auxiliary-bucket"
+os.environ["ASSET_AUXILIARY_BUCKET_NAME"] = "test-asset-auxiliary-bucket"
+os.environ["PRESIGNED_URL_TIMEOUT_SECONDS"] = "86400"
 os.environ["ASSET_UPLOAD_TABLE_NAME"] = "assetUploadTable"
 os.environ["ASSET_LINKS_STORAGE_TABLE_NAME"] = "assetLinksStorageTable"
 os.environ["ASSET_VERSIONS_STORAGE_TABLE_NAME"] = "assetVersionsStorageTable"
@@ -132,6 +153,41 @@ os.environ["AUTH_TABLE_NAME"] = "authTable"
 os.environ["USER_ROLES_TABLE_NAME"] = "userRolesTable"
 os.environ["ROLES_TABLE_NAME"] = "rolesTable"
 
+# Add environment variables for executeWorkflow.py
+os.environ["WORKFLOW_EXECUTION_STORAGE_TABLE_NAME"] = "workflowExecutionStorageTable"
+os.environ["S3_ASSETAUXILIARY_STORAGE_BUCKET"] = "test-asset-auxiliary-bucket"
+os.environ["BULK_EXECUTION_RETRY_QUEUE_URL"] = "https://sqs.us-east-1.amazonaws.com/123456789012/bulkExecutionRetry"
+
+# Add environment variables for tagTypeService.py
+os.environ["TAGS_STORAGE_TABLE_NAME"] = "tagsStorageTable"
+os.environ["TAG_TYPES_STORAGE_TABLE_NAME"] = "tagTypesStorageTable"
+
+
+@pytest.fixture(scope="function", autouse=True)
+def aws_client_registry():
+    """
+    Drop shared and injected AWS clients after each test
+
+    Returns:
+        module: The AWS client registry, use set_aws_client/set_aws_resource to inject clients
+    """
+    yield awsClients
+    awsClients.reset_aws_clients()
+
+
+@pytest.fixture(scope="function")
+def aws_call_budget():
+    """
+    Fixture that provides a context manager counting the AWS calls made inside it, failing the test
+    when they exceed the declared budget, e.g.
+
+        with aws_call_budget(max_calls=3, operations={"s3.HeadObject": 0}) as calls:
+
+    Returns:
+        function: aws_call_budget(max_calls=None, operations=None) context manager
+    """
+    return _aws_call_budget
+
 
 @pytest.fixture(scope="function")
 def lambda_context():
@@ -0,0 +1,91 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+from backend.backend.customLogging import logger as custom_logger
+
+
+def make_logger(service, **kwargs):
+    stream = io.StringIO()
+    logger = custom_logger.safeLogger(service=service, stream=stream, **kwargs)
+    return logger, stream
+
+
+def records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_sensitive_keys_are_redacted():
+    logger, stream = make_logger("test-logger-mask")
+
+    logger.info({"headers": {"authorization": "Bearer token", "host": "example.com"}, "body": "{}"})
+
+    message = records(stream)[0]["message"]
+    assert message == {"headers": {"authorization": "<redacted>", "host": "example.com"}, "body": "{}"}
+
+
+def test_masking_is_skipped_without_sensitive_keys():
+    logger, stream = make_logger("test-logger-no-mask")
+
+    with patch.object(custom_logger, "mask_sensitive_data", wraps=custom_logger.mask_sensitive_data) as mask:
+        logger.info({"Key": "asset/file.obj", "Size": 10})
+        assert mask.call_count == 0
+        logger.info({"Credentials": {"SessionToken": "secret"}})
+
+    assert mask.call_count > 0
+    assert records(stream)[1]["message"] == {"Credentials": {"SessionToken": "<redacted>"}}
+
+
+def test_lazy_message_is_only_computed_when_written():
+    logger, stream = make_logger("test-logger-lazy")
+    compute = MagicMock(return_value={"documents": 3})
+
+    logger.debug(custom_logger.LazyMessage(compute))
+    compute.assert_not_called()
+
+    logger.info(custom_logger.LazyMessage(compute))
+    compute.assert_called_once()
+    assert records(stream)[0]["message"] == {"documents": 3}
+
+
+def test_large_records_are_summarized():
+    logger, stream = make_logger("test-logger-summary")
+    listing = [{"Key": f"asset/file-{i}.obj", "Size": i} for i in range(5000)]
+
+    with patch.object(custom_logger, "LOG_MAX_RECORD_LENGTH", 10000):
+        logger.info(listing)
+        logger.info("x" * 50000)
+
+    summarized, truncated = records(stream)
+    assert summarized["truncated"] is True
+    assert summarized["message"][:2] == listing[:2]
+    assert summarized["message"][-1] == "<4980 more items>"
+    assert len(truncated["message"]) < 10000
+
+
+def test_summarize_caps_items_strings_and_depth():
+    payload = {"items": list(range(30)), "text": "y" * 1500, "nested": {"a": {"b": {"c": 1}}}}
+
+    summary = custom_logger.summarize(payload, max_items=5, max_string_length=100, max_depth=3)
+
+    assert summary["items"] == [0, 1, 2, 3, 4, "<25 more items>"]
+    assert summary["text"] == "y" * 100 + "...<1400 more characters>"
+    assert summary["nested"] == {"a": {"b": "<dict of 1 items>"}}
+    assert custom_logger.summarize(payload["nested"]) == payload["nested"]
+
+
+def test_debug_records_are_sampled_per_logger():
+    sampled, sampled_stream = make_logger("test-logger-sampled", debug_sample_rate=0.5)
+    quiet, quiet_stream = make_logger("test-logger-quiet")
+
+    with patch.object(custom_logger.random, "random", side_effect=[0.1, 0.9, 0.2]):
+        for i in range(3):
+            sampled.debug(f"debug {i}")
+            quiet.debug(f"debug {i}")
+    sampled.info("info")
+
+    assert [record["message"] for record in records(sampled_stream)] == ["debug 0", "debug 2", "info"]
+    assert records(quiet_stream) == []
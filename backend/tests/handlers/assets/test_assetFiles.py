@@ -0,0 +1,247 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import boto3
+import pytest
+from unittest.mock import patch, MagicMock
+
+import backend.backend.handlers.assets.assetFiles as assetFiles
+from backend.backend.models.assetsV3 import BatchFileOperationsRequestModel
+
+
+ASSET_BUCKET = "test-asset-bucket"
+AUXILIARY_BUCKET = "test-asset-auxiliary-bucket"
+
+
+@pytest.fixture(scope="function")
+def asset_files(s3_client):
+    """
+    Create a versioned asset bucket with files for two assets and the auxiliary bucket
+
+    Args:
+        s3_client: Mocked S3 client
+
+    Returns:
+        boto3.client: Mocked S3 client bound to the asset files handler
+    """
+    s3_client.create_bucket(Bucket=ASSET_BUCKET)
+    s3_client.put_bucket_versioning(Bucket=ASSET_BUCKET, VersioningConfiguration={"Status": "Enabled"})
+    s3_client.create_bucket(Bucket=AUXILIARY_BUCKET)
+    for key in ["test-asset/a.obj", "test-asset/a.obj.previewFile.png", "test-asset/b.obj", "test-asset/c.obj",
+                "test-asset/textures/t1.png", "test-asset/textures/t2.png"]:
+        s3_client.put_object(Bucket=ASSET_BUCKET, Key=key, Body=b"data")
+    s3_client.put_object(Bucket=ASSET_BUCKET, Key="test-asset/c.obj", Body=b"data-v2")
+
+    assets = {
+        asset_id: {
+            "databaseId": "test-database",
+            "assetId": asset_id,
+            "bucketId": "test-bucket-id",
+            "assetLocation": {"Key": f"{asset_id}/"}
+        }
+        for asset_id in ["test-asset", "other-asset"]
+    }
+    bucket_details = {"bucketId": "test-bucket-id", "bucketName": ASSET_BUCKET, "baseAssetsPrefix": "/"}
+
+    with patch.object(assetFiles, "s3_client", s3_client), \
+            patch.object(assetFiles, "s3_resource", boto3.resource("s3", region_name="us-east-1")), \
+            patch.object(assetFiles, "get_default_bucket_details", return_value=bucket_details), \
+            patch.object(assetFiles, "get_asset_with_permissions",
+                         side_effect=lambda databaseId, assetId, operation, claims_and_roles: assets[assetId]), \
+            patch.object(assetFiles, "load_batch_assets",
+                         side_effect=lambda databaseId, asset_ids: {asset_id: assets[asset_id]
+                                                                    for asset_id in asset_ids}), \
+            patch.object(assetFiles, "send_subscription_email"):
+        yield s3_client
+
+
+def list_keys(s3_client):
+    return sorted(obj["Key"] for obj in s3_client.list_objects_v2(Bucket=ASSET_BUCKET).get("Contents", []))
+
+
+def job_context(remaining_seconds=900):
+    context = MagicMock()
+    context.function_name = "assetFiles"
+    context.get_remaining_time_in_millis.return_value = remaining_seconds * 1000
+    return context
+
+
+def test_batch_runs_each_operation_type(asset_files):
+    request_model = BatchFileOperationsRequestModel(confirmPermanentDelete=True, operations=[
+        {"operation": "copy", "filePath": "/a.obj", "destinationPath": "/copy/a.obj"},
+        {"operation": "copy", "filePath": "/b.obj", "destinationPath": "/b.obj", "destinationAssetId": "other-asset"},
+        {"operation": "move", "filePath": "/b.obj", "destinationPath": "/moved/b.obj"},
+        {"operation": "delete", "filePath": "/c.obj"},
+        {"operation": "archive", "filePath": "/textures", "isPrefix": True},
+    ])
+
+    response = assetFiles.batch_file_operations(
+        "test-database", "test-asset", request_model, {"tokens": []}, "assetFiles")
+
+    assert response.status == "COMPLETED"
+    assert [result.success for result in response.results] == [True] * 5
+    assert list_keys(asset_files) == [
+        "other-asset/b.obj",
+        "test-asset/a.obj",
+        "test-asset/a.obj.previewFile.png",
+        "test-asset/copy/a.obj",
+        "test-asset/copy/a.obj.previewFile.png",
+        "test-asset/moved/b.obj",
+    ]
+    # Permanent delete removes every version, archive only adds delete markers
+    versions = asset_files.list_object_versions(Bucket=ASSET_BUCKET)
+    assert not [v for v in versions.get("Versions", []) if v["Key"] == "test-asset/c.obj"]
+    assert len([m for m in versions.get("DeleteMarkers", []) if m["Key"].startswith("test-asset/textures/")]) == 2
+
+
+def test_batch_reports_per_item_failures(asset_files):
+    request_model = BatchFileOperationsRequestModel(operations=[
+        {"operation": "copy", "filePath": "/a.obj", "destinationPath": "/b.obj"},
+        {"operation": "move", "filePath": "/missing.obj", "destinationPath": "/x.obj"},
+        {"operation": "copy", "filePath": "/a.obj", "destinationPath": "/dup.obj"},
+        {"operation": "copy", "filePath": "/c.obj", "destinationPath": "/dup.obj"},
+        {"operation": "archive", "filePath": "/a.obj.previewFile.png"},
+    ])
+
+    response = assetFiles.batch_file_operations(
+        "test-database", "test-asset", request_model, {"tokens": []}, "assetFiles")
+
+    assert [result.success for result in response.results] == [False, False, True, False, True]
+    assert response.results[0].message.endswith("Destination file already exists.")
+    assert response.results[1].message.endswith("Source file not found.")
+    assert "another operation" in response.results[3].message
+    assert response.succeededCount == 2 and response.failedCount == 3
+
+
+def test_delete_objects_is_batched(asset_files):
+    objects = [{"Key": f"test-asset/bulk/{i}.obj"} for i in range(2500)]
+
+    with patch.object(assetFiles, "s3_client") as mock_s3:
+        mock_s3.delete_objects.return_value = {"Errors": [{"Key": "test-asset/bulk/7.obj", "Message": "Access Denied"}]}
+        errors = assetFiles.delete_s3_objects_batched(ASSET_BUCKET, objects)
+
+    delete_calls = mock_s3.delete_objects.call_args_list
+    assert sorted(len(c.kwargs["Delete"]["Objects"]) for c in delete_calls) == [500, 1000, 1000]
+    assert errors == {("test-asset/bulk/7.obj", None): "Access Denied"}
+
+
+def test_large_batch_runs_as_background_job(asset_files):
+    operations = [{"operation": "archive", "filePath": "/textures", "isPrefix": True}] + [
+        {"operation": "archive", "filePath": f"/missing{i}.obj"}
+        for i in range(assetFiles.BATCH_FILE_OPERATIONS_SYNC_MAX_ITEMS)]
+    request_model = BatchFileOperationsRequestModel(operations=operations)
+    mock_lambda = MagicMock()
+
+    with patch.object(assetFiles, "lambda_client", mock_lambda):
+        queued = assetFiles.batch_file_operations(
+            "test-database", "test-asset", request_model, {"tokens": []}, "assetFiles")
+
+    assert queued.status == "QUEUED" and queued.jobId
+    payload = json.loads(mock_lambda.invoke.call_args.kwargs["Payload"])
+    assert list_keys(asset_files)[-2:] == ["test-asset/textures/t1.png", "test-asset/textures/t2.png"]
+
+    response = assetFiles.lambda_handler(payload, job_context())
+    job = assetFiles.get_batch_file_operations_job("test-database", "test-asset", queued.jobId, {"tokens": []})
+
+    assert response["statusCode"] == 200
+    assert job.status == "COMPLETED"
+    assert job.succeededCount == 1 and job.failedCount == assetFiles.BATCH_FILE_OPERATIONS_SYNC_MAX_ITEMS
+    assert "test-asset/textures/t1.png" not in list_keys(asset_files)
+
+
+def test_background_job_checkpoints_and_continues_before_the_timeout(asset_files):
+    operations = [{"operation": "copy", "filePath": "/b.obj", "destinationPath": f"/copies/{i}.obj"}
+                  for i in range(assetFiles.BATCH_FILE_OPERATIONS_SYNC_MAX_ITEMS + 1)]
+    request_model = BatchFileOperationsRequestModel(operations=operations)
+    mock_lambda = MagicMock()
+
+    with patch.object(assetFiles, "lambda_client", mock_lambda):
+        queued = assetFiles.batch_file_operations(
+            "test-database", "test-asset", request_model, {"tokens": []}, "assetFiles")
+        payload = json.loads(mock_lambda.invoke.call_args.kwargs["Payload"])
+        mock_lambda.reset_mock()
+
+        # Not enough time left after the first chunk, the job continues in a new invocation
+        context = job_context(remaining_seconds=assetFiles.BATCH_FILE_OPERATIONS_JOB_MARGIN_SECONDS)
+        assetFiles.lambda_handler(payload, context)
+        job = assetFiles.get_batch_file_operations_job("test-database", "test-asset", queued.jobId, {"tokens": []})
+        assert job.status == "RUNNING"
+        assert len(job.results) == assetFiles.BATCH_FILE_OPERATIONS_JOB_CHUNK_SIZE
+        assert json.loads(mock_lambda.invoke.call_args.kwargs["Payload"]) == payload
+
+        # The continuation skips the copies that are done
+        with patch.object(assetFiles, "copy_s3_object", wraps=assetFiles.copy_s3_object) as copy_s3_object:
+            assetFiles.lambda_handler(payload, job_context())
+        assert copy_s3_object.call_count == len(operations) - assetFiles.BATCH_FILE_OPERATIONS_JOB_CHUNK_SIZE
+        job = assetFiles.get_batch_file_operations_job("test-database", "test-asset", queued.jobId, {"tokens": []})
+        assert job.status == "COMPLETED"
+        assert [result.index for result in job.results] == list(range(len(operations)))
+        assert job.succeededCount == len(operations)
+
+        # A duplicate delivery of a finished job does nothing
+        with patch.object(assetFiles, "execute_batch_file_operations") as execute_batch_file_operations:
+            assetFiles.lambda_handler(payload, job_context())
+        execute_batch_file_operations.assert_not_called()
+
+
+def test_purge_prefix_checkpoints_and_resumes(asset_files):
+    for i in range(5):
+        asset_files.put_object(Bucket=ASSET_BUCKET, Key=f"test-asset/big/{i}.obj", Body=b"data")
+    asset_files.delete_object(Bucket=ASSET_BUCKET, Key="test-asset/big/0.obj")
+
+    # Stop after the first page, which ends part way through the versions of a key
+    with patch.object(assetFiles, "S3_DELETE_OBJECTS_MAX_KEYS", 3), \
+            patch.object(assetFiles.time, "time", side_effect=[0, 10]):
+        removed, checkpoint = assetFiles.purge_s3_prefix(ASSET_BUCKET, "test-asset/big/", all_versions=True, deadline=5)
+
+    assert len(removed) == 1 and "KeyMarker" in checkpoint
+
+    removed, checkpoint = assetFiles.purge_s3_prefix(ASSET_BUCKET, "test-asset/big/", all_versions=True,
+                                                     checkpoint=checkpoint)
+
+    assert checkpoint is None
+    assert len(removed) == 4
+    versions = asset_files.list_object_versions(Bucket=ASSET_BUCKET, Prefix="test-asset/big/")
+    assert not versions.get("Versions") and not versions.get("DeleteMarkers")
+
+
+@pytest.mark.parametrize("file_count", [10, 500])
+def test_listing_files_costs_constant_s3_calls(asset_files, aws_call_budget, file_count):
+    for i in range(file_count):
+        metadata = {"vams-primarytype": "model"} if i == 0 else {}
+        asset_files.put_object(Bucket=ASSET_BUCKET, Key=f"big-asset/{i}.obj", Body=b"data", Metadata=metadata)
+
+    # The first listing reads the primary type of every file and caches it by version
+    result = assetFiles.list_s3_objects_with_archive_status(ASSET_BUCKET, "big-asset/", {})
+    assert len(result["items"]) == file_count
+    assert result["items"][0]["primaryType"] == "model"
+
+    # One version listing page and the primary type cache, whatever the number of files
+    with aws_call_budget(max_calls=3, operations={"s3.ListObjectVersions": 1, "s3.GetObject": 1,
+                                                  "s3.HeadObject": 0, "s3.PutObject": 0}):
+        cached = assetFiles.list_s3_objects_with_archive_status(ASSET_BUCKET, "big-asset/", {})
+    assert cached["items"] == result["items"]
+
+    # Only files changed since the last listing are read again
+    asset_files.put_object(Bucket=ASSET_BUCKET, Key="big-asset/0.obj", Body=b"data-v2")
+    asset_files.delete_object(Bucket=ASSET_BUCKET, Key="big-asset/1.obj")
+    with aws_call_budget(max_calls=4, operations={"s3.HeadObject": 1}):
+        changed = assetFiles.list_s3_objects_with_archive_status(ASSET_BUCKET, "big-asset/", {}, include_archived=True)
+    assert changed["items"][0]["primaryType"] is None
+    assert [item["key"] for item in changed["items"] if item["isArchived"]] == ["big-asset/1.obj"]
+    assert len(changed["items"]) == file_count
+
+
+def test_listing_files_pages_by_key(asset_files):
+    first = assetFiles.list_s3_objects_with_archive_status(ASSET_BUCKET, "test-asset/", {"maxItems": 4})
+    second = assetFiles.list_s3_objects_with_archive_status(
+        ASSET_BUCKET, "test-asset/", {"maxItems": 4, "startingToken": first["nextToken"]})
+
+    keys = [item["key"] for item in first["items"] + second["items"]]
+    assert keys == [key for key in list_keys(asset_files) if key.startswith("test-asset/")]
+    assert "nextToken" not in second
+
+    # Versions of one file can span two version listing pages
+    single_versions = assetFiles.list_s3_objects_with_archive_status(ASSET_BUCKET, "test-asset/", {"pageSize": 1})
+    assert [item["key"] for item in single_versions["items"]] == keys
@@ -0,0 +1,165 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from boto3.dynamodb.conditions import Key
+from unittest.mock import patch, MagicMock
+
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+assetService = import_with_mocked_modules(
+    "backend.backend.handlers.assets.assetService",
+    ("handlers.assets.assetCount", "handlers.assets.assetFiles")
+)
+
+
+@pytest.fixture(scope="function")
+def comment_table(ddb_resource):
+    """
+    Create a comment table with more comments for one asset than fit in a query page
+
+    Args:
+        ddb_resource: Mocked DynamoDB resource
+
+    Returns:
+        DynamoDB table resource
+    """
+    table = ddb_resource.create_table(
+        TableName="commentStorageTable",
+        BillingMode="PAY_PER_REQUEST",
+        KeySchema=[
+            {"AttributeName": "assetId", "KeyType": "HASH"},
+            {"AttributeName": "assetVersionId:commentId", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "assetId", "AttributeType": "S"},
+            {"AttributeName": "assetVersionId:commentId", "AttributeType": "S"},
+        ],
+    )
+    with table.batch_writer() as batch:
+        for i in range(30):
+            batch.put_item(Item={"assetId": "test-asset", "assetVersionId:commentId": f"1:{i}", "commentBody": "x"})
+        batch.put_item(Item={"assetId": "other-asset", "assetVersionId:commentId": "1:0", "commentBody": "x"})
+    return table
+
+
+def test_delete_items_follows_every_query_page(comment_table):
+    items = assetService.query_all_items(comment_table, KeyConditionExpression=Key("assetId").eq("test-asset"), Limit=7)
+    keys = [{"assetId": "test-asset", "assetVersionId:commentId": item["assetVersionId:commentId"]} for item in items]
+
+    deleted_count = assetService.batch_delete_items(comment_table, keys)
+
+    assert deleted_count == 30
+    assert comment_table.query(KeyConditionExpression=Key("assetId").eq("test-asset"))["Items"] == []
+    assert comment_table.query(KeyConditionExpression=Key("assetId").eq("other-asset"))["Count"] == 1
+
+
+def test_purge_hands_remaining_work_to_a_job():
+    asset = {"assetLocation": {"Key": "test-asset/"}, "previewLocation": {"Key": "previews/test-asset/"}}
+    tasks = assetService.get_asset_purge_tasks(asset, "test-asset-bucket")
+    checkpoints = iter([({}, None), ({}, {"KeyMarker": "test-asset/f500.obj"})])
+
+    with patch.object(assetService, "purge_s3_prefix", side_effect=lambda *args, **kwargs: next(checkpoints)):
+        purge_state = assetService.run_asset_purge(tasks, deadline=0)
+
+    assert [task["prefix"] for task in tasks] == ["test-asset/", "test-asset/", "previews/test-asset/"]
+    assert purge_state == {"tasks": tasks[1:], "checkpoint": {"KeyMarker": "test-asset/f500.obj"}}
+
+    mock_lambda = MagicMock()
+    context = MagicMock(function_name="assetService")
+    context.get_remaining_time_in_millis.return_value = 900000
+    with patch.object(assetService, "lambda_client", mock_lambda), \
+            patch.object(assetService, "purge_s3_prefix", return_value=([], None)) as mock_purge:
+        job = {"databaseId": "db", "assetId": "test-asset", **purge_state}
+        assetService.lambda_handler({"assetPurgeJob": job}, context)
+
+    assert mock_purge.call_args_list[0].kwargs["checkpoint"] == {"KeyMarker": "test-asset/f500.obj"}
+    assert mock_purge.call_count == 2
+    mock_lambda.invoke.assert_not_called()
+
+
+def api_context(remaining_seconds=900):
+    context = MagicMock(function_name="assetService")
+    context.get_remaining_time_in_millis.return_value = remaining_seconds * 1000
+    return context
+
+
+def test_purge_continues_inline_until_the_deadline_when_the_job_cannot_start():
+    asset = {"assetLocation": {"Key": "test-asset/"}}
+    checkpoints = iter([({}, {"KeyMarker": "test-asset/f500.obj"}), ({}, None), ({}, None)])
+    mock_lambda = MagicMock()
+    mock_lambda.invoke.side_effect = Exception("Rate exceeded")
+
+    with patch.object(assetService, "lambda_client", mock_lambda), \
+            patch.object(assetService, "purge_s3_prefix",
+                         side_effect=lambda *args, **kwargs: next(checkpoints)) as mock_purge:
+        status = assetService.purge_asset_files("db", "test-asset", asset, "test-asset-bucket", api_context())
+
+    assert status == "complete"
+    assert mock_purge.call_count == 3
+    assert mock_purge.call_args_list[1].kwargs["checkpoint"] == {"KeyMarker": "test-asset/f500.obj"}
+    assert mock_purge.call_args_list[1].kwargs["deadline"] is not None
+
+
+@pytest.fixture(scope="function")
+def deletable_asset():
+    """
+    Patch the asset service tables and side effects around one asset with files to purge
+
+    Returns:
+        The mocked asset table
+    """
+    asset = {
+        "databaseId": "db", "assetId": "test-asset", "bucketId": "test-bucket-id",
+        "assetLocation": {"Key": "test-asset/"}
+    }
+    asset_table = MagicMock()
+    asset_table.get_item.return_value = {"Item": asset}
+    bucket = {"bucketId": "test-bucket-id", "bucketName": "test-asset-bucket", "baseAssetsPrefix": "/"}
+    buckets_table = MagicMock()
+    buckets_table.query.return_value = {"Items": [bucket]}
+
+    with patch.object(assetService, "asset_table", asset_table), \
+            patch.object(assetService, "buckets_table", buckets_table), \
+            patch.object(assetService, "subscription_table", None), \
+            patch.object(assetService, "metadata_table", None), \
+            patch.object(assetService, "asset_links_table", None), \
+            patch.object(assetService, "asset_upload_table", None), \
+            patch.object(assetService, "comment_table", None), \
+            patch.object(assetService, "versions_table", None), \
+            patch.object(assetService, "send_subscription_email"), \
+            patch.object(assetService, "update_asset_count"):
+        yield asset_table
+
+
+def delete_asset(checkpoints, lambda_client=None):
+    request_model = assetService.DeleteAssetRequestModel(confirmPermanentDelete=True)
+    with patch.object(assetService, "lambda_client", lambda_client or MagicMock()), \
+            patch.object(assetService, "purge_s3_prefix", side_effect=lambda *args, **kwargs: next(checkpoints)):
+        return assetService.delete_asset_permanent("db", "test-asset", request_model, {"tokens": []}, api_context())
+
+
+def test_permanent_delete_removes_the_asset_records(deletable_asset):
+    result = delete_asset(iter([({}, None), ({}, None)]))
+
+    assert result.success
+    assert result.message == "Asset test-asset permanently deleted from all systems"
+    assert deletable_asset.delete_item.call_count == 2
+
+
+def test_permanent_delete_reports_a_background_purge(deletable_asset):
+    result = delete_asset(iter([({}, {"KeyMarker": "test-asset/f500.obj"})]))
+
+    assert result.message.endswith("Remaining asset files are being removed in the background")
+    assert deletable_asset.delete_item.call_count == 2
+
+
+def test_permanent_delete_keeps_the_asset_when_files_remain(deletable_asset):
+    mock_lambda = MagicMock()
+    mock_lambda.invoke.side_effect = Exception("Rate exceeded")
+    checkpoints = iter([({}, {"KeyMarker": "test-asset/f500.obj"}), ({}, {"KeyMarker": "test-asset/f900.obj"})])
+
+    with pytest.raises(assetService.VAMSGeneralErrorResponse, match="retry the delete"):
+        delete_asset(checkpoints, mock_lambda)
+
+    deletable_asset.delete_item.assert_not_called()
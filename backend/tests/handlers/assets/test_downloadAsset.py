@@ -0,0 +1,146 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from unittest.mock import patch
+
+from backend.backend.models.assetsV3 import DownloadAssetRequestModel
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+downloadAsset = import_with_mocked_modules("backend.backend.handlers.assets.downloadAsset", ("common.s3",))
+
+
+ASSET_BUCKET = "test-asset-bucket"
+
+
+@pytest.fixture(scope="function")
+def asset_files(s3_client, ddb_resource):
+    """
+    Create an asset bucket with files and an asset file versions table for one asset version
+
+    Args:
+        s3_client: Mocked S3 client
+        ddb_resource: Mocked DynamoDB resource
+
+    Returns:
+        boto3.client: Mocked S3 client bound to the download handler
+    """
+    s3_client.create_bucket(Bucket=ASSET_BUCKET)
+    s3_client.put_bucket_versioning(Bucket=ASSET_BUCKET, VersioningConfiguration={"Status": "Enabled"})
+    for key in ["test-asset/", "test-asset/a.obj", "test-asset/textures/b.png", "test-asset/textures/c.png",
+                "test-asset/textures2/d.png", "test-asset/run.exe"]:
+        s3_client.put_object(Bucket=ASSET_BUCKET, Key=key, Body=b"data", ContentType="application/octet-stream")
+
+    file_versions_table = ddb_resource.create_table(
+        TableName="assetFileVersionsStorageTable",
+        BillingMode="PAY_PER_REQUEST",
+        KeySchema=[
+            {"AttributeName": "assetId:assetVersionId", "KeyType": "HASH"},
+            {"AttributeName": "fileKey", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "assetId:assetVersionId", "AttributeType": "S"},
+            {"AttributeName": "fileKey", "AttributeType": "S"},
+        ],
+    )
+    version_id = s3_client.head_object(Bucket=ASSET_BUCKET, Key="test-asset/a.obj")["VersionId"]
+    file_versions_table.put_item(Item={
+        "assetId:assetVersionId": "test-asset:1", "fileKey": "a.obj", "versionId": version_id, "size": 4,
+        "etag": "abc"})
+    for file_key in ["a.obj", "models/b.obj", "models/c.obj", "z.obj"]:
+        file_versions_table.put_item(Item={
+            "assetId:assetVersionId": "test-asset:2", "fileKey": file_key, "versionId": version_id, "size": 4})
+
+    asset = {
+        "databaseId": "test-database",
+        "assetId": "test-asset",
+        "bucketId": "test-bucket-id",
+        "isDistributable": True,
+        "assetLocation": {"Key": "test-asset/"}
+    }
+    bucket_details = {"bucketId": "test-bucket-id", "bucketName": ASSET_BUCKET, "baseAssetsPrefix": "/"}
+
+    with patch.object(downloadAsset, "s3", s3_client), \
+            patch.object(downloadAsset, "asset_file_versions_table", file_versions_table), \
+            patch.object(downloadAsset, "get_asset_details", return_value=asset), \
+            patch.object(downloadAsset, "get_default_bucket_details", return_value=bucket_details), \
+            patch.object(downloadAsset, "validateUnallowedFileExtensionAndContentType",
+                         side_effect=lambda key, content_type: not key.endswith(".exe")):
+        yield s3_client
+
+
+def test_manifest_lists_all_asset_files(asset_files):
+    request_model = DownloadAssetRequestModel(downloadType="assetManifest")
+
+    response = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+
+    assert [f.relativePath for f in response.files] == ["a.obj", "textures/b.png", "textures/c.png",
+                                                        "textures2/d.png"]
+    assert response.skippedFiles == ["run.exe"]
+    assert response.NextToken is None
+    assert all(f.size == 4 and f.etag and f.downloadUrl for f in response.files)
+
+
+def test_manifest_does_not_head_the_listed_files(asset_files):
+    request_model = DownloadAssetRequestModel(downloadType="assetManifest")
+
+    with patch.object(asset_files, "head_object", side_effect=AssertionError("HEAD request per file")):
+        response = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+
+    assert len(response.files) == 4
+    # The content type is unknown without a HEAD request, the download is never served as executable content
+    assert "response-content-type=application%2Foctet-stream" in response.files[0].downloadUrl
+
+
+def test_manifest_folder_does_not_match_sibling_prefixes(asset_files):
+    request_model = DownloadAssetRequestModel(downloadType="assetManifest", key="textures")
+
+    response = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+
+    assert [f.relativePath for f in response.files] == ["textures/b.png", "textures/c.png"]
+
+
+def test_manifest_paginates_folder(asset_files):
+    request_model = DownloadAssetRequestModel(downloadType="assetManifest", key="textures/", maxItems=1)
+
+    first_page = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+    assert [f.relativePath for f in first_page.files] == ["textures/b.png"]
+    assert first_page.NextToken
+
+    request_model = DownloadAssetRequestModel(
+        downloadType="assetManifest", key="textures/", maxItems=1, startingToken=first_page.NextToken)
+    second_page = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+    assert [f.relativePath for f in second_page.files] == ["textures/c.png"]
+
+
+def test_manifest_for_asset_version(asset_files):
+    request_model = DownloadAssetRequestModel(downloadType="assetManifest", assetVersionId="1")
+
+    response = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+
+    assert len(response.files) == 1
+    assert response.files[0].relativePath == "a.obj"
+    assert response.files[0].versionId in response.files[0].downloadUrl
+    assert response.assetVersionId == "1"
+
+
+def test_manifest_for_asset_version_fills_pages_after_filtering(asset_files):
+    pages = []
+    starting_token = None
+    while True:
+        request_model = DownloadAssetRequestModel(downloadType="assetManifest", assetVersionId="2", key="models",
+                                                  maxItems=1, startingToken=starting_token)
+        response = downloadAsset.download_asset_manifest("test-database", "test-asset", request_model)
+        pages.append([f.relativePath for f in response.files])
+        starting_token = response.NextToken
+        if not starting_token:
+            break
+
+    # Records outside of the folder don't end a page early, only the last page can be short
+    assert pages[:2] == [["models/b.obj"], ["models/c.obj"]]
+    assert all(page == [] for page in pages[2:]) and len(pages) <= 3
+
+
+def test_manifest_rejects_file_version_id():
+    with pytest.raises(ValueError):
+        DownloadAssetRequestModel(downloadType="assetManifest", versionId="abc")
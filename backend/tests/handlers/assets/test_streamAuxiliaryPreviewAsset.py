@@ -0,0 +1,140 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+
+from backend.backend.common import dynamodb
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+streamAuxiliaryPreviewAsset = import_with_mocked_modules(
+    "backend.backend.handlers.assets.streamAuxiliaryPreviewAsset", ("common.s3",)
+)
+
+
+AUXILIARY_BUCKET = "test-asset-auxiliary-bucket"
+
+
+@pytest.fixture(scope="function")
+def auxiliary_bucket(s3_client):
+    """
+    Create the auxiliary bucket with Potree preview files for one asset file
+
+    Args:
+        s3_client: Mocked S3 client
+
+    Returns:
+        boto3.client: Mocked S3 client bound to the auxiliary bucket
+    """
+    s3_client.create_bucket(Bucket=AUXILIARY_BUCKET)
+    for key in [
+        "test-asset/model.e57/preview/PotreeViewer/metadata.json",
+        "test-asset/model.e57/preview/PotreeViewer/hierarchy.bin",
+        "test-asset/model.e57/preview/PotreeViewer/octree.bin",
+        "test-asset/model.e57/preview/PotreeViewer/payload.exe",
+        "test-asset/other.e57/preview/PotreeViewer/octree.bin",
+    ]:
+        s3_client.put_object(Bucket=AUXILIARY_BUCKET, Key=key, Body=b"data")
+
+    with patch.object(streamAuxiliaryPreviewAsset, "s3_client", s3_client), \
+            patch.object(streamAuxiliaryPreviewAsset, "validateUnallowedFileExtensionAndContentType",
+                         side_effect=lambda key, content_type: not key.endswith(".exe")):
+        yield s3_client
+
+
+@pytest.fixture
+def stream_event():
+    """Create an API Gateway event for streaming an auxiliary preview file"""
+    return {
+        "requestContext": {"http": {
+            "method": "GET",
+            "path": "/database/test-database/assets/test-asset/auxiliaryPreviewAssets/stream/model.e57/preview/"
+                    "PotreeViewer/metadata.json"
+        }},
+        "pathParameters": {
+            "databaseId": "test-database",
+            "assetId": "test-asset",
+            "proxy": "model.e57/preview/PotreeViewer/metadata.json"
+        },
+        "headers": {},
+        "queryStringParameters": {}
+    }
+
+
+def test_create_stream_session_signs_preview_folder(auxiliary_bucket):
+    session = streamAuxiliaryPreviewAsset.create_stream_session(
+        "test-asset/model.e57/preview/PotreeViewer/metadata.json")
+
+    assert session["sessionPrefix"] == "test-asset/model.e57/preview/PotreeViewer/"
+    # Short lived URLs, not the download URL timeout
+    assert session["expiresIn"] == streamAuxiliaryPreviewAsset.STREAM_SESSION_URL_TIMEOUT_SECONDS
+    assert "NextToken" not in session
+    # Files outside the folder and unallowed extensions are never signed
+    assert sorted(session["files"].keys()) == ["hierarchy.bin", "metadata.json", "octree.bin"]
+    assert "test-asset/model.e57/preview/PotreeViewer/octree.bin" in session["files"]["octree.bin"]
+
+
+def test_create_stream_session_pages(auxiliary_bucket):
+    first = streamAuxiliaryPreviewAsset.create_stream_session("test-asset/model.e57/preview/PotreeViewer/", 2)
+    second = streamAuxiliaryPreviewAsset.create_stream_session("test-asset/model.e57/preview/PotreeViewer/", 2,
+                                                               first["NextToken"])
+
+    assert len(first["files"]) == 2
+    assert "NextToken" not in second
+    # The unallowed file of the second page is skipped
+    assert sorted([*first["files"], *second["files"]]) == ["hierarchy.bin", "metadata.json", "octree.bin"]
+
+
+@patch.object(streamAuxiliaryPreviewAsset, "validate", return_value=(True, ""))
+@patch.object(streamAuxiliaryPreviewAsset, "get_asset_details")
+@patch.object(streamAuxiliaryPreviewAsset, "CasbinEnforcer")
+@patch.object(streamAuxiliaryPreviewAsset, "request_to_claims")
+@patch.object(streamAuxiliaryPreviewAsset, "validate_pagination_info", dynamodb.validate_pagination_info)
+@patch.object(dynamodb, "logger", MagicMock())
+def test_lambda_handler_stream_session(mock_request_to_claims, mock_casbin_enforcer, mock_get_asset_details,
+                                       mock_validate, auxiliary_bucket, stream_event):
+    mock_request_to_claims.return_value = {"tokens": ["test-user"]}
+    mock_casbin_enforcer.return_value.enforce.return_value = True
+    mock_casbin_enforcer.return_value.enforceAPI.return_value = True
+    mock_get_asset_details.return_value = {"assetLocation": {"Key": "test-asset/"}}
+    stream_event["queryStringParameters"] = {"streamSession": "true"}
+
+    response = streamAuxiliaryPreviewAsset.lambda_handler(stream_event, None)
+
+    assert response["statusCode"] == 200
+    session = json.loads(response["body"])["message"]
+    assert sorted(session["files"].keys()) == ["hierarchy.bin", "metadata.json", "octree.bin"]
+
+    # Pages are capped at STREAM_SESSION_MAX_FILES files whatever maxItems asks for
+    stream_event["queryStringParameters"] = {"streamSession": "true", "maxItems": "100000"}
+    with patch.object(streamAuxiliaryPreviewAsset, "STREAM_SESSION_MAX_FILES", 1):
+        response = streamAuxiliaryPreviewAsset.lambda_handler(stream_event, None)
+    session = json.loads(response["body"])["message"]
+    assert len(session["files"]) == 1 and "NextToken" in session
+
+
+@patch.object(streamAuxiliaryPreviewAsset, "validate", return_value=(True, ""))
+@patch.object(streamAuxiliaryPreviewAsset, "get_asset_details")
+@patch.object(streamAuxiliaryPreviewAsset, "CasbinEnforcer")
+@patch.object(streamAuxiliaryPreviewAsset, "request_to_claims")
+def test_lambda_handler_not_modified(mock_request_to_claims, mock_casbin_enforcer, mock_get_asset_details,
+                                     mock_validate, stream_event):
+    mock_request_to_claims.return_value = {"tokens": ["test-user"]}
+    mock_casbin_enforcer.return_value.enforce.return_value = True
+    mock_casbin_enforcer.return_value.enforceAPI.return_value = True
+    mock_get_asset_details.return_value = {"assetLocation": {"Key": "test-asset/"}}
+    stream_event["headers"] = {"if-none-match": '"abc123"'}
+
+    mock_s3_client = MagicMock()
+    mock_s3_client.get_object.side_effect = ClientError(
+        {"Error": {"Code": "304", "Message": "Not Modified"}, "ResponseMetadata": {"HTTPStatusCode": 304}},
+        "GetObject")
+
+    with patch.object(streamAuxiliaryPreviewAsset, "s3_client", mock_s3_client):
+        response = streamAuxiliaryPreviewAsset.lambda_handler(stream_event, None)
+
+    assert response["statusCode"] == 304
+    assert response["headers"]["ETag"] == '"abc123"'
+    assert mock_s3_client.get_object.call_args.kwargs["IfNoneMatch"] == '"abc123"'
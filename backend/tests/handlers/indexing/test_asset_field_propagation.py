@@ -0,0 +1,68 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+import backend.backend.handlers.indexing.streams as streams
+from backend.backend.common import indexGeneration
+
+
+PREVIOUS = {"_rectype": "asset", "str_assetid": "asset-1", "str_assetname": "Old name", "str_material": "wood",
+            "list_tags": ["a"]}
+
+
+@pytest.fixture(scope="function")
+def asset_index():
+    """
+    Create an AOSIndexAssetMetadata of a provisioned domain over a mocked client whose tasks complete at once
+
+    Returns:
+        AOSIndexAssetMetadata: The asset index
+    """
+    index = streams.AOSIndexAssetMetadata.__new__(streams.AOSIndexAssetMetadata)
+    index.client = MagicMock()
+    index.client.update_by_query.return_value = {"task": "node:1"}
+    index.client.tasks.get.return_value = {"completed": True, "response": {"updated": 3, "failures": []}}
+    index.indexName = "vams-index"
+    index.service = "es"
+    # Changes are marked for the generation bump of an indexing handler, none runs here
+    with patch.dict(indexGeneration._changed_indexes), patch.dict(indexGeneration._index_changes):
+        yield index
+
+
+def test_only_changed_asset_fields_are_written_to_the_file_documents(asset_index):
+    metadata_table = MagicMock()
+    metadata_table.get_prefix_items.return_value = [{"databaseId": "db", "assetId": "asset-1/a.obj", "weight": "2"}]
+    document = {"_rectype": "asset", "str_assetid": "asset-1", "str_assetname": "New name", "list_tags": ["a"]}
+
+    assert asset_index.propagate_asset_fields("db", "asset-1", PREVIOUS, document, metadata_table)
+
+    body = asset_index.client.update_by_query.call_args.kwargs["body"]
+    assert body["script"]["params"] == {"changed": {"str_assetname": "New name"}, "removed": ["str_material"]}
+    assert {"term": {"str_assetid.raw": "asset-1"}} in body["query"]["bool"]["filter"]
+
+    # Nothing to write when the asset fields are unchanged
+    asset_index.client.update_by_query.reset_mock()
+    assert asset_index.propagate_asset_fields("db", "asset-1", PREVIOUS, dict(PREVIOUS), metadata_table)
+    asset_index.client.update_by_query.assert_not_called()
+
+
+@pytest.mark.parametrize("previous, document, prefix_items, service", [
+    # New asset, its files were never indexed
+    (None, PREVIOUS, [], "es"),
+    # File metadata overrides the changed asset metadata field
+    (PREVIOUS, {**PREVIOUS, "str_material": "steel"}, [{"assetId": "asset-1/a.obj", "material": "oak"}], "es"),
+    # Asset metadata field named like a field of the S3 object
+    (PREVIOUS, {**PREVIOUS, "num_size": 3}, [], "es"),
+    # Serverless collections don't run update by query tasks
+    (PREVIOUS, {**PREVIOUS, "str_assetname": "New name"}, [], "aoss"),
+])
+def test_file_documents_are_indexed_again_when_fields_cannot_be_propagated(asset_index, previous, document,
+                                                                           prefix_items, service):
+    metadata_table = MagicMock()
+    metadata_table.get_prefix_items.return_value = prefix_items
+    asset_index.service = service
+
+    assert not asset_index.propagate_asset_fields("db", "asset-1", previous, document, metadata_table)
+    asset_index.client.update_by_query.assert_not_called()
@@ -0,0 +1,155 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import opensearchpy
+import pytest
+from unittest.mock import patch, MagicMock
+
+import backend.backend.handlers.indexing.streams as streams
+from backend.backend.common import indexGeneration
+
+
+def asset_record(eventName="MODIFY"):
+    return {
+        "eventName": eventName,
+        "dynamodb": {
+            "Keys": {"databaseId": {"S": "db"}, "assetId": {"S": "asset-1"}},
+            "NewImage": {
+                "databaseId": {"S": "db"},
+                "assetId": {"S": "asset-1"},
+                "assetName": {"S": "Bridge"},
+                "description": {"S": "A bridge"},
+                "assetType": {"S": "folder"},
+                "tags": {"L": [{"S": "steel"}]},
+                "bucketId": {"S": "bucket-1"},
+                "currentVersion": {"M": {"Version": {"S": "1"}}},
+            },
+        },
+    }
+
+
+@pytest.fixture(scope="function")
+def asset_index():
+    """
+    Create an AOSIndexAssetMetadata over a mocked client where no document of the asset is indexed yet
+
+    Returns:
+        AOSIndexAssetMetadata: The asset index
+    """
+    index = streams.AOSIndexAssetMetadata.__new__(streams.AOSIndexAssetMetadata)
+    index.client = MagicMock()
+    index.client.get.side_effect = opensearchpy.NotFoundError(404, "not_found", {})
+    index.client.update.return_value = {"get": {"_source": {}}}
+    index.indexName = "vams-index"
+    index.suggestIndexName = "vams-index-suggest"
+    index.service = "es"
+    with patch.dict(indexGeneration._changed_indexes), patch.dict(indexGeneration._index_changes):
+        yield index
+
+
+def test_asset_table_changes_are_indexed_without_a_metadata_table_write(asset_index):
+    metadata_table = MagicMock()
+    metadata_table.get_metadata.return_value = {"databaseId": "db", "assetId": "asset-1", "material": "steel",
+                                                "assetName": "Overridden"}
+    s3_index = MagicMock()
+
+    streams.lambda_handler_a({"Records": [asset_record()]}, None, index=lambda: asset_index,
+                             s3index=lambda: s3_index, metadataTable_fn=lambda: metadata_table)
+
+    asset_index.client.index.assert_called_once()
+    call = asset_index.client.index.call_args.kwargs
+    assert call["id"] == "asset-1"
+    assert call["body"] == {
+        "_rectype": "asset",
+        "str_databaseid": "db",
+        "str_assetid": "asset-1",
+        "str_material": "steel",
+        "str_assetname": "Bridge",
+        "str_description": "A bridge",
+        "str_assettype": "folder",
+        "list_tags": ["steel"],
+    }
+    metadata_table.table.update_item.assert_not_called()
+
+    # The name and tag suggestions of the asset, in one request
+    bulk = asset_index.client.bulk.call_args.kwargs["body"]
+    assert [line["index"]["_id"] for line in bulk[::2]] == ["asset#asset-1", "tag#asset-1#steel"]
+    assert all(line["index"]["_index"] == "vams-index-suggest" for line in bulk[::2])
+    assert bulk[1] == {"suggest": "Bridge", "value": "Bridge", "type": "asset", "databaseId": "db",
+                       "assetId": "asset-1", "assetName": "Bridge", "assetType": "folder", "tags": ["steel"]}
+
+    # A new asset, its files are indexed with the asset fields of the stream image
+    s3_index.index_asset_files.assert_called_once_with("db", "asset-1", {
+        "assetName": "Bridge", "description": "A bridge", "assetType": "folder", "tags": ["steel"],
+        "bucketId": "bucket-1"})
+    s3_index.process_item.assert_not_called()
+
+
+def test_assets_without_a_metadata_record_are_indexed(asset_index):
+    metadata_table = MagicMock()
+    metadata_table.get_metadata.return_value = None
+    record = asset_record("INSERT")
+    del record["dynamodb"]["NewImage"]["bucketId"]
+    s3_index = MagicMock()
+
+    streams.lambda_handler_a({"Records": [record]}, None, index=lambda: asset_index,
+                             s3index=lambda: s3_index, metadataTable_fn=lambda: metadata_table)
+
+    body = asset_index.client.index.call_args.kwargs["body"]
+    assert body["str_assetid"] == "asset-1"
+    assert body["str_databaseid"] == "db"
+    # Without the bucket in the image, the files are indexed from the asset table record
+    s3_index.process_item.assert_called_once_with("db", "asset-1")
+
+
+class ServerlessCollection:
+    """opensearch-py client stand-in of a serverless collection
+
+    Deletes show up in searches and counts after a refresh.
+    """
+
+    def __init__(self, documents):
+        self.documents = dict(documents)
+        self.searchable = dict(documents)
+        self.searches = 0
+
+    def refresh(self):
+        self.searchable = dict(self.documents)
+
+    def _matches(self, query):
+        field, value = next(iter(query["term"].items()))
+        field = field.replace(".raw", "")
+        return sorted(id for id, document in self.searchable.items() if document.get(field) == value)
+
+    def search(self, index, body):
+        self.searches += 1
+        after = body.get("search_after")
+        ids = [id for id in self._matches(body["query"]) if not after or id > after[0]]
+        return {"hits": {"hits": [{"_id": id, "sort": [id]} for id in ids[:body["size"]]]}}
+
+    def count(self, index, body):
+        return {"count": len(self._matches(body["query"]))}
+
+    def bulk(self, body):
+        for action in body:
+            self.documents.pop(action["delete"]["_id"], None)
+        return {"errors": False, "items": []}
+
+
+def test_serverless_deletes_page_past_documents_the_collection_still_finds(asset_index):
+    documents = {"asset-1": {"str_assetid": "asset-1"}, "asset-2": {"str_assetid": "asset-2"}}
+    documents.update({f"asset-1/file-{number}.obj": {"str_assetid": "asset-1"} for number in range(5)})
+    collection = ServerlessCollection(documents)
+    asset_index.client = collection
+    asset_index.service = "aoss"
+    asset_index.suggestIndexName = None
+
+    with patch.object(streams, "DELETE_BY_SEARCH_PAGE_SIZE", 2), \
+            patch.object(streams.time, "sleep", side_effect=lambda seconds: collection.refresh()) as sleep:
+        assert asset_index.delete_item_by_query("asset-1") == 6
+
+    assert list(collection.documents) == ["asset-2"]
+    # One pass over 3 full pages, then the count still finds the deleted documents until the refresh
+    # and a second pass confirms nothing else is left
+    assert collection.searches == 5
+    assert sleep.call_count == 1
@@ -0,0 +1,291 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import json
+import sys
+import boto3
+import opensearchpy
+import pytest
+from unittest.mock import patch, MagicMock
+
+import backend.backend.handlers.indexing.streams as streams
+sys.modules['handlers.indexing.streams'] = streams
+import backend.backend.handlers.indexing.reindex as reindex  # noqa: E402
+from backend.backend.common import indexGeneration  # noqa: E402
+from backend.backend.common.indexGeneration import bumps_index_generation  # noqa: E402
+
+
+ASSET_BUCKET = "test-asset-bucket"
+LIVE_INDEX = "vams-index"
+
+
+class FakeIndices:
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+
+    def get_alias(self, name):
+        indexes = [index for index, aliases in self.cluster.aliases.items() if name in aliases]
+        if not indexes:
+            raise opensearchpy.NotFoundError(404, "aliases_not_found_exception", {})
+        return {index: {"aliases": {name: {}}} for index in indexes}
+
+    def exists(self, index):
+        return index in self.cluster.indexes
+
+    def get_mapping(self, index):
+        name = self.cluster.resolve(index)
+        return {name: {"mappings": self.cluster.indexes[name]["mappings"]}}
+
+    def get_settings(self, index):
+        name = self.cluster.resolve(index)
+        return {name: {"settings": {"index": copy.deepcopy(self.cluster.indexes[name]["settings"])}}}
+
+    def create(self, index, body):
+        self.cluster.indexes[index] = {"docs": {}, "mappings": body["mappings"], "settings": body["settings"]["index"]}
+
+    def put_settings(self, index, body):
+        self.cluster.indexes[self.cluster.resolve(index)]["settings"].update(body["index"])
+
+    def refresh(self, index):
+        pass
+
+    def update_aliases(self, body):
+        for action in body["actions"]:
+            operation, target = next(iter(action.items()))
+            if operation == "remove_index":
+                del self.cluster.indexes[target["index"]]
+            elif operation == "remove":
+                self.cluster.aliases[target["index"]].remove(target["alias"])
+            else:
+                self.cluster.aliases.setdefault(target["index"], set()).add(target["alias"])
+
+    def delete(self, index, ignore_unavailable=False):
+        self.cluster.indexes.pop(index, None)
+
+
+class FakeOpenSearch:
+    """In-memory stand-in for the opensearch-py client with the indexes and aliases the reindex job uses"""
+
+    def __init__(self):
+        self.indexes = {}
+        self.aliases = {}
+        self.indices = FakeIndices(self)
+
+    def resolve(self, index):
+        return next((name for name, aliases in self.aliases.items() if index in aliases), index)
+
+    def docs(self, index):
+        return self.indexes[self.resolve(index)]["docs"]
+
+    def index(self, index, body, id):
+        self.docs(index)[id] = body
+
+    def get(self, index, id):
+        if id not in self.docs(index):
+            raise opensearchpy.NotFoundError(404, "not_found", {})
+        return {"_id": id, "_source": self.docs(index)[id]}
+
+    def create(self, index, id, body):
+        if id in self.docs(index):
+            raise opensearchpy.ConflictError(409, "version_conflict_engine_exception", {})
+        self.docs(index)[id] = body
+
+    def delete(self, index, id):
+        if id not in self.docs(index):
+            raise opensearchpy.NotFoundError(404, "not_found", {})
+        del self.docs(index)[id]
+
+    def update(self, index, id, body, params=None):
+        document = self.docs(index).setdefault(id, {})
+        document.update(body["doc"])
+        return {"get": {"_source": dict(document)}}
+
+    def bulk(self, body):
+        items = []
+        lines = iter(body)
+        for line in lines:
+            operation, action = next(iter(line.items()))
+            if operation == "index":
+                self.docs(action["_index"])[action["_id"]] = next(lines)
+                items.append({"index": {"status": 201}})
+            else:
+                found = self.docs(action["_index"]).pop(action["_id"], None)
+                items.append({"delete": {"status": 200 if found else 404}})
+        return {"errors": any(item.get("delete", {}).get("status") == 404 for item in items), "items": items}
+
+    def _matches(self, index, query):
+        field, value = next(iter(query["term"].items()))
+        field = field.replace("str_assetid.raw", "str_assetid")
+        return [id for id, document in self.docs(index).items() if document.get(field) == value]
+
+    def search(self, index, body):
+        hits = [{"_id": id, "_source": self.docs(index)[id]} for id in self._matches(index, body["query"])]
+        return {"hits": {"hits": hits[:body["size"]]}}
+
+    def delete_by_query(self, index, body, params=None):
+        for id in self._matches(index, body["query"]):
+            del self.docs(index)[id]
+
+
+@pytest.fixture(scope="function")
+def reindex_environment(s3_client):
+    """
+    Create the asset, metadata and bucket tables, the asset and auxiliary buckets and a live search
+    index created by the deployment under the alias name
+
+    Returns:
+        FakeOpenSearch: The search cluster
+    """
+    s3_client.create_bucket(Bucket=ASSET_BUCKET)
+    s3_client.create_bucket(Bucket=reindex.bucket_name_assetAuxiliary)
+
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    key_schema = [{"AttributeName": "databaseId", "KeyType": "HASH"}, {"AttributeName": "assetId", "KeyType": "RANGE"}]
+    attributes = [{"AttributeName": "databaseId", "AttributeType": "S"},
+                  {"AttributeName": "assetId", "AttributeType": "S"}]
+    asset_table = dynamodb.create_table(TableName=reindex.asset_Database, KeySchema=key_schema,
+                                        AttributeDefinitions=attributes, BillingMode="PAY_PER_REQUEST")
+    metadata_table = dynamodb.create_table(TableName="metadataStorageTable", KeySchema=key_schema,
+                                           AttributeDefinitions=attributes, BillingMode="PAY_PER_REQUEST")
+    buckets_table = dynamodb.create_table(
+        TableName="s3AssetBucketsStorageTable",
+        KeySchema=[{"AttributeName": "bucketId", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "bucketId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST")
+    buckets_table.put_item(Item={"bucketId": "test-bucket-id", "bucketName": ASSET_BUCKET, "baseAssetsPrefix": "/"})
+
+    for number in range(5):
+        asset_id = f"asset-{number}"
+        asset_table.put_item(Item={"databaseId": "test-database", "assetId": asset_id, "bucketId": "test-bucket-id",
+                                   "assetName": f"Asset {number}", "tags": ["part"]})
+        metadata_table.put_item(Item={"databaseId": "test-database", "assetId": asset_id, "material": "steel",
+                                      "_asset_table_updated": 1})
+        for name in ["model.obj", "texture.png"]:
+            s3_client.put_object(Bucket=ASSET_BUCKET, Key=f"{asset_id}/{name}", Body=b"data")
+
+    cluster = FakeOpenSearch()
+    cluster.indexes[LIVE_INDEX] = {
+        "docs": {"stale-asset": {"_rectype": "asset", "str_assetid": "stale-asset"}},
+        "mappings": {"dynamic_templates": [{"strings": {"match": "str_*"}}]},
+        "settings": {"number_of_shards": "2", "number_of_replicas": "1"},
+    }
+    cluster.indexes[LIVE_INDEX + "-suggest"] = {"docs": {}, "mappings": {}, "settings": {}}
+
+    with patch.object(reindex, "s3c", s3_client), \
+            patch.object(reindex, "dynamodb", dynamodb), \
+            patch.object(reindex, "get_search_index", return_value=(cluster, LIVE_INDEX)), \
+            patch.object(reindex, "REINDEX_SWAP_QUIET_SECONDS", 0), \
+            patch.object(streams, "s3client", s3_client), \
+            patch.object(streams, "dynamodbResource", dynamodb), \
+            patch.object(streams, "buckets_table", buckets_table), \
+            patch.dict("os.environ", {"AOS_TYPE": "es"}):
+        yield cluster
+
+
+def test_reindex_builds_a_new_index_and_moves_the_alias(reindex_environment, s3_client):
+    cluster = reindex_environment
+    mock_lambda = MagicMock()
+    context = MagicMock(function_name="reindex")
+    context.get_remaining_time_in_millis.return_value = 0
+
+    @bumps_index_generation
+    def delete_file_while_building(key):
+        s3_client.delete_object(Bucket=ASSET_BUCKET, Key=key)
+        streams.AOSIndexS3Objects(cluster, LIVE_INDEX).delete_item(key)
+
+    with patch.object(reindex, "client", mock_lambda), patch.object(reindex, "REINDEX_SCAN_PAGE_SIZE", 1):
+        job = reindex.lambda_handler({"action": "start", "segments": 2}, context)
+        assert cluster.indexes[job['buildIndex']]["settings"]["refresh_interval"] == "-1"
+        with pytest.raises(ValueError):
+            reindex.lambda_handler({"action": "start"}, context)
+
+        # One segment invocation per scan page, since the deadline has passed
+        invocations = 0
+        while mock_lambda.invoke.call_count > invocations:
+            payload = json.loads(mock_lambda.invoke.call_args_list[invocations].kwargs["Payload"])
+            invocations += 1
+            if invocations == 3:
+                indexed = [id for id in cluster.indexes[job['buildIndex']]["docs"] if id.endswith("/model.obj")]
+                delete_file_while_building(indexed[0])
+            reindex.lambda_handler(payload, context)
+
+    status = reindex.lambda_handler({"action": "status", "jobId": job['jobId']}, context)
+    assert status['status'] == "COMPLETED"
+    assert status['assetCount'] == 5
+    assert status['segmentsDone'] == 2
+
+    # The deployment's index was replaced, the alias resolves to the rebuilt index
+    assert LIVE_INDEX not in cluster.indexes
+    assert cluster.resolve(LIVE_INDEX) == job['buildIndex']
+    built = cluster.indexes[job['buildIndex']]
+    assert built["settings"]["number_of_replicas"] == "1"
+    assert built["mappings"] == {"dynamic_templates": [{"strings": {"match": "str_*"}}]}
+
+    documents = {id: document for id, document in built["docs"].items() if not id.startswith("#")}
+    assert len(documents) == 5 + 9
+    assert indexed[0] not in documents
+    assert sorted(id for id in built["docs"] if id.startswith("#")) == ["#vams-index-generation", "#vams-reindex-state"]
+    assert documents["asset-1"]["str_assetname"] == "Asset 1"
+    assert documents["asset-1"]["str_material"] == "steel"
+    assert documents["asset-1/texture.png"]["str_material"] == "steel"
+    assert built["docs"]["#vams-reindex-state"][indexGeneration.REINDEX_BUILD_INDEX_FIELD] is None
+
+    # Suggestions are written to the suggestion index of the alias
+    suggestions = cluster.indexes[LIVE_INDEX + "-suggest"]["docs"]
+    assert suggestions["asset#asset-1"]["value"] == "Asset 1"
+    assert suggestions["tag#asset-1#part"]["databaseId"] == "test-database"
+    assert suggestions["file#asset-1/texture.png"]["value"] == "texture.png"
+
+
+def test_segments_continue_after_the_asset_that_passed_the_deadline(reindex_environment):
+    cluster = reindex_environment
+    mock_lambda = MagicMock()
+    context = MagicMock(function_name="reindex")
+    context.get_remaining_time_in_millis.return_value = 0
+
+    with patch.object(reindex, "client", mock_lambda):
+        job = reindex.lambda_handler({"action": "start", "segments": 1}, context)
+        invocations = 0
+        while mock_lambda.invoke.call_count > invocations:
+            payload = json.loads(mock_lambda.invoke.call_args_list[invocations].kwargs["Payload"])
+            invocations += 1
+            reindex.lambda_handler(payload, context)
+
+    # All 5 assets are on one scan page, each invocation indexes the files of one asset
+    assert invocations == 5
+    status = reindex.lambda_handler({"action": "status", "jobId": job['jobId']}, context)
+    assert status['status'] == "COMPLETED"
+    assert status['assetCount'] == 5
+    documents = cluster.indexes[job['buildIndex']]["docs"]
+    assert len([id for id in documents if not id.startswith("#")]) == 5 + 10
+
+
+def test_indexers_fail_when_their_changes_cannot_be_recorded(reindex_environment):
+    cluster = reindex_environment
+    indexGeneration.set_reindex_build_index(cluster, LIVE_INDEX, "vams-index-v2")
+    cluster.indexes["vams-index-v2"] = {"docs": {}, "mappings": {}, "settings": {}}
+
+    @bumps_index_generation
+    def delete_file(key):
+        streams.AOSIndexS3Objects(cluster, LIVE_INDEX).delete_item(key)
+
+    delete_file("asset-1/model.obj")
+    replays = cluster.indexes["vams-index-v2"]["docs"]
+    assert [json.loads(replay[indexGeneration.REINDEX_REPLAY_CHANGE_FIELD]) for replay in replays.values()] == \
+        [{"deletedId": "asset-1/model.obj"}]
+
+    # The generation document is only used by caches, a failed bump doesn't stop the recording
+    with patch.object(cluster, "update", side_effect=opensearchpy.ConnectionTimeout("timeout", 0, None)):
+        delete_file("asset-2/model.obj")
+    assert len(replays) == 2
+
+    # The batch is retried when the changes can't be recorded
+    with patch.object(cluster, "get", side_effect=opensearchpy.ConnectionTimeout("timeout", 0, None)), \
+            pytest.raises(opensearchpy.ConnectionTimeout):
+        delete_file("asset-3/model.obj")
+    with patch.object(cluster, "bulk", return_value={"errors": True, "items": []}), \
+            pytest.raises(Exception, match="Unable to record the changes"):
+        delete_file("asset-4/model.obj")
+    assert len(replays) == 2
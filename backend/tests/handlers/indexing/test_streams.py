@@ -396,8 +396,10 @@ def test_index_handler_asset_insert2():
     index.delete_item = Mock()
     index.delete_item_by_query = Mock()
 
+    index.index_document = Mock()
+
     meta_table = Mock()
-    meta_table.write_asset_table_updated_event = Mock()
+    meta_table.get_metadata = Mock(return_value=None)
 
     meta_table_mock = Mock()
     meta_table_mock.return_value = meta_table
@@ -406,10 +408,12 @@ def test_index_handler_asset_insert2():
                      index=lambda_handler_mock,
                      metadataTable_fn=meta_table_mock)
 
-    meta_table.write_asset_table_updated_event.assert_called_with(
+    meta_table.get_metadata.assert_called_with(
                         "gltfsamples",
                         "x64ec1b1e-0ad2-4533-a19a-08af9cf5145c"
                     )
+    index.index_document.assert_called_once()
+    meta_table.update_item.assert_not_called()
 
 
 def test_index_handler_asset_remove():
@@ -570,9 +574,9 @@ def test_lambda_handler_s3_missing_records():
         'Key': 'x3436ba89-d832-4486-a6d5-606fc18a8691/test-folder/5.txt'
     })
 
-    metadata_fn.get_metadata.assert_called_with(
-        databaseId, 'x3436ba89-d832-4486-a6d5-606fc18a8691')
-    assert sleep_fn.call_count == 120
+    metadata_fn.get_metadata.assert_not_called()
+    assert get_asset_fields_fn.call_count == 60
+    assert sleep_fn.call_count == 60
 
 
 def test_lambda_handler_s3():
@@ -650,9 +654,7 @@ def test_lambda_handler_s3():
     })
 
     assert sleep_fn.call_count == 0
-    metadata_fn.get_metadata.assert_called_with(
-        databaseId,
-        'x3436ba89-d832-4486-a6d5-606fc18a8691')
+    metadata_fn.get_metadata.assert_not_called()
 
     s3index.process_single_s3_object.assert_called_with(
         databaseId,
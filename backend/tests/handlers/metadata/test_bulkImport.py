@@ -0,0 +1,158 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import boto3
+import pytest
+from unittest.mock import patch, MagicMock
+
+from backend.backend.handlers.metadataschema.schema import CompiledMetadataSchema
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+bulkImport = import_with_mocked_modules("backend.backend.handlers.metadata.bulkImport",
+                                        ("handlers.metadataschema.schema",))
+
+
+ASSET_BUCKET = "test-asset-bucket"
+SCHEMA_FIELDS = [
+    {"field": "material", "dataType": "string", "required": True},
+    {"field": "weight", "dataType": "number"},
+    {"field": "finish", "dataType": "inline-controlled-list", "inlineControlledListValues": "matte,gloss",
+     "dependsOn": ["material"]},
+]
+
+
+@pytest.fixture(scope="function")
+def import_environment(s3_client):
+    """
+    Create the asset table, the auxiliary and asset buckets and an in-memory metadata table
+
+    Args:
+        s3_client: Mocked S3 client
+
+    Returns:
+        dict: Metadata records by metadata table asset ID
+    """
+    s3_client.create_bucket(Bucket=ASSET_BUCKET)
+    s3_client.create_bucket(Bucket=bulkImport.bucket_name_assetAuxiliary)
+
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    asset_table = dynamodb.create_table(
+        TableName=bulkImport.asset_Database,
+        KeySchema=[{"AttributeName": "databaseId", "KeyType": "HASH"},
+                   {"AttributeName": "assetId", "KeyType": "RANGE"}],
+        AttributeDefinitions=[{"AttributeName": "databaseId", "AttributeType": "S"},
+                              {"AttributeName": "assetId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    for asset_id in ["asset-1", "asset-2", "asset-denied"]:
+        asset_table.put_item(Item={"databaseId": "test-database", "assetId": asset_id, "bucketId": "test-bucket-id",
+                                   "assetName": asset_id, "assetLocation": {"Key": f"{asset_id}/"}})
+
+    stored = {"asset-2": {"databaseId": "test-database", "assetId": "asset-2", "material": "steel"}}
+
+    def write_metadata(databaseId, records):
+        stored.update({key: {**metadata, "databaseId": databaseId, "assetId": key}
+                       for key, metadata in records.items()})
+
+    enforcer = MagicMock()
+    enforcer.enforceAPI.return_value = True
+    enforcer.enforce.side_effect = lambda asset, action: asset["assetId"] != "asset-denied"
+    bucket_details = {"bucketId": "test-bucket-id", "bucketName": ASSET_BUCKET, "baseAssetsPrefix": "/"}
+
+    with patch.object(bulkImport, "logger"), \
+            patch.object(bulkImport, "s3c", s3_client), \
+            patch.object(bulkImport, "dynamodb", dynamodb), \
+            patch.object(bulkImport, "CasbinEnforcer", return_value=enforcer), \
+            patch.object(bulkImport, "get_compiled_schema", return_value=CompiledMetadataSchema(SCHEMA_FIELDS)), \
+            patch.object(bulkImport, "batch_get_metadata",
+                         side_effect=lambda databaseId, keys: {key: stored[key] for key in keys if key in stored}), \
+            patch.object(bulkImport, "batch_write_metadata", side_effect=write_metadata) as batch_write, \
+            patch.object(bulkImport, "get_asset_object_from_id",
+                         side_effect=lambda databaseId, assetId: {"assetId": assetId, "bucketId": "test-bucket-id",
+                                                                  "assetLocation": {"Key": f"{assetId}/"}}), \
+            patch.object(bulkImport, "get_default_bucket_details", return_value=bucket_details), \
+            patch.object(bulkImport, "normalize_s3_path", side_effect=lambda base, path: base + path), \
+            patch.object(bulkImport, "build_response",
+                         side_effect=lambda code, body: {"statusCode": code, "body": body}):
+        stored["batch_write"] = batch_write
+        yield stored
+
+
+def import_event(method, body=None, jobId=None):
+    path_params = {"databaseId": "test-database"}
+    if jobId:
+        path_params["jobId"] = jobId
+    return {
+        "requestContext": {"http": {"method": method}, "authorizer": {}, "requestId": "request-1"},
+        "pathParameters": path_params,
+        "body": json.dumps(body) if body else None,
+    }
+
+
+def run_import(body, remaining_millis=900000):
+    mock_lambda = MagicMock()
+    with patch.object(bulkImport, "client", mock_lambda):
+        queued = bulkImport.lambda_handler(import_event("POST", body), MagicMock(function_name="bulkImport"))
+        assert queued["statusCode"] == 200
+
+        context = MagicMock(function_name="bulkImport")
+        context.get_remaining_time_in_millis.return_value = remaining_millis
+        invocations = 0
+        while mock_lambda.invoke.call_count > invocations:
+            invocations += 1
+            payload = json.loads(mock_lambda.invoke.call_args.kwargs["Payload"])
+            bulkImport.lambda_handler(payload, context)
+
+    response = bulkImport.lambda_handler(
+        import_event("GET", jobId=json.loads(queued["body"])["jobId"]), MagicMock(function_name="bulkImport"))
+    return json.loads(response["body"]), invocations
+
+
+def test_import_writes_valid_records_and_reports_failed_rows(import_environment):
+    status, invocations = run_import({"version": "1", "records": [
+        {"assetId": "asset-1", "metadata": {"material": "wood", "weight": "12.5"}},
+        {"assetId": "asset-1", "metadata": {"finish": "matte"}},
+        {"assetId": "asset-1", "prefix": "asset-1/model.obj", "metadata": {"weight": "heavy"}},
+        {"assetId": "asset-2", "metadata": {"weight": "3"}},
+        {"assetId": "asset-2", "prefix": "asset-2/model.obj", "metadata": {"finish": "shiny"}},
+        {"assetId": "asset-denied", "metadata": {"material": "wood"}},
+        {"assetId": "asset-3", "prefix": "asset-3/model.obj", "metadata": {"weight": "1"}},
+    ]})
+
+    assert invocations == 1
+    assert status["status"] == "COMPLETED"
+    assert status["importedCount"] == 3
+    assert status["failedCount"] == 4
+    assert [(error["row"], error["errors"]) for error in status["errors"]] == [
+        (3, ["weight must be a number"]),
+        (5, ["finish must be one of the listed values"]),
+        (6, ["Asset does not exist or is not authorized"]),
+        (7, ["Asset does not exist or is not authorized"]),
+    ]
+    # Records of the same asset are merged, stored fields are kept
+    assert import_environment["asset-1"]["material"] == "wood"
+    assert import_environment["asset-1"]["finish"] == "matte"
+    assert import_environment["asset-2"] == {"databaseId": "test-database", "assetId": "asset-2",
+                                             "material": "steel", "weight": "3"}
+    import_environment["batch_write"].assert_called_once()
+
+
+def test_csv_import_continues_in_new_invocations(import_environment, s3_client):
+    rows = ["assetId,prefix,material,finish"] + [f"asset-1,asset-1/part-{i}.obj,,gloss" for i in range(5)]
+    rows.append("asset-2,,,matte")
+    s3_client.put_object(Bucket=ASSET_BUCKET, Key="asset-1/imports/metadata.csv", Body="\n".join(rows).encode())
+
+    with patch.object(bulkImport, "METADATA_IMPORT_CHUNK_SIZE", 2):
+        body = {"version": "1", "csvFile": {"assetId": "asset-1", "key": "imports/metadata.csv"}}
+        status, invocations = run_import(body, remaining_millis=0)
+
+    # One chunk per invocation when the deadline has passed
+    assert invocations == 3
+    assert status["status"] == "COMPLETED"
+    assert status["totalRecords"] == 6
+    # Files without material fail the finish dependency, required fields only apply to assets
+    assert status["failedCount"] == 5
+    assert status["errors"][0] == {"row": 1, "assetId": "asset-1", "prefix": "asset-1/part-0.obj",
+                                   "errors": ["finish depends on material, which is not filled out"]}
+    assert import_environment["asset-2"]["finish"] == "matte"
@@ -400,10 +400,10 @@ def test_read_not_found(mock_validate_pagination, mock_table, mock_get_asset, mo
     # Call the lambda handler
     response = read_lambda_handler(get_metadata_event, None)
     
-    # Verify the response
-    assert response["statusCode"] == 404
+    # Verify the response: assets without a metadata record have empty metadata
+    assert response["statusCode"] == 200
     body = json.loads(response["body"])
-    assert "error" in body
+    assert body["metadata"] == {}
     
     # Verify the mocks were called correctly
     mock_claims.assert_called_once()
@@ -510,6 +510,36 @@ def test_metadata_out_of_v1_spec(mock_enforcer, mock_claims, invalid_event_metad
     assert "error" in body
     assert "metadata version 1 requires string keys and values" in body["error"]
 
+
+def test_read_of_an_asset_without_metadata_returns_empty_metadata(get_metadata_event):
+    from backend.backend.handlers.metadata import read
+
+    enforcer = MagicMock()
+    enforcer.enforceAPI.return_value = True
+    enforcer.enforce.return_value = True
+    metadata_table = MagicMock()
+    metadata_table.get_item.return_value = {}
+
+    with patch.object(read, "request_to_claims", return_value={"tokens": ["test-token"]}), \
+            patch.object(read, "CasbinEnforcer", return_value=enforcer), \
+            patch.object(read, "get_asset_object_from_id", return_value={"databaseId": "123", "assetId": "456"}), \
+            patch.object(read, "validate_pagination_info"), \
+            patch.object(read, "metadata_table", metadata_table):
+        response = read.lambda_handler(get_metadata_event, None)
+        assert response["statusCode"] == 200
+        assert json.loads(json.loads(response["body"])) == {"version": "1", "metadata": {}}
+
+        metadata_table.get_item.side_effect = lambda Key: {"Item": {**Key, "material": "wood"}} \
+            if Key["assetId"] == "456/folder/" else {}
+        assert read.read_asset_metadata("123", "456", "456/folder/a.obj", {"tokens": ["test-token"]}) == \
+            {"databaseId": "123", "assetId": "456/folder/", "material": "wood"}
+
+        # Assets that don't exist are still not authorized
+        with patch.object(read, "get_asset_object_from_id", return_value=None), \
+                pytest.raises(read.ValidationError) as error:
+            read.read_asset_metadata("123", "456", None, {"tokens": ["test-token"]})
+        assert error.value.args == (403, "Not Authorized")
+
 # Tests for delete handler
 @patch('backend.backend.handlers.metadata.delete.request_to_claims')
 @patch('backend.backend.handlers.metadata.delete.CasbinEnforcer')
@@ -549,3 +579,24 @@ def test_delete(mock_table, mock_get_asset, mock_enforcer, mock_claims, delete_m
     mock_enforcer_instance.enforce.assert_called_once()
     mock_get_asset.assert_called_once_with("456")
     mock_table.delete_item.assert_called_once()
+
+
+@patch('backend.backend.handlers.metadata.read.batch_get_metadata')
+def test_get_metadata_for_paths_reads_shared_prefixes_once(mock_batch_get):
+    from backend.backend.handlers.metadata.read import get_metadata_for_paths
+
+    mock_batch_get.return_value = {
+        "456": {"databaseId": "123", "assetId": "456", "material": "steel", "site": "asset"},
+        "456/folder/": {"databaseId": "123", "assetId": "456/folder/", "site": "folder"},
+        "456/folder/a.obj": {"databaseId": "123", "assetId": "456/folder/a.obj", "material": "aluminium"},
+    }
+
+    result = get_metadata_for_paths("123", "456", ["456/folder/a.obj", "456/folder/b.obj"])
+
+    mock_batch_get.assert_called_once()
+    keys = mock_batch_get.call_args[0][1]
+    assert len(set(keys)) == 5
+    assert result["456/folder/a.obj"]["material"] == "aluminium"
+    assert result["456/folder/a.obj"]["site"] == "folder"
+    assert result["456/folder/b.obj"]["material"] == "steel"
+    assert result["456/folder/b.obj"]["assetId"] == "456/folder/"
@@ -0,0 +1,109 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+import backend.backend.handlers.metadataschema.schema as schema
+from backend.backend.common.dynamodb import to_update_expr
+
+
+SCHEMA_FIELDS = [
+    {"databaseId": "test-database", "field": "weight", "dataType": "number"},
+    {"databaseId": "test-database", "field": "material", "dataType": "string", "required": True},
+    {"databaseId": "test-database", "field": "finish", "dataType": "string", "dependsOn": ["material"]},
+]
+
+
+@pytest.fixture(scope="function")
+def metadata_schema(ddb_resource):
+    """
+    Create a MetadataSchema over a mocked schema table holding SCHEMA_FIELDS, with an empty compiled schema cache
+
+    Returns:
+        MetadataSchema: The schema service
+    """
+    table = ddb_resource.create_table(
+        TableName="test-schema-table",
+        KeySchema=[{"AttributeName": "databaseId", "KeyType": "HASH"}, {"AttributeName": "field", "KeyType": "RANGE"}],
+        AttributeDefinitions=[{"AttributeName": "databaseId", "AttributeType": "S"},
+                              {"AttributeName": "field", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    for field in SCHEMA_FIELDS:
+        table.put_item(Item=field)
+    enforcer = MagicMock()
+    enforcer.enforce.return_value = True
+
+    with patch.object(schema, "_compiled_schema_map", {}), \
+            patch.object(schema, "claims_and_roles", {"tokens": ["test-user"]}), \
+            patch.object(schema, "CasbinEnforcer", return_value=enforcer), \
+            patch.object(schema, "to_update_expr", to_update_expr):
+        yield schema.MetadataSchema("test-schema-table", ddb_resource)
+
+
+def count_queries(metadata_schema):
+    return patch.object(metadata_schema.table, "query", wraps=metadata_schema.table.query)
+
+
+def test_compiled_schema_is_read_once_until_the_schema_is_written(metadata_schema):
+    with count_queries(metadata_schema) as query:
+        compiled = metadata_schema.get_compiled_schema("test-database")
+        for _ in range(10):
+            assert metadata_schema.get_compiled_schema("test-database") is compiled
+        assert compiled.validate_values({"weight": "heavy", "other": "x"}) == ["weight must be a number"]
+        assert query.call_count == 1
+
+        # Other databases are cached separately
+        metadata_schema.get_compiled_schema("other-database")
+        assert query.call_count == 2
+
+        metadata_schema.update_schema("test-database", "weight", {"field": "weight", "dataType": "string"})
+        compiled = metadata_schema.get_compiled_schema("test-database")
+        assert compiled.validate_values({"weight": "heavy"}) == []
+        assert metadata_schema.get_compiled_schema("other-database") is not None
+        assert query.call_count == 3
+
+        metadata_schema.delete_schema("test-database", "weight")
+        metadata_schema.get_compiled_schema("test-database")
+        assert query.call_count == 4
+
+
+def test_schema_writes_of_other_containers_invalidate_the_cached_schema(metadata_schema, ddb_resource):
+    compiled = metadata_schema.get_compiled_schema("test-database")
+
+    # Another container has its own MetadataSchema; the version row is shared through the table
+    schema.MetadataSchema("test-schema-table", ddb_resource).delete_schema("test-database", "material")
+
+    compiled_again = metadata_schema.get_compiled_schema("test-database")
+    assert compiled_again is not compiled
+    assert compiled_again.required == []
+    assert metadata_schema.get_compiled_schema("test-database") is compiled_again
+
+
+def test_compiled_schema_is_read_again_after_the_refresh_interval(metadata_schema):
+    compiled = metadata_schema.get_compiled_schema("test-database")
+
+    with patch.object(schema, "METADATA_SCHEMA_REFRESH_SECONDS", -1):
+        assert metadata_schema.get_compiled_schema("test-database") is not compiled
+
+
+def test_version_row_is_not_a_schema_field(metadata_schema):
+    metadata_schema.update_schema("test-database", "weight", {"field": "weight", "dataType": "number"})
+
+    fields = metadata_schema.get_all_schemas("test-database", {"maxItems": 100, "pageSize": 100, "startingToken": None})
+    assert sorted(field["field"] for field in fields["Items"]) == ["finish", "material", "weight"]
+    assert metadata_schema.get_schema("test-database", schema.METADATA_SCHEMA_VERSION_FIELD) is None
+    assert sorted(metadata_schema.get_compiled_schema("test-database").value_checks) == ["finish", "material", "weight"]
+
+
+def test_updates_are_validated_against_the_stored_record(metadata_schema):
+    compiled = metadata_schema.get_compiled_schema("test-database")
+
+    assert compiled.validate_update({"weight": "heavy"}, {"material": "wood"}, asset_record=True) == \
+        ["weight must be a number"]
+    assert compiled.validate_update({"weight": "3"}, {}, asset_record=True) == ["material is required"]
+    assert compiled.validate_update({"weight": "3"}, {}, asset_record=False) == []
+    assert compiled.validate_update({"finish": "matte"}, {"material": "wood"}, asset_record=True) == []
+    assert compiled.validate_update({"finish": "matte"}, {}, asset_record=False) == \
+        ["finish depends on material, which is not filled out"]
@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 
 # Import the actual lambda handler and utility function
 from backend.backend.handlers.search.search import lambda_handler, property_token_filter_to_opensearch_query
+import backend.backend.handlers.search.search as search
 
 
 def test_example_body_with_query_only2():
@@ -556,3 +557,183 @@ def test_lambda_handler_missing_body(mock_search_aos_from_env, mock_casbin_enfor
     response_body = json.loads(response["body"])
     assert "error" in response_body
     assert "Missing request body" in response_body["error"]
+
+
+class PagedSearchClient:
+    """opensearch-py client stand-in that serves search_after pages of documents sorted by ID"""
+
+    def __init__(self, documents):
+        self.documents = sorted(documents, key=lambda document: document["_id"])
+        self.requests = []
+        self.closed = []
+
+    def create_point_in_time(self, index, keep_alive):
+        return {"pit_id": "pit-1"}
+
+    def delete_point_in_time(self, body):
+        self.closed.extend(body["pit_id"])
+
+    def search(self, body, index=None):
+        self.requests.append({"body": body, "index": index})
+        after = body.get("search_after", [None, ""])[-1]
+        page = [document for document in self.documents if document["_id"] > after][:body["size"]]
+        return {"pit_id": body.get("pit", {}).get("id"), "hits": {"hits": [
+            {"_id": document["_id"], "_score": 1.0, "_source": document["_source"], "sort": [1.0, document["_id"]]}
+            for document in page]}}
+
+
+@patch('backend.backend.handlers.search.search.request_to_claims')
+@patch('backend.backend.handlers.search.search.CasbinEnforcer')
+@patch('backend.backend.handlers.search.search.get_databases')
+def test_lambda_handler_export_walks_every_page_with_a_cursor(mock_get_databases, mock_casbin_enforcer,
+                                                              mock_request_to_claims):
+    """Test the export route pages through the whole result set and authorizes each page"""
+    mock_request_to_claims.return_value = {"tokens": ["test-token"]}
+    mock_get_databases.return_value = {"Items": [{"databaseId": "db-1"}]}
+    mock_casbin_enforcer.return_value.enforceAPI.return_value = True
+    mock_casbin_enforcer.return_value.enforce.side_effect = lambda document, action: document["assetName"] != "denied"
+
+    documents = [{"_id": f"asset-{index:03d}", "_source": {
+        "str_databaseid": "db-1", "str_assetname": "denied" if index % 5 == 0 else f"asset {index}"}}
+        for index in range(25)]
+    client = PagedSearchClient(documents)
+    search_aos = search.SearchAOS.__new__(search.SearchAOS)
+    search_aos.client = client
+    search_aos.indexName = "test-index"
+
+    exported = []
+    cursor = None
+    with patch.dict('os.environ', {"AOS_DISABLED": "false", "AOS_TYPE": "es"}):
+        for _ in range(10):
+            body = {"tokens": [], "operation": "AND", "pageSize": 10}
+            if cursor:
+                body["cursor"] = cursor
+            event = {"requestContext": {"http": {"method": "POST", "path": "/search/export"}},
+                     "body": json.dumps(body)}
+            response = search.lambda_handler(event, {}, search_fn=lambda: search_aos)
+            assert response["statusCode"] == 200
+            page = json.loads(response["body"])
+            exported.extend(hit["_id"] for hit in page["hits"])
+            cursor = page["cursor"]
+            if cursor is None:
+                break
+
+    assert exported == [document["_id"] for document in documents if document["_source"]["str_assetname"] != "denied"]
+    # Three pages of at most 10 hits on the point in time, which is closed after the last page
+    assert len(client.requests) == 3
+    assert all(request["index"] is None and request["body"]["pit"]["id"] == "pit-1" for request in client.requests)
+    assert "aggs" not in client.requests[0]["body"] and "from" not in client.requests[0]["body"]
+    assert client.closed == ["pit-1"]
+
+
+@patch('backend.backend.handlers.search.search.request_to_claims')
+@patch('backend.backend.handlers.search.search.CasbinEnforcer')
+@patch('backend.backend.handlers.search.search.get_databases')
+def test_lambda_handler_reuses_aggregations_until_the_index_generation_changes(mock_get_databases, mock_casbin_enforcer,
+                                                                               mock_request_to_claims):
+    """Test facets are computed once per query, authorization scope and index generation"""
+    mock_request_to_claims.return_value = {"tokens": ["test-token"]}
+    mock_casbin_enforcer.return_value.enforceAPI.return_value = True
+    mock_casbin_enforcer.return_value.enforce.return_value = True
+
+    client = MagicMock()
+    client.get.return_value = {"_source": {"num_generation": 1}}
+    client.search.side_effect = lambda body, index: {
+        "hits": {"total": {"value": 0}, "hits": []},
+        **({"aggregations": {"str_assettype": {"doc_count": 1, "filtered_assettype": {"buckets": [
+            {"key": "glb", "doc_count": 1}]}}}} if "aggs" in body else {}),
+    }
+    search_aos = search.SearchAOS.__new__(search.SearchAOS)
+    search_aos.client = client
+    search_aos.indexName = "test-index"
+
+    def run_search(allowed_databases):
+        mock_get_databases.return_value = {"Items": [{"databaseId": database} for database in allowed_databases]}
+        event = {"requestContext": {"http": {"method": "POST", "path": "/search"}},
+                 "body": json.dumps({"tokens": [], "operation": "AND", "from": 0, "size": 10})}
+        response = search.lambda_handler(event, {}, search_fn=lambda: search_aos)
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"])["aggregations"]["str_assettype"]["buckets"][0]["key"] == "glb"
+        return "aggs" in client.search.call_args.kwargs["body"]
+
+    with patch.dict('os.environ', {"AOS_DISABLED": "false"}), patch.object(search, "_aggregation_cache", {}), \
+            patch.object(search, "_index_generations", {}):
+        assert run_search(["db-1"]) is True
+        assert run_search(["db-1"]) is False
+        # Another authorization scope computes its own facets
+        assert run_search(["db-1", "db-2"]) is True
+        # The generation is read once per check interval, not once per search
+        assert client.get.call_count == 1
+
+        client.get.return_value = {"_source": {"num_generation": 2}}
+        assert run_search(["db-1"]) is False
+        with patch.object(search, "INDEX_GENERATION_CHECK_SECONDS", -1):
+            assert run_search(["db-1"]) is True
+        assert run_search(["db-1"]) is False
+        assert client.get.call_count == 2
+
+
+class SuggestSearchClient:
+    """opensearch-py client stand-in that returns the same suggestion hits for every query"""
+
+    def __init__(self, hits):
+        self.hits = hits
+        self.requests = []
+
+    def search(self, body, index=None):
+        self.requests.append({"body": body, "index": index})
+        return {"hits": {"hits": self.hits}}
+
+
+@patch('backend.backend.handlers.search.search.request_to_claims')
+@patch('backend.backend.handlers.search.search.CasbinEnforcer')
+@patch('backend.backend.handlers.search.search.get_databases')
+def test_lambda_handler_suggest_returns_authorized_prefix_suggestions(mock_get_databases, mock_casbin_enforcer,
+                                                                      mock_request_to_claims):
+    """Test the suggest route reads the suggestion index of the allowed databases and checks each suggestion"""
+    mock_request_to_claims.return_value = {"tokens": ["test-token"]}
+    mock_get_databases.return_value = {"Items": [{"databaseId": "db-1"}, {"databaseId": "db-2"}]}
+    mock_casbin_enforcer.return_value.enforceAPI.return_value = True
+    mock_casbin_enforcer.return_value.enforce.side_effect = \
+        lambda document, action: document["assetName"] != "Bridge secret"
+
+    def hit(id, type, value, asset_id, asset_name, **fields):
+        return {"_id": id, "_source": {"type": type, "value": value, "databaseId": "db-1", "assetId": asset_id,
+                                       "assetName": asset_name, "assetType": "folder", "tags": [], **fields}}
+
+    client = SuggestSearchClient([
+        hit("asset#a-1", "asset", "Bridge", "a-1", "Bridge"),
+        hit("asset#a-2", "asset", "Bridge secret", "a-2", "Bridge secret"),
+        hit("tag#a-1#bridges", "tag", "bridges", "a-1", "Bridge"),
+        hit("tag#a-3#bridges", "tag", "bridges", "a-3", "Old bridge"),
+        hit("file#a-1/bridge.obj", "file", "bridge.obj", "a-1", "Bridge", key="a-1/bridge.obj"),
+    ])
+    search_aos = search.SearchAOS.__new__(search.SearchAOS)
+    search_aos.client = client
+    search_aos.indexName = "test-index"
+
+    def suggest(parameters):
+        event = {"requestContext": {"http": {"method": "GET", "path": "/search/suggest"}},
+                 "queryStringParameters": parameters}
+        return search.lambda_handler(event, {}, search_fn=lambda: search_aos)
+
+    with patch.dict('os.environ', {"AOS_DISABLED": "false"}), patch.dict(search._suggest_databases_cache, clear=True):
+        response = suggest({"prefix": "bri", "size": "10"})
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"])["suggestions"] == [
+            {"type": "asset", "value": "Bridge", "databaseId": "db-1", "assetId": "a-1"},
+            {"type": "tag", "value": "bridges"},
+            {"type": "file", "value": "bridge.obj", "databaseId": "db-1", "assetId": "a-1", "key": "a-1/bridge.obj"},
+        ]
+        request = client.requests[0]
+        assert request["index"] == "test-index-suggest"
+        assert {"terms": {"databaseId": ["db-1", "db-2"]}} in request["body"]["query"]["bool"]["filter"]
+
+        # The allowed databases are reused by the next keystroke
+        assert suggest({"prefix": "brid", "size": "2"})["statusCode"] == 200
+        assert mock_get_databases.call_count == 1
+        assert len(json.loads(suggest({"prefix": "brid", "size": "1"})["body"])["suggestions"]) == 1
+
+        assert suggest({"prefix": " "})["statusCode"] == 400
+        assert suggest({"prefix": "bri", "size": "26"})["statusCode"] == 400
+        assert suggest({"prefix": "bri", "type": "folder"})["statusCode"] == 400
@@ -3,6 +3,10 @@ import json
 import boto3
 from unittest.mock import patch, MagicMock
 
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+tagTypeService = import_with_mocked_modules("backend.backend.handlers.tagTypes.tagTypeService", ("common.tagCatalog",))
+
 @pytest.fixture(scope="function")
 def tag_type_table(ddb_resource):
     """
@@ -452,3 +456,37 @@ def test_method_not_allowed(tag_type_table, get_tag_types_event, monkeypatch):
         
         # Verify the enforcer was called
         mock_enforcer.enforceAPI.assert_called_once()
+
+
+def test_get_tag_types_pages_skip_the_tag_catalog_version_item(tag_type_table, tag_table):
+    """
+    Test that the tag catalog version item doesn't count toward the page size of tag type listings
+
+    Args:
+        tag_type_table: Mocked tag type table
+        tag_table: Mocked tag table
+    """
+    tag_type_table.put_item(Item={"tagTypeName": "#tagCatalogVersion", "catalogVersion": 1})
+    tag_type_table.put_item(Item={"tagTypeName": "other-tag-type", "description": "Other", "required": "False"})
+    mock_enforcer = MagicMock()
+    mock_enforcer.enforce.return_value = True
+    mock_catalog = MagicMock()
+    mock_catalog.get_tags_for_tag_type.return_value = []
+    dynamodb_client = boto3.client("dynamodb", region_name="us-east-1")
+
+    with patch.object(tagTypeService, "dynamodbClient", dynamodb_client), \
+            patch.object(tagTypeService, "TAG_CATALOG_VERSION_ITEM", "#tagCatalogVersion"), \
+            patch.object(tagTypeService, "claims_and_roles", {"tokens": ["test-token"]}), \
+            patch.object(tagTypeService, "CasbinEnforcer", return_value=mock_enforcer), \
+            patch.object(tagTypeService, "get_tag_catalog", return_value=mock_catalog):
+        names = []
+        query_params = {"maxItems": "2", "pageSize": "1", "startingToken": None}
+        while True:
+            message = json.loads(tagTypeService.get_tag_types({}, query_params)["body"])["message"]
+            names.append([item["tagTypeName"] for item in message["Items"]])
+            if "NextToken" not in message:
+                break
+            query_params["startingToken"] = message["NextToken"]
+
+    assert [len(page) for page in names] == [2]
+    assert sorted(names[0]) == ["other-tag-type", "test-tag-type"]
@@ -6,7 +6,10 @@ import os
 import pytest
 from unittest.mock import patch, MagicMock
 
-from backend.backend.handlers.tags.tagService import lambda_handler
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+lambda_handler = import_with_mocked_modules("backend.backend.handlers.tags.tagService",
+                                            ("common.tagCatalog",)).lambda_handler
 
 
 @pytest.fixture
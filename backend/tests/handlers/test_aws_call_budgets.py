@@ -0,0 +1,44 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from backend.tests.benchmarks.budgets import BUDGET_DATA_SET, OPERATION_BUDGETS
+from backend.tests.utils.aws_call_budget import budget_violations
+
+RUNNER = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "run_benchmarks.py")
+
+
+@pytest.fixture(scope="module")
+def budget_results(tmp_path_factory):
+    """
+    Run the benchmark operations once on BUDGET_DATA_SET in a separate interpreter (the handlers need
+    the real common and handlers packages that conftest.py replaces)
+
+    Returns:
+        dict: Operation name -> benchmark result
+    """
+    output = tmp_path_factory.mktemp("budgets") / "results.json"
+    arguments = [argument for name, value in BUDGET_DATA_SET.items() for argument in (f"--{name}", str(value))]
+    completed = subprocess.run(
+        [sys.executable, RUNNER, *arguments, "--iterations", "1", "--output", str(output)],
+        capture_output=True, text=True, timeout=300,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    return json.loads(output.read_text())["operations"]
+
+
+@pytest.mark.parametrize("operation", sorted(OPERATION_BUDGETS))
+def test_handler_stays_within_aws_call_budget(budget_results, operation):
+    result = budget_results[operation]
+    aws_calls = {name: count for name, count in result["callsByOperation"].items()
+                 if not name.startswith(("casbin.", "opensearch."))}
+    budget = OPERATION_BUDGETS[operation]
+
+    assert budget_violations(aws_calls, budget.aws_calls, budget.operations) == [], aws_calls
+    assert result["openSearchCalls"] <= budget.opensearch_calls
@@ -0,0 +1,40 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from backend.tests.utils.import_time_utils import measure_import_time
+
+# Cold start import budgets (milliseconds) of representative handler entry points. They are about
+# three times the measured import time so they hold on slow CI machines, while still catching a
+# handler that starts importing a heavy dependency (e.g. every powertools parser event model) again.
+IMPORT_BUDGETS_MS = {
+    "handlers.assets.assetService": 1500,
+    "handlers.assets.uploadFile": 1500,
+    "handlers.assets.downloadAsset": 1500,
+    "handlers.indexing.sqsBucketSync": 1500,
+    "handlers.databases.databaseService": 1000,
+    "handlers.metadata.read": 800,
+    "handlers.search.search": 800,
+    "handlers.indexing.streams": 800,
+    "handlers.metadataschema.schema": 800,
+}
+
+# Packages only some code paths need, they are imported when first used
+LAZY_PACKAGES = [
+    "opensearchpy",
+    "casbin",
+    "aws_lambda_powertools.utilities.parser",
+    "aws_lambda_powertools.utilities.data_classes",
+]
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_handler_import_stays_within_cold_start_budget(module):
+    result = measure_import_time(module)
+
+    assert result.error is None
+    assert result.cumulative_ms < IMPORT_BUDGETS_MS[module], result.to_dict()
+    # AWS clients are created on first use, not at import
+    assert result.aws_clients_created == 0
+    assert [package for package in LAZY_PACKAGES if result.imported(package)] == []
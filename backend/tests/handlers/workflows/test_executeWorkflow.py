@@ -0,0 +1,206 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import itertools
+import boto3
+import pytest
+from unittest.mock import patch, MagicMock
+
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+executeWorkflow = import_with_mocked_modules("backend.backend.handlers.workflows.executeWorkflow",
+                                             ("handlers.metadata.read",))
+
+
+ASSET_BUCKET = "test-asset-bucket"
+WORKFLOW_ARN = "arn:aws:states:us-east-1:123456789012:stateMachine:test-workflow"
+
+
+@pytest.fixture(scope="function")
+def bulk_environment(s3_client):
+    """
+    Create asset files, the asset and workflow execution tables and a mocked Step Functions client
+
+    Args:
+        s3_client: Mocked S3 client
+
+    Returns:
+        MagicMock: Mocked Step Functions client bound to the execute workflow handler
+    """
+    s3_client.create_bucket(Bucket=ASSET_BUCKET)
+    s3_client.create_bucket(Bucket=executeWorkflow.bucket_name_assetAuxiliary)
+    for asset_id in ["asset-1", "asset-2"]:
+        for name in ["a.obj", "b.obj", "c.gltf", "a.obj.previewFile.png"]:
+            s3_client.put_object(Bucket=ASSET_BUCKET, Key=f"{asset_id}/{name}", Body=f"{asset_id}-{name}".encode())
+
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+    asset_table = dynamodb.create_table(
+        TableName=executeWorkflow.asset_Database,
+        KeySchema=[{"AttributeName": "databaseId", "KeyType": "HASH"},
+                   {"AttributeName": "assetId", "KeyType": "RANGE"}],
+        AttributeDefinitions=[{"AttributeName": "databaseId", "AttributeType": "S"},
+                              {"AttributeName": "assetId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+    for asset_id in ["asset-1", "asset-2"]:
+        asset_table.put_item(Item={"databaseId": "test-database", "assetId": asset_id, "bucketId": "test-bucket-id",
+                                   "assetName": asset_id, "assetLocation": {"Key": f"{asset_id}/"}})
+    dynamodb.create_table(
+        TableName=executeWorkflow.workflow_execution_database,
+        KeySchema=[{"AttributeName": "databaseId:assetId", "KeyType": "HASH"},
+                   {"AttributeName": "executionId", "KeyType": "RANGE"}],
+        AttributeDefinitions=[{"AttributeName": "databaseId:assetId", "AttributeType": "S"},
+                              {"AttributeName": "executionId", "AttributeType": "S"},
+                              {"AttributeName": "workflowDatabaseId:workflowId", "AttributeType": "S"}],
+        LocalSecondaryIndexes=[{"IndexName": "WorkflowLSI",
+                                "KeySchema": [{"AttributeName": "databaseId:assetId", "KeyType": "HASH"},
+                                              {"AttributeName": "workflowDatabaseId:workflowId", "KeyType": "RANGE"}],
+                                "Projection": {"ProjectionType": "ALL"}}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+
+    started = []
+    mock_sfn = MagicMock()
+    mock_sfn.start_execution.side_effect = lambda **kwargs: started.append(json.loads(kwargs["input"])) or {
+        "executionArn": WORKFLOW_ARN.replace("stateMachine", "execution") + f":execution-{len(started)}"}
+    mock_sfn.describe_execution.return_value = {"status": "SUCCEEDED"}
+    mock_sfn.get_paginator.return_value.paginate.return_value = [{"executions": []}]
+    mock_sfn.started = started
+
+    workflow = {"databaseId": "test-database", "workflowId": "test-workflow", "workflow_arn": WORKFLOW_ARN}
+    bucket_details = {"bucketId": "test-bucket-id", "bucketName": ASSET_BUCKET, "baseAssetsPrefix": "/"}
+
+    with patch.object(executeWorkflow, "logger"), \
+            patch.object(executeWorkflow, "s3c", s3_client), \
+            patch.object(executeWorkflow, "dynamodb", dynamodb), \
+            patch.object(executeWorkflow, "sfn_client", mock_sfn), \
+            patch.object(executeWorkflow, "validate", return_value=(True, "")), \
+            patch.object(executeWorkflow, "get_workflow", return_value=[workflow]), \
+            patch.object(executeWorkflow, "validate_pipelines", return_value=(True, "")), \
+            patch.object(executeWorkflow, "get_default_bucket_details", return_value=bucket_details), \
+            patch.object(executeWorkflow, "get_asset_metadata", return_value={}):
+        yield mock_sfn
+
+
+def bulk_event(method, body=None, jobId=None):
+    path = "/database/test-database/workflows/test-workflow/bulkExecutions" + (f"/{jobId}" if jobId else "")
+    path_params = {"databaseId": "test-database", "workflowId": "test-workflow"}
+    if jobId:
+        path_params["jobId"] = jobId
+    return {
+        "requestContext": {"http": {"method": method, "path": path}, "authorizer": {}},
+        "pathParameters": path_params,
+        "body": json.dumps(body) if body else None,
+    }
+
+
+def run_bulk_job(body, on_retry=None):
+    """Queue a bulk execution job and run it and its continuations until it stops continuing
+
+    Args:
+        body: The bulk execution request body
+        on_retry: Optional function called before each delayed run from the retry queue
+
+    Returns:
+        Tuple of the final job status and the delayed retry queue messages
+    """
+    pending = []
+    retry_messages = []
+    mock_lambda = MagicMock()
+    mock_lambda.invoke.side_effect = lambda **kwargs: pending.append(json.loads(kwargs["Payload"]))
+    mock_sqs = MagicMock()
+    mock_sqs.send_message.side_effect = lambda **kwargs: retry_messages.append(kwargs) or pending.append(
+        {"Records": [{"body": kwargs["MessageBody"]}]})
+
+    with patch.object(executeWorkflow, "client", mock_lambda), patch.object(executeWorkflow, "sqs_client", mock_sqs):
+        queued = executeWorkflow.lambda_handler(bulk_event("POST", body), MagicMock(function_name="executeWorkflow"))
+        assert queued["statusCode"] == 200
+
+        context = MagicMock(function_name="executeWorkflow")
+        context.get_remaining_time_in_millis.return_value = 900000
+        while pending:
+            event = pending.pop(0)
+            if "Records" in event and on_retry:
+                on_retry()
+            executeWorkflow.lambda_handler(event, context)
+
+    response = executeWorkflow.lambda_handler(
+        bulk_event("GET", jobId=json.loads(queued["body"])["jobId"]), MagicMock(function_name="executeWorkflow"))
+    return json.loads(response["body"]), retry_messages
+
+
+def test_bulk_execution_skips_files_already_executed_for_same_etag(bulk_environment):
+    executed, _ = run_bulk_job({"workflowDatabaseId": "test-database", "assetIds": ["asset-1"], "fileGlob": "*.obj"})
+
+    assert executed["status"] == "COMPLETED"
+    assert executed["totalTargets"] == 2 and executed["startedCount"] == 2
+    started_keys = sorted(started["inputAssetFileKey"] for started in bulk_environment.started)
+    assert started_keys == ["asset-1/a.obj", "asset-1/b.obj"]
+
+    # Re-running skips the files whose executions succeeded, unless the file changed since
+    executeWorkflow.s3c.put_object(Bucket=ASSET_BUCKET, Key="asset-1/b.obj", Body=b"changed")
+    rerun, _ = run_bulk_job({"workflowDatabaseId": "test-database", "assetIds": ["asset-1"], "fileGlob": "*.obj"})
+
+    assert rerun["skippedCount"] == 1 and rerun["startedCount"] == 1
+    assert bulk_environment.started[-1]["inputAssetFileKey"] == "asset-1/b.obj"
+
+
+def test_bulk_execution_caps_running_executions(bulk_environment):
+    running_arns = []
+    bulk_environment.get_paginator.return_value.paginate.side_effect = lambda **kwargs: [
+        {"executions": [{"executionArn": arn} for arn in running_arns]}]
+
+    def describe_execution(executionArn):
+        # The oldest running execution finishes between the dispatcher runs
+        if executionArn in running_arns:
+            return {"status": "RUNNING"}
+        return {"status": "SUCCEEDED"}
+
+    execution_numbers = itertools.count()
+    bulk_environment.describe_execution.side_effect = describe_execution
+    bulk_environment.start_execution.side_effect = lambda **kwargs: running_arns.append(
+        WORKFLOW_ARN.replace("stateMachine", "execution") + f":execution-{next(execution_numbers)}") or {
+        "executionArn": running_arns[-1]}
+
+    with patch.object(executeWorkflow.time, "sleep") as mock_sleep:
+        executed, retry_messages = run_bulk_job(
+            {"workflowDatabaseId": "test-database", "fileGlob": "**", "maxConcurrency": 2},
+            on_retry=lambda: running_arns.pop(0))
+
+        assert executed["totalAssets"] == 2 and executed["totalTargets"] == 6
+        assert executed["startedCount"] == 6 and executed["succeededCount"] == 4
+        assert len(executed["running"]) == 2
+        # The dispatcher continues from the retry queue instead of waiting for executions to finish
+        mock_sleep.assert_not_called()
+        assert len(retry_messages) == 4
+        assert all(message["DelaySeconds"] == executeWorkflow.BULK_EXECUTION_RETRY_DELAY_SECONDS
+                   for message in retry_messages)
+
+        # A duplicate delivery of an earlier continuation does not dispatch again
+        started_count = bulk_environment.start_execution.call_count
+        executeWorkflow.lambda_handler({"Records": [{"body": retry_messages[0]["MessageBody"]}]}, MagicMock())
+        assert bulk_environment.start_execution.call_count == started_count
+
+
+def test_bulk_execution_asset_targets_only_match_asset_executions(bulk_environment):
+    execution_table = executeWorkflow.dynamodb.Table(executeWorkflow.workflow_execution_database)
+    running_arn = WORKFLOW_ARN.replace("stateMachine", "execution") + ":file-execution"
+    execution_table.put_item(Item={
+        "databaseId:assetId": "$test-database:$asset-1", "executionId": "file-execution",
+        "workflowDatabaseId:workflowId": "$test-database:$test-workflow", "execution_arn": running_arn,
+        "stopDate": "", "executionStatus": "NEW", "inputAssetFileKey": "asset-1/a.obj", "inputAssetFileEtag": "etag"})
+    bulk_environment.describe_execution.side_effect = lambda executionArn: {
+        "status": "RUNNING" if executionArn == running_arn else "SUCCEEDED"}
+
+    # A running execution on one file does not hold back the asset level execution
+    executed, _ = run_bulk_job({"workflowDatabaseId": "test-database", "assetIds": ["asset-1"]})
+    assert executed["startedCount"] == 1 and executed["skippedCount"] == 0
+    assert bulk_environment.started[-1]["inputAssetFileKey"] == "asset-1/"
+
+    # While the asset level execution runs, the asset is skipped
+    asset_arn = WORKFLOW_ARN.replace("stateMachine", "execution") + ":execution-1"
+    bulk_environment.describe_execution.side_effect = lambda executionArn: {
+        "status": "RUNNING" if executionArn in [running_arn, asset_arn] else "SUCCEEDED"}
+    rerun, _ = run_bulk_job({"workflowDatabaseId": "test-database", "assetIds": ["asset-1"]})
+    assert rerun["startedCount"] == 0 and rerun["skippedCount"] == 1
@@ -0,0 +1,128 @@
+# Copyright 2024 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+from unittest.mock import patch
+
+from backend.backend.models.assetsV3 import CompleteUploadResponseModel
+from backend.tests.utils.lambda_test_utils import import_with_mocked_modules
+
+processOutput = import_with_mocked_modules(
+    "backend.backend.handlers.workflows.processWorkflowExecutionOutput",
+    ("handlers.metadata.read", "handlers.metadata.create", "handlers.assets.uploadFile", "common.s3")
+)
+
+
+ASSET_BUCKET = "test-asset-bucket"
+
+
+@pytest.fixture(scope="function")
+def pipeline_outputs(s3_client):
+    """
+    Create an asset bucket with pipeline metadata and file outputs
+
+    Args:
+        s3_client: Mocked S3 client
+
+    Returns:
+        boto3.client: Mocked S3 client bound to the output processing handler
+    """
+    s3_client.create_bucket(Bucket=ASSET_BUCKET)
+    s3_client.put_object(Bucket=ASSET_BUCKET, Key="pipelines/run-1/metadata/output.json",
+                         Body=json.dumps({"vertices": 1024, "materials": ["steel", "glass"]}).encode())
+    s3_client.put_object(Bucket=ASSET_BUCKET, Key="pipelines/run-1/files/converted.glb", Body=b"glb")
+
+    asset = {"databaseId": "test-database", "assetId": "test-asset", "bucketId": "test-bucket-id"}
+    bucket_details = {"bucketId": "test-bucket-id", "bucketName": ASSET_BUCKET, "baseAssetsPrefix": "/"}
+    with patch.object(processOutput, "logger"), \
+            patch.object(processOutput, "s3c", s3_client), \
+            patch.object(processOutput, "lookup_existing_asset", return_value=asset), \
+            patch.object(processOutput, "get_default_bucket_details", return_value=bucket_details), \
+            patch.object(processOutput, "create_external_upload_record", return_value="y-upload"):
+        yield s3_client
+
+
+def test_outputs_are_saved_through_services_with_executing_user(pipeline_outputs):
+    event = {"body": {
+        "databaseId": "test-database",
+        "assetId": "test-asset",
+        "executingUserName": "test_token",
+        "executingRequestContext": {"authorizer": {}},
+        "metadataPathKey": "pipelines/run-1/metadata/",
+        "filesPathKey": "pipelines/run-1/files/",
+    }}
+    upload_response = CompleteUploadResponseModel(message="External upload completed successfully",
+                                                  uploadId="y-upload", assetId="test-asset", fileResults=[],
+                                                  overallSuccess=True)
+    stored_metadata = {"databaseId": "test-database", "assetId": "test-asset", "owner": "team"}
+
+    with patch.object(processOutput, "read_asset_metadata", return_value=stored_metadata) as mock_read, \
+            patch.object(processOutput, "save_asset_metadata") as mock_save, \
+            patch.object(processOutput, "complete_external_upload_for_user",
+                         return_value=upload_response) as mock_upload:
+        response = processOutput.lambda_handler(event, None)
+
+    assert response["statusCode"] == 200
+    claims_and_roles = mock_read.call_args.args[3]
+    assert claims_and_roles["tokens"] == ["test_token"]
+    mock_save.assert_called_once_with("test-database", "test-asset",
+                                      {"owner": "team", "vertices": "1024", "materials": "steel,glass"},
+                                      claims_and_roles)
+
+    upload_id, request_model, upload_claims = mock_upload.call_args.args
+    assert upload_id == "y-upload" and upload_claims == claims_and_roles
+    assert request_model.uploadType == "assetFile"
+    assert [(f.relativeKey, f.tempKey) for f in request_model.files] == \
+        [("converted.glb", "pipelines/run-1/files/converted.glb")]
+
+
+def test_outputs_past_the_first_listing_page_are_all_processed(pipeline_outputs):
+    for i in range(1005):
+        pipeline_outputs.put_object(Bucket=ASSET_BUCKET, Key=f"pipelines/run-1/files/tiles/{i:04d}.b3dm", Body=b"tile")
+    for i in range(3):
+        pipeline_outputs.put_object(Bucket=ASSET_BUCKET, Key=f"pipelines/run-1/metadata/lod{i}.json",
+                                    Body=json.dumps({"lod": str(i), f"lod{i}": "done", "empty": []}).encode())
+    event = {"body": {
+        "databaseId": "test-database",
+        "assetId": "test-asset",
+        "executingUserName": "test_token",
+        "executingRequestContext": {"authorizer": {}},
+        "metadataPathKey": "pipelines/run-1/metadata/",
+        "filesPathKey": "pipelines/run-1/files/",
+    }}
+    upload_response = CompleteUploadResponseModel(message="External upload completed successfully",
+                                                  uploadId="y-upload", assetId="test-asset", fileResults=[],
+                                                  overallSuccess=True)
+    stored_metadata = {"databaseId": "test-database", "assetId": "test-asset"}
+
+    with patch.object(processOutput, "read_asset_metadata", return_value=stored_metadata), \
+            patch.object(processOutput, "save_asset_metadata") as mock_save, \
+            patch.object(processOutput, "complete_external_upload_for_user",
+                         return_value=upload_response) as mock_upload:
+        response = processOutput.lambda_handler(event, None)
+
+    assert response["statusCode"] == 200
+    # Metadata files are merged in listing order and saved once
+    mock_save.assert_called_once()
+    assert mock_save.call_args.args[2] == {"lod": "2", "lod0": "done", "lod1": "done", "lod2": "done",
+                                           "vertices": "1024", "materials": "steel,glass"}
+    request_model = mock_upload.call_args.args[1]
+    assert len(request_model.files) == 1006
+
+
+def test_output_metadata_is_saved_for_assets_without_metadata(pipeline_outputs):
+    event = {"body": {
+        "databaseId": "test-database",
+        "assetId": "test-asset",
+        "executingUserName": "test_token",
+        "executingRequestContext": {"authorizer": {}},
+        "metadataPathKey": "pipelines/run-1/metadata/",
+    }}
+
+    with patch.object(processOutput, "read_asset_metadata", return_value={}), \
+            patch.object(processOutput, "save_asset_metadata") as mock_save:
+        response = processOutput.lambda_handler(event, None)
+
+    assert response["statusCode"] == 200
+    assert mock_save.call_args.args[2] == {"vertices": "1024", "materials": "steel,glass"}
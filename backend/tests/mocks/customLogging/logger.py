@@ -18,7 +18,17 @@ class safeLogger:
             service_name: Alternative parameter name for service
         """
         self.service = service_name if service_name is not None else service
-        
+
+    def debug(self, message):
+        """
+        Log a debug message.
+
+        Args:
+            message: The message to log
+        """
+        # In the mock implementation, we don't actually log anything
+        pass
+
     def info(self, message):
         """
         Log an informational message.
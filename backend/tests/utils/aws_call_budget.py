@@ -0,0 +1,106 @@
+"""
+AWS Call Budget Utilities for VAMS Backend
+
+The costly regressions of the handlers are round trip count blowups (a head_object per listed file,
+a scan per role) rather than CPU. This module counts the botocore API calls made while a block
+runs, on every client including moto clients and the clients of worker threads, and fails when
+they exceed a declared budget:
+
+    def test_listing_files(aws_call_budget):
+        with aws_call_budget(max_calls=51, operations={"s3.ListObjectsV2": 1}) as calls:
+            list_files(...)
+        assert calls.count("s3.HeadObject") == 50
+
+Operations are named like the call tracing metrics (see backend/common/callTracing.py), e.g.
+'s3.HeadObject' or 'dynamodb.Query'. Paginators count one call per page.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+from botocore.client import BaseClient
+
+
+class AwsCallCounter:
+    """AWS API calls made while counting, by operation"""
+
+    def __init__(self):
+        # Operation -> number of calls
+        self.operations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str) -> None:
+        with self._lock:
+            self.operations[operation] = self.operations.get(operation, 0) + 1
+
+    def count(self, operation: Optional[str] = None) -> int:
+        """Number of calls, of one operation or in total"""
+        with self._lock:
+            if operation is not None:
+                return self.operations.get(operation, 0)
+            return sum(self.operations.values())
+
+
+def budget_violations(calls_by_operation: Dict[str, int], max_calls: Optional[int] = None,
+                      operations: Optional[Dict[str, int]] = None) -> List[str]:
+    """Compare call counts with a budget
+
+    Args:
+        calls_by_operation: Operation -> number of calls
+        max_calls: Upper bound of the total number of calls
+        operations: Operation -> upper bound of its number of calls
+
+    Returns:
+        Descriptions of the exceeded bounds, empty when the calls are within budget
+    """
+    violations = []
+    total = sum(calls_by_operation.values())
+    if max_calls is not None and total > max_calls:
+        violations.append(f"{total} AWS calls, budget {max_calls}")
+    for operation, budget in sorted((operations or {}).items()):
+        count = calls_by_operation.get(operation, 0)
+        if count > budget:
+            violations.append(f"{count} {operation} calls, budget {budget}")
+    return violations
+
+
+@contextmanager
+def count_aws_calls():
+    """Count the botocore API calls made inside the block
+
+    Yields:
+        AwsCallCounter
+    """
+    counter = AwsCallCounter()
+    make_api_call = BaseClient._make_api_call
+
+    def counting_make_api_call(client, operation_name, api_params):
+        counter.record(f"{client.meta.service_model.service_name}.{operation_name}")
+        return make_api_call(client, operation_name, api_params)
+
+    with patch.object(BaseClient, "_make_api_call", counting_make_api_call):
+        yield counter
+
+
+@contextmanager
+def aws_call_budget(max_calls: Optional[int] = None, operations: Optional[Dict[str, int]] = None):
+    """Count the botocore API calls made inside the block and fail when they exceed the budget
+
+    Args:
+        max_calls: Upper bound of the total number of calls
+        operations: Operation (e.g. 's3.HeadObject') -> upper bound of its number of calls
+
+    Yields:
+        AwsCallCounter
+
+    Raises:
+        AssertionError: When a bound is exceeded, listing every operation that was called
+    """
+    with count_aws_calls() as counter:
+        yield counter
+    violations = budget_violations(counter.operations, max_calls, operations)
+    if violations:
+        calls = ", ".join(f"{operation}={count}" for operation, count in sorted(counter.operations.items()))
+        raise AssertionError(f"AWS call budget exceeded: {'; '.join(violations)} (calls: {calls})")
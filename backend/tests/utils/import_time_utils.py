@@ -0,0 +1,202 @@
+"""
+Import Time Utilities for VAMS Backend
+
+Every Lambda cold start pays for the module level imports of its handler. This module imports a
+handler entry point in a fresh interpreter with `python -X importtime` and reports what it cost,
+so import time budgets can be enforced in tests and regressions are easy to track down.
+
+Run it directly to profile every handler entry point:
+
+    python tests/utils/import_time_utils.py              # table sorted by cumulative import time
+    python tests/utils/import_time_utils.py --json       # machine readable results
+    python tests/utils/import_time_utils.py handlers.search.search --top 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+BACKEND_SOURCE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+# Runs in the child interpreter. Handlers read their configuration from os.environ at import, so
+# variables the backend source reads that are not set (os.environ[...] or os.environ.get without a
+# default) resolve to "0" (valid as a name, number and flag) instead of failing the import.
+# Afterwards the number of AWS clients and resources created during the import is reported on
+# stdout, they should all be created on first use.
+CHILD_BOOTSTRAP = """
+import os, sys, json
+class _PlaceholderEnviron(type(os.environ)):
+    def __getitem__(self, key):
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            caller = sys._getframe(1)
+            if caller.f_code.co_name == "get":
+                # os.environ.get(key, default) keeps its default
+                if caller.f_locals.get("default") is not None:
+                    raise
+                caller = caller.f_back
+            if caller.f_code.co_filename.startswith({source_dir!r}):
+                return "0"
+            raise
+os.environ.__class__ = _PlaceholderEnviron
+import {module}
+awsClients = sys.modules.get("common.awsClients")
+created = len(awsClients._clients) + len(awsClients._resources) if awsClients else 0
+print(json.dumps({{"awsClientsCreated": created}}))
+"""
+
+DEFAULT_ENV = {
+    "AWS_REGION": "us-east-1",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "POWERTOOLS_SERVICE_NAME": "importTime",
+}
+
+
+class ImportTimeResult:
+    """Import time of a handler entry point measured in a fresh interpreter"""
+
+    def __init__(self, module: str, modules: Dict[str, Dict[str, int]], aws_clients_created: int = 0,
+                 error: Optional[str] = None):
+        self.module = module
+        # Imported module name -> {'self_us', 'cumulative_us'}
+        self.modules = modules
+        # AWS clients and resources created while importing, should be 0 (see common/awsClients.py)
+        self.aws_clients_created = aws_clients_created
+        self.error = error
+
+    @property
+    def cumulative_ms(self) -> float:
+        """Total time spent importing the entry point and everything it imports"""
+        entry = self.modules.get(self.module)
+        return entry["cumulative_us"] / 1000 if entry else 0.0
+
+    def imported(self, package: str) -> bool:
+        """Whether the package (or any of its submodules) was imported"""
+        return any(name == package or name.startswith(package + ".") for name in self.modules)
+
+    def top_packages(self, count: int = 10) -> List[Dict]:
+        """Top level packages with the most self import time"""
+        totals = {}
+        for name, timing in self.modules.items():
+            top_level = name.split(".")[0]
+            totals[top_level] = totals.get(top_level, 0) + timing["self_us"]
+        ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [{"package": package, "self_ms": round(self_us / 1000, 1)} for package, self_us in ranked]
+
+    def to_dict(self, top: int = 10) -> Dict:
+        return {
+            "module": self.module,
+            "cumulativeMs": round(self.cumulative_ms, 1),
+            "importedModules": len(self.modules),
+            "awsClientsCreated": self.aws_clients_created,
+            "topPackages": self.top_packages(top),
+            "error": self.error,
+        }
+
+
+def parse_import_time(output: str) -> Dict[str, Dict[str, int]]:
+    """Parse `-X importtime` output
+
+    Args:
+        output: stderr of the child interpreter
+
+    Returns:
+        Dictionary of imported module name to {'self_us', 'cumulative_us'}
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_import_time(module: str, env: Optional[Dict[str, str]] = None, timeout: int = 120) -> ImportTimeResult:
+    """Import a handler module in a fresh interpreter and record its import time
+
+    Args:
+        module: Module name relative to the backend source directory (e.g. 'handlers.search.search')
+        env: Extra environment variables for the child interpreter
+        timeout: Seconds to wait for the import
+
+    Returns:
+        ImportTimeResult
+    """
+    child_env = {key: value for key, value in os.environ.items() if not key.startswith("PYTHON")}
+    child_env.update(DEFAULT_ENV)
+    child_env.update(env or {})
+    child_env["PYTHONPATH"] = BACKEND_SOURCE_DIR
+    # Import compiled bytecode like a deployed function does, without writing caches into the tree
+    child_env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         CHILD_BOOTSTRAP.format(module=module, source_dir=BACKEND_SOURCE_DIR)],
+        cwd=BACKEND_SOURCE_DIR,
+        env=child_env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    error = None
+    aws_clients_created = 0
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines()
+                  if line.strip() and not line.startswith("import time:")]
+        error = errors[-1] if errors else completed.stdout.strip()[-500:] or "import failed"
+    else:
+        aws_clients_created = json.loads(completed.stdout.strip().splitlines()[-1])["awsClientsCreated"]
+    return ImportTimeResult(module, parse_import_time(completed.stderr), aws_clients_created, error)
+
+
+def discover_handler_modules() -> List[str]:
+    """Find every handler entry point (modules under handlers/ that define lambda_handler)"""
+    handler_modules = []
+    handlers_dir = os.path.join(BACKEND_SOURCE_DIR, "handlers")
+    for root, _, files in os.walk(handlers_dir):
+        for file_name in sorted(files):
+            if not file_name.endswith(".py"):
+                continue
+            path = os.path.join(root, file_name)
+            with open(path, encoding="utf-8") as source:
+                if "def lambda_handler" not in source.read():
+                    continue
+            relative = os.path.relpath(path, BACKEND_SOURCE_DIR)[:-len(".py")]
+            module = relative.replace(os.sep, ".")
+            handler_modules.append(module[:-len(".__init__")] if module.endswith(".__init__") else module)
+    return sorted(handler_modules)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure handler import (cold start) time")
+    parser.add_argument("modules", nargs="*", help="Handler modules to measure, defaults to every handler entry point")
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    parser.add_argument("--top", type=int, default=5, help="Number of heaviest packages to report per handler")
+    args = parser.parse_args(argv)
+
+    results = [measure_import_time(module) for module in (args.modules or discover_handler_modules())]
+    results.sort(key=lambda result: result.cumulative_ms, reverse=True)
+
+    if args.json:
+        print(json.dumps([result.to_dict(args.top) for result in results], indent=2))
+    else:
+        for result in results:
+            packages = ", ".join(f"{p['package']} {p['self_ms']}ms" for p in result.top_packages(args.top))
+            status = f"ERROR {result.error}" if result.error else packages
+            print(f"{result.cumulative_ms:9.1f} ms  {result.aws_clients_created:2d} clients  "
+                  f"{result.module:<56} {status}")
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,11 @@ This module provides utility functions and classes to help automate unit tests
 for AWS Lambda functions and API Gateway endpoints in the VAMS backend.
 """
 
+import importlib
 import json
 import os
-from typing import Any, Dict, Optional, Union, Callable
+import sys
+from typing import Any, Dict, Optional, Tuple, Union, Callable
 from unittest.mock import MagicMock, patch
 
 import boto3
@@ -277,6 +279,32 @@ def mock_aws_service(service_name: str):
     return decorator
 
 
+def import_with_mocked_modules(module_name: str, mocked_modules: Tuple[str, ...]):
+    """
+    Import a handler module with some of the backend modules it imports replaced by mocks.
+
+    The mocks are only installed in sys.modules while the handler is imported, so other tests
+    import the real modules (and see their import errors).
+
+    Args:
+        module_name: Name of the module to import, e.g. 'backend.backend.handlers.assets.assetService'
+        mocked_modules: Backend module names to mock, e.g. ('handlers.assets.assetCount',)
+
+    Returns:
+        The imported module
+    """
+    saved_modules = {name: sys.modules.get(name) for name in mocked_modules}
+    sys.modules.update({name: MagicMock() for name in mocked_modules})
+    try:
+        return importlib.import_module(module_name)
+    finally:
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
 def create_lambda_response(
     status_code: int = 200,
     body: Optional[Union[Dict[str, Any], str]] = None,
@@ -161,6 +161,18 @@ export function buildAssetService(
     storageResources.dynamo.subscriptionsStorageTable.grantReadWriteData(fun);
     sendEmailFunction.grantInvoke(fun);
 
+    // Permanent deletion of large assets continues the S3 purge as background jobs on this same function.
+    // Use a standalone policy, granting through the default role policy would create a circular dependency.
+    new iam.Policy(scope, `${name}SelfInvokePolicy`, {
+        statements: [
+            new iam.PolicyStatement({
+                actions: ["lambda:InvokeFunction"],
+                resources: [fun.functionArn],
+            }),
+        ],
+        roles: [fun.role!],
+    });
+
     fun.addToRolePolicy(
         new iam.PolicyStatement({
             actions: ["sns:CreateTopic", "sns:ListTopics", "sns:DeleteTopic"],
@@ -225,6 +237,18 @@ export function buildAssetFiles(
     storageResources.dynamo.rolesStorageTable.grantReadData(fun);
     sendEmailFunction.grantInvoke(fun);
 
+    // Large batch file operations are queued as background jobs on this same function.
+    // Use a standalone policy, granting through the default role policy would create a circular dependency.
+    new iam.Policy(scope, `${name}SelfInvokePolicy`, {
+        statements: [
+            new iam.PolicyStatement({
+                actions: ["lambda:InvokeFunction"],
+                resources: [fun.functionArn],
+            }),
+        ],
+        roles: [fun.role!],
+    });
+
     grantReadWritePermissionsToAllAssetBuckets(fun);
     kmsKeyLambdaPermissionAddToResourcePolicy(fun, storageResources.encryption.kmsKey);
     globalLambdaEnvironmentsAndPermissions(fun, config);
@@ -321,6 +345,8 @@ export function buildStreamAuxiliaryPreviewAssetFunction(
             AUTH_TABLE_NAME: storageResources.dynamo.authEntitiesStorageTable.tableName,
             USER_ROLES_TABLE_NAME: storageResources.dynamo.userRolesStorageTable.tableName,
             ROLES_TABLE_NAME: storageResources.dynamo.rolesStorageTable.tableName,
+            PRESIGNED_URL_TIMEOUT_SECONDS:
+                config.app.authProvider.presignedUrlTimeoutSeconds.toString(),
         },
     });
     storageResources.s3.assetAuxiliaryBucket.grantRead(fun);
@@ -369,11 +395,14 @@ export function buildDownloadAssetFunction(
             PRESIGNED_URL_TIMEOUT_SECONDS:
                 config.app.authProvider.presignedUrlTimeoutSeconds.toString(),
             ROLES_TABLE_NAME: storageResources.dynamo.rolesStorageTable.tableName,
+            ASSET_FILE_VERSIONS_STORAGE_TABLE_NAME:
+                storageResources.dynamo.assetFileVersionsStorageTable.tableName,
         },
     });
 
     storageResources.dynamo.s3AssetBucketsStorageTable.grantReadData(fun);
     storageResources.dynamo.assetStorageTable.grantReadData(fun);
+    storageResources.dynamo.assetFileVersionsStorageTable.grantReadData(fun);
     storageResources.dynamo.authEntitiesStorageTable.grantReadData(fun);
     storageResources.dynamo.userRolesStorageTable.grantReadData(fun);
     storageResources.dynamo.rolesStorageTable.grantReadData(fun);
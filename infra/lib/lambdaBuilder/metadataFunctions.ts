@@ -4,6 +4,7 @@
  */
 
 import * as lambda from "aws-cdk-lib/aws-lambda";
+import * as iam from "aws-cdk-lib/aws-iam";
 import * as path from "path";
 import { Construct } from "constructs";
 import { Duration } from "aws-cdk-lib";
@@ -18,6 +19,7 @@ import * as kms from "aws-cdk-lib/aws-kms";
 import {
     kmsKeyLambdaPermissionAddToResourcePolicy,
     globalLambdaEnvironmentsAndPermissions,
+    grantReadPermissionsToAllAssetBuckets,
 } from "../helper/security";
 
 export function buildMetadataFunctions(
@@ -69,6 +71,8 @@ export function buildMetadataFunction(
             S3_ASSET_BUCKETS_STORAGE_TABLE_NAME:
                 storageResources.dynamo.s3AssetBucketsStorageTable.tableName,
             METADATA_STORAGE_TABLE_NAME: storageResources.dynamo.metadataStorageTable.tableName,
+            METADATA_SCHEMA_STORAGE_TABLE_NAME:
+                storageResources.dynamo.metadataSchemaStorageTable.tableName,
             ASSET_STORAGE_TABLE_NAME: storageResources.dynamo.assetStorageTable.tableName,
             DATABASE_STORAGE_TABLE_NAME: storageResources.dynamo.databaseStorageTable.tableName,
             AUTH_TABLE_NAME: storageResources.dynamo.authEntitiesStorageTable.tableName,
@@ -78,6 +82,7 @@ export function buildMetadataFunction(
     });
     storageResources.dynamo.s3AssetBucketsStorageTable.grantReadData(fun);
     storageResources.dynamo.metadataStorageTable.grantReadWriteData(fun);
+    storageResources.dynamo.metadataSchemaStorageTable.grantReadData(fun);
     storageResources.dynamo.assetStorageTable.grantReadData(fun);
     storageResources.dynamo.databaseStorageTable.grantReadData(fun);
     storageResources.dynamo.authEntitiesStorageTable.grantReadData(fun);
@@ -88,3 +93,44 @@ export function buildMetadataFunction(
 
     return fun;
 }
+
+export function buildMetadataBulkImportFunction(
+    scope: Construct,
+    lambdaCommonBaseLayer: LayerVersion,
+    storageResources: storageResources,
+    config: Config.Config,
+    vpc: ec2.IVpc,
+    subnets: ec2.ISubnet[]
+): lambda.Function {
+    const name = "bulkImport";
+    const fun = buildMetadataFunction(
+        scope,
+        lambdaCommonBaseLayer,
+        storageResources,
+        config,
+        vpc,
+        subnets,
+        name
+    );
+    fun.addEnvironment(
+        "S3_ASSETAUXILIARY_STORAGE_BUCKET",
+        storageResources.s3.assetAuxiliaryBucket.bucketName
+    );
+    storageResources.s3.assetAuxiliaryBucket.grantReadWrite(fun);
+    // CSV imports are read from asset files
+    grantReadPermissionsToAllAssetBuckets(fun);
+
+    // Imports are run by background jobs on this same function.
+    // Use a standalone policy, granting through the default role policy would create a circular dependency.
+    new iam.Policy(scope, `${name}MetadataSelfInvokePolicy`, {
+        statements: [
+            new iam.PolicyStatement({
+                actions: ["lambda:InvokeFunction"],
+                resources: [fun.functionArn],
+            }),
+        ],
+        roles: [fun.role!],
+    });
+
+    return fun;
+}
@@ -154,6 +154,71 @@ export function buildIndexingFunction(
     return fun;
 }
 
+export function buildReindexFunction(
+    scope: Construct,
+    lambdaCommonBaseLayer: LayerVersion,
+    storageResources: storageResources,
+    config: Config.Config,
+    vpc: ec2.IVpc,
+    subnets: ec2.ISubnet[]
+): lambda.Function {
+    const name = "reindex";
+    const fun = new lambda.Function(scope, name, {
+        code: lambda.Code.fromAsset(path.join(__dirname, `../../../backend/backend`)),
+        handler: `handlers.indexing.${name}.lambda_handler`,
+        runtime: LAMBDA_PYTHON_RUNTIME,
+        layers: [lambdaCommonBaseLayer],
+        timeout: Duration.minutes(15),
+        memorySize: Config.LAMBDA_MEMORY_SIZE,
+        vpc: vpc, //Only built for provisioned OpenSearch, which runs in the VPC
+        vpcSubnets: { subnets: subnets },
+
+        environment: {
+            S3_ASSET_BUCKETS_STORAGE_TABLE_NAME:
+                storageResources.dynamo.s3AssetBucketsStorageTable.tableName,
+            METADATA_STORAGE_TABLE_NAME: storageResources.dynamo.metadataStorageTable.tableName,
+            ASSET_STORAGE_TABLE_NAME: storageResources.dynamo.assetStorageTable.tableName,
+            S3_ASSETAUXILIARY_STORAGE_BUCKET: storageResources.s3.assetAuxiliaryBucket.bucketName,
+            AOS_ENDPOINT_PARAM: config.openSearchDomainEndpointSSMParam,
+            AOS_INDEX_NAME_PARAM: config.openSearchIndexNameSSMParam,
+            AOS_TYPE: "es",
+        },
+    });
+
+    // add access to read the parameter store param aossEndpoint
+    fun.role?.addToPrincipalPolicy(
+        new cdk.aws_iam.PolicyStatement({
+            actions: ["ssm:GetParameter"],
+            resources: [Service.IAMArn("*" + config.name + "*").ssm],
+        })
+    );
+
+    storageResources.dynamo.metadataStorageTable.grantReadData(fun);
+    storageResources.dynamo.assetStorageTable.grantReadData(fun);
+    storageResources.dynamo.s3AssetBucketsStorageTable.grantReadData(fun);
+    // Job and segment progress
+    storageResources.s3.assetAuxiliaryBucket.grantReadWrite(fun);
+
+    // Segments of a reindex job run on this same function.
+    // Use a standalone policy, granting through the default role policy would create a circular dependency.
+    new iam.Policy(scope, `${name}SelfInvokePolicy`, {
+        statements: [
+            new iam.PolicyStatement({
+                actions: ["lambda:InvokeFunction"],
+                resources: [fun.functionArn],
+            }),
+        ],
+        roles: [fun.role!],
+    });
+
+    grantReadPermissionsToAllAssetBuckets(fun);
+    kmsKeyLambdaPermissionAddToResourcePolicy(fun, storageResources.encryption.kmsKey);
+    globalLambdaEnvironmentsAndPermissions(fun, config);
+    suppressCdkNagErrorsByGrantReadWrite(fun);
+
+    return fun;
+}
+
 export function buildSqsBucketSyncFunction(
     scope: Construct,
     lambdaCommonBaseLayer: LayerVersion,
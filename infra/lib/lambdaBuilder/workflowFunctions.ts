@@ -8,6 +8,7 @@ import * as path from "path";
 import * as dynamodb from "aws-cdk-lib/aws-dynamodb";
 import * as iam from "aws-cdk-lib/aws-iam";
 import * as s3 from "aws-cdk-lib/aws-s3";
+import * as sqs from "aws-cdk-lib/aws-sqs";
 import { Construct } from "constructs";
 import { Duration } from "aws-cdk-lib";
 import { suppressCdkNagErrorsByGrantReadWrite } from "../helper/security";
@@ -237,12 +238,22 @@ export function buildExecuteWorkflowFunction(
     scope: Construct,
     lambdaCommonBaseLayer: LayerVersion,
     storageResources: storageResources,
-    metadataReadFunction: lambda.IFunction,
     config: Config.Config,
     vpc: ec2.IVpc,
     subnets: ec2.ISubnet[]
 ): lambda.Function {
     const name = "executeWorkflow";
+
+    // Bulk execution jobs with maxConcurrency executions running continue from this queue after a delay
+    const bulkExecutionRetryQueue = new sqs.Queue(scope, `${name}BulkExecutionRetryQueue`, {
+        visibilityTimeout: Duration.seconds(960), // Corresponding function's is 900.
+        encryption: storageResources.encryption.kmsKey
+            ? sqs.QueueEncryption.KMS
+            : sqs.QueueEncryption.SQS_MANAGED,
+        encryptionMasterKey: storageResources.encryption.kmsKey,
+        enforceSSL: true,
+    });
+
     const fun = new lambda.Function(scope, name, {
         code: lambda.Code.fromAsset(path.join(__dirname, `../../../backend/backend`)),
         handler: `handlers.workflows.${name}.lambda_handler`,
@@ -269,8 +280,9 @@ export function buildExecuteWorkflowFunction(
             AUTH_TABLE_NAME: storageResources.dynamo.authEntitiesStorageTable.tableName,
             USER_ROLES_TABLE_NAME: storageResources.dynamo.userRolesStorageTable.tableName,
             S3_ASSETAUXILIARY_STORAGE_BUCKET: storageResources.s3.assetAuxiliaryBucket.bucketName,
-            METADATA_READ_LAMBDA_FUNCTION_NAME: metadataReadFunction.functionName,
+            METADATA_STORAGE_TABLE_NAME: storageResources.dynamo.metadataStorageTable.tableName,
             ROLES_TABLE_NAME: storageResources.dynamo.rolesStorageTable.tableName,
+            BULK_EXECUTION_RETRY_QUEUE_URL: bulkExecutionRetryQueue.queueUrl,
         },
     });
 
@@ -283,7 +295,38 @@ export function buildExecuteWorkflowFunction(
     storageResources.dynamo.userRolesStorageTable.grantReadData(fun);
     storageResources.s3.assetAuxiliaryBucket.grantReadWrite(fun);
     storageResources.dynamo.rolesStorageTable.grantReadData(fun);
-    metadataReadFunction.grantInvoke(fun);
+    storageResources.dynamo.metadataStorageTable.grantReadData(fun);
+
+    // Bulk executions are dispatched by background jobs on this same function.
+    // Use a standalone policy, granting through the default role policy would create a circular dependency.
+    new iam.Policy(scope, `${name}SelfInvokePolicy`, {
+        statements: [
+            new iam.PolicyStatement({
+                actions: ["lambda:InvokeFunction"],
+                resources: [fun.functionArn],
+            }),
+        ],
+        roles: [fun.role!],
+    });
+
+    bulkExecutionRetryQueue.grantSendMessages(fun);
+    bulkExecutionRetryQueue.grantConsumeMessages(fun);
+    const bulkExecutionRetryEsm = new lambda.EventSourceMapping(
+        scope,
+        `${name}BulkExecutionRetryEventSource`,
+        {
+            eventSourceArn: bulkExecutionRetryQueue.queueArn,
+            target: fun,
+            batchSize: 1,
+        }
+    );
+
+    // Due to cdk upgrade, not all regions support tags for EventSourceMapping
+    // this line should remove the tags for regions that dont support it (govcloud currently not supported)
+    if (config.app.govCloud.enabled) {
+        const cfnEsm = bulkExecutionRetryEsm.node.defaultChild as lambda.CfnEventSourceMapping;
+        cfnEsm.addPropertyDeletionOverride("Tags");
+    }
 
     grantReadWritePermissionsToAllAssetBuckets(fun);
     kmsKeyLambdaPermissionAddToResourcePolicy(fun, storageResources.encryption.kmsKey);
@@ -297,6 +340,7 @@ export function buildExecuteWorkflowFunction(
                 "states:StartExecution",
                 "states:DescribeStateMachine",
                 "states:DescribeExecution",
+                "states:ListExecutions",
             ],
             resources: [
                 IAMArn("*" + config.name + "*").statemachine,
@@ -311,9 +355,7 @@ export function buildProcessWorkflowExecutionOutputFunction(
     scope: Construct,
     lambdaCommonBaseLayer: LayerVersion,
     storageResources: storageResources,
-    fileUploadLambdaFunction: lambda.Function,
-    readMetadataLambdaFunction: lambda.Function,
-    createMetadataLambdaFunction: lambda.Function,
+    sendEmailFunction: lambda.Function,
     config: Config.Config,
     vpc: ec2.IVpc,
     subnets: ec2.ISubnet[]
@@ -342,23 +384,24 @@ export function buildProcessWorkflowExecutionOutputFunction(
             WORKFLOW_EXECUTION_STORAGE_TABLE_NAME:
                 storageResources.dynamo.workflowExecutionsStorageTable.tableName,
             ASSET_UPLOAD_TABLE_NAME: storageResources.dynamo.assetUploadsStorageTable.tableName,
-            FILE_UPLOAD_LAMBDA_FUNCTION_NAME: fileUploadLambdaFunction.functionName,
-            READ_METADATA_LAMBDA_FUNCTION_NAME: readMetadataLambdaFunction.functionName,
-            CREATE_METADATA_LAMBDA_FUNCTION_NAME: createMetadataLambdaFunction.functionName,
+            METADATA_STORAGE_TABLE_NAME: storageResources.dynamo.metadataStorageTable.tableName,
+            SEND_EMAIL_FUNCTION_NAME: sendEmailFunction.functionName,
+            PRESIGNED_URL_TIMEOUT_SECONDS:
+                config.app.authProvider.presignedUrlTimeoutSeconds.toString(),
             AUTH_TABLE_NAME: storageResources.dynamo.authEntitiesStorageTable.tableName,
             USER_ROLES_TABLE_NAME: storageResources.dynamo.userRolesStorageTable.tableName,
             ROLES_TABLE_NAME: storageResources.dynamo.rolesStorageTable.tableName,
         },
     });
 
-    fileUploadLambdaFunction.grantInvoke(fun);
-    readMetadataLambdaFunction.grantInvoke(fun);
-    createMetadataLambdaFunction.grantInvoke(fun);
+    // Metadata and upload completion run in-process through the metadata and upload file services
+    sendEmailFunction.grantInvoke(fun);
 
     storageResources.dynamo.s3AssetBucketsStorageTable.grantReadData(fun);
     storageResources.dynamo.rolesStorageTable.grantReadData(fun);
     storageResources.dynamo.databaseStorageTable.grantReadWriteData(fun);
-    storageResources.dynamo.assetStorageTable.grantReadData(fun);
+    storageResources.dynamo.assetStorageTable.grantReadWriteData(fun);
+    storageResources.dynamo.metadataStorageTable.grantReadWriteData(fun);
     storageResources.dynamo.assetUploadsStorageTable.grantReadWriteData(fun);
     storageResources.dynamo.workflowExecutionsStorageTable.grantReadWriteData(fun);
     storageResources.dynamo.authEntitiesStorageTable.grantReadData(fun);
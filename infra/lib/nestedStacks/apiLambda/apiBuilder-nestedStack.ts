@@ -49,7 +49,10 @@ import { NestedStack } from "aws-cdk-lib";
 
 import { buildMetadataSchemaService } from "../../lambdaBuilder/metadataSchemaFunctions";
 
-import { buildMetadataFunctions } from "../../lambdaBuilder/metadataFunctions";
+import {
+    buildMetadataFunctions,
+    buildMetadataBulkImportFunction,
+} from "../../lambdaBuilder/metadataFunctions";
 import { buildAuthFunctions } from "../../lambdaBuilder/authFunctions";
 import { buildTagService, buildCreateTagFunction } from "../../lambdaBuilder/tagFunctions";
 import {
@@ -737,6 +740,18 @@ export function apiBuilder(
         api: api,
     });
 
+    attachFunctionToApi(scope, assetFilesFunction, {
+        routePath: "/database/{databaseId}/assets/{assetId}/batchFileOperations",
+        method: apigateway.HttpMethod.POST,
+        api: api,
+    });
+
+    attachFunctionToApi(scope, assetFilesFunction, {
+        routePath: "/database/{databaseId}/assets/{assetId}/batchFileOperations/{jobId}",
+        method: apigateway.HttpMethod.GET,
+        api: api,
+    });
+
     const createAssetFunction = buildCreateAssetFunction(
         scope,
         lambdaCommonBaseLayer,
@@ -858,6 +873,25 @@ export function apiBuilder(
         });
     }
 
+    const metadataBulkImportFunction = buildMetadataBulkImportFunction(
+        scope,
+        lambdaCommonBaseLayer,
+        storageResources,
+        config,
+        vpc,
+        subnets
+    );
+    attachFunctionToApi(scope, metadataBulkImportFunction, {
+        routePath: "/database/{databaseId}/metadata/imports",
+        method: apigateway.HttpMethod.POST,
+        api: api,
+    });
+    attachFunctionToApi(scope, metadataBulkImportFunction, {
+        routePath: "/database/{databaseId}/metadata/imports/{jobId}",
+        method: apigateway.HttpMethod.GET,
+        api: api,
+    });
+
     const metadataSchemaFunctions = buildMetadataSchemaService(
         scope,
         lambdaCommonBaseLayer,
@@ -993,9 +1027,7 @@ export function apiBuilder(
         scope,
         lambdaCommonBaseLayer,
         storageResources,
-        uploadFileFunction,
-        metadataCrudFunctions[1],
-        metadataCrudFunctions[0],
+        sendEmailFunction,
         config,
         vpc,
         subnets
@@ -1021,7 +1053,6 @@ export function apiBuilder(
         scope,
         lambdaCommonBaseLayer,
         storageResources,
-        metadataCrudFunctions[1],
         config,
         vpc,
         subnets
@@ -1032,6 +1063,16 @@ export function apiBuilder(
         method: apigateway.HttpMethod.POST,
         api: api,
     });
+    attachFunctionToApi(scope, runWorkflowFunction, {
+        routePath: "/database/{databaseId}/workflows/{workflowId}/bulkExecutions",
+        method: apigateway.HttpMethod.POST,
+        api: api,
+    });
+    attachFunctionToApi(scope, runWorkflowFunction, {
+        routePath: "/database/{databaseId}/workflows/{workflowId}/bulkExecutions/{jobId}",
+        method: apigateway.HttpMethod.GET,
+        api: api,
+    });
 
     const ingestAssetFunction = buildIngestAssetFunction(
         scope,
@@ -243,7 +243,8 @@ export class OpensearchProvisionedConstruct extends Construct {
                 indexNameSSMParam: props.config.openSearchIndexNameSSMParam,
                 domainEndpoint: "https://" + osDomain.domainEndpoint,
                 indexName: props.config.openSearchIndexName,
-                version: "1",
+                suggestIndexName: props.config.openSearchIndexName + "-suggest",
+                version: "2",
             },
         });
 
@@ -220,7 +220,8 @@ export class OpensearchServerlessConstruct extends Construct {
                 indexNameSSMParam: props.config.openSearchIndexNameSSMParam,
                 collectionEndpoint: collection.attrCollectionEndpoint,
                 indexName: props.config.openSearchIndexName,
-                version: "1",
+                suggestIndexName: props.config.openSearchIndexName + "-suggest",
+                version: "2",
             },
         });
 
@@ -257,7 +258,10 @@ export class OpensearchServerlessConstruct extends Construct {
                     {
                         ResourceType: "index",
                         // Resource: ["index/*/*"],
-                        Resource: [`index/${this.collectionUid}/assets1236`],
+                        Resource: [
+                            `index/${this.collectionUid}/assets1236`,
+                            `index/${this.collectionUid}/assets1236-suggest`,
+                        ],
                         Permission: [
                             // "aoss:*",
                             "aoss:ReadDocument",
@@ -325,7 +329,10 @@ export class OpensearchServerlessConstruct extends Construct {
                 Rules: [
                     {
                         ResourceType: "index",
-                        Resource: [`index/${this.collectionUid}/assets1236`],
+                        Resource: [
+                            `index/${this.collectionUid}/assets1236`,
+                            `index/${this.collectionUid}/assets1236-suggest`,
+                        ],
                         Permission: ["aoss:*"],
                     },
                     {
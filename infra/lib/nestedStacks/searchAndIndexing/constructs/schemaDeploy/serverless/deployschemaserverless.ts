@@ -44,6 +44,67 @@ const setCollectionEndpointSSM = async (paramName: string, value: string | undef
     console.log("endpoint SSM response", response);
 };
 
+// Typeahead suggestions of asset names, file names and tags (backend/backend/common/searchSuggestions.py),
+// the suggest field is analyzed with edge n-grams so that a prefix is a plain match
+const createSuggestIndex = async (client: Client, suggestIndexName: string | undefined) => {
+    if (!suggestIndexName) {
+        return;
+    }
+    const exists_resp = await client.indices.exists({ index: suggestIndexName });
+    if (exists_resp.body) {
+        console.log("suggest index already exists");
+        return;
+    }
+
+    const keyword = { type: "keyword" };
+    const index_resp = await client.indices.create({
+        index: suggestIndexName,
+        body: {
+            settings: {
+                analysis: {
+                    filter: {
+                        suggest_edge_ngram: {
+                            type: "edge_ngram",
+                            min_gram: 1,
+                            max_gram: 20,
+                        },
+                    },
+                    analyzer: {
+                        suggest_index: {
+                            type: "custom",
+                            tokenizer: "standard",
+                            filter: ["lowercase", "suggest_edge_ngram"],
+                        },
+                        suggest_search: {
+                            type: "custom",
+                            tokenizer: "standard",
+                            filter: ["lowercase"],
+                        },
+                    },
+                },
+            },
+            mappings: {
+                properties: {
+                    suggest: {
+                        type: "text",
+                        analyzer: "suggest_index",
+                        search_analyzer: "suggest_search",
+                    },
+                    value: keyword,
+                    type: keyword,
+                    databaseId: keyword,
+                    assetId: keyword,
+                    key: keyword,
+                    assetName: keyword,
+                    assetType: keyword,
+                    tags: keyword,
+                },
+            },
+        },
+    });
+    console.log("suggest index_resp", index_resp);
+};
+
 export const handler: Handler = async function (event: any) {
     console.log("the event", event);
 
@@ -86,6 +147,8 @@ export const handler: Handler = async function (event: any) {
 
     console.log("established opensearch client connection");
 
+    await createSuggestIndex(client, event?.ResourceProperties?.suggestIndexName);
+
     const exists_resp = await client.indices.exists({
         index: event?.ResourceProperties?.indexName,
     });
@@ -4,7 +4,10 @@
  */
 
 import { storageResources } from "../storage/storageBuilder-nestedStack";
-import { buildIndexingFunction } from "../../lambdaBuilder/searchIndexBucketSyncFunctions";
+import {
+    buildIndexingFunction,
+    buildReindexFunction,
+} from "../../lambdaBuilder/searchIndexBucketSyncFunctions";
 import * as eventsources from "aws-cdk-lib/aws-lambda-event-sources";
 import * as lambda from "aws-cdk-lib/aws-lambda";
 import * as sqs from "aws-cdk-lib/aws-sqs";
@@ -75,6 +78,16 @@ export function searchBuilder(
         method: apigwv2.HttpMethod.GET,
         api: api,
     });
+    attachFunctionToApi(scope, searchFun, {
+        routePath: "/search/export",
+        method: apigwv2.HttpMethod.POST,
+        api: api,
+    });
+    attachFunctionToApi(scope, searchFun, {
+        routePath: "/search/suggest",
+        method: apigwv2.HttpMethod.GET,
+        api: api,
+    });
 
     let indexingS3ObjectMetadataFunction: lambda.Function | undefined = undefined;
 
@@ -247,6 +260,17 @@ export function searchBuilder(
 
         //grant search function access to AOS
         aos.grantOSDomainAccess(searchFun);
+
+        //Rebuilds the index behind its alias, invoked directly (see the developer guide)
+        const reindexFunction = buildReindexFunction(
+            scope,
+            lambdaCommonBaseLayer,
+            storageResources,
+            config,
+            vpc,
+            subnets
+        );
+        aos.grantOSDomainAccess(reindexFunction);
     }
 
     /////////////////////////////////////////////////////////////////////////////
@@ -167,6 +167,58 @@ export const runWorkflow = async (
     }
 };
 
+/**
+ * Queues a workflow execution on many assets/files of a database. Returns array of boolean and the job status or error message.
+ * @returns {Promise<boolean|{message}|any>}
+ */
+export const runBulkWorkflow = async (
+    { databaseId, workflowId, assetIds, fileGlob, maxConcurrency, isGlobalWorkflow = false },
+    api = API
+) => {
+    try {
+        const eventBody = {
+            workflowDatabaseId: isGlobalWorkflow ? "GLOBAL" : databaseId,
+        };
+        if (assetIds) eventBody.assetIds = assetIds;
+        if (fileGlob) eventBody.fileGlob = fileGlob;
+        if (maxConcurrency) eventBody.maxConcurrency = maxConcurrency;
+
+        const response = await api.post(
+            "api",
+            `database/${databaseId}/workflows/${workflowId}/bulkExecutions`,
+            { body: eventBody }
+        );
+        if (response.jobId) {
+            return [true, response];
+        }
+        return [false, response.message];
+    } catch (error) {
+        console.log(error);
+        return [false, error?.message, error?.response?.data?.message];
+    }
+};
+
+/**
+ * Returns array of boolean and the progress of a bulk workflow execution job or error message.
+ * @returns {Promise<boolean|{message}|any>}
+ */
+export const getBulkWorkflowExecutionJob = async ({ databaseId, workflowId, jobId }, api = API) => {
+    try {
+        const response = await api.get(
+            "api",
+            `database/${databaseId}/workflows/${workflowId}/bulkExecutions/${jobId}`,
+            {}
+        );
+        if (response.jobId) {
+            return [true, response];
+        }
+        return [false, response.message];
+    } catch (error) {
+        console.log(error);
+        return [false, error?.message, error?.response?.data?.message];
+    }
+};
+
 /**
  * Returns array of boolean and response/error message for the workflow that the current user is saving/updating, or false if error.
  * @returns {Promise<boolean|{message}|any>}
@@ -1002,6 +1054,47 @@ export const fetchDatabaseMetadataSchema = async ({ databaseId }, api = API) =>
     }
 };
 
+/**
+ * Queues a metadata import of many assets/files of a database, given as records or as a CSV file of an asset.
+ * Returns array of boolean and the job status or error message.
+ * @returns {Promise<boolean|{message}|any>}
+ */
+export const importMetadata = async ({ databaseId, records, csvFile }, api = API) => {
+    try {
+        const eventBody = { version: "1" };
+        if (records) eventBody.records = records;
+        if (csvFile) eventBody.csvFile = csvFile;
+
+        const response = await api.post("api", `database/${databaseId}/metadata/imports`, {
+            body: eventBody,
+        });
+        if (response.jobId) {
+            return [true, response];
+        }
+        return [false, response.message];
+    } catch (error) {
+        console.log(error);
+        return [false, error?.message, error?.response?.data?.message];
+    }
+};
+
+/**
+ * Returns array of boolean and the progress and error report of a metadata import job or error message.
+ * @returns {Promise<boolean|{message}|any>}
+ */
+export const getMetadataImportJob = async ({ databaseId, jobId }, api = API) => {
+    try {
+        const response = await api.get("api", `database/${databaseId}/metadata/imports/${jobId}`, {});
+        if (response.jobId) {
+            return [true, response];
+        }
+        return [false, response.message];
+    } catch (error) {
+        console.log(error);
+        return [false, error?.message, error?.response?.data?.message];
+    }
+};
+
 /** add in the columnar data loaders **/
 /**
  * Creates a new folder in the specified asset
@@ -43,6 +43,41 @@ export interface FileOperationResult {
     error?: string;
 }
 
+export interface BatchFileOperation {
+    operation: "copy" | "move" | "archive" | "delete";
+    filePath: string;
+    destinationPath?: string;
+    destinationAssetId?: string;
+    isPrefix?: boolean;
+}
+
+export interface BatchFileOperationsRequest {
+    operations: BatchFileOperation[];
+    confirmPermanentDelete?: boolean;
+}
+
+export interface BatchFileOperationResult {
+    index: number;
+    operation: string;
+    filePath: string;
+    success: boolean;
+    message: string;
+    affectedFiles: string[];
+}
+
+export interface BatchFileOperationsResponse {
+    jobId?: string;
+    status: "QUEUED" | "RUNNING" | "COMPLETED" | "FAILED";
+    message: string;
+    totalOperations: number;
+    succeededCount: number;
+    failedCount: number;
+    results: BatchFileOperationResult[];
+}
+
+// Interval between status checks of a background batch file operations job
+const BATCH_JOB_POLL_INTERVAL_MS = 2000;
+
 export interface GeneratePresignedUrlsRequest {
     databaseId: string;
     assetId: string;
@@ -119,6 +154,63 @@ export const copyFile = async (
     }
 };
 
+/**
+ * Run many file operations on an asset in a single request.
+ * Large batches are queued as a background job and returned with a jobId.
+ */
+export const batchFileOperations = async (
+    databaseId: string,
+    assetId: string,
+    request: BatchFileOperationsRequest,
+    api = API
+): Promise<BatchFileOperationsResponse> => {
+    try {
+        const response = await api.post(
+            "api",
+            `/database/${databaseId}/assets/${assetId}/batchFileOperations`,
+            {
+                body: request,
+            }
+        );
+
+        if (response) {
+            return response;
+        } else {
+            throw new Error("Invalid response format");
+        }
+    } catch (error: any) {
+        console.error("Error running batch file operations:", error);
+        throw new Error(error?.message || "Failed to run batch file operations");
+    }
+};
+
+/**
+ * Get the status and results of a background batch file operations job
+ */
+export const getBatchFileOperationsJob = async (
+    databaseId: string,
+    assetId: string,
+    jobId: string,
+    api = API
+): Promise<BatchFileOperationsResponse> => {
+    try {
+        const response = await api.get(
+            "api",
+            `/database/${databaseId}/assets/${assetId}/batchFileOperations/${jobId}`,
+            {}
+        );
+
+        if (response) {
+            return response;
+        } else {
+            throw new Error("Invalid response format");
+        }
+    } catch (error: any) {
+        console.error("Error getting batch file operations job:", error);
+        throw new Error(error?.message || "Failed to get batch file operations job");
+    }
+};
+
 /**
  * Unarchive a file that was previously archived
  */
@@ -283,7 +375,7 @@ export const generatePresignedUrls = async (
 };
 
 /**
- * Process multiple file operations (move or copy)
+ * Process multiple file operations (move or copy) as a single batch
  */
 export const processMultipleFileOperations = async (
     databaseId: string,
@@ -293,48 +385,44 @@ export const processMultipleFileOperations = async (
     operation: "move" | "copy",
     destinationAssetId?: string
 ): Promise<FileOperationResult[]> => {
-    const results: FileOperationResult[] = [];
-
-    for (const filePath of files) {
-        try {
-            // Construct destination path
-            const fileName = filePath.split("/").pop() || filePath;
-            const destinationPath = destinationFolder.endsWith("/")
-                ? `${destinationFolder}${fileName}`
-                : `${destinationFolder}/${fileName}`;
-
-            if (operation === "move") {
-                const response = await moveFile(databaseId, assetId, {
-                    sourcePath: filePath,
-                    destinationPath: destinationPath,
-                });
+    const operations: BatchFileOperation[] = files.map((filePath) => {
+        // Construct destination path
+        const fileName = filePath.split("/").pop() || filePath;
+        const destinationPath = destinationFolder.endsWith("/")
+            ? `${destinationFolder}${fileName}`
+            : `${destinationFolder}/${fileName}`;
+
+        return {
+            operation: operation,
+            filePath: filePath,
+            destinationPath: destinationPath,
+            destinationAssetId: operation === "copy" ? destinationAssetId : undefined,
+        };
+    });
 
-                results.push({
-                    filePath,
-                    success: response.success,
-                    error: response.success ? undefined : response.message,
-                });
-            } else {
-                const response = await copyFile(databaseId, assetId, {
-                    sourcePath: filePath,
-                    destinationPath: destinationPath,
-                    destinationAssetId: destinationAssetId,
-                });
+    try {
+        let response = await batchFileOperations(databaseId, assetId, { operations });
 
-                results.push({
-                    filePath,
-                    success: response.success,
-                    error: response.success ? undefined : response.message,
-                });
-            }
-        } catch (error: any) {
-            results.push({
-                filePath,
-                success: false,
-                error: error.message || `Failed to ${operation} file`,
-            });
+        // Wait for large batches that run as a background job
+        while (response.jobId && (response.status === "QUEUED" || response.status === "RUNNING")) {
+            await new Promise((resolve) => setTimeout(resolve, BATCH_JOB_POLL_INTERVAL_MS));
+            response = await getBatchFileOperationsJob(databaseId, assetId, response.jobId);
         }
-    }
 
-    return results;
+        if (response.status === "FAILED") {
+            throw new Error(response.message);
+        }
+
+        return response.results.map((result) => ({
+            filePath: result.filePath,
+            success: result.success,
+            error: result.success ? undefined : result.message,
+        }));
+    } catch (error: any) {
+        return files.map((filePath) => ({
+            filePath,
+            success: false,
+            error: error.message || `Failed to ${operation} file`,
+        }));
+    }
 };